@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from typing import Any, Dict
+
+from api.deps import verify_admin_token
+from services.key_manager import get_key_manager
+from services.queue_inspector import get_queue_inspector
+
+import asyncio
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 모든 관리자 엔드포인트는 X-Admin-Token 헤더 검증을 거침
+router = APIRouter(dependencies=[Depends(verify_admin_token)])
+
+
+@router.get("/gemini-keys")
+async def get_gemini_key_status() -> Dict[str, Any]:
+    """
+    Gemini API 키 상태 스냅샷 조회
+
+    이 프로세스가 보유한 로컬 키 상태(사용량 추정치, 블랙리스트 남은 시간)를 반환합니다.
+    키 원문은 노출하지 않고 해시 식별자(key_id)만 사용하며, 같은 값이 Prometheus 레이블로도 쓰입니다.
+    """
+    return get_key_manager().snapshot()
+
+
+@router.get("/queues")
+async def get_queue_status() -> Dict[str, Any]:
+    """
+    Celery 큐 적체 상태 조회 (워커 자동 확장 기준)
+
+    큐별 대기 작업 수(depth), 가장 오래 기다린 작업의 대기 시간(oldest_age_seconds),
+    우선순위별 대기 작업 수(by_priority)를 반환합니다. 같은 값이 /metrics에도 게이지로 노출됩니다.
+    """
+    return await asyncio.to_thread(get_queue_inspector().snapshot)
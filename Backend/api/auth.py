@@ -18,6 +18,7 @@ from services.auth import (
 )
 # MongoDB 의존성 추가
 from db.mongodb import get_mongodb
+from services.user_cache import get_user_cache
 
 router = APIRouter()
 
@@ -182,6 +183,7 @@ async def google_callback(
                     "updated_at": current_time
                 }}
             )
+            await get_user_cache().ainvalidate(user_id)
             user = existing_user
         else:
             # 새 사용자 생성 - 실제 유저 모델 구조에 맞게 저장
@@ -234,7 +236,7 @@ async def google_callback(
         }
         
         # JWT 토큰 생성
-        access_token = create_access_token(token_payload)
+        access_token = create_access_token(token_payload, user=user)
         refresh_token = create_refresh_token({"sub": user_id_str})
         
         # 프론트엔드에 전달할 사용자 정보
@@ -578,7 +580,7 @@ async def refresh_token_endpoint(
             "auth_provider": user.get("auth_provider")
         }
         
-        new_access_token = create_access_token(token_payload)
+        new_access_token = create_access_token(token_payload, user=user)
         
         return JSONResponse(content={
             "access_token": new_access_token
@@ -757,6 +759,7 @@ async def naver_callback(
                     "last_login_at": current_time
                 }}
             )
+            await get_user_cache().ainvalidate(user_id)
             user = existing_user
         else:
             # 새 사용자 생성 - 유저 모델 구조에 맞게 저장
@@ -801,7 +804,7 @@ async def naver_callback(
         }
         
         # JWT 토큰 생성
-        access_token = create_access_token(token_payload)
+        access_token = create_access_token(token_payload, user=user)
         refresh_token = create_refresh_token({"sub": user_id_str})
         
         # 프론트엔드에 전달할 사용자 정보
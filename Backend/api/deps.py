@@ -9,20 +9,16 @@ from datetime import datetime
 
 import jwt
 from models.user import User
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from services import auth as auth_service
-from itertools import cycle
 from core.config import settings
+from services.key_manager import get_key_manager, key_id
+from services.user_cache import get_user_cache, load_user
+from core.metrics import GEMINI_KEY_QUOTA_ERRORS
+import hmac
 import logging
-from redis import Redis
-import time
 import asyncio
 
-redis_client = Redis.from_url(settings.REDIS_URL)
-
-# 전역 변수로 미리 선언
-_gemini_key_cycle = None
-
 # API 키 관리를 위한 Lock 객체
 _api_key_lock = asyncio.Lock()
 
@@ -79,8 +75,8 @@ async def get_current_user(
                 },
             )
             
-        # 사용자 조회
-        user = await db.users.find_one({"_id": user_object_id})
+        # 사용자 조회 (캐시 우선)
+        user = await load_user(db, user_object_id)
         if user is None:
             logger.warning(f"사용자를 찾을 수 없음: {user_id}")
             raise HTTPException(
@@ -151,8 +147,8 @@ async def get_current_user_for_multipart(
                 if not user_id:
                     raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
                 
-                # 사용자 조회
-                user = await db.users.find_one({"_id": ObjectId(user_id)})
+                # 사용자 조회 (캐시 우선)
+                user = await load_user(db, user_id)
                 if not user:
                     raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
                 
@@ -173,8 +169,8 @@ async def get_current_user_for_multipart(
         if not ObjectId.is_valid(user_id):
             raise HTTPException(status_code=400, detail="유효하지 않은 사용자 ID 형식입니다")
         
-        # 사용자 조회
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
+        # 사용자 조회 (캐시 우선)
+        user = await load_user(db, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
@@ -187,6 +183,120 @@ async def get_current_user_for_multipart(
         raise HTTPException(status_code=401, detail="인증에 실패했습니다")
 
 
+class UserClaims:
+    """
+    서명된 액세스 토큰의 사용자 클레임 (get_current_user_claims 결과)
+
+    사용자 ID, 이름, 온보딩 여부, limits 버전은 토큰 발급 시점의 값이며,
+    전체 User는 get_user()를 처음 호출할 때 한 번만 조회합니다 (사용자 캐시 경유).
+    limits 등 몇 개 필드만 필요하면 get_fields()를 사용합니다.
+    """
+
+    __slots__ = ("id", "name", "auth_provider", "is_onboarded", "limits_version", "_db", "_user")
+
+    def __init__(self, payload: Dict[str, Any], db):
+        self.id: str = payload["sub"]
+        self.name: Optional[str] = payload.get("name")
+        self.auth_provider: Optional[str] = payload.get("auth_provider")
+        self.is_onboarded: Optional[bool] = payload.get("onboarded")
+        self.limits_version: Optional[str] = payload.get("lv")
+        self._db = db
+        self._user: Optional[User] = None
+
+    async def get_user(self) -> User:
+        """전체 사용자 정보 조회 (없으면 404)"""
+        if self._user is None:
+            user = await load_user(self._db, self.id)
+            if user is None:
+                logger.warning(f"사용자를 찾을 수 없음: {self.id}")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="사용자를 찾을 수 없습니다",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            self._user = User.from_mongo(user)
+        return self._user
+
+    async def get_fields(self, *fields: str) -> Dict[str, Any]:
+        """
+        전체 User를 만들지 않고 필요한 필드만 조회 (없으면 404)
+
+        이미 읽은 사용자 정보나 로컬 사용자 캐시의 문서가 토큰의 limits 버전(lv)과 같으면 DB를 읽지 않고,
+        아니면 해당 필드만 projection으로 조회합니다.
+        """
+        if self._user is not None:
+            return {field: getattr(self._user, field, None) for field in fields}
+
+        cached = get_user_cache().get_local(self.id)
+        if cached is not None and auth_service.limits_version(cached.get("limits")) == self.limits_version:
+            return {field: cached.get(field) for field in fields}
+
+        user = await self._db.users.find_one({"_id": ObjectId(self.id)}, {field: 1 for field in fields})
+        if user is None:
+            logger.warning(f"사용자를 찾을 수 없음: {self.id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="사용자를 찾을 수 없습니다",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return {field: user.get(field) for field in fields}
+
+
+def _auth_error(detail: str, error_type: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={
+            "WWW-Authenticate": "Bearer",
+            "X-Error-Type": error_type  # 오류 유형 식별자
+        },
+    )
+
+
+async def get_current_user_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db = Depends(get_mongodb)
+) -> UserClaims:
+    """
+    액세스 토큰 서명만 검증하고 클레임을 반환하는 경량 인증 의존성
+
+    사용자 ID만 필요한 조회 API용으로, 요청마다 사용자 조회와 User 모델 생성을 하지 않습니다.
+    오류 응답(상태 코드, X-Error-Type)은 get_current_user와 같습니다.
+    """
+    if credentials is None:
+        raise _auth_error("인증 정보가 필요합니다", "missing_token")
+
+    try:
+        payload = jwt.decode(
+            credentials.credentials,
+            settings.JWT_SECRET_KEY,
+            algorithms=settings.JWT_ALGORITHM
+        )
+    except jwt.ExpiredSignatureError:
+        raise _auth_error("인증 토큰이 만료되었습니다. 리프레시 토큰을 사용하여 갱신하세요.", "token_expired")
+    except jwt.InvalidTokenError:
+        raise _auth_error("유효하지 않은 인증 토큰입니다", "invalid_token")
+
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise _auth_error("유효하지 않은 인증 정보", "invalid_payload")
+    if not ObjectId.is_valid(user_id):
+        raise _auth_error("유효하지 않은 사용자 ID 형식", "invalid_user_id_format")
+
+    return UserClaims(payload, db)
+
+
+
+
+async def verify_admin_token(request: Request) -> None:
+    """관리자 API 접근 검증 (X-Admin-Token 헤더와 ADMIN_API_TOKEN 비교)"""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    provided_token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(provided_token, settings.ADMIN_API_TOKEN):
+        logger.warning("관리자 API 인증 실패")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다")
 
 
 async def get_next_gemini_key_async():
@@ -195,99 +305,11 @@ async def get_next_gemini_key_async():
         return get_next_gemini_key()
 
 def get_next_gemini_key():
-    """다음 Gemini API 키를 반환합니다. Redis 기반 블랙리스트를 통해 할당량 초과된 키 관리."""
-    global _gemini_key_cycle
-    
-    # 모든 키 가져오기
-    gemini_keys = settings.gemini_api_keys()
-    if not gemini_keys:
-        logger.warning("Gemini API 키가 설정되지 않았습니다.")
-        return ""
-    
-    # 초기화가 필요하면 초기화
-    if _gemini_key_cycle is None:
-        _gemini_key_cycle = cycle(gemini_keys)
-    
-    # 현재 시간
-    current_time = time.time()
-    
-    # 모든 키 확인 (최대 한 바퀴)
-    keys_checked = 0
-    total_keys = len(gemini_keys)
-    
-    while keys_checked < total_keys:
-        keys_checked += 1
-        key = next(_gemini_key_cycle)
-        
-        try:
-            # Redis에서 블랙리스트 체크
-            blacklist_key = f"key_blacklist:gemini:{key}"
-            blacklist_until = redis_client.get(blacklist_key)
-            
-            if blacklist_until:
-                blacklist_until = float(blacklist_until)
-                if current_time < blacklist_until:
-                    # 아직 블랙리스트 시간이 지나지 않음
-                    time_left = int(blacklist_until - current_time)
-                    logger.debug(f"키 {key[:8]}...는 블랙리스트에 있음 (남은 시간: {time_left}초)")
-                    continue
-                else:
-                    # 블랙리스트 시간 경과, 블랙리스트에서 제거
-                    redis_client.delete(blacklist_key)
-                    logger.info(f"키 {key[:8]}...의 블랙리스트 시간이 만료되어 다시 사용합니다.")
-            
-            # 사용량 제한 확인 (선택 사항)
-            usage_key = f"key_usage:gemini:{key}"
-            usage_count = int(redis_client.get(usage_key) or 0)
-            
-            # 사용량이 일정 수준 이상이면 다른 키 사용 (선택적으로 적용)
-            if usage_count >= 40:  # 시간당 40회로 제한
-                logger.debug(f"키 {key[:8]}...의 사용량이 많아 다른 키 시도 (사용량: {usage_count})")
-                continue
-                
-            # 사용 가능한 키 발견
-            # 사용량 카운터 증가
-            redis_client.incr(usage_key)
-            redis_client.expire(usage_key, 3600)  # 1시간 후 리셋
-            
-            logger.info(f"Gemini API 키 사용: {key[:8]}... (사용량: {usage_count + 1})")
-            return key
-            
-        except Exception as e:
-            logger.error(f"Redis에서 키 블랙리스트 확인 중 오류: {str(e)}")
-            # Redis 오류 시 그냥 키 반환
-            return key
-    
-    # 모든 키가 블랙리스트에 있는 경우, 블랙리스트 시간이 가장 적게 남은 키 선택
-    logger.warning("모든 Gemini API 키가 블랙리스트에 있습니다. 가장 빨리 해제될 키를 선택합니다.")
-    
-    try:
-        earliest_release = float('inf')
-        earliest_key = None
-        
-        for key in gemini_keys:
-            blacklist_key = f"key_blacklist:gemini:{key}"
-            blacklist_until = redis_client.get(blacklist_key)
-            
-            if blacklist_until:
-                blacklist_until = float(blacklist_until)
-                time_left = blacklist_until - current_time
-                
-                if time_left < earliest_release:
-                    earliest_release = time_left
-                    earliest_key = key
-        
-        if earliest_key:
-            logger.warning(f"모든 키가 블랙리스트에 있어 {earliest_key[:8]}... 키를 강제로 선택합니다. (블랙리스트 해제까지 {int(earliest_release)}초)")
-            return earliest_key
-    except Exception as e:
-        logger.error(f"최적 키 선택 중 오류: {str(e)}")
-    
-    # 어떤 키든 반환
-    return gemini_keys[0]  # 첫 번째 키 반환
+    """다음 Gemini API 키를 반환합니다. 프로세스 로컬 키 상태 사본에서 메모리 안에서 선택합니다."""
+    return get_key_manager().acquire()
 
 def handle_api_error(key, error_message):
-    """API 오류 발생 시 키를 Redis 블랙리스트에 추가"""
+    """API 오류 발생 시 키를 블랙리스트에 추가 (Redis 기록 + pub/sub으로 다른 프로세스에 전파)"""
     try:
         # 할당량 초과 여부 확인 (더 많은 키워드 추가)
         quota_terms = ["quota", "rate limit", "exceeded", "resource", "429", "limit"]
@@ -295,19 +317,13 @@ def handle_api_error(key, error_message):
         
         if quota_exceeded:
             # 할당량 초과 시 30분 동안 블랙리스트에 추가
-            blacklist_until = time.time() + 1800  # 30분
-            redis_client.set(f"key_blacklist:gemini:{key}", blacklist_until)
-            logger.warning(f"Gemini API 키 {key[:8]}...를 할당량 초과로 30분간 블랙리스트에 추가했습니다.")
-            
-            # 키 개수 로깅
-            active_keys = 0
-            total_keys = len(settings.gemini_api_keys())
+            GEMINI_KEY_QUOTA_ERRORS.labels(key=key_id(key)).inc()
+            key_manager = get_key_manager()
+            key_manager.blacklist(key)
+            logger.warning(f"Gemini API 키 {key[:8]}...를 할당량 초과로 {settings.GEMINI_KEY_BLACKLIST_SECONDS // 60}분간 블랙리스트에 추가했습니다.")
             
-            for k in settings.gemini_api_keys():
-                if not redis_client.exists(f"key_blacklist:gemini:{k}"):
-                    active_keys += 1
-            
-            logger.warning(f"현재 사용 가능한 키: {active_keys}/{total_keys}")
+            # 키 개수 로깅 (로컬 상태 기준)
+            logger.warning(f"현재 사용 가능한 키: {key_manager.active_key_count()}/{len(key_manager.keys)}")
             
             return True
         return False
@@ -315,7 +331,6 @@ def handle_api_error(key, error_message):
         logger.error(f"API 오류 처리 중 예외 발생: {str(e)}")
         return False
 
-
         
 
 # API 키 순환자 초기화
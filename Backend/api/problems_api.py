@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, Header, Request, Response
 from fastapi.responses import HTMLResponse, FileResponse
 from typing import Any, List, Dict, Optional, Union
 from bson import ObjectId, errors as bson_errors
@@ -11,9 +11,13 @@ from schemas.problem import ProblemResponse, ProblemDetailResponse, QuestionResp
 from gtts import gTTS
 import os
 import base64
-from api.deps import get_current_user
+from api.deps import UserClaims, get_current_user, get_current_user_claims
+from services.user_cache import get_user_cache
+from services.script_tts import SCRIPT_VOICE, clean_script_text, render_script_tts
+from services.tts_cache import AUDIO_MEDIA_TYPE, audio_file_response, get_tts_cache
 from models.user import User
 
+import asyncio
 import logging
 from dotenv import load_dotenv
 import httpx
@@ -74,7 +78,7 @@ async def get_problems_by_category(
 @router.get("/detail/{problem_id}", response_model=ProblemDetailResponse, status_code=status.HTTP_200_OK)
 async def get_problem_detail(
     problem_id: str = Path(..., description="조회할 문제 ID"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
     db: Database = Depends(get_mongodb)
 ) -> ProblemDetailResponse:
     """문제 세부 정보 조회"""
@@ -97,7 +101,7 @@ async def get_problem_detail(
             )
         
         # 2. 현재 사용자 ID로 쿼리 필터 준비
-        user_id = str(current_user.id)  # 객체의 속성으로 접근
+        user_id = current_user.id  # 토큰의 사용자 ID
         query_filter = {
             "problem_id": problem_id,
             "user_id": user_id
@@ -136,12 +140,8 @@ async def get_problem_detail(
                 else:
                     test_notes = group["docs"]
         
-        print(f"Current user: {current_user}")
-        print(f"Limits: {current_user.limits}")
-
-        # 5. 스크립트 생성 제한 정보 조회
-        # current_user는 User 객체이므로 속성으로 접근
-        limits = current_user.limits
+        # 5. 스크립트 생성 제한 정보 조회 (사용자의 limits 필드만 조회)
+        limits = (await current_user.get_fields("limits"))["limits"]
         script_count = limits.get("script_count", 0) if limits else 0
         
         script_limit = {
@@ -342,16 +342,18 @@ async def make_script(
         if script_count >= 5:
             raise HTTPException(status_code=403, detail="스크립트 생성은 최대 5회까지만 가능합니다")
         
-        # 스크립트 횟수 증가
+        # 스크립트 횟수 증가 (제한 미만일 때만 증가)
         script_limit_field = "limits.script_count"
+        update_result = await db.users.update_one(
+            {"_id": ObjectId(user_id), script_limit_field: {"$not": {"$gte": 5}}},
+            {"$inc": {script_limit_field: 1}}
+        )
+        await get_user_cache().ainvalidate(user_id)
+        if update_result.modified_count == 0:
+            # 캐시된 사용자 정보를 읽은 뒤 다른 요청이 먼저 제한에 도달한 경우
+            raise HTTPException(status_code=403, detail="스크립트 생성은 최대 5회까지만 가능합니다")
         
         try:
-            # 스크립트 생성 카운트 증가
-            await db.users.update_one(
-                {"_id": ObjectId(user_id)},
-                {"$inc": {script_limit_field: 1}}
-            )
-
             # 1. 문제 정보 조회
             problem = await db.problems.find_one({"_id": ObjectId(problem_pk)})
             if not problem:
@@ -487,10 +489,14 @@ async def make_script(
                     {"_id": ObjectId(user_id)},
                     {"$inc": {script_limit_field: -1}}
                 )
+                await get_user_cache().ainvalidate(user_id)
             except Exception as rollback_error:
                 logger.error(f"카운트 롤백 중 오류: {str(rollback_error)}")
             
             raise HTTPException(status_code=500, detail=f"스크립트 생성 중 오류 발생: {str(e)}")
+    except HTTPException:
+        # 제한 초과(403) 등은 그대로 전달
+        raise
     except Exception as e:
         # 최상위 예외 처리
         logger.error(f"요청 처리 중 예외 발생: {str(e)}", exc_info=True)
@@ -585,125 +591,120 @@ async def delete_script(
         )
 
 
-@router.post("/scripts/{script_pk}/audio", status_code=status.HTTP_200_OK)
-async def listen_script(
-    script_pk: str = Path(..., description="조회할 스크립트 ID"),
-    db: Database = Depends(get_mongodb)
-) -> Dict[str, Any]:
-    """
-    스크립트 발음을 외부 Colab TTS API로 변환하여 Base64 인코딩된 오디오 데이터 반환
-    """
-    try:
-        # MongoDB에서 스크립트 조회
-        script =  await db.scripts.find_one({"_id": ObjectId(script_pk)})
-
-        if not script:
-            raise HTTPException(status_code=404, detail="Script not found")
-
-        # 스크립트 내용 추출
-        script_content = script.get('content', '')
-        logger.debug(f"스크립트 내용 길이: {len(script_content)}")
-
-        if not script_content:
-            raise HTTPException(status_code=400, detail="No content available for TTS")
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as audio_file:
+        return audio_file.read()
 
-        # HTML 태그 제거 및 텍스트만 추출
-        from bs4 import BeautifulSoup
 
-        # HTML 파싱
-        soup = BeautifulSoup(script_content, 'html.parser')
+async def ensure_script_audio(script_pk: str, db: Database):
+    """
+    스크립트 발음 음성 파일 준비 (정리된 텍스트가 캐시에 없을 때만 TTS 서비스 호출)
 
-        # 텍스트만 추출 (HTML 태그 제거)
-        clean_text = soup.get_text(separator=' ', strip=True)
+    Returns:
+        Tuple[str, str]: (캐시 키, 로컬 MP3 파일 경로)
 
-        # 추가적인 텍스트 정리 (여러 공백, 특수 문자 등 처리)
-        import re
-        clean_text = re.sub(r'\\s+', ' ', clean_text)  # 여러 공백을 하나로 치환
-        clean_text = clean_text.strip()
+    Raises:
+        HTTPException: 404 스크립트 없음, 400 텍스트 없음, TTS 서비스 오류
+    """
+    if not ObjectId.is_valid(script_pk):
+        raise HTTPException(status_code=404, detail="Script not found")
 
-        # 로깅을 통해 변환 전/후 내용 확인 (디버깅용)
-        logger.debug(f"Original content length: {len(script_content)}")
-        logger.debug(f"Cleaned text length: {len(clean_text)}")
+    # MongoDB에서 스크립트 조회
+    script = await db.scripts.find_one({"_id": ObjectId(script_pk)}, {"content": 1})
+    if not script:
+        raise HTTPException(status_code=404, detail="Script not found")
 
-        if not clean_text:
-            raise HTTPException(status_code=400, detail="No valid text content after HTML removal")
+    # 스크립트 내용 추출
+    script_content = script.get('content', '')
+    logger.debug(f"스크립트 내용 길이: {len(script_content)}")
 
-        # Colab TTS API URL 설정 (ngrok URL)
-        # .env에서 COLAB_TTS_API_URL 가져오기
-        # COLAB_TTS_API_URL = os.getenv("COLAB_TTS_API_URL")
-        COLAB_TTS_API_URL = "https://omypic.ngrok.app/csm-1b"
+    if not script_content:
+        raise HTTPException(status_code=400, detail="No content available for TTS")
 
-        # if not COLAB_TTS_API_URL:
-        #     raise HTTPException(status_code=500, detail="Colab TTS 서비스 URL이 설정되지 않았습니다.")
+    # HTML 태그 제거 및 텍스트만 추출 (캐시 키도 정리된 텍스트 기준)
+    clean_text = clean_script_text(script_content)
+    logger.debug(f"Cleaned text length: {len(clean_text)}")
 
-        # Colab API 호출 데이터 형식 맞추기
-        tts_request_payload = {"text": clean_text}
+    if not clean_text:
+        raise HTTPException(status_code=400, detail="No valid text content after HTML removal")
 
-        logger.debug(f"Colab TTS API 호출: {COLAB_TTS_API_URL}")
+    try:
+        return await get_tts_cache().aensure(clean_text, SCRIPT_VOICE, render_script_tts)
 
-        # Colab API 호출
-        async with httpx.AsyncClient(timeout=180.0) as client:  # 타임아웃을 180초(3분)으로 증가
-            try:
-                # CSM-1B API는 바이너리 WAV 데이터를 직접 반환
-                logger.info(f"CSM-1B API 호출 시작: {COLAB_TTS_API_URL}")
+    except httpx.HTTPStatusError as e:
+        # 상세 오류 정보 로깅
+        logger.error(f"Colab TTS API HTTP 오류: {e.response.status_code}")
+        logger.error(f"응답 헤더: {e.response.headers}")
 
-                response = await client.post(
-                    COLAB_TTS_API_URL,
-                    json=tts_request_payload,
-                    headers={"Accept": "audio/wav"}  # WAV 형식 명시적 요청
-                )
+        # 응답 본문이 텍스트인 경우만 로깅 (바이너리 데이터는 생략)
+        try:
+            if 'text' in e.response.headers.get('Content-Type', ''):
+                logger.error(f"응답 본문: {e.response.text}")
+        except:
+            logger.error("응답 본문을 로깅할 수 없습니다 (바이너리 데이터)")
 
-                # 상태 코드 로깅 추가
-                logger.info(f"API 응답 상태 코드: {response.status_code}")
-                logger.debug(f"API 응답 헤더: {response.headers}")
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"음성 생성 API 오류: 상태 코드 {e.response.status_code}"
+        )
 
-                # HTTP 오류 발생 시 예외 발생
-                response.raise_for_status()
+    except httpx.RequestError as e:
+        logger.error(f"Colab TTS API 요청 오류: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"음성 생성 API 연결 오류: {str(e)}"
+        )
 
-                # 응답 데이터가 있는지 확인
-                if not response.content:
-                    raise HTTPException(status_code=500, detail="음성 생성 API에서 데이터를 받지 못했습니다")
 
-                # 파일 처리 - WAV 바이너리 데이터를 Base64로 인코딩
-                file_size = len(response.content)
-                encoded_audio = base64.b64encode(response.content).decode('utf-8')
+@router.get("/scripts/{script_pk}/audio", status_code=status.HTTP_200_OK)
+async def stream_script_audio(
+    script_pk: str = Path(..., description="조회할 스크립트 ID"),
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_mongodb)
+) -> Response:
+    """
+    스크립트 발음 음성(MP3)을 바이너리로 전송 (Range 요청 지원)
 
-                # Content-Type 헤더 확인, 없으면 기본값으로 audio/wav 사용
-                audio_type = response.headers.get('Content-Type', 'audio/wav')
+    스크립트가 수정될 수 있으므로 브라우저는 매번 확인하되(no-cache),
+    내용이 같으면 ETag로 본문 없이 304를 받습니다.
+    """
+    try:
+        digest, path = await ensure_script_audio(script_pk, db)
+        return audio_file_response(path, digest, "no-cache", if_none_match=if_none_match)
 
-                logger.debug(f"Colab TTS API 응답 처리 완료: {file_size} bytes, 형식: {audio_type}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        # 자세한 오류 정보 로깅
+        logger.error(f"TTS 처리 중 예상치 못한 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"음성 생성 중 오류: {str(e)}")
 
-                # 클라이언트에 응답 반환
-                return {
-                    "audio_base64": encoded_audio,
-                    "audio_type": audio_type,
-                    "file_size_bytes": file_size,
-                    "file_size_kb": round(file_size / 1024, 2)
-                }
 
-            except httpx.HTTPStatusError as e:
-                # 상세 오류 정보 로깅
-                logger.error(f"Colab TTS API HTTP 오류: {e.response.status_code}")
-                logger.error(f"응답 헤더: {e.response.headers}")
+@router.post("/scripts/{script_pk}/audio", status_code=status.HTTP_200_OK)
+async def listen_script(
+    request: Request,
+    script_pk: str = Path(..., description="조회할 스크립트 ID"),
+    db: Database = Depends(get_mongodb)
+) -> Dict[str, Any]:
+    """
+    스크립트 발음 음성을 Base64 인코딩된 MP3로 반환 (기존 클라이언트 호환용)
 
-                # 응답 본문이 텍스트인 경우만 로깅 (바이너리 데이터는 생략)
-                try:
-                    if 'text' in e.response.headers.get('Content-Type', ''):
-                        logger.error(f"응답 본문: {e.response.text}")
-                except:
-                    logger.error("응답 본문을 로깅할 수 없습니다 (바이너리 데이터)")
+    같은 스크립트는 캐시된 음성을 그대로 사용하며, 바이너리 재생은 audio_url(GET)을 사용하세요.
+    """
+    try:
+        _, path = await ensure_script_audio(script_pk, db)
 
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"음성 생성 API 오류: 상태 코드 {e.response.status_code}"
-                )
+        audio = await asyncio.to_thread(_read_file, path)
+        file_size = len(audio)
 
-            except httpx.RequestError as e:
-                logger.error(f"Colab TTS API 요청 오류: {str(e)}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"음성 생성 API 연결 오류: {str(e)}"
-                )
+        # 클라이언트에 응답 반환
+        return {
+            "audio_base64": base64.b64encode(audio).decode('utf-8'),
+            "audio_type": AUDIO_MEDIA_TYPE,
+            "file_size_bytes": file_size,
+            "file_size_kb": round(file_size / 1024, 2),
+            "audio_url": str(request.url_for("stream_script_audio", script_pk=script_pk))
+        }
 
     except HTTPException:
         raise
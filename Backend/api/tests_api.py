@@ -1,29 +1,53 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, status, Response, UploadFile, File, BackgroundTasks, Body, Form
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, status, Response, UploadFile, File, Body, Form, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from typing import Any, Dict, Union, Optional
 from bson import ObjectId, errors as bson_errors
 from motor.motor_asyncio import AsyncIOMotorDatabase as Database
 
 from datetime import datetime
+from core.config import settings
 from db.mongodb import get_mongodb
-from api.deps import get_current_user, get_current_user_for_multipart
+from api.deps import UserClaims, get_current_user, get_current_user_claims, get_current_user_for_multipart
 from models.user import User
 
 from celery_worker import celery_app
-from tasks.audio_tasks import process_audio_task
+from tasks.audio_tasks import build_answer_context, submit_answer_pipeline
 
-import base64
-import os
 import asyncio
-from gtts import gTTS
 import logging
 
 from schemas.test import TestHistoryResponse, TestDetailResponse, TestCreationResponse, SingleProblemResponse, RandomProblemEvaluationResponse
-from services.audio_processor import AudioProcessor, FastAudioProcessor
+from services.audio_stream import validate_audio_extension, spool_upload, upload_source, remove_spooled_file
+from services.blob_store import digest_from_key, get_blob_store, store_upload
+from services.fair_share import (
+    PRIORITY_DEFAULT,
+    PRIORITY_FINAL,
+    PRIORITY_INTERACTIVE,
+    fair_priority,
+    get_fair_share_executor,
+)
+from services.idempotency import get_submission_guard, submission_key
+from services.status_events import status_event_stream
+from services.status_store import (
+    TERMINAL_STATUSES,
+    get_status_store,
+    merge_status,
+    overall_status_from_state,
+    problem_number_of,
+    problem_status_from_state,
+    resolve_stale_overall,
+    stale_status_projection,
+)
+from services.score_stats import remove_test_scores
+from services.transcript_cache import audio_file_digest
+from services.tts_cache import DIGEST_PATTERN, GTTS_VOICE, audio_file_response, get_tts_cache, render_gtts
+from services.user_cache import get_user_cache
 
 from services.evaluator import ResponseEvaluator
 from services.test_service import (
     create_test,
+    get_test_history_page,
     process_audio_background,
     validate_user,
     validate_test,
@@ -42,9 +66,14 @@ from services.test_service import (
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# 두 가지 전역 인스턴스 생성 (Groq 기반)
-standard_audio_processor = AudioProcessor(model_name="whisper-large-v3")  # 7문제, 15문제용
-fast_audio_processor = FastAudioProcessor(model_name="whisper-large-v3")  # 랜덤 단일 문제용
+# 전체 상태 확인 시 테스트 문서에서 읽을 필드 (종합 피드백 등 큰 필드는 제외)
+OVERALL_STATUS_PROJECTION = {
+    "problem_data": 1,
+    "overall_feedback_status": 1,
+    "overall_feedback_message": 1,
+    "overall_feedback_started_at": 1,
+    "overall_feedback_completed_at": 1
+}
 
 evaluator = ResponseEvaluator()
 
@@ -52,21 +81,28 @@ router = APIRouter()
 
 @router.get("/history", response_model=TestHistoryResponse)
 async def get_test_history(
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100, description="한 페이지에 조회할 테스트 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지 조회)"),
+    current_user: UserClaims = Depends(get_current_user_claims),
     db: Database = Depends(get_mongodb)
 ) -> Any:
     """
-    로그인한 사용자의 모의고사 히스토리 조회
+    로그인한 사용자의 모의고사 히스토리 조회 (최신순, 커서 기반 페이지네이션)
+
+    목록에 필요한 요약 필드만 읽으며, 다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다.
     """
     try:
-        # 현재 사용자 정보 사용
-        user_pk = str(current_user.id)
-        
-        # 디버깅을 위한 로깅 추가
-        logger.info(f"사용자 limits 필드: {getattr(current_user, 'limits', None)}")
+        # 토큰의 사용자 ID 사용
+        user_pk = current_user.id
+
+        # 사용자 정보(limits, 평균 점수 필드만)와 테스트 내역(요약 필드만, 한 페이지)을 함께 조회
+        user, (tests, next_cursor) = await asyncio.gather(
+            current_user.get_fields("limits", "average_score"),
+            get_test_history_page(db, user_pk, limit, cursor)
+        )
         
         # 사용자의 테스트 생성 횟수 정보 가져오기 (limits 필드 사용)
-        limits = getattr(current_user, 'limits', {"test_count": 0, "categorical_test_count": 0, "random_problem": 0, "script_count": 0})
+        limits = user["limits"] or {}
         
         # 남은 횟수 계산 (테스트와 랜덤 문제 모두 limits 필드에서 가져옴)
         test_counts = {
@@ -93,10 +129,6 @@ async def get_test_history(
             }
         }
 
-        # 사용자의 테스트 내역 조회
-        tests_cursor = db.tests.find({"user_id": user_pk})
-        tests = await tests_cursor.to_list(length=None)
-
         # 조회된 테스트 데이터 변환
         test_history = []
         for test in tests:
@@ -110,15 +142,18 @@ async def get_test_history(
             })
 
         # 응답 생성
-        average_score = getattr(current_user, 'average_score', None)
+        average_score = user["average_score"]
         
         response = {
             "average_score": average_score,
             "test_history": test_history,
-            "test_counts": test_counts
+            "test_counts": test_counts,
+            "next_cursor": next_cursor
         }
         
         return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"테스트 히스토리 조회 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -197,34 +232,22 @@ async def make_test(
     # 현재 인증된 사용자 정보 사용
     user_id = str(current_user.id)
     
-    # 최신 사용자 정보 DB에서 다시 조회 (캐싱된 정보가 아닌 최신 상태 확인)
-    latest_user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not latest_user:
-        return JSONResponse(
-            status_code=404,
-            content={"detail": "사용자를 찾을 수 없습니다"}
-        )
-    
-    # User.from_mongo 메서드를 사용하여 일관된 필드 접근
-    user_obj = User.from_mongo(latest_user)
-    
-    # 로깅 추가 - 데이터 구조 확인
-    logger.info(f"DB에서 가져온 사용자 정보: {latest_user}")
-    logger.info(f"변환된 사용자 객체의 limits 필드: {user_obj.limits}")
-    
-    # User 객체의 limits 필드 사용
-    limits = user_obj.limits
+    # get_current_user가 읽은 사용자 정보 사용 (사용자 캐시는 limits 변경 시 무효화되며,
+    # 동시 요청으로 제한을 넘지 않도록 아래 $inc에서 한 번 더 확인)
+    logger.info(f"사용자 {user_id}의 limits 필드: {current_user.limits}")
+    limits = current_user.limits
     
     # 테스트 타입에 따른 제한 확인
     if test_type == 1:  # 15문제 테스트
         test_count = limits.get("test_count", 0)
         logger.info(f"현재 test_count: {test_count}")
-        if test_count >= 1:
+        limit_max, limit_detail = 1, "실전 모의고사는 최대 1회까지만 생성 가능합니다"
+        if test_count >= limit_max:
             # 로깅 추가
             logger.warning(f"사용자 {user_id}의 test_count({test_count})가 제한(1)을 초과했습니다")
             return JSONResponse(
                 status_code=403,
-                content={"detail": "실전 모의고사는 최대 1회까지만 생성 가능합니다"}
+                content={"detail": limit_detail}
             )
         
         # 무조건 limits 필드 사용
@@ -233,12 +256,13 @@ async def make_test(
     elif test_type == 2: # 랜덤 1문제
         random_problem_count = limits.get("random_problem", 0)
         logger.info(f"현재 random_problem_count: {random_problem_count}")
-        if random_problem_count >= 3:
+        limit_max, limit_detail = 3, "맛보기 한 문제는 최대 3회까지만 생성 가능합니다"
+        if random_problem_count >= limit_max:
             # 로깅 추가
             logger.warning(f"사용자 {user_id}의 random_problem_count({random_problem_count})가 제한(3)을 초과했습니다")
             return JSONResponse(
                 status_code=403,
-                content={"detail": "맛보기 한 문제는 최대 3회까지만 생성 가능합니다"}
+                content={"detail": limit_detail}
             )
         
         # 무조건 limits 필드 사용
@@ -247,12 +271,13 @@ async def make_test(
     else: # 유형별 문제 (3, 4, 5)
         categorical_test_count = limits.get('categorical_test_count', 0)
         logger.info(f"현재 categorical_test_count: {categorical_test_count}")
-        if categorical_test_count >= 2:
+        limit_max, limit_detail = 2, "유형별 문제는 최대 2회까지만 생성 가능합니다"
+        if categorical_test_count >= limit_max:
             # 로깅 추가
             logger.warning(f"사용자 {user_id}의 categorical_test_count({categorical_test_count})가 제한(2)을 초과했습니다")
             return JSONResponse(
                 status_code=403,
-                content={"detail": "유형별 문제는 최대 2회까지만 생성 가능합니다"}
+                content={"detail": limit_detail}
             )
         
         # 무조건 limits 필드 사용
@@ -262,18 +287,22 @@ async def make_test(
     logger.info(f"테스트 카운트 업데이트 필드: {limit_field}")
     
     try:
-        # 테스트 횟수 증가 - 무조건 limits 필드 사용
+        # 테스트 횟수 증가 - 무조건 limits 필드 사용 (제한 미만일 때만 증가)
         update_result = await db.users.update_one(
-            {"_id": ObjectId(user_id)},
+            {"_id": ObjectId(user_id), limit_field: {"$not": {"$gte": limit_max}}},
             {"$inc": {limit_field: 1}}
         )
+        await get_user_cache().ainvalidate(user_id)
         
         # 업데이트 확인 로깅
         logger.info(f"사용자 {user_id} 업데이트 결과: {update_result.modified_count}개 수정됨")
-        
-        # 업데이트 후 사용자 데이터 확인을 위한 재조회
-        updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
-        logger.info(f"업데이트 후 사용자 데이터: {updated_user}")
+        if update_result.modified_count == 0:
+            # 캐시된 사용자 정보를 읽은 뒤 다른 요청이 먼저 제한에 도달한 경우
+            logger.warning(f"사용자 {user_id}의 {limit_field}가 제한({limit_max})에 도달했습니다")
+            return JSONResponse(
+                status_code=403,
+                content={"detail": limit_detail}
+            )
 
         try:
             # 통합된 create_test 함수 호출
@@ -291,6 +320,7 @@ async def make_test(
                         {"_id": ObjectId(user_id)},
                         {"$inc": {limit_field: -1}}
                     )
+                    await get_user_cache().ainvalidate(user_id)
                     return JSONResponse(
                         status_code=404,
                         content={"detail": "생성된 테스트를 찾을 수 없습니다"}
@@ -308,6 +338,7 @@ async def make_test(
                 {"_id": ObjectId(user_id)},
                 {"$inc": {limit_field: -1}}
             )
+            await get_user_cache().ainvalidate(user_id)
             raise e
         
     except bson_errors.InvalidId as e:
@@ -325,6 +356,7 @@ async def make_test(
                 {"_id": ObjectId(user_id)},
                 {"$inc": {limit_field: -1}}
             )
+            await get_user_cache().ainvalidate(user_id)
         except Exception as rollback_error:
             logger.error(f"카운트 롤백 중 오류: {str(rollback_error)}")
         
@@ -368,6 +400,9 @@ async def delete_test(
                 detail="테스트 삭제에 실패했습니다."
             )
         
+        # 삭제된 테스트가 반영했던 점수를 사용자 평균 점수에서 제거
+        await remove_test_scores(db, test)
+        
         # 204 No Content 반환 (성공적으로 삭제됨)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
         
@@ -381,24 +416,65 @@ async def delete_test(
             detail=f"테스트 삭제 중 오류 발생: {str(e)}"
         )
 
+async def ensure_problem_audio(problem_pk: str, db: Database):
+    """
+    문제 음성 파일 준비 (캐시에 없을 때만 gTTS 합성)
+
+    Returns:
+        Tuple[dict, str, str]: (문제 문서, 캐시 키, 로컬 파일 경로)
+
+    Raises:
+        HTTPException: 404 문제 없음, 400 문제 내용 없음
+    """
+    if not ObjectId.is_valid(problem_pk):
+        raise HTTPException(status_code=404, detail="Problem not found")
+
+    problem = await db.problems.find_one({"_id": ObjectId(problem_pk)}, {"content": 1})
+    if not problem:
+        raise HTTPException(status_code=404, detail="Problem not found")
+
+    problem_content = problem.get('content', '')
+    if not problem_content:
+        raise HTTPException(status_code=400, detail="No content available for TTS")
+
+    digest, path = await get_tts_cache().aensure(problem_content, GTTS_VOICE, render_gtts)
+    return problem, digest, path
+
+
+@router.get("/audio/{digest}.mp3")
+async def get_cached_audio(
+    digest: str = Path(..., description="음성 캐시 키")
+) -> Response:
+    """
+    캐시 키(텍스트 해시)로 음성 파일 반환 (내용이 바뀌면 키도 바뀌므로 브라우저에 영구 캐시)
+    """
+    if not DIGEST_PATTERN.match(digest):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    path = await asyncio.to_thread(get_tts_cache().lookup, digest)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    return audio_file_response(path, digest)
+
+
 @router.get("/{problem_pk}/audio")
 async def get_problem_audio(
     problem_pk: str = Path(..., description="문제 ID"),
     db: Database = Depends(get_mongodb)
-) -> Dict[str, Any]:
+) -> Response:
     """
-    주어진 문제 ID로 문제 내용을 음성으로 변환하여 Base64 인코딩된 오디오 데이터를 반환합니다.
+    주어진 문제 ID의 문제 내용 음성(MP3)을 반환합니다.
+
+    처음 요청된 문제(또는 내용이 바뀐 문제)만 gTTS로 합성하고, 이후에는 캐시된 파일을 그대로 전송합니다.
+    Range 요청을 지원하며, Content-Location 헤더로 영구 캐시 가능한 /audio/{캐시 키}.mp3 주소를 알려줍니다.
 
     Args:
         problem_pk (str): MongoDB에서 조회할 문제의 고유 ID
         db (AsyncIOMotorDatabase): MongoDB 데이터베이스 연결 세션
 
     Returns:
-        Dict[str, Any]: 다음 키를 포함하는 딕셔너리
-        - audio_base64 (str): Base64로 인코딩된 MP3 오디오 데이터
-        - audio_type (str): 오디오 파일 유형 (mp3)
-        - file_size_bytes (int): 오디오 파일의 바이트 크기
-        - file_size_kb (float): 오디오 파일의 킬로바이트 크기
+        FileResponse: audio/mpeg 오디오 (Range 요청 시 206 부분 응답)
 
     Raises:
         HTTPException: 
@@ -407,40 +483,14 @@ async def get_problem_audio(
             - 500: 오디오 생성 중 예상치 못한 오류 발생 시
     """
     try:
-        # MongoDB에서 문제 조회
-        problem = await db.problems.find_one({"_id": ObjectId(problem_pk)})
-        
-        if not problem:
-            raise HTTPException(status_code=404, detail="Problem not found")
-        
-        # 문제 내용 추출
-        problem_content = problem.get('content', '')
-        
-        if not problem_content:
-            raise HTTPException(status_code=400, detail="No content available for TTS")
-        
-        # 임시 오디오 파일 생성
-        tts = gTTS(text=problem_content, lang='en')
-        temp_audio_path = f"./temp_audio_{problem_pk}.mp3"
-        tts.save(temp_audio_path)
-        
-        # 파일 크기 계산
-        file_size = os.path.getsize(temp_audio_path)
-        
-        # 파일을 Base64로 인코딩
-        with open(temp_audio_path, 'rb') as audio_file:
-            encoded_audio = base64.b64encode(audio_file.read()).decode('utf-8')
-        
-        # 임시 파일 삭제
-        os.remove(temp_audio_path)
-        
-        return {
-            "audio_base64": encoded_audio,
-            "audio_type": "mp3",
-            "file_size_bytes": file_size,
-            "file_size_kb": round(file_size / 1024, 2)
-        }
-    
+        _, digest, path = await ensure_problem_audio(problem_pk, db)
+
+        response = audio_file_response(path, digest, f"public, max-age={settings.TTS_AUDIO_MAX_AGE_SECONDS}")
+        response.headers["Content-Location"] = f"../audio/{digest}.mp3"
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"오디오 생성 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating audio: {str(e)}")
@@ -462,23 +512,10 @@ async def play_problem_audio(
         HTMLResponse: 오디오 재생 HTML 페이지
     """
     try:
-        # MongoDB에서 문제 조회
-        problem = await db.problems.find_one({"_id": ObjectId(problem_pk)})
-        
-        if not problem:
-            raise HTTPException(status_code=404, detail="Problem not found")
-        
-        # 문제 내용 추출
+        # 음성을 미리 준비해 두고 페이지에서는 캐시 키 주소로 재생
+        problem, digest, _ = await ensure_problem_audio(problem_pk, db)
         problem_content = problem.get('content', '')
         
-        if not problem_content:
-            raise HTTPException(status_code=400, detail="No content available for TTS")
-        
-        # 임시 오디오 파일 생성
-        tts = gTTS(text=problem_content, lang='en')
-        temp_audio_path = f"./temp_audio_{problem_pk}.mp3"
-        tts.save(temp_audio_path)
-        
         # HTML 페이지 생성 - 상대 경로 사용
         html_content = f"""
         <!DOCTYPE html>
@@ -506,7 +543,7 @@ async def play_problem_audio(
             <div class="container">
                 <h1>Problem Audio Playback</h1>
                 <audio controls autoplay style="width: 300px;">
-                    <source src="./download" type="audio/mp3">
+                    <source src="../../audio/{digest}.mp3" type="audio/mpeg">
                     Your browser does not support the audio element.
                 </audio>
                 <p>문제 내용: {problem_content}</p>
@@ -517,18 +554,66 @@ async def play_problem_audio(
         
         return HTMLResponse(content=html_content)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"오디오 재생 페이지 생성 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating audio: {str(e)}")
 
 
+async def claim_answer_submission(
+    test: dict,
+    test_pk: str,
+    problem_pk: str,
+    problem_number: str,
+    key: str,
+    is_last_problem: bool
+) -> Optional[JSONResponse]:
+    """
+    답변 제출 키 선점
+
+    같은 키의 제출이 이미 있으면 새 작업을 시작하지 않고 기존 작업 상태를 담은 응답을 반환합니다.
+    기존 작업이 실패했으면 다시 평가할 수 있도록 새로 선점합니다.
+
+    Returns:
+        JSONResponse: 중복 제출인 경우의 응답 (선점에 성공하면 None)
+    """
+    guard = get_submission_guard()
+    if await guard.aclaim(key, problem_id=problem_pk) is None:
+        return None
+
+    live_status = await get_status_store().aget_problem_status(test_pk, problem_number)
+    processing_status, processing_message = merge_status(
+        test.get("problem_data", {}).get(problem_number, {}), live_status
+    )
+    if processing_status == "failed":
+        await guard.arelease(key)
+        if await guard.aclaim(key, problem_id=problem_pk) is None:
+            return None
+
+    logger.info(f"중복 답변 제출 - 테스트 {test_pk}, 문제 {problem_number}: 기존 작업 상태 {processing_status}")
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": f"{problem_number}번째 문제의 녹음은 이미 제출되었습니다. 기존 평가 상태를 확인해 주세요.",
+            "test_id": test_pk,
+            "problem_id": problem_pk,
+            "problem_number": problem_number,
+            "is_last_problem": is_last_problem,
+            "duplicate": True,
+            "status": processing_status,
+            "status_message": processing_message
+        }
+    )
+
+
 @router.post("/{test_pk}/record/{problem_pk}")
 async def record_answer(
     test_pk: str,
     problem_pk: str,
     audio_file: UploadFile = File(...),
     is_last_problem: bool = Body(False),
-    background_tasks: BackgroundTasks = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Database = Depends(get_mongodb)
 ) -> Any:
     """
@@ -567,55 +652,83 @@ async def record_answer(
         if not problem_exists:
             raise HTTPException(status_code=404, detail="해당 테스트에 이 문제가 포함되어 있지 않습니다.")
         
-        # 상태 필드 초기화
-        await db.tests.update_one(
-            {"_id": ObjectId(test_pk)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "processing",
-                f"problem_data.{problem_number}.processing_started_at": datetime.now()
-            }}
-        )
-        
-        if is_last_problem:
-            # 마지막 문제인 경우 전체 피드백 상태 초기화
-            await db.tests.update_one(
-                {"_id": ObjectId(test_pk)},
-                {"$set": {
-                    "overall_feedback_status": "pending",
-                    "overall_feedback_started_at": datetime.now()
-                }}
-            )
-        
-        # 파일 내용을 미리 읽어 메모리에 저장
-        audio_content = await audio_file.read()
-        audio_filename = audio_file.filename
-        
         # 파일 유형 검사
-        file_extension = audio_filename.split(".")[-1].lower() if audio_filename else ""
-        if file_extension not in ["mp3", "wav", "webm", "m4a"]:
-            raise HTTPException(
-                status_code=400, 
-                detail="지원되지 않는 파일 형식입니다. MP3, WAV, WEBM, M4A 형식만 지원합니다."
+        validate_audio_extension(audio_file.filename)
+        
+        # 중복 제출 확인 (Idempotency-Key가 있으면 업로드를 읽기 전에 확인)
+        guard_key = None
+        if idempotency_key:
+            guard_key = submission_key(test_pk, problem_number, idempotency_key=idempotency_key)
+            duplicate = await claim_answer_submission(
+                test, test_pk, problem_pk, problem_number, guard_key, is_last_problem
             )
+            if duplicate is not None:
+                return duplicate
         
-        # 파일 크기 제한 (10MB)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if len(audio_content) > max_size:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"파일 크기가 너무 큽니다. 최대 10MB까지만 지원합니다. (현재 크기: {len(audio_content)/1024/1024:.2f}MB)"
+        try:
+            # 파일을 메모리에 올리지 않고 청크 단위로 임시 파일에 기록 (10MB 초과 시 즉시 중단)
+            audio_path = await spool_upload(audio_file)
+
+            # 헤더가 없으면 녹음 지문으로 중복 제출 확인
+            if guard_key is None:
+                guard_key = submission_key(
+                    test_pk, problem_number, audio_digest=await asyncio.to_thread(audio_file_digest, audio_path)
+                )
+                duplicate = await claim_answer_submission(
+                    test, test_pk, problem_pk, problem_number, guard_key, is_last_problem
+                )
+                if duplicate is not None:
+                    remove_spooled_file(audio_path)
+                    return duplicate
+
+            # 상태 필드 초기화 (상태 저장소에 기록하여 상태 API와 실시간 알림에 반영, Redis 장애 시에만 테스트 문서에 기록)
+            status_store = get_status_store()
+            started_at = datetime.now()
+            await status_store.aset_test_problems(test_pk, {
+                key: value.get("problem_id") for key, value in test.get("problem_data", {}).items()
+            })
+            if not await status_store.aset_problem_status(
+                test_pk, problem_number, "processing", "답변 처리 대기 중입니다.", started_at=started_at.isoformat()
+            ):
+                await db.tests.update_one(
+                    {"_id": ObjectId(test_pk)},
+                    {"$set": {
+                        f"problem_data.{problem_number}.processing_status": "processing",
+                        f"problem_data.{problem_number}.processing_started_at": started_at
+                    }}
+                )
+
+            if is_last_problem:
+                # 마지막 문제인 경우 전체 피드백 상태 초기화
+                if not await status_store.aset_overall_status(
+                    test_pk, "pending", "전체 테스트 평가 대기 중입니다.", started_at=started_at.isoformat()
+                ):
+                    await db.tests.update_one(
+                        {"_id": ObjectId(test_pk)},
+                        {"$set": {
+                            "overall_feedback_status": "pending",
+                            "overall_feedback_started_at": started_at
+                        }}
+                    )
+
+            # 프로세스 내 공정 분배 실행기로 오디오 처리 및 평가 진행 (임시 파일은 처리 후 삭제)
+            # 마지막 답변은 먼저, 같은 우선순위 안에서는 사용자별로 돌아가며 처리
+            get_fair_share_executor().submit(
+                test.get("user_id"),
+                process_audio_background,
+                db,
+                test_pk,
+                problem_pk,
+                problem_number,
+                audio_path,
+                is_last_problem,
+                priority=PRIORITY_FINAL if is_last_problem else PRIORITY_DEFAULT
             )
-        
-        # 백그라운드 태스크로 오디오 처리 및 평가 진행
-        background_tasks.add_task(
-            process_audio_background,
-            db,
-            test_pk,
-            problem_pk,
-            problem_number,
-            audio_content,
-            is_last_problem
-        )
+        except Exception:
+            # 작업을 시작하지 못했으면 같은 답변을 다시 제출할 수 있도록 선점 해제
+            if guard_key is not None:
+                await get_submission_guard().arelease(guard_key)
+            raise
         
         # 응답 생성
         return JSONResponse(
@@ -642,6 +755,7 @@ async def record_answer_celery(
     problem_pk: str,
     audio_file: UploadFile = File(...),
     is_last_problem: bool = Body(False),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Database = Depends(get_mongodb)
 ) -> Any:
     try:
@@ -671,43 +785,70 @@ async def record_answer_celery(
         if not problem_exists:
             raise HTTPException(status_code=404, detail="해당 테스트에 이 문제가 포함되어 있지 않습니다.")
         
-        # 상태 필드 초기화
-        await db.tests.update_one(
-            {"_id": ObjectId(test_pk)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "processing",
-                f"problem_data.{problem_number}.processing_started_at": datetime.now()
-            }}
-        )
-        
-        if is_last_problem:
-            # 마지막 문제인 경우 전체 피드백 상태 초기화
-            await db.tests.update_one(
-                {"_id": ObjectId(test_pk)},
-                {"$set": {
-                    "overall_feedback_status": "pending",
-                    "overall_feedback_started_at": datetime.now()
-                }}
+        # 중복 제출 확인 (Idempotency-Key가 있으면 업로드를 읽기 전에 확인)
+        guard_key = None
+        if idempotency_key:
+            guard_key = submission_key(test_pk, problem_number, idempotency_key=idempotency_key)
+            duplicate = await claim_answer_submission(
+                test, test_pk, problem_pk, problem_number, guard_key, is_last_problem
             )
-        
-        # 오디오 콘텐츠 읽기 (원본 바이트)
-        audio_content = await audio_file.read() # audio_content는 이제 bytes 타입
-
-        # --- Base64 인코딩 로직 주석 처리 ---
-        # import base64
-        # audio_content_base64 = base64.b64encode(audio_content).decode('utf-8')
-        # --- 여기까지 주석 처리 ---
-
-        # Celery 작업으로 오디오 처리 요청 (원본 바이트 전달)
-        # tasks.audio_tasks 임포트 확인 필요 (파일 상단에 있는지)
-        from tasks.audio_tasks import process_audio_task # 만약 임포트가 없다면 추가
-        process_audio_task.delay(
-            test_pk,
-            problem_pk,
-            problem_number,
-            audio_content,  # 원본 바이트(bytes) 전달
-            is_last_problem
-        )
+            if duplicate is not None:
+                return duplicate
+
+        try:
+            # 오디오를 저장소에 한 번만 기록 (10MB 초과 시 즉시 중단, 키에 녹음 지문 포함)
+            audio_ref = await store_upload(audio_file)
+
+            # 헤더가 없으면 녹음 지문으로 중복 제출 확인
+            if guard_key is None:
+                guard_key = submission_key(test_pk, problem_number, audio_digest=digest_from_key(audio_ref))
+                duplicate = await claim_answer_submission(
+                    test, test_pk, problem_pk, problem_number, guard_key, is_last_problem
+                )
+                if duplicate is not None:
+                    return duplicate
+
+            # 제출된 문제와 마지막 문제 제출 여부 기록 (건너뛴 문제가 있어도 종합 평가가 실행되도록)
+            submission = {"$addToSet": {"submitted_problems": problem_number}}
+            if is_last_problem:
+                submission["$set"] = {"final_problem_submitted": True}
+
+            # 처리 상태는 상태 저장소에 기록 (Redis 장애 시에만 테스트 문서에 기록)
+            status_store = get_status_store()
+            started_at = datetime.now()
+            await status_store.aset_test_problems(test_pk, {
+                key: value.get("problem_id") for key, value in test.get("problem_data", {}).items()
+            })
+            if not await status_store.aset_problem_status(
+                test_pk, problem_number, "processing", "답변 처리 대기 중입니다.", started_at=started_at.isoformat()
+            ):
+                submission.setdefault("$set", {}).update({
+                    f"problem_data.{problem_number}.processing_status": "processing",
+                    f"problem_data.{problem_number}.processing_started_at": started_at
+                })
+            await db.tests.update_one({"_id": ObjectId(test_pk)}, submission)
+
+            # 단계별 Celery 파이프라인으로 처리 요청 (브로커에는 오디오 대신 참조 키만 전달)
+            # 이미 조회한 테스트/문제 정보를 메시지에 담아 워커가 다시 조회하지 않도록 함
+            # 종합 평가는 모든 문제의 처리가 끝나면 (마지막 문제를 제출했으면 제출된 답변이 모두 끝나면) 자동으로 실행됨
+            # 마지막 답변은 먼저, 최근 제출이 많은 사용자의 답변은 다른 사용자보다 나중에 처리
+            context = build_answer_context(test, problem)
+            priority = await asyncio.to_thread(
+                fair_priority, context["user_id"], PRIORITY_FINAL if is_last_problem else PRIORITY_DEFAULT
+            )
+            submit_answer_pipeline(
+                test_pk,
+                problem_pk,
+                problem_number,
+                audio_ref,
+                context,
+                priority=priority
+            )
+        except Exception:
+            # 작업을 시작하지 못했으면 같은 답변을 다시 제출할 수 있도록 선점 해제
+            if guard_key is not None:
+                await get_submission_guard().arelease(guard_key)
+            raise
 
         # 202 Accepted 응답
         return JSONResponse(
@@ -745,11 +886,15 @@ async def evaluate_random_problem(
             asyncio.create_task(validate_problem(db, test_id))
         )
         
-        # 오디오 콘텐츠 결정 (새 파일 또는 캐시된 파일)
-        audio_content = await get_audio_content(test, audio_file)
-        
         # 음성 변환 (순차적)
-        transcribed_text = await transcribe_audio(audio_content, user_id)
+        if audio_file:
+            # 새 파일은 메모리에 모으지 않고 청크를 바로 변환 -> STT 파이프라인으로 전달
+            async with upload_source(audio_file) as audio_source:
+                transcribed_text = await transcribe_audio(audio_source, user_id)
+        else:
+            # 캐시된 파일
+            audio_content = await get_audio_content(test, audio_file)
+            transcribed_text = await transcribe_audio(audio_content, user_id)
         
         # 스크립트 저장 (순차적)
         await save_script(db, user_id, problem_id, transcribed_text)
@@ -797,12 +942,11 @@ async def evaluate_random_problem_celery(
         test = await validate_test(db, test_id)
         problem_id = await get_problem_id(db, test_id)
         
-        # 오디오 내용 가져오기
-        audio_content = await get_audio_content(test, audio_file)
-        
-        # Base64로 인코딩
-        import base64
-        audio_content_base64 = base64.b64encode(audio_content).decode('utf-8')
+        # 오디오를 저장소에 기록 (새 업로드 또는 캐시된 오디오)
+        if audio_file:
+            audio_ref = await store_upload(audio_file)
+        else:
+            audio_ref = await get_blob_store().aput(await get_audio_content(test, audio_file))
         
         # 상태 업데이트
         await db.tests.update_one(
@@ -813,13 +957,16 @@ async def evaluate_random_problem_celery(
             }}
         )
         
-        # Celery 작업 시작
+        # Celery 작업 시작 (사용자가 결과를 바로 기다리는 단건 평가이므로 가장 먼저 처리)
         from tasks.audio_tasks import evaluate_random_problem_task
-        evaluate_random_problem_task.delay(
-            test_id=test_id,
-            problem_id=problem_id,
-            user_id=user_id,
-            audio_content_base64=audio_content_base64
+        evaluate_random_problem_task.apply_async(
+            kwargs={
+                "test_id": test_id,
+                "problem_id": problem_id,
+                "user_id": user_id,
+                "audio_ref": audio_ref
+            },
+            priority=await asyncio.to_thread(fair_priority, user_id, PRIORITY_INTERACTIVE)
         )
         
         # 즉시 응답
@@ -849,24 +996,56 @@ async def check_problem_status(
     if not ObjectId.is_valid(test_pk) or not ObjectId.is_valid(problem_pk):
         raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
     
-    # 테스트 조회
-    test = await db.tests.find_one({"_id": ObjectId(test_pk)})
+    # 상태 저장소에 기록이 있으면 테스트 문서를 읽지 않고 응답
+    state = await get_status_store().aget_test_state(test_pk)
+    live_response = problem_status_from_state(state, problem_pk)
+    if live_response is not None and not live_response.get("stale"):
+        return live_response
+
+    if live_response is not None:
+        # 오래 갱신되지 않은 중간 상태: 해당 문제의 상태 필드만 읽어 최종 결과가 저장되었는지 확인
+        problem_number = problem_number_of(state, problem_pk)
+        prefix = f"problem_data.{problem_number}"
+        test = await db.tests.find_one(
+            {"_id": ObjectId(test_pk)},
+            {
+                f"{prefix}.processing_status": 1,
+                f"{prefix}.processing_message": 1,
+                f"{prefix}.processing_started_at": 1,
+                f"{prefix}.processing_completed_at": 1
+            }
+        )
+        stored = (test or {}).get("problem_data", {}).get(problem_number, {})
+        if stored.get("processing_status") not in TERMINAL_STATUSES:
+            return live_response  # 마지막 중간 상태를 stale 표시와 함께 응답
+        return {
+            "status": stored["processing_status"],
+            "message": stored.get("processing_message", ""),
+            "started_at": stored.get("processing_started_at", live_response["started_at"]),
+            "completed_at": stored.get("processing_completed_at")
+        }
+    
+    # 기록이 없으면 (TTL 만료, Redis 장애) 테스트 문서의 문제 상태 사용
+    test = await db.tests.find_one({"_id": ObjectId(test_pk)}, {"problem_data": 1})
     if not test:
         raise HTTPException(status_code=404, detail="해당 테스트를 찾을 수 없습니다.")
     
     # 문제 데이터 찾기
+    problem_number = None
     problem_data = None
-    for data in test.get("problem_data", {}).values():
+    for key, data in test.get("problem_data", {}).items():
         if data.get("problem_id") == problem_pk:
+            problem_number = key
             problem_data = data
             break
     
     if not problem_data:
         raise HTTPException(status_code=404, detail="해당 문제를 찾을 수 없습니다.")
     
-    # 상태 정보 추출
-    processing_status = problem_data.get("processing_status", "not_started")
-    processing_message = problem_data.get("processing_message", "아직 처리가 시작되지 않았습니다.")
+    # 상태 정보 추출 (처리 중이면 상태 저장소의 중간 상태 사용)
+    processing_status, processing_message = merge_status(
+        problem_data, state["statuses"].get(problem_number), "아직 처리가 시작되지 않았습니다."
+    )
     
     return {
         "status": processing_status,
@@ -876,32 +1055,48 @@ async def check_problem_status(
     }
 
 
-# 모의고사 점수, 피드백 생성 비동기 처리를 위한 상태 확인 엔드포인트 - 전체 문제
-@router.get("/{test_pk}/overall-status")
-async def check_overall_test_status(
-    test_pk: str,
-    db: Database = Depends(get_mongodb)
-) -> Any:
-    """테스트 전체 상태 확인 엔드포인트"""
-    if not ObjectId.is_valid(test_pk):
-        raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
+async def load_overall_status(test_pk: str, db: Database) -> Optional[dict]:
+    """
+    테스트 전체 처리 상태 조회 (상태 API와 실시간 알림 snapshot에서 공용)
+
+    상태 저장소에 문제 구성과 상태가 모두 있으면 테스트 문서를 읽지 않습니다.
+
+    Returns:
+        dict: 전체 상태 (테스트가 없으면 None)
+    """
+    state = await get_status_store().aget_test_state(test_pk)
+    live_response = overall_status_from_state(state)
+    if live_response is not None:
+        # 오래 갱신되지 않은 중간 상태가 있으면 그 항목의 상태 필드만 읽어 최종 결과가 저장되었는지 확인
+        projection = stale_status_projection(live_response)
+        if projection is None:
+            return live_response
+        test = await db.tests.find_one({"_id": ObjectId(test_pk)}, projection)
+        return resolve_stale_overall(live_response, test)
     
-    # 테스트 정보 조회
-    test = await db.tests.find_one({"_id": ObjectId(test_pk)})
+    # 테스트 정보 조회 (상태 확인에 필요한 필드만)
+    test = await db.tests.find_one({"_id": ObjectId(test_pk)}, OVERALL_STATUS_PROJECTION)
     if not test:
-        raise HTTPException(status_code=404, detail="해당 테스트를 찾을 수 없습니다.")
+        return None
     
-    # 전체 피드백 상태 확인
-    overall_status = test.get("overall_feedback_status", "not_started")
-    overall_message = test.get("overall_feedback_message", "")
+    # 전체 피드백 상태 확인 (처리 중이면 상태 저장소의 중간 상태 사용)
+    overall_status, overall_message = merge_status(
+        {
+            "processing_status": test.get("overall_feedback_status", "not_started"),
+            "processing_message": test.get("overall_feedback_message", "")
+        },
+        state["overall"]
+    )
     
-    # 문제별 상태 수집
+    # 문제별 상태 수집 (처리 중이면 상태 저장소의 중간 상태 사용)
     problem_statuses = []
     for key, data in test.get("problem_data", {}).items():
+        processing_status, processing_message = merge_status(data, state["statuses"].get(key))
         problem_statuses.append({
+            "problem_number": key,
             "problem_id": data.get("problem_id"),
-            "status": data.get("processing_status", "not_started"),
-            "message": data.get("processing_message", "")
+            "status": processing_status,
+            "message": processing_message
         })
     
     # 모든 문제가 완료되었는지 확인
@@ -917,4 +1112,50 @@ async def check_overall_test_status(
         "problem_statuses": problem_statuses,
         "started_at": test.get("overall_feedback_started_at"),
         "completed_at": test.get("overall_feedback_completed_at")
-    }
\ No newline at end of file
+    }
+
+
+# 모의고사 점수, 피드백 생성 비동기 처리를 위한 상태 확인 엔드포인트 - 전체 문제
+@router.get("/{test_pk}/overall-status")
+async def check_overall_test_status(
+    test_pk: str,
+    db: Database = Depends(get_mongodb)
+) -> Any:
+    """테스트 전체 상태 확인 엔드포인트"""
+    if not ObjectId.is_valid(test_pk):
+        raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
+    
+    overall_status = await load_overall_status(test_pk, db)
+    if overall_status is None:
+        raise HTTPException(status_code=404, detail="해당 테스트를 찾을 수 없습니다.")
+    
+    return overall_status
+
+
+# 모의고사 점수, 피드백 생성 상태 실시간 알림 엔드포인트 (폴링 대체)
+@router.get("/{test_pk}/events")
+async def stream_test_events(
+    test_pk: str,
+    db: Database = Depends(get_mongodb)
+) -> Any:
+    """
+    테스트 처리 상태 SSE 스트림 엔드포인트
+
+    연결 직후 snapshot(전체 상태, /overall-status와 같은 형식)을 보내고,
+    이후 problem / overall 이벤트로 상태 변경을 전달합니다. 종합 평가가 끝나면 스트림이 종료됩니다.
+    """
+    if not ObjectId.is_valid(test_pk):
+        raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
+
+    async def load_snapshot():
+        overall_status = await load_overall_status(test_pk, db)
+        return jsonable_encoder(overall_status) if overall_status is not None else None
+
+    return StreamingResponse(
+        status_event_stream(test_pk, load_snapshot),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 프록시 버퍼링 해제 (이벤트 즉시 전달)
+        }
+    )
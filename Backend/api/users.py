@@ -11,7 +11,8 @@ from datetime import datetime, timezone, date
 from fastapi.responses import JSONResponse
 
 from models.user import User
-from api.deps import get_current_user
+from api.deps import UserClaims, get_current_user, get_current_user_claims
+from services.user_cache import get_user_cache, load_user
 
 import logging
 
@@ -163,8 +164,8 @@ async def update_user_info(
             detail="유효하지 않은 사용자 ID 형식입니다."
         )
     
-    # 사용자 존재 여부 확인
-    existing_user = await db.users.find_one({"_id": user_object_id})
+    # 사용자 존재 여부 확인 (get_current_user가 방금 캐시한 문서 재사용)
+    existing_user = await load_user(db, user_object_id)
     if not existing_user:
         print(f"사용자를 찾을 수 없음: {user_id}")
         raise HTTPException(
@@ -213,6 +214,7 @@ async def update_user_info(
             {"_id": user_object_id},
             {"$set": update_data}
         )
+        await get_user_cache().ainvalidate(user_id)
         
         if result.modified_count == 0:
             if result.matched_count > 0:
@@ -265,8 +267,8 @@ async def update_user_info(
             detail="유효하지 않은 사용자 ID 형식입니다."
         )
     
-    # 사용자 존재 여부 확인
-    existing_user = await db.users.find_one({"_id": user_object_id})
+    # 사용자 존재 여부 확인 (get_current_user가 방금 캐시한 문서 재사용)
+    existing_user = await load_user(db, user_object_id)
     if not existing_user:
         print(f"사용자를 찾을 수 없음: {user_id}")
         raise HTTPException(
@@ -315,6 +317,7 @@ async def update_user_info(
             {"_id": user_object_id},
             {"$set": update_data}
         )
+        await get_user_cache().ainvalidate(user_id)
         
         if result.modified_count == 0:
             if result.matched_count > 0:
@@ -347,7 +350,7 @@ async def update_user_info(
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(current_user: User = Depends(get_current_user)):
+async def delete_user(current_user: UserClaims = Depends(get_current_user_claims)):
     """
     현재 로그인한 사용자 계정 삭제 엔드포인트
     """
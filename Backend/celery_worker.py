@@ -1,5 +1,8 @@
 from celery import Celery
+from kombu import Queue
 from core.config import settings
+from services.fair_share import PRIORITY_DEFAULT
+from services.queue_inspector import PRIORITY_SEP, PRIORITY_STEPS
 
 # Redis URL 설정
 redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else 'redis://localhost:6379/0'
@@ -11,7 +14,8 @@ celery_app = Celery(
     'omypic_worker',
     broker=redis_url,
     backend=redis_url,
-    broker_transport_options={'visibility_timeout': 3600},
+    # priority_steps: 작업 우선순위(0~9, 작을수록 먼저)별로 Redis 리스트를 나눠 높은 우선순위부터 꺼냄
+    broker_transport_options={'visibility_timeout': 3600, 'priority_steps': PRIORITY_STEPS, 'sep': PRIORITY_SEP},
     include=['tasks.audio_tasks']
 )
 
@@ -43,18 +47,41 @@ celery_app.conf.update(
     # Task 재시도 설정
     task_default_retry_delay=60,  # 실패 시 60초 후 재시도
 
-    # Task별 재시도 정책 (annotations)
+    # 우선순위 설정 (services.fair_share 참고)
+    # 워커가 작업을 미리 많이 가져가면 나중에 들어온 높은 우선순위 작업이 뒤에서 기다리므로 1개씩만 예약
+    task_default_priority=PRIORITY_DEFAULT,
+    worker_prefetch_multiplier=1,
+
+    # 큐 구성 - 답변 처리 단계를 전용 큐로 분리하여 STT 처리량과 LLM 할당량을 따로 조절
+    # -Q 없이 실행한 워커는 모든 큐를 처리하고, 운영에서는 큐별 워커로 동시성을 나눔:
+    #   celery -A celery_worker.celery_app worker -Q stt --concurrency=50
+    #   celery -A celery_worker.celery_app worker -Q llm --concurrency=10
+    #   celery -A celery_worker.celery_app worker -Q celery --concurrency=20
+    task_queues=(
+        Queue('celery'),  # 기본 큐: 저장, 평균 점수 갱신 등 DB 작업
+        Queue('stt'),  # 음성 인식
+        Queue('llm'),  # LLM 평가
+    ),
+    task_default_queue='celery',
+    task_routes={
+        'transcribe_answer': {'queue': 'stt'},
+        'evaluate_answer': {'queue': 'llm'},
+        'evaluate_overall_test': {'queue': 'llm'},
+        'evaluate_random_problem': {'queue': 'llm'},
+    },
+
+    # Task별 처리율 제한 (annotations, 작업 이름 기준)
     task_annotations={
-        'tasks.audio_tasks.*': {
-            'rate_limit': '10/m',  # 분당 최대 10개 작업 처리 (API 제한 고려)
-            'max_retries': 3,  # 최대 3번 재시도
-            'retry_backoff': True,  # 지수 백오프 재시도 (1분 → 2분 → 4분)
-            'retry_backoff_max': 600,  # 최대 10분까지 백오프
-            'retry_jitter': True,  # 재시도 시간에 랜덤 지터 추가 (동시 재시도 방지)
-        }
+        'transcribe_answer': {'rate_limit': settings.CELERY_STT_RATE_LIMIT},
+        'evaluate_answer': {'rate_limit': settings.CELERY_LLM_RATE_LIMIT},
+        'evaluate_overall_test': {'rate_limit': settings.CELERY_LLM_RATE_LIMIT},
+        'evaluate_random_problem': {'rate_limit': settings.CELERY_LLM_RATE_LIMIT},
     }
 )
 
+# 큐 대기/실행 시간 메트릭 시그널 등록 (발행 측인 API 프로세스에서도 필요)
+import tasks.monitoring  # noqa: E402,F401
+
 if __name__ == '__main__':
     celery_app.start()
 
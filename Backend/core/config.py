@@ -52,12 +52,84 @@ class Settings(BaseSettings):
 
     GEMINI_API_KEYS: str = os.getenv("GEMINI_API_KEYS")
 
+    # Gemini API 키 상태 관리 설정
+    GEMINI_KEY_USAGE_LIMIT: int = 40          # 키당 시간당 최대 사용 횟수
+    GEMINI_KEY_BLACKLIST_SECONDS: int = 1800  # 할당량 초과 시 블랙리스트 유지 시간(초)
+    KEY_STATE_SYNC_INTERVAL: float = 10.0     # 로컬 키 상태와 Redis 간 재동기화 주기(초)
+
+    # 외부 API 전역 처리율 제한 (Redis 토큰 버킷, 모든 프로세스/워커 합산)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_GEMINI_PER_MINUTE: float = 10.0   # Gemini 키 하나당 분당 요청 수
+    RATE_LIMIT_WIT_AI_PER_MINUTE: float = 60.0   # Wit.ai 앱 분당 요청 수
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 60.0    # 토큰을 기다리는 최대 시간(초), 초과 시 APIRateLimitError
+
     # Wit.ai STT 설정
     WIT_AI_API_KEY: str = os.getenv("WIT_AI_API_KEY", "")
 
+    # 오디오 변환(ffmpeg) 설정
+    AUDIO_TRANSCODE_FORMAT: str = os.getenv("AUDIO_TRANSCODE_FORMAT", "mp3")  # mp3 또는 opus (STT 전송 크기 절감)
+    AUDIO_TRANSCODE_WORKERS: int = 4        # 프로세스당 동시에 실행할 ffmpeg 최대 개수
+    AUDIO_TRANSCODE_TIMEOUT: float = 60.0   # ffmpeg 한 번 실행의 최대 시간(초)
+
+    AUDIO_VAD_ENABLED: bool = True          # STT 전 무음 제거/무음 녹음 판정 사용 여부
+    AUDIO_PASSTHROUGH_ENABLED: bool = True  # 헤더 검사 결과 STT 요구사항을 만족하면 변환 없이 전송
+    STT_SEGMENT_ENABLED: bool = True        # 긴 답변을 무음 지점에서 나누어 병렬 인식
+    STT_SEGMENT_MIN_SECONDS: float = 10.0   # 분할 구간 최소 길이(초)
+    STT_SEGMENT_MAX_SECONDS: float = 20.0   # 분할 구간 최대 길이(초)
+    STT_SEGMENT_CONCURRENCY: int = 3        # 요청 하나당 동시에 인식할 구간 수
+    STT_CACHE_TTL_SECONDS: int = 86400      # 음성 인식 결과 캐시 유지 시간(초)
+
+    # STT 백엔드 설정 (wit_ai: 운영, local: 로컬 대체 서버로 부하 테스트)
+    STT_BACKEND: str = os.getenv("STT_BACKEND", "wit_ai")
+    STT_LOCAL_URL: str = os.getenv("STT_LOCAL_URL", "http://localhost:8090/speech")
+
+    # STT HTTP 클라이언트 설정 (프로세스당 하나의 연결 풀 공유)
+    STT_MAX_CONNECTIONS: int = 20           # STT 서버로 여는 최대 연결 수
+    STT_MAX_KEEPALIVE: int = 10             # 재사용을 위해 유지할 유휴 연결 수
+    STT_MAX_CONCURRENCY: int = 8            # 프로세스 전체에서 동시에 보내는 STT 요청 수
+    STT_CONNECT_TIMEOUT: float = 10.0       # 연결 타임아웃(초)
+    STT_READ_TIMEOUT: float = 60.0          # 응답 대기 타임아웃(초)
+    STT_HTTP2_ENABLED: bool = True          # h2 패키지가 설치된 경우 HTTP/2 사용
+
+    # 답변 오디오 저장소 설정 (Celery 작업에는 오디오 대신 참조 키만 전달)
+    AUDIO_BLOB_BACKEND: str = os.getenv("AUDIO_BLOB_BACKEND", "s3")  # s3 (S3/MinIO) 또는 local
+    AUDIO_BLOB_BUCKET: str = os.getenv("AUDIO_BLOB_BUCKET", "")      # 비어 있으면 AWS_S3_BUCKET_NAME 사용
+    AUDIO_BLOB_PREFIX: str = "answer-audio/"
+    AUDIO_BLOB_ENDPOINT_URL: str = os.getenv("AUDIO_BLOB_ENDPOINT_URL", "")  # MinIO 등 S3 호환 저장소 주소
+    AUDIO_BLOB_DIR: str = os.getenv("AUDIO_BLOB_DIR", "/tmp/omypic_audio_blobs")  # local 저장소 경로
+    AUDIO_BLOB_TTL_SECONDS: int = 3 * 86400  # 답변 오디오 보관 기간(초), 이후 정리 작업이 삭제
+    # 문제/스크립트 음성(TTS) 캐시: 로컬 디스크에서 제공, s3이면 S3/MinIO에도 보관하여 서버 간 공유
+    TTS_CACHE_BACKEND: str = os.getenv("TTS_CACHE_BACKEND", "local")  # local 또는 s3
+    TTS_CACHE_DIR: str = os.getenv("TTS_CACHE_DIR", "/tmp/omypic_tts_cache")
+    TTS_CACHE_PREFIX: str = "tts-audio/"
+    TTS_AUDIO_MAX_AGE_SECONDS: int = 86400  # 문제 ID로 조회한 음성의 브라우저 캐시 시간 (문제 내용이 바뀔 수 있음)
+    # 스크립트 발음 TTS 서비스 (CSM-1B, WAV 응답)
+    SCRIPT_TTS_API_URL: str = os.getenv("SCRIPT_TTS_API_URL", "https://omypic.ngrok.app/csm-1b")
+    SCRIPT_TTS_TIMEOUT_SECONDS: float = 180.0
+    SCRIPT_TTS_MAX_CONNECTIONS: int = 4
+
+    # 관리자 API 설정 (비어 있으면 관리자 API 비활성화)
+    ADMIN_API_TOKEN: str = os.getenv("ADMIN_API_TOKEN", "")
+
     # Redis 및 Celery 설정
     REDIS_URL: str = os.getenv("REDIS_URL")
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND")
+    # 작업 단계별 처리율 제한 (워커 인스턴스 기준, Celery rate_limit 형식)
+    CELERY_STT_RATE_LIMIT: str = os.getenv("CELERY_STT_RATE_LIMIT", "60/m")  # 음성 인식 (stt 큐)
+    CELERY_LLM_RATE_LIMIT: str = os.getenv("CELERY_LLM_RATE_LIMIT", "10/m")  # LLM 평가 (llm 큐)
+    # 답변 처리 중간 상태 보관 시간 (Redis 해시, 최종 결과는 Mongo에 저장)
+    PROCESSING_STATUS_TTL_SECONDS: int = 86400
+    # 같은 답변 중복 제출을 막는 기간 (이 시간 안에 같은 녹음/Idempotency-Key로 다시 제출하면 기존 작업 상태 반환)
+    ANSWER_IDEMPOTENCY_TTL_SECONDS: int = 3600
+    # 사용자 간 공정 분배: 기간 안에 BURST개를 넘게 제출한 사용자의 작업은 우선순위를 낮춤
+    FAIR_SHARE_WINDOW_SECONDS: int = 300
+    FAIR_SHARE_BURST: int = 3
+    FAIR_SHARE_CONCURRENCY: int = 4  # API 프로세스 내 평가 작업(BackgroundTasks 경로) 동시 실행 수
+    # Celery 워커 메트릭 포트 (작업 대기/실행 시간, 0이면 비활성화)
+    CELERY_METRICS_PORT: int = 9808
+    # 인증 사용자 캐시 (Redis 유지 시간, 프로세스 로컬 유지 시간; 사용자 정보 변경 시 즉시 무효화)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 5
     
     def cors_origins(self) -> List[str]:
         return [i.strip() for i in self.CORS_ORIGINS.split(",") if i.strip()]
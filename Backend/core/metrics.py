@@ -74,6 +74,138 @@ PROBLEM_TYPE_EVALUATION_TIME = Histogram(
     buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
 )
 
+# Gemini API 키별 상태 측정 항목 (key 레이블은 API 키의 해시 식별자)
+GEMINI_KEY_USAGE = Gauge(
+    "gemini_key_usage",
+    "Gemini API 키별 시간당 사용량 추정치",
+    ["key"]
+)
+
+GEMINI_KEY_USAGE_LIMIT = Gauge(
+    "gemini_key_usage_limit",
+    "Gemini API 키당 시간당 사용량 한도"
+)
+
+GEMINI_KEY_BLACKLIST_REMAINING = Gauge(
+    "gemini_key_blacklist_remaining_seconds",
+    "Gemini API 키별 블랙리스트 해제까지 남은 시간(초)",
+    ["key"]
+)
+
+GEMINI_KEY_ALLOCATIONS = Counter(
+    "gemini_key_allocations_total",
+    "Gemini API 키별 할당 횟수",
+    ["key"]
+)
+
+GEMINI_KEY_QUOTA_ERRORS = Counter(
+    "gemini_key_quota_errors_total",
+    "Gemini API 키별 할당량 초과(429) 오류 수",
+    ["key"]
+)
+
+GEMINI_KEY_FORCED_SELECTIONS = Counter(
+    "gemini_key_forced_selections_total",
+    "사용 가능한 키가 없어 강제로 선택된 횟수",
+    ["key"]
+)
+
+# 오디오 파이프라인 단계별 측정 항목
+AUDIO_PIPELINE_STAGE_DURATION = Histogram(
+    "audio_pipeline_stage_duration_seconds",
+    "오디오 파이프라인 단계별 처리 시간(초) (queue_wait, transcode, stt_request 등)",
+    ["stage", "format"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+)
+
+TRANSCODE_IN_PROGRESS = Gauge(
+    "audio_transcode_in_progress",
+    "현재 실행 중인 ffmpeg 변환 프로세스 수"
+)
+
+AUDIO_PROBE_RESULTS = Counter(
+    "audio_probe_results_total",
+    "업로드 오디오 헤더 검사 결과",
+    ["container", "result"]  # result: passthrough / transcode / unknown
+)
+
+STT_REQUESTS_IN_PROGRESS = Gauge(
+    "stt_requests_in_progress",
+    "현재 진행 중인 STT API 요청 수",
+    ["mode"]  # async / sync
+)
+
+STT_CONCURRENCY_WAIT = Histogram(
+    "stt_concurrency_wait_seconds",
+    "STT 동시 요청 제한으로 대기한 시간(초)",
+    ["mode"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+TRANSCODE_OUTPUT_BYTES = Histogram(
+    "audio_transcode_output_bytes",
+    "변환된 STT 전송용 오디오 크기(바이트)",
+    ["format"],
+    buckets=(16_000, 64_000, 128_000, 256_000, 512_000, 1_000_000, 2_000_000, float("inf"))
+)
+
+STT_CACHE_LOOKUPS = Counter(
+    "stt_cache_lookups_total",
+    "음성 인식 결과 캐시 조회 수",
+    ["layer", "result"]
+)
+
+AUDIO_SPEECH_SECONDS = Histogram(
+    "audio_speech_duration_seconds",
+    "VAD로 검출한 녹음당 발화 길이(초)",
+    buckets=(0.5, 2, 5, 10, 20, 30, 45, 60, 90, 120, float("inf"))
+)
+
+AUDIO_SILENCE_TRIMMED_SECONDS = Histogram(
+    "audio_silence_trimmed_seconds",
+    "VAD로 제거한 녹음당 무음 길이(초)",
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, float("inf"))
+)
+
+SILENT_RECORDINGS = Counter(
+    "audio_silent_recordings_total",
+    "무음으로 판정되어 STT/평가를 생략한 녹음 수"
+)
+
+RATE_LIMIT_WAIT = Histogram(
+    "rate_limit_wait_seconds",
+    "외부 API 전역 처리율 제한으로 대기한 시간(초)",
+    ["resource", "result"],  # resource: gemini / wit_ai, result: acquired / timeout
+    buckets=[0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+)
+
+# Celery 작업 대기/실행 시간 (워커 프로세스에서 기록, CELERY_METRICS_PORT로 노출)
+CELERY_TASK_QUEUE_LATENCY = Histogram(
+    "celery_task_queue_latency_seconds",
+    "Celery 작업 발행부터 실행 시작까지 대기 시간(초)",
+    ["task", "queue"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, float("inf"))
+)
+
+CELERY_TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Celery 작업 실행 시작부터 종료까지 시간(초)",
+    ["task", "queue", "state"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, float("inf"))
+)
+
+TTS_CACHE_LOOKUPS = Counter(
+    "tts_cache_lookups_total",
+    "음성 합성(TTS) 캐시 조회 수",
+    ["layer", "result"]
+)
+
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups_total",
+    "인증 사용자 캐시 조회 수",
+    ["layer", "result"]
+)
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         # 경로 정규화 (파라미터 제거)
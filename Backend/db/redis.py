@@ -0,0 +1,51 @@
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from core.config import settings
+import logging
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+_sync_client = None  # 프로세스당 하나의 동기 클라이언트를 재사용
+_async_client = None  # API 프로세스(이벤트 루프)당 하나의 비동기 클라이언트를 재사용
+
+
+def get_redis_sync() -> Redis:
+    """
+    Redis 클라이언트 반환 (동기 버전)
+
+    API 프로세스와 Celery 워커가 공유하는 키 상태, 캐시 등에 사용합니다.
+    redis-py 클라이언트는 내부적으로 연결 풀을 사용하므로 프로세스당 한 번만 생성합니다.
+    """
+    global _sync_client
+
+    if _sync_client is None:
+        _sync_client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=2,  # 2초: Redis 장애 시 요청이 오래 멈추지 않도록
+            socket_timeout=5,          # 5초: 명령 응답 대기 시간
+            health_check_interval=30   # 30초: 유휴 연결 상태 확인 (pub/sub 연결 유지)
+        )
+        logger.info("Redis 동기 클라이언트가 생성되었습니다.")
+
+    return _sync_client
+
+
+def get_redis_async() -> AsyncRedis:
+    """
+    Redis 클라이언트 반환 (비동기 버전)
+
+    API에서 pub/sub 구독처럼 응답을 오래 기다리는 작업에 사용합니다 (이벤트 루프를 막지 않음).
+    구독 연결은 명령 응답을 기다리는 것이 아니므로 socket_timeout을 두지 않습니다.
+    """
+    global _async_client
+
+    if _async_client is None:
+        _async_client = AsyncRedis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=2,
+            health_check_interval=30
+        )
+        logger.info("Redis 비동기 클라이언트가 생성되었습니다.")
+
+    return _async_client
@@ -2,16 +2,21 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from scripts.scheduler import setup_scheduler
-from prometheus_client import make_asgi_app
+from prometheus_client import REGISTRY, make_asgi_app
 
 import time
+import asyncio
 import logging
 
 from api import problems_api, tests_api
-from api import auth, users
+from api import auth, users, admin
 from core.config import settings
-from db.mongodb import connect_to_mongo, close_mongo_connection
+from db.mongodb import connect_to_mongo, close_mongo_connection, get_mongodb
+from services.stt_client import close_stt_client
+from services.script_tts import close_tts_http_client
 from core.metrics import PrometheusMiddleware  # 프로메테우스 추가
+from services.queue_inspector import QueueMetricsCollector, get_queue_inspector
+from services.user_cache import listen_for_invalidations
 
 # 요청 본문 크기 제한 설정
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -36,20 +41,39 @@ async def lifespan(app: FastAPI):
     app.state.scheduler.start()
     logger.info("스케줄러가 시작되었습니다.")
 
+    # 다른 프로세스(워커, 스케줄러)의 사용자 정보 변경을 로컬 사용자 캐시에 반영
+    app.state.user_cache_listener = asyncio.create_task(listen_for_invalidations())
+
     yield  # 애플리케이션 실행
     
+    # 사용자 캐시 무효화 구독 종료
+    app.state.user_cache_listener.cancel()
+
     # 스케줄러 종료
     if hasattr(app.state, "scheduler"):
         app.state.scheduler.shutdown()
         logger.info("스케줄러가 종료되었습니다.")
 
+    # STT HTTP 연결 풀 종료
+    await close_stt_client()
+
+    # 스크립트 TTS HTTP 연결 풀 종료
+    await close_tts_http_client()
+
     # MongoDB 연결 종료
     await close_mongo_connection()
     
     print("앱 종료됨")
 
 async def setup_mongo_indexes():
-    """필요한 MongoDB 인덱스를 설정합니다."""
+    """필요한 MongoDB 인덱스를 설정합니다. (이미 있으면 그대로 유지)"""
+    db = await get_mongodb()
+
+    # 테스트 히스토리 keyset 페이지네이션 (user_id 일치 + test_date, _id 내림차순)
+    await db.tests.create_index(
+        [("user_id", 1), ("test_date", -1), ("_id", -1)],
+        name="user_id_test_date_id"
+    )
     print("MongoDB 인덱스가 생성되었습니다.")
 
 
@@ -83,6 +107,8 @@ app.add_middleware(
 app.add_middleware(PrometheusMiddleware)
 
 # Prometheus 메트릭 엔드포인트 추가
+# Celery 큐 적체량(celery_queue_depth, celery_queue_oldest_message_age_seconds)은 수집 시점에 브로커에서 조회
+REGISTRY.register(QueueMetricsCollector(get_queue_inspector()))
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
@@ -105,6 +131,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["인증"])
 app.include_router(users.router, prefix="/api/users", tags=["사용자"])
 app.include_router(tests_api.router, prefix="/api/tests", tags=["모의고사"])
 app.include_router(problems_api.router, prefix="/api/problems", tags=["문제"])
+app.include_router(admin.router, prefix="/api/admin", tags=["관리자"])
 
 
 @app.get("/")
@@ -40,6 +40,7 @@ class TestHistoryResponse(BaseModel):
     average_score: Optional[TestScoreInfo] = None
     test_history: List[TestHistoryItem] = []
     test_counts: TestCounts
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 # 테스트 상세 응답 모델
@@ -0,0 +1,45 @@
+"""
+사용자 평균 점수 누적값(score_stats)을 기존 테스트 기록으로 채우는 일회성 스크립트입니다.
+증분 갱신을 배포한 뒤 한 번 실행하며, 누적값이 어긋났을 때 다시 실행해도 같은 결과를 만듭니다.
+
+사용법:
+    python scripts/backfill_score_stats.py              # 채점된 테스트가 있는 모든 사용자
+    python scripts/backfill_score_stats.py --user-id <사용자 ID>
+"""
+
+import argparse
+import sys
+import os
+
+# 프로젝트 루트 디렉토리 추가 (실행 환경에 따라 경로 조정 필요)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.mongodb import get_mongodb_sync
+from services.score_stats import rebuild_user_score_stats_sync
+
+
+def backfill(user_id=None):
+    """사용자별 누적값을 다시 계산합니다."""
+    db = get_mongodb_sync()
+
+    if user_id:
+        user_ids = [user_id]
+    else:
+        user_ids = db.tests.distinct("user_id", {"test_score.total_score": {"$exists": True}})
+
+    for index, current_user_id in enumerate(user_ids, start=1):
+        try:
+            averages = rebuild_user_score_stats_sync(db, current_user_id)
+            print(f"[{index}/{len(user_ids)}] 사용자 {current_user_id}: {averages}")
+        except Exception as e:
+            print(f"[{index}/{len(user_ids)}] 사용자 {current_user_id} 처리 중 오류 발생: {str(e)}")
+
+    print(f"평균 점수 누적값 백필 완료: {len(user_ids)}명")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사용자 평균 점수 누적값 백필")
+    parser.add_argument("--user-id", help="특정 사용자만 처리")
+    args = parser.parse_args()
+
+    backfill(args.user_id)
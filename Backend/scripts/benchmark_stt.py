@@ -0,0 +1,171 @@
+"""
+STT 백엔드 처리량 벤치마크
+
+백엔드별, 동시 요청 수별로 요청을 보내 처리량과 지연 분포를 측정합니다.
+- raw 모드(기본): 백엔드에 오디오를 바로 전송 (STT 요청 자체의 처리량)
+- --pipeline 모드: AudioProcessor 전체 경로(ffmpeg 변환, VAD, 분할, STT)를 실행 (ffmpeg 필요)
+
+사용법:
+    python scripts/stt_stub_server.py --latency-ms 800 &
+    python scripts/benchmark_stt.py --backends local --concurrency 1,4,16 --requests 64
+    python scripts/benchmark_stt.py --backends local,wit_ai --audio answer.mp3 --pipeline
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from services.audio_processor import AudioProcessor
+from services.stt_backends import available_stt_backends, get_stt_backend
+from services.stt_client import SttHttpClient
+from services.transcoder import PCM_CONTENT_TYPE, TARGET_SAMPLE_RATE
+from services.transcript_cache import TranscriptCache
+
+# 로깅 설정 (요청별 로그는 생략)
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "mp3": "audio/mpeg3",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+    "webm": "audio/webm",
+}
+
+
+def synthetic_pcm(seconds: float) -> bytes:
+    """벤치마크용 합성 음성 PCM (음량이 변하는 톤, 16kHz 모노)"""
+    t = np.arange(int(seconds * TARGET_SAMPLE_RATE)) / TARGET_SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 0.5 * t)
+    wave = 0.3 * envelope * np.sin(2 * np.pi * 220 * t)
+    return (wave * 32767).astype("<i2").tobytes()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(call, concurrency: int, total: int) -> dict:
+    """동시 요청 수 concurrency로 total개의 요청을 실행하고 통계 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(i)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors += 1
+                logger.warning(f"요청 실패: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "mean_ms": (statistics.mean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def make_call(backend_name: str, concurrency: int, payload: bytes, content_type: str, pipeline: bool):
+    """벤치마크 대상 호출 함수 생성 (동시 요청 수에 맞춘 전용 연결 풀 사용)"""
+    backend = get_stt_backend(backend_name)
+    if hasattr(backend, "client"):
+        backend.client = SttHttpClient(max_connections=concurrency, max_concurrency=concurrency)
+
+    if not pipeline:
+        async def call(i: int):
+            await backend.atranscribe(payload, content_type)
+        return call, backend
+
+    processor = AudioProcessor(backend=backend)
+    # 같은 오디오를 반복 전송하므로 캐시를 끄고 매번 전체 경로를 실행
+    processor.transcript_cache = TranscriptCache(redis_client=None, namespace=backend.name, local_size=0)
+
+    async def call(i: int):
+        await processor.process_audio_stream(payload)
+    return call, backend
+
+
+async def benchmark(
+    backends: List[str],
+    levels: List[int],
+    total: int,
+    audio_path: Optional[str],
+    seconds: float,
+    pipeline: bool
+) -> None:
+    if audio_path:
+        with open(audio_path, "rb") as f:
+            payload = f.read()
+        extension = audio_path.rsplit(".", 1)[-1].lower()
+        content_type = CONTENT_TYPES.get(extension, "audio/mpeg3")
+    elif pipeline:
+        raise SystemExit("--pipeline 모드에는 --audio 파일이 필요합니다")
+    else:
+        payload = synthetic_pcm(seconds)
+        content_type = PCM_CONTENT_TYPE
+
+    mode = "pipeline" if pipeline else "raw"
+    print(f"모드: {mode}, 요청 수: {total}, 오디오: {len(payload)} 바이트")
+    print(f"{'backend':<10} {'conc':>5} {'ok':>5} {'err':>5} {'req/s':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'mean(ms)':>9}")
+
+    for name in backends:
+        for concurrency in levels:
+            call, backend = make_call(name, concurrency, payload, content_type, pipeline)
+            result = await run_level(call, concurrency, total)
+            if hasattr(backend, "client"):
+                await backend.client.aclose()
+
+            print(
+                f"{name:<10} {concurrency:>5} {result['ok']:>5} {result['errors']:>5} "
+                f"{result['throughput']:>8.2f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+                f"{result['mean_ms']:>9.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 백엔드 처리량 벤치마크")
+    parser.add_argument("--backends", default="local", help=f"쉼표로 구분 (등록된 백엔드: {', '.join(available_stt_backends())})")
+    parser.add_argument("--concurrency", default="1,4,8,16", help="동시 요청 수 목록 (쉼표로 구분)")
+    parser.add_argument("--requests", type=int, default=64, help="동시 요청 수 단계별 요청 개수")
+    parser.add_argument("--audio", help="전송할 오디오 파일 (없으면 합성 PCM 사용)")
+    parser.add_argument("--seconds", type=float, default=15.0, help="합성 PCM 길이(초)")
+    parser.add_argument("--pipeline", action="store_true", help="AudioProcessor 전체 경로 실행")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(
+        backends=[b.strip() for b in args.backends.split(",") if b.strip()],
+        levels=[int(c) for c in args.concurrency.split(",") if c.strip()],
+        total=args.requests,
+        audio_path=args.audio,
+        seconds=args.seconds,
+        pipeline=args.pipeline
+    ))
+
+
+if __name__ == "__main__":
+    main()
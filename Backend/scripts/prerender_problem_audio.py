@@ -0,0 +1,50 @@
+"""
+전체 문제의 음성(TTS)을 미리 합성하여 캐시에 채우는 스크립트입니다.
+문제를 추가/수정한 뒤 또는 새 서버(빈 캐시)를 띄운 뒤 실행하면 첫 재생부터 합성 대기 없이 제공됩니다.
+이미 캐시된 문제는 건너뛰므로 여러 번 실행해도 됩니다.
+
+사용법:
+    python scripts/prerender_problem_audio.py                 # 모든 문제
+    python scripts/prerender_problem_audio.py --concurrency 8
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# 프로젝트 루트 디렉토리 추가 (실행 환경에 따라 경로 조정 필요)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.mongodb import get_mongodb_sync
+from services.tts_cache import GTTS_VOICE, get_tts_cache, render_gtts
+
+
+async def prerender(problems, concurrency: int):
+    """문제 음성을 동시에 concurrency개씩 합성합니다."""
+    cache = get_tts_cache()
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def render_one(index, problem):
+        nonlocal failed
+        async with semaphore:
+            try:
+                digest, _ = await cache.aensure(problem["content"], GTTS_VOICE, render_gtts)
+                print(f"[{index}/{len(problems)}] 문제 {problem['_id']}: {digest}")
+            except Exception as e:
+                failed += 1
+                print(f"[{index}/{len(problems)}] 문제 {problem['_id']} 처리 중 오류 발생: {str(e)}")
+
+    await asyncio.gather(*(render_one(index, problem) for index, problem in enumerate(problems, start=1)))
+    print(f"문제 음성 캐시 채우기 완료: {len(problems) - failed}개 성공, {failed}개 실패")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="문제 음성(TTS) 캐시 미리 채우기")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 합성할 문제 수")
+    args = parser.parse_args()
+
+    db = get_mongodb_sync()
+    problems = list(db.problems.find({"content": {"$nin": [None, ""]}}, {"content": 1}))
+    asyncio.run(prerender(problems, args.concurrency))
@@ -1,6 +1,9 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from db.mongodb import get_collection
+from services.blob_store import cleanup_expired_blobs
+from services.user_cache import get_user_cache
+import asyncio
 import logging
 
 # 로깅 설정
@@ -21,11 +24,20 @@ async def reset_user_limits():
                 "limits.script_count": 0
             }}
         )
+        await get_user_cache().ainvalidate_all()
         
         logger.info(f"사용자 제한 초기화 완료: {result.modified_count}명의 사용자 정보가 업데이트되었습니다.")
     except Exception as e:
         logger.error(f"사용자 제한 초기화 중 오류 발생: {str(e)}")
 
+async def cleanup_audio_blobs():
+    """매시간 보관 기간이 지난 답변 오디오를 저장소에서 삭제합니다."""
+    try:
+        # 저장소 클라이언트가 동기 방식이므로 스레드에서 실행
+        await asyncio.to_thread(cleanup_expired_blobs)
+    except Exception as e:
+        logger.error(f"답변 오디오 정리 중 오류 발생: {str(e)}")
+
 def setup_scheduler():
     """스케줄러를 설정하고 시작합니다."""
     scheduler = AsyncIOScheduler()
@@ -38,5 +50,14 @@ def setup_scheduler():
         name="사용자 제한 초기화",
         replace_existing=True
     )
+
+    # 매시간 30분에 실행되는 답변 오디오 정리 작업 추가
+    scheduler.add_job(
+        cleanup_audio_blobs,
+        CronTrigger(minute=30),
+        id="cleanup_audio_blobs",
+        name="답변 오디오 정리",
+        replace_existing=True
+    )
     
     return scheduler
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+로컬 STT 대체 서버
+
+Wit.ai와 같은 형식(NDJSON)으로 고정 인식 결과를 돌려주는 HTTP 서버입니다.
+STT_BACKEND=local로 설정하면 외부 API 호출 없이 전체 음성 처리 파이프라인을 부하 테스트할 수 있습니다.
+
+사용법:
+    python scripts/stt_stub_server.py --port 8090 --latency-ms 800 --jitter-ms 200 --per-second-ms 50
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PCM_BYTES_PER_SECOND = 16000 * 2  # 16kHz 모노 16비트 기준 오디오 길이 추정
+
+DEFAULT_TRANSCRIPTS = [
+    "I usually go to the park near my house on weekends and take a walk with my dog.",
+    "My favorite place in my neighborhood is a small cafe where I can read books quietly.",
+    "When I was young I went to the beach with my family every summer and it was really fun.",
+    "These days I am interested in cooking so I try to make a new dish every weekend.",
+    "I think the biggest change in my country is that people use smartphones for everything.",
+]
+
+
+def create_app(
+    latency_ms: float = 800.0,
+    jitter_ms: float = 200.0,
+    per_second_ms: float = 0.0,
+    error_rate: float = 0.0,
+    transcripts=None
+) -> FastAPI:
+    """
+    STT 대체 서버 앱 생성
+
+    Args:
+        latency_ms: 기본 응답 지연(ms)
+        jitter_ms: 지연에 더해지는 무작위 편차(ms, ±)
+        per_second_ms: 오디오 1초(PCM 기준 추정)당 추가 지연(ms)
+        error_rate: 500 오류를 반환할 확률 (0~1)
+        transcripts: 돌려줄 인식 결과 목록 (같은 오디오에는 항상 같은 결과)
+    """
+    transcripts = transcripts or DEFAULT_TRANSCRIPTS
+    app = FastAPI(title="STT Stub Server")
+    app.state.requests = 0
+
+    @app.post("/speech")
+    async def speech(request: Request):
+        body = await request.body()
+        app.state.requests += 1
+
+        delay_ms = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        delay_ms += per_second_ms * len(body) / PCM_BYTES_PER_SECOND
+        await asyncio.sleep(max(0.0, delay_ms) / 1000)
+
+        if random.random() < error_rate:
+            return PlainTextResponse("stub error", status_code=500)
+
+        if not body:
+            return PlainTextResponse('{"text": "", "is_final": true}\n')
+
+        index = int.from_bytes(hashlib.blake2b(body, digest_size=4).digest(), "big") % len(transcripts)
+        text = transcripts[index]
+        words = text.split()
+        # Wit.ai처럼 중간 결과 뒤에 최종 결과를 보냄
+        lines = [
+            json.dumps({"text": " ".join(words[:len(words) // 2]), "is_final": False}),
+            json.dumps({"text": text, "is_final": True}),
+        ]
+        return PlainTextResponse("\n".join(lines) + "\n", media_type="application/json")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": app.state.requests}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 STT 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="기본 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=200.0, help="무작위 지연 편차(ms)")
+    parser.add_argument("--per-second-ms", type=float, default=0.0, help="오디오 1초당 추가 지연(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 반환 확률 (0~1)")
+    parser.add_argument("--transcripts", help="인식 결과 목록 파일 (한 줄에 하나)")
+    args = parser.parse_args()
+
+    transcripts = None
+    if args.transcripts:
+        with open(args.transcripts, encoding="utf-8") as f:
+            transcripts = [line.strip() for line in f if line.strip()]
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        per_second_ms=args.per_second_ms,
+        error_rate=args.error_rate,
+        transcripts=transcripts
+    )
+    logger.info(f"STT 대체 서버 시작: http://{args.host}:{args.port}/speech")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.mongodb import connect_to_mongo, close_mongo_connection, get_collection
 from core.config import settings
+from services.user_cache import get_user_cache
 
 async def reset_limits_manually():
     """모든 사용자의 limits 값을 수동으로 초기화합니다."""
@@ -32,6 +33,7 @@ async def reset_limits_manually():
                 "limits.script_count": 0
             }}
         )
+        await get_user_cache().ainvalidate_all()
         
         print(f"사용자 제한 초기화 완료: {result.modified_count}명의 사용자 정보가 업데이트되었습니다.")
         
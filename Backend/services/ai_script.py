@@ -18,6 +18,7 @@ try:
     from langchain.prompts import ChatPromptTemplate
     from langchain.prompts.chat import SystemMessagePromptTemplate, HumanMessagePromptTemplate
     from api.deps import get_next_groq_key, get_next_gemini_key
+    from services.rate_limiter import gemini_limiter
     from db.mongodb import get_mongodb, get_collection
 except ImportError as e:
     logger.error(f"필수 모듈 임포트 실패: {str(e)}")
@@ -323,6 +324,7 @@ async def generate_follow_up_questions(problem_pk: str, answers: Dict[str, str])
             
             # 꼬리질문 생성 - 최신 LangChain 방식 사용
             chain = chat_prompt | llm
+            await gemini_limiter(llm.google_api_key).aacquire()
             follow_up = await chain.ainvoke({
                 "topic_type": question_type_data["type"],
                 "problem_content": original_question,
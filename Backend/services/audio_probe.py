@@ -0,0 +1,363 @@
+"""
+오디오 헤더 검사 모듈
+
+파일 앞부분의 헤더만 읽어 컨테이너/코덱/채널/샘플레이트/길이를 파악합니다 (디코딩 없음).
+- MP3: ID3v2 태그 건너뛰기, 프레임 헤더, Xing/Info 헤더(VBR 프레임 수)
+- WAV: RIFF fmt 청크, data 청크 위치/크기
+- WebM: EBML Segment Info(길이), Tracks(코덱, 샘플레이트, 채널)
+이미 STT 요구사항(모노, 작은 비트레이트, 길이 제한)을 만족하는 입력은 ffmpeg 변환 없이 그대로 전송할 수 있습니다.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterator, Optional, Tuple
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+HEADER_BYTES = 64 * 1024          # 헤더 검사에 읽는 최대 크기
+MAX_PASSTHROUGH_BITRATE = 64000   # 그대로 전송할 압축 오디오의 최대 비트레이트 (변환 결과와 같은 64kbps)
+PCM_SAMPLE_RATE = 16000           # 그대로 전송/사용할 PCM의 샘플레이트
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """헤더에서 읽은 오디오 정보"""
+    container: str                  # mp3 / wav / webm
+    codec: str                      # mp3 / pcm_s16le / opus / vorbis ...
+    content_type: str               # 그대로 전송할 때 사용할 Content-Type
+    sample_rate: int
+    channels: int
+    duration: Optional[float] = None   # 초 (헤더로 알 수 없으면 None)
+    bitrate: Optional[int] = None      # bps (압축 오디오)
+    data_offset: int = 0               # WAV data 청크 시작 위치
+    data_size: int = 0                 # WAV data 청크 크기
+
+
+# MP3 (MPEG Audio Layer III)
+
+_MP3_BITRATES = {
+    "v1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "v2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+
+
+def id3v2_size(head: bytes) -> int:
+    """ID3v2 태그 전체 크기 (태그가 없으면 0)"""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in head[6:10]:  # syncsafe 정수 (바이트당 7비트)
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _mp3_frame(header: bytes) -> Optional[Tuple[int, int, int, int, int]]:
+    """MP3 프레임 헤더 해석: (MPEG 버전 비트, 비트레이트 bps, 샘플레이트, 채널 수, 프레임 길이)"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None  # 예약값, Layer III가 아님, free format
+
+    bitrate = _MP3_BITRATES["v1" if version == 3 else "v2"][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header[2] >> 1) & 0x01
+    channels = 1 if (header[3] >> 6) == 3 else 2
+    coefficient = 144 if version == 3 else 72
+    frame_length = coefficient * bitrate // sample_rate + padding
+    return version, bitrate, sample_rate, channels, frame_length
+
+
+def _probe_mp3(frames: bytes, audio_bytes: int) -> Optional[AudioInfo]:
+    """ID3 태그 뒤 첫 프레임부터의 데이터로 MP3 정보 추출"""
+    frame = _mp3_frame(frames[:4])
+    if frame is None:
+        return None
+    version, bitrate, sample_rate, channels, frame_length = frame
+
+    # 오탐 방지: 다음 프레임 헤더도 확인 (데이터가 충분한 경우)
+    if len(frames) >= frame_length + 4 and _mp3_frame(frames[frame_length:frame_length + 4]) is None:
+        return None
+
+    samples_per_frame = 1152 if version == 3 else 576
+    duration = audio_bytes * 8 / bitrate
+
+    # Xing/Info 헤더: VBR 파일의 전체 프레임 수
+    side_info = (17 if channels == 1 else 32) if version == 3 else (9 if channels == 1 else 17)
+    xing = 4 + side_info
+    if frames[xing:xing + 4] in (b"Xing", b"Info") and len(frames) >= xing + 12:
+        flags = struct.unpack(">I", frames[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            frame_count = struct.unpack(">I", frames[xing + 8:xing + 12])[0]
+            if frame_count:
+                duration = frame_count * samples_per_frame / sample_rate
+                bitrate = int(audio_bytes * 8 / duration)
+
+    return AudioInfo(
+        container="mp3",
+        codec="mp3",
+        content_type="audio/mpeg3",
+        sample_rate=sample_rate,
+        channels=channels,
+        duration=duration,
+        bitrate=bitrate
+    )
+
+
+# WAV (RIFF)
+
+def _probe_wav(head: bytes, total_size: int) -> Optional[AudioInfo]:
+    """RIFF 청크를 따라가며 fmt/data 청크 정보 추출"""
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(head):
+        chunk_id = head[offset:offset + 4]
+        chunk_size = struct.unpack("<I", head[offset + 4:offset + 8])[0]
+        body = offset + 8
+
+        if chunk_id == b"fmt " and body + 16 <= len(head):
+            fmt = struct.unpack("<HHIIHH", head[body:body + 16])
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, byte_rate, _, bits = fmt
+            # 스트리밍 녹음은 data 크기가 0 또는 최댓값으로 기록됨
+            available = total_size - body
+            data_size = chunk_size if 0 < chunk_size <= available else available
+            codec = f"pcm_s{bits}le" if audio_format in (1, 0xFFFE) else f"wav_{audio_format:#x}"
+            return AudioInfo(
+                container="wav",
+                codec=codec,
+                content_type="audio/wav",
+                sample_rate=sample_rate,
+                channels=channels,
+                duration=data_size / byte_rate if byte_rate else None,
+                bitrate=byte_rate * 8,
+                data_offset=body,
+                data_size=data_size
+            )
+
+        offset = body + chunk_size + (chunk_size & 1)  # 청크는 2바이트 단위로 정렬
+
+    return None
+
+
+# WebM (Matroska/EBML)
+
+_EBML_HEADER = 0x1A45DFA3
+_EBML_DOCTYPE = 0x4282
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_TRACKS = 0x1654AE6B
+_TRACK_ENTRY = 0xAE
+_TRACK_TYPE = 0x83
+_CODEC_ID = 0x86
+_AUDIO = 0xE1
+_SAMPLING_FREQUENCY = 0xB5
+_CHANNELS = 0x9F
+_CLUSTER = 0x1F43B675
+
+_WEBM_CODECS = {"A_OPUS": "opus", "A_VORBIS": "vorbis"}
+
+
+def _read_vint(data: bytes, offset: int, keep_marker: bool) -> Tuple[Optional[int], int]:
+    """EBML 가변 길이 정수 (ID는 marker 비트 유지, 크기는 제거). 크기가 '알 수 없음'이면 None"""
+    if offset >= len(data):
+        raise IndexError("EBML 데이터 부족")
+    first = data[offset]
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8 or offset + length > len(data):
+        raise IndexError("잘못된 EBML 정수")
+
+    value = first if keep_marker else first & (0xFF >> length)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, offset + length  # unknown size (라이브 녹음)
+    return value, offset + length
+
+
+def _ebml_elements(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """start~end 구간의 (ID, 본문 시작, 본문 끝) 목록 (크기를 알 수 없으면 end까지)"""
+    offset = start
+    while offset < end:
+        element_id, offset = _read_vint(data, offset, keep_marker=True)
+        size, offset = _read_vint(data, offset, keep_marker=False)
+        body_end = end if size is None else min(end, offset + size)
+        yield element_id, offset, body_end
+        offset = body_end
+
+
+def _ebml_uint(data: bytes) -> int:
+    return int.from_bytes(data, "big") if data else 0
+
+
+def _ebml_float(data: bytes) -> float:
+    if len(data) == 4:
+        return struct.unpack(">f", data)[0]
+    if len(data) == 8:
+        return struct.unpack(">d", data)[0]
+    return 0.0
+
+
+def _probe_webm(head: bytes) -> Optional[AudioInfo]:
+    """EBML 헤더의 DocType, Segment Info의 길이, 첫 오디오 트랙 정보 추출"""
+    timecode_scale = 1_000_000  # 기본값: 1ms (ns 단위)
+    duration = None
+    track = None
+
+    try:
+        for element_id, body, body_end in _ebml_elements(head, 0, len(head)):
+            if element_id == _EBML_HEADER:
+                doctype = next((head[b:e] for i, b, e in _ebml_elements(head, body, body_end) if i == _EBML_DOCTYPE), b"")
+                if doctype not in (b"webm", b"matroska"):
+                    return None
+            elif element_id == _SEGMENT:
+                for child_id, child, child_end in _ebml_elements(head, body, body_end):
+                    if child_id == _INFO:
+                        for info_id, b, e in _ebml_elements(head, child, child_end):
+                            if info_id == _TIMECODE_SCALE:
+                                timecode_scale = _ebml_uint(head[b:e])
+                            elif info_id == _DURATION:
+                                duration = _ebml_float(head[b:e])
+                    elif child_id == _TRACKS:
+                        track = track or _webm_audio_track(head, child, child_end)
+                    elif child_id == _CLUSTER:
+                        break  # 미디어 데이터 시작: 헤더 정보는 이 앞에 있음
+                break
+    except IndexError:
+        pass  # 헤더를 일부만 읽은 경우: 지금까지 얻은 정보 사용
+
+    if track is None:
+        return None
+
+    codec, sample_rate, channels = track
+    return AudioInfo(
+        container="webm",
+        codec=codec,
+        content_type="audio/webm",
+        sample_rate=sample_rate,
+        channels=channels,
+        duration=duration * timecode_scale / 1e9 if duration else None
+    )
+
+
+def _webm_audio_track(data: bytes, start: int, end: int) -> Optional[Tuple[str, int, int]]:
+    """Tracks 요소에서 첫 오디오 트랙의 (코덱, 샘플레이트, 채널 수)"""
+    for element_id, body, body_end in _ebml_elements(data, start, end):
+        if element_id != _TRACK_ENTRY:
+            continue
+
+        track_type, codec_id, sample_rate, channels = None, "", 8000, 1
+        for child_id, b, e in _ebml_elements(data, body, body_end):
+            if child_id == _TRACK_TYPE:
+                track_type = _ebml_uint(data[b:e])
+            elif child_id == _CODEC_ID:
+                codec_id = data[b:e].decode("ascii", errors="ignore").rstrip("\x00")
+            elif child_id == _AUDIO:
+                for audio_id, ab, ae in _ebml_elements(data, b, e):
+                    if audio_id == _SAMPLING_FREQUENCY:
+                        sample_rate = int(_ebml_float(data[ab:ae]))
+                    elif audio_id == _CHANNELS:
+                        channels = _ebml_uint(data[ab:ae])
+
+        if track_type == 2:
+            return _WEBM_CODECS.get(codec_id, codec_id.lower()), sample_rate, channels
+
+    return None
+
+
+# 공개 함수
+
+def _probe(head: bytes, total_size: int, read_after_tag: Callable[[int], bytes]) -> Optional[AudioInfo]:
+    try:
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _probe_wav(head, total_size)
+        if head[:4] == b"\x1a\x45\xdf\xa3":
+            return _probe_webm(head)
+
+        # MP3: ID3 태그(앨범 아트 등으로 클 수 있음) 뒤의 첫 프레임부터 읽음
+        tag_size = id3v2_size(head)
+        frames = read_after_tag(tag_size) if tag_size else head
+        return _probe_mp3(frames, total_size - tag_size)
+    except (struct.error, IndexError, ValueError, ZeroDivisionError) as e:
+        logger.debug(f"오디오 헤더 검사 실패: {e}")
+        return None
+
+
+def probe_audio(audio_content: bytes) -> Optional[AudioInfo]:
+    """
+    오디오 바이트의 헤더만 읽어 형식 정보 반환
+
+    Returns:
+        Optional[AudioInfo]: 인식할 수 없는 형식이면 None
+    """
+    return _probe(
+        audio_content[:HEADER_BYTES],
+        len(audio_content),
+        lambda offset: audio_content[offset:offset + HEADER_BYTES]
+    )
+
+
+def probe_audio_file(path: str) -> Optional[AudioInfo]:
+    """오디오 파일의 헤더만 읽어 형식 정보 반환 (파일 전체를 읽지 않음)"""
+    with open(path, "rb") as f:
+        total_size = os.fstat(f.fileno()).st_size
+        head = f.read(HEADER_BYTES)
+
+        def read_after_tag(offset: int) -> bytes:
+            f.seek(offset)
+            return f.read(HEADER_BYTES)
+
+        return _probe(head, total_size, read_after_tag)
+
+
+def is_pcm16_mono(info: Optional[AudioInfo]) -> bool:
+    """16kHz 모노 16비트 PCM WAV 여부 (디코딩 없이 data 청크를 그대로 사용 가능)"""
+    return (
+        info is not None
+        and info.codec == "pcm_s16le"
+        and info.sample_rate == PCM_SAMPLE_RATE
+        and info.channels == 1
+    )
+
+
+def is_stt_compliant(
+    info: Optional[AudioInfo],
+    accepted_content_types: FrozenSet[str],
+    max_seconds: float
+) -> bool:
+    """
+    변환 없이 그대로 STT에 전송해도 되는지 판단
+
+    - STT 백엔드가 받는 Content-Type
+    - 모노, 길이를 알 수 있고 max_seconds 이하
+    - PCM은 16kHz 16비트, 압축 오디오는 64kbps 이하 (Opus는 음성용 코덱이므로 비트레이트 제한 없음)
+    """
+    if info is None or info.content_type not in accepted_content_types:
+        return False
+    if info.channels != 1 or info.duration is None or info.duration > max_seconds:
+        return False
+    if info.codec.startswith("pcm_"):
+        return is_pcm16_mono(info)
+    if info.codec == "opus":
+        return True
+    return info.codec == "mp3" and info.bitrate is not None and info.bitrate <= MAX_PASSTHROUGH_BITRATE
@@ -1,37 +1,60 @@
-import io
+import time
+import asyncio
+import contextlib
 import logging
 import requests
-import json
-from pydub import AudioSegment
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from core.config import settings
-from core.metrics import AUDIO_PROCESS_DURATION, track_time, track_audio_size
+from core.exceptions import APIQuotaExceededError, APIRateLimitError
+from core.metrics import (
+    AUDIO_PROCESS_DURATION, AUDIO_PIPELINE_STAGE_DURATION, AUDIO_PROBE_RESULTS, ERROR_COUNTER, track_audio_size
+)
+from services.audio_probe import AudioInfo, is_pcm16_mono, is_stt_compliant, probe_audio, probe_audio_file
+from services.audio_stream import OUTPUT_CHUNK_SIZE, AudioSource, transcode_stream
+from services.transcoder import MAX_AUDIO_SECONDS, PCM_CONTENT_TYPE, TARGET_SAMPLE_RATE, TranscodeError, get_transcoder
+from services.vad import SilentAudioError, VoiceActivityTrimmer, trim_silence
+from services.segmenter import SilenceSegmenter, split_at_silence, stitch_transcripts
+from services.transcript_cache import audio_digest, audio_file_digest, new_audio_hasher, get_transcript_cache
+from services.stt_backends import SttBackend, get_stt_backend
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+MAX_PCM_BYTES = MAX_AUDIO_SECONDS * TARGET_SAMPLE_RATE * 2  # 2분 길이의 16kHz 모노 16비트 PCM
+
 
 class AudioProcessor:
-    """오디오 처리 클래스: 음성 데이터를 텍스트로 변환 (Wit.ai API 활용)"""
+    """오디오 처리 클래스: 음성 데이터를 텍스트로 변환 (STT 백엔드 활용, 기본값 Wit.ai)"""
 
-    def __init__(self):
+    def __init__(self, backend: Optional[SttBackend] = None):
         """
         오디오 프로세서 초기화
 
-        Wit.ai API를 사용하여 음성을 텍스트로 변환합니다.
-        - 무료 무제한 사용 가능
-        - 한국어 지원
+        Args:
+            backend: 음성 인식에 사용할 STT 백엔드 (기본값: STT_BACKEND 설정의 백엔드)
+
+        Raises:
+            ValueError: 백엔드 설정이 잘못된 경우 (예: WIT_AI_API_KEY 누락)
         """
-        self.api_key = settings.WIT_AI_API_KEY
-        self.base_url = "https://api.wit.ai/speech"
+        self.backend = backend or get_stt_backend()
 
-        if not self.api_key:
-            raise ValueError("WIT_AI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        self.transcoder = get_transcoder()
+        # 백엔드마다 인식 결과가 다르므로 캐시 네임스페이스를 분리
+        self.transcript_cache = get_transcript_cache(self.backend.name)
+        self.vad_enabled = settings.AUDIO_VAD_ENABLED
+        self.passthrough_enabled = settings.AUDIO_PASSTHROUGH_ENABLED
+        self.segment_enabled = settings.STT_SEGMENT_ENABLED
+        self.segment_concurrency = max(1, settings.STT_SEGMENT_CONCURRENCY)
 
-    @track_time(AUDIO_PROCESS_DURATION, {"processor": "wit_ai"})
     def process_audio(self, audio_content: bytes) -> str:
         """
-        오디오 바이트 데이터를 텍스트로 변환 (Wit.ai API 활용)
+        오디오 바이트 데이터를 텍스트로 변환 (STT 백엔드 활용)
+
+        처리 시간은 사용 중인 백엔드 이름을 processor 레이블로 기록합니다.
 
         Args:
             audio_content: 오디오 파일 바이트 데이터 (MP3, WAV 등)
@@ -42,6 +65,19 @@ class AudioProcessor:
         Raises:
             ValueError: 오디오 처리 중 오류 발생 시
         """
+        start_time = time.time()
+        status = "success"
+        try:
+            return self._process_audio(audio_content)
+        except Exception as e:
+            status = "error"
+            ERROR_COUNTER.labels(module=__name__, error_type=type(e).__name__).inc()
+            raise
+        finally:
+            AUDIO_PROCESS_DURATION.labels(status=status, processor=self.backend.name).observe(time.time() - start_time)
+
+    def _process_audio(self, audio_content: bytes) -> str:
+        """process_audio 본체 (메트릭은 process_audio에서 기록)"""
         try:
             # 기본적인 유효성 검사
             if not audio_content or len(audio_content) < 100:
@@ -51,49 +87,66 @@ class AudioProcessor:
             logger.info(f"오디오 데이터 크기: {len(audio_content)} 바이트")
 
             # 오디오 크기 메트릭 추가
-            track_audio_size(audio_content, "wit_ai")
-
-            # 오디오 전처리 (필요시 MP3로 변환)
-            processed_audio = self._preprocess_audio(audio_content)
-
-            logger.info("Wit.ai 음성 인식 시작")
-
-            # Wit.ai API 호출
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "audio/mpeg3"
-            }
-
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                data=processed_audio,
-                timeout=60
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Wit.ai API 오류: {response.status_code} - {response.text}")
-                raise ValueError(f"Wit.ai API 오류: {response.status_code}")
-
-            # Wit.ai는 NDJSON 형식으로 응답 (여러 줄의 JSON)
-            transcribed_text = self._parse_wit_response(response.text)
+            track_audio_size(audio_content, self.backend.name)
+
+            # 같은 녹음이 다시 제출된 경우 캐시된 결과 반환 (변환/STT 생략)
+            raw_digest = audio_digest(audio_content)
+            cached_text = self.transcript_cache.get(raw_digest)
+            if cached_text is not None:
+                logger.info("음성 인식 캐시 적중 (원본 지문)")
+                return cached_text
+
+            # 헤더 검사: 이미 STT 요구사항을 만족하는 녹음은 디코딩/변환 없이 그대로 전송
+            audio_info = probe_audio(audio_content)
+            if self._can_passthrough(audio_info):
+                transcribed_text = self._request_stt(audio_content, audio_info.content_type)
+                self.transcript_cache.set(raw_digest, transcript=transcribed_text)
+                return transcribed_text
+
+            # 오디오 전처리 (무음 제거, 긴 답변 분할, 16kHz 모노 MP3/Opus로 변환)
+            try:
+                segments = self._prepare_segments(audio_content) if self.segment_enabled else None
+                if segments and len(segments) > 1:
+                    # 긴 답변: 구간별로 병렬 인식 후 이어 붙임
+                    transcribed_text = self._transcribe_segments(segments)
+                    self.transcript_cache.set(raw_digest, transcript=transcribed_text)
+                    return transcribed_text
+
+                processed_audio = (
+                    self._encode_speech(segments[0], audio_content) if segments
+                    else self._preprocess_audio(audio_content)
+                )
+            except SilentAudioError:
+                # 무음 녹음: STT 없이 빈 결과 반환 (호출 측에서 NL 처리)
+                logger.info("무음 녹음으로 판정되어 음성 인식을 생략합니다")
+                return ""
+
+            # 변환 결과가 같은 녹음 (컨테이너/메타데이터만 다른 경우)
+            payload_digest = audio_digest(processed_audio) if processed_audio is not audio_content else None
+            cached_text = self.transcript_cache.get(payload_digest) if payload_digest else None
+            if cached_text is not None:
+                logger.info("음성 인식 캐시 적중 (변환 데이터 지문)")
+                self.transcript_cache.set(raw_digest, transcript=cached_text)
+                return cached_text
+
+            transcribed_text = self._request_stt(processed_audio, self.transcoder.content_type)
 
             if transcribed_text:
-                logger.info(f"Wit.ai 음성 인식 완료: {transcribed_text[:50]}...")
-            else:
-                logger.warning("Wit.ai 음성 인식 결과가 비어있습니다")
-                transcribed_text = ""
+                self.transcript_cache.set(raw_digest, payload_digest, transcript=transcribed_text)
 
             return transcribed_text
 
         except requests.exceptions.Timeout:
-            logger.error("Wit.ai API 타임아웃")
+            logger.error(f"STT API 타임아웃 (백엔드: {self.backend.name})")
             raise ValueError("음성 인식 서버 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
         except requests.exceptions.ConnectionError:
-            logger.error("Wit.ai API 연결 실패")
+            logger.error(f"STT API 연결 실패 (백엔드: {self.backend.name})")
             raise ValueError("음성 인식 서버에 연결할 수 없습니다. 네트워크를 확인해주세요.")
+        except (APIQuotaExceededError, APIRateLimitError):
+            # 처리율 제한 대기 초과 등은 그대로 전달하여 Celery가 백오프 후 재시도
+            raise
         except Exception as e:
-            logger.error(f"Wit.ai 음성 처리 중 오류 발생: {str(e)}", exc_info=True)
+            logger.error(f"음성 처리 중 오류 발생 (백엔드: {self.backend.name}): {str(e)}", exc_info=True)
 
             # 구체적인 예외 유형에 따라 다른 메시지 반환
             if "파일 형식" in str(e).lower() or "format" in str(e).lower():
@@ -103,73 +156,378 @@ class AudioProcessor:
             else:
                 raise ValueError(f"음성 처리 중 오류가 발생했습니다: {str(e)}")
 
-    def _parse_wit_response(self, response_text: str) -> str:
+    def _request_stt(self, payload: bytes, content_type: str) -> str:
         """
-        Wit.ai NDJSON 응답을 파싱하여 최종 텍스트 추출
+        STT 백엔드에 오디오를 전송하고 인식 결과 반환 (동기 버전)
 
-        Args:
-            response_text: Wit.ai API 응답 텍스트 (NDJSON 형식)
+        Raises:
+            ValueError: API가 200이 아닌 응답을 반환한 경우
+            requests.exceptions.RequestException: 네트워크 오류
+        """
+        logger.info(f"음성 인식 시작 (백엔드: {self.backend.name})")
+
+        stt_start = time.time()
+        try:
+            return self.backend.transcribe(payload, content_type)
+        finally:
+            AUDIO_PIPELINE_STAGE_DURATION.labels(
+                stage="stt_request", format=self.transcoder.profile.name
+            ).observe(time.time() - stt_start)
+
+    def _prepare_segments(self, audio_content: bytes) -> Optional[List[bytes]]:
+        """
+        발화 PCM을 무음 지점에서 분할 (짧은 답변은 구간 하나)
 
         Returns:
-            str: 추출된 텍스트
+            Optional[List[bytes]]: PCM 구간 목록, 디코딩 실패 시 None (기존 전처리 경로 사용)
+
+        Raises:
+            SilentAudioError: 녹음 전체가 사실상 무음인 경우
         """
-        # Wit.ai는 여러 줄의 JSON으로 응답 (스트리밍 방식)
-        # 마지막 줄에 최종 결과가 있음
-        lines = response_text.strip().split('\n')
+        try:
+            speech_pcm = self._decode_speech(audio_content)
+        except SilentAudioError:
+            raise
+        except Exception as e:
+            logger.warning(f"오디오 분할 준비 실패, 기존 전처리 경로 사용: {str(e)}")
+            return None
 
-        for line in reversed(lines):
-            if not line.strip():
-                continue
-            try:
-                result = json.loads(line)
-                if 'text' in result and result['text']:
-                    return result['text'].strip()
-            except json.JSONDecodeError:
-                continue
+        return split_at_silence(
+            speech_pcm,
+            min_seconds=settings.STT_SEGMENT_MIN_SECONDS,
+            max_seconds=settings.STT_SEGMENT_MAX_SECONDS
+        )
 
-        return ""
+    def _encode_speech(self, pcm: bytes, audio_content: bytes) -> bytes:
+        """발화 PCM을 STT 전송 형식으로 인코딩 (실패 시 원본 오디오)"""
+        try:
+            return self.transcoder.encode_pcm(pcm)
+        except Exception as e:
+            logger.warning(f"오디오 인코딩 실패, 원본 오디오 사용: {str(e)}")
+            return audio_content
 
-    def _preprocess_audio(self, audio_content: bytes) -> bytes:
+    def _transcribe_segment(self, pcm: bytes) -> str:
+        """PCM 구간 하나를 인식 (인코딩 실패 시 PCM 그대로 전송)"""
+        try:
+            return self._request_stt(self.transcoder.encode_pcm(pcm), self.transcoder.content_type)
+        except TranscodeError:
+            return self._request_stt(pcm, PCM_CONTENT_TYPE)
+
+    def _transcribe_segments(self, segments: List[bytes]) -> str:
         """
-        Wit.ai API 전송 전 오디오 데이터 전처리
+        PCM 구간들을 요청당 segment_concurrency개까지 병렬로 인식하고 순서대로 이어 붙임
+
+        전체 인식 시간이 답변 길이가 아닌 가장 긴 구간의 인식 시간에 가까워집니다.
+        """
+        logger.info(f"긴 답변을 {len(segments)}개 구간으로 나누어 병렬 인식")
+
+        workers = min(self.segment_concurrency, len(segments))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt-segment") as pool:
+            parts = list(pool.map(self._transcribe_segment, segments))
 
-        - MP3 형식으로 변환
-        - 샘플링 레이트 최적화
-        - 모노 채널로 변환
+        return stitch_transcripts(parts)
+
+    async def process_audio_stream(self, source: AudioSource) -> str:
+        """
+        오디오 입력을 스트리밍으로 변환하여 텍스트 추출 (Wit.ai API 활용)
+
+        업로드 청크 -> ffmpeg(16kHz 모노 MP3) -> Wit.ai chunked 요청으로 이어지는 파이프라인으로,
+        입력 전체를 메모리에 올리지 않고 변환된 첫 청크부터 바로 음성 인식 요청을 보냅니다.
+        VAD 사용 시에는 ffmpeg가 PCM을 출력하고, 무음을 잘라낸 PCM을 그대로 Wit.ai로 전송합니다.
 
         Args:
-            audio_content: 오디오 파일 바이트 데이터
+            source: 임시 파일 경로, 오디오 바이트, 또는 업로드 청크 비동기 이터레이터
 
         Returns:
-            bytes: 전처리된 오디오 바이트 데이터 (MP3)
+            str: 추출된 텍스트
+
+        Raises:
+            ValueError: 오디오 처리 중 오류 발생 시
+            HTTPException: 업로드 크기 제한을 넘은 경우 (청크 이터레이터 입력)
+        """
+        start_time = time.time()
+        status = "success"
+
+        # 원본 지문: 바이트/파일은 미리 계산하여 캐시 조회, 청크 입력은 흘려보내며 계산
+        raw_digest = None
+        raw_hasher = None
+        if isinstance(source, bytes):
+            raw_digest = audio_digest(source)
+        elif isinstance(source, str):
+            raw_digest = await asyncio.to_thread(audio_file_digest, source)
+        else:
+            raw_hasher = new_audio_hasher()
+            source = self._hash_chunks(source, raw_hasher)
+
+        if raw_digest:
+            cached_text = await self.transcript_cache.aget(raw_digest)
+            if cached_text is not None:
+                logger.info("음성 인식 캐시 적중 (원본 지문)")
+                return cached_text
+
+        try:
+            # 헤더 검사 (파일/바이트 입력): 요구사항을 만족하면 변환 없이 그대로 전송
+            audio_info = None
+            if isinstance(source, bytes):
+                audio_info = probe_audio(source)
+            elif isinstance(source, str):
+                audio_info = await asyncio.to_thread(probe_audio_file, source)
+
+            if raw_digest and self._can_passthrough(audio_info):
+                payload = source if isinstance(source, bytes) else await asyncio.to_thread(Path(source).read_bytes)
+                transcribed_text = await self.backend.atranscribe(payload, audio_info.content_type)
+                await self.transcript_cache.aset(raw_digest, transcript=transcribed_text)
+                return transcribed_text
+
+            logger.info(f"스트리밍 음성 인식 시작 (백엔드: {self.backend.name})")
+
+            payload_hasher = new_audio_hasher()
+            if self.segment_enabled:
+                transcribed_text, is_silent = await self._stream_segmented(source, audio_info)
+            else:
+                transcribed_text, is_silent = await self._stream_single(source, payload_hasher, audio_info)
+
+            if is_silent:
+                # 무음 녹음: 음성 인식 결과와 관계없이 빈 결과 반환 (호출 측에서 NL 처리)
+                logger.info("무음 녹음으로 판정되어 음성 인식 결과를 사용하지 않습니다")
+                return ""
+
+            if transcribed_text:
+                await self.transcript_cache.aset(
+                    raw_digest or raw_hasher.hexdigest(),
+                    None if self.segment_enabled else payload_hasher.hexdigest(),
+                    transcript=transcribed_text
+                )
+
+            return transcribed_text
+
+        except FileNotFoundError:
+            # ffmpeg가 없는 환경: 입력을 모아 기존 동기 경로(전처리 실패 시 원본 전송)로 처리
+            logger.warning("ffmpeg를 찾을 수 없어 기존 음성 처리 경로를 사용합니다")
+            audio_content = await self._collect_source(source)
+            return await asyncio.to_thread(self.process_audio, audio_content)
+        except TranscodeError as e:
+            status = "error"
+            logger.error(f"오디오 스트리밍 변환 실패: {str(e)}")
+            raise ValueError("지원되지 않는 오디오 형식입니다. MP3 또는 WAV 파일을 사용해주세요.")
+        except httpx.TimeoutException:
+            status = "error"
+            logger.error(f"STT API 타임아웃 (백엔드: {self.backend.name})")
+            raise ValueError("음성 인식 서버 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+        except httpx.ConnectError:
+            status = "error"
+            logger.error(f"STT API 연결 실패 (백엔드: {self.backend.name})")
+            raise ValueError("음성 인식 서버에 연결할 수 없습니다. 네트워크를 확인해주세요.")
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            AUDIO_PROCESS_DURATION.labels(status=status, processor=f"{self.backend.name}_stream").observe(time.time() - start_time)
+
+    async def _stream_single(
+        self,
+        source: AudioSource,
+        payload_hasher,
+        audio_info: Optional[AudioInfo] = None
+    ) -> Tuple[str, bool]:
+        """변환 결과를 하나의 chunked 요청으로 흘려보내 인식 (인식 결과, 무음 여부)"""
+        vad = VoiceActivityTrimmer() if self.vad_enabled else None
+        content_type = PCM_CONTENT_TYPE if vad else self.transcoder.content_type
+        chunk_stream = (
+            self._pcm_stream(source, audio_info) if vad
+            else transcode_stream(source, self.transcoder)
+        )
+
+        try:
+            async with chunk_stream as encoded_chunks:
+                if vad:
+                    encoded_chunks = vad.stream(encoded_chunks)
+                transcribed_text = await self.backend.atranscribe(
+                    self._hash_chunks(encoded_chunks, payload_hasher),
+                    content_type
+                )
+        except ValueError:
+            # 무음 녹음은 빈 본문이 전송되어 STT 서버가 오류를 반환할 수 있음
+            if vad and vad.is_silent:
+                return "", True
+            raise
+
+        if vad and vad.is_silent:
+            return "", True
+
+        return transcribed_text, False
+
+    async def _stream_segmented(
+        self,
+        source: AudioSource,
+        audio_info: Optional[AudioInfo] = None
+    ) -> Tuple[str, bool]:
         """
+        변환 결과를 무음 지점에서 나누며, 구간이 완성되는 즉시 병렬로 인식 (인식 결과, 무음 여부)
+
+        첫 구간 인식이 나머지 오디오의 디코딩과 동시에 진행되며,
+        동시에 진행되는 요청 수는 segment_concurrency개로 제한합니다.
+        """
+        vad = VoiceActivityTrimmer() if self.vad_enabled else None
+        segmenter = SilenceSegmenter(
+            min_seconds=settings.STT_SEGMENT_MIN_SECONDS,
+            max_seconds=settings.STT_SEGMENT_MAX_SECONDS
+        )
+        semaphore = asyncio.Semaphore(self.segment_concurrency)
+        tasks: List[asyncio.Task] = []
+
+        async def transcribe(segment: bytes) -> str:
+            async with semaphore:
+                stt_start = time.time()
+                try:
+                    return await self.backend.atranscribe(segment, PCM_CONTENT_TYPE)
+                finally:
+                    AUDIO_PIPELINE_STAGE_DURATION.labels(stage="stt_request", format="pcm").observe(
+                        time.time() - stt_start
+                    )
+
         try:
-            # pydub으로 오디오 로드
-            audio = AudioSegment.from_file(io.BytesIO(audio_content))
+            async with self._pcm_stream(source, audio_info) as pcm_chunks:
+                speech_chunks = vad.stream(pcm_chunks) if vad else pcm_chunks
+                async for chunk in speech_chunks:
+                    tasks.extend(asyncio.create_task(transcribe(seg)) for seg in segmenter.feed(chunk))
+
+            if vad and vad.is_silent:
+                for task in tasks:
+                    task.cancel()
+                return "", True
+
+            tasks.extend(asyncio.create_task(transcribe(seg)) for seg in segmenter.finish())
+            parts = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        if len(parts) > 1:
+            logger.info(f"긴 답변을 {len(parts)}개 구간으로 나누어 병렬 인식")
+
+        return stitch_transcripts(list(parts)), False
+
+    @contextlib.asynccontextmanager
+    async def _pcm_stream(self, source: AudioSource, audio_info: Optional[AudioInfo]):
+        """
+        16kHz 모노 PCM 청크 스트림
+
+        입력이 이미 16kHz 모노 16비트 WAV이면 ffmpeg 없이 data 청크를 그대로 나누어 전달합니다.
+        """
+        if not is_pcm16_mono(audio_info) or not isinstance(source, (bytes, str)):
+            async with transcode_stream(source, self.transcoder, pcm_output=True) as pcm_chunks:
+                yield pcm_chunks
+            return
 
-            logger.info(f"오디오 형식: 채널={audio.channels}, 샘플레이트={audio.frame_rate}, 길이={len(audio)/1000:.1f}초")
+        audio_content = source if isinstance(source, bytes) else await asyncio.to_thread(Path(source).read_bytes)
+        pcm = self._wav_pcm(audio_content, audio_info)
 
-            # 2분으로 제한 (비용 효율성)
-            max_duration_ms = 2 * 60 * 1000
-            if len(audio) > max_duration_ms:
-                logger.info(f"오디오 길이 제한: {len(audio)/1000:.1f}초 -> {max_duration_ms/1000}초")
-                audio = audio[:max_duration_ms]
+        async def chunks():
+            for offset in range(0, len(pcm), OUTPUT_CHUNK_SIZE):
+                yield pcm[offset:offset + OUTPUT_CHUNK_SIZE]
 
-            # 샘플링 레이트 최적화
-            if audio.frame_rate > 16000:
-                audio = audio.set_frame_rate(16000)
+        yield chunks()
 
-            # 모노로 변환
-            if audio.channels > 1:
-                audio = audio.set_channels(1)
+    @staticmethod
+    def _wav_pcm(audio_content: bytes, audio_info: AudioInfo) -> bytes:
+        """WAV data 청크의 PCM (2분 제한, 샘플 단위로 정렬)"""
+        size = min(audio_info.data_size, MAX_PCM_BYTES)
+        size -= size % 2
+        return audio_content[audio_info.data_offset:audio_info.data_offset + size]
 
-            # MP3로 변환
-            buffer = io.BytesIO()
-            audio.export(buffer, format="mp3", bitrate="64k", parameters=["-ac", "1"])
-            logger.info("오디오 전처리 완료: MP3 형식으로 변환됨")
+    def _can_passthrough(self, audio_info: Optional[AudioInfo]) -> bool:
+        """
+        헤더 검사 결과 변환 없이 그대로 STT에 전송할 수 있는지 판단
+
+        STT 백엔드가 받는 형식이고 모노/작은 비트레이트/길이 제한을 만족해야 하며,
+        분할 인식이 필요한 긴 답변은 디코딩 경로를 사용합니다.
+        그대로 전송하는 녹음은 VAD를 거치지 않으므로 무음 녹음은 STT가 빈 결과를 반환합니다.
+        """
+        if audio_info is None:
+            AUDIO_PROBE_RESULTS.labels(container="unknown", result="unknown").inc()
+            return False
+
+        passthrough = (
+            self.passthrough_enabled
+            and is_stt_compliant(audio_info, self.backend.content_types, MAX_AUDIO_SECONDS)
+            and not (self.segment_enabled and audio_info.duration > settings.STT_SEGMENT_MAX_SECONDS)
+        )
+
+        AUDIO_PROBE_RESULTS.labels(
+            container=audio_info.container,
+            result="passthrough" if passthrough else "transcode"
+        ).inc()
+        if passthrough:
+            logger.info(
+                f"STT 요구사항을 만족하는 오디오, 변환 없이 전송: {audio_info.container}/{audio_info.codec} "
+                f"{audio_info.sample_rate}Hz {audio_info.duration:.1f}초"
+            )
+        return passthrough
+
+    @staticmethod
+    async def _hash_chunks(chunks, hasher):
+        """청크를 그대로 전달하면서 지문 해시를 갱신"""
+        async for chunk in chunks:
+            hasher.update(chunk)
+            yield chunk
+
+    @staticmethod
+    async def _collect_source(source: AudioSource) -> bytes:
+        """스트리밍 입력을 바이트로 모음 (ffmpeg가 없는 환경의 대체 경로용)"""
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, str):
+            return await asyncio.to_thread(Path(source).read_bytes)
+        return b"".join([chunk async for chunk in source])
+
+    def _decode_speech(self, audio_content: bytes) -> bytes:
+        """
+        오디오를 16kHz 모노 PCM으로 디코딩하고 무음 제거 (VAD 사용 시)
+
+        Raises:
+            SilentAudioError: 녹음 전체가 사실상 무음인 경우
+        """
+        audio_info = probe_audio(audio_content)
+        if is_pcm16_mono(audio_info):
+            # 이미 16kHz 모노 PCM WAV: ffmpeg 디코딩 생략
+            pcm = self._wav_pcm(audio_content, audio_info)
+        else:
+            pcm = self.transcoder.decode_pcm(audio_content)
+        if not self.vad_enabled:
+            return pcm
+
+        trimmed_pcm, vad = trim_silence(pcm)
+        if vad.is_silent:
+            raise SilentAudioError(f"발화 구간이 없습니다 (발화 {vad.speech_seconds:.1f}초)")
+        return trimmed_pcm
+
+    def _preprocess_audio(self, audio_content: bytes) -> bytes:
+        """
+        Wit.ai API 전송 전 오디오 데이터 전처리
+
+        - 2분으로 길이 제한, 16kHz 모노로 변환 (Transcoder, ffmpeg 한 번 실행)
+        - 앞뒤 무음 제거, 긴 공백 축소 (VAD 사용 시: PCM 디코딩 -> VAD -> 인코딩)
+        - MP3(64k) 또는 Opus 형식으로 인코딩 (AUDIO_TRANSCODE_FORMAT)
+
+        Args:
+            audio_content: 오디오 파일 바이트 데이터
+
+        Returns:
+            bytes: 전처리된 오디오 바이트 데이터
+
+        Raises:
+            SilentAudioError: 녹음 전체가 사실상 무음인 경우
+        """
+        try:
+            if not self.vad_enabled:
+                return self.transcoder.transcode(audio_content)
 
-            return buffer.getvalue()
+            return self.transcoder.encode_pcm(self._decode_speech(audio_content))
 
+        except SilentAudioError:
+            raise
         except Exception as e:
             logger.error(f"오디오 전처리 중 오류 발생: {str(e)}", exc_info=True)
             # 전처리 실패시 원본 반환
@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import logging
+import os
+import tempfile
+import time
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import HTTPException, UploadFile
+
+from core.metrics import AUDIO_PIPELINE_STAGE_DURATION, TRANSCODE_OUTPUT_BYTES
+from services.transcoder import PIPE_INPUT, TranscodeError, Transcoder, get_transcoder
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024         # 업로드 파일을 읽는 단위 (64KB)
+OUTPUT_CHUNK_SIZE = 32 * 1024         # ffmpeg 출력을 STT 요청으로 흘려보내는 단위 (32KB)
+MAX_AUDIO_BYTES = 10 * 1024 * 1024    # 업로드 최대 크기 (10MB)
+
+ALLOWED_AUDIO_EXTENSIONS = ("mp3", "wav", "webm", "m4a")
+# moov 아톰이 파일 끝에 올 수 있어 파이프 입력으로는 디코딩할 수 없는 컨테이너
+SEEKABLE_ONLY_EXTENSIONS = ("m4a", "mp4")
+
+# 오디오 입력: 파일 경로(str), 바이트(bytes), 또는 청크 비동기 이터레이터
+AudioSource = Union[str, bytes, AsyncIterator[bytes]]
+
+
+def get_audio_extension(filename: Optional[str]) -> str:
+    """파일 이름에서 소문자 확장자 추출"""
+    return filename.split(".")[-1].lower() if filename and "." in filename else ""
+
+
+def validate_audio_extension(filename: Optional[str]) -> str:
+    """
+    지원하는 오디오 확장자인지 확인
+
+    Raises:
+        HTTPException: 지원되지 않는 파일 형식인 경우 (400)
+    """
+    file_extension = get_audio_extension(filename)
+    if file_extension not in ALLOWED_AUDIO_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail="지원되지 않는 파일 형식입니다. MP3, WAV, WEBM, M4A 형식만 지원합니다."
+        )
+    return file_extension
+
+
+async def iter_upload(
+    upload: UploadFile,
+    max_bytes: int = MAX_AUDIO_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    업로드 파일을 청크 단위로 읽어 반환 (전체를 메모리에 올리지 않음)
+
+    Raises:
+        HTTPException: 누적 크기가 max_bytes를 넘는 경우 (400)
+    """
+    total = 0
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"파일 크기가 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지만 지원합니다."
+            )
+        yield chunk
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = MAX_AUDIO_BYTES) -> bytes:
+    """크기 제한을 넘는 즉시 중단하며 업로드 파일 전체를 읽음 (바이트가 꼭 필요한 경로용)"""
+    return b"".join([chunk async for chunk in iter_upload(upload, max_bytes)])
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int = MAX_AUDIO_BYTES) -> str:
+    """
+    업로드 파일을 청크 단위로 임시 파일에 기록하고 경로 반환
+
+    요청이 끝난 뒤 처리되는 백그라운드 작업에 바이트 대신 경로를 넘기기 위해 사용합니다.
+    사용이 끝난 파일은 remove_spooled_file로 삭제해야 합니다.
+    """
+    suffix = f".{get_audio_extension(upload.filename) or 'bin'}"
+    fd, path = tempfile.mkstemp(prefix="omypic_audio_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in iter_upload(upload, max_bytes):
+                f.write(chunk)
+    except BaseException:
+        remove_spooled_file(path)
+        raise
+
+    return path
+
+
+def remove_spooled_file(path: str) -> None:
+    """임시 오디오 파일 삭제 (이미 없으면 무시)"""
+    with contextlib.suppress(OSError):
+        os.unlink(path)
+
+
+@contextlib.asynccontextmanager
+async def upload_source(upload: UploadFile, max_bytes: int = MAX_AUDIO_BYTES):
+    """
+    업로드 파일을 변환 파이프라인 입력으로 사용할 수 있게 준비
+
+    파이프로 디코딩 가능한 형식은 청크 이터레이터를 그대로 넘기고,
+    M4A처럼 탐색이 필요한 컨테이너만 임시 파일에 기록한 뒤 경로를 넘깁니다.
+    """
+    if get_audio_extension(upload.filename) in SEEKABLE_ONLY_EXTENSIONS:
+        path = await spool_upload(upload, max_bytes)
+        try:
+            yield path
+        finally:
+            remove_spooled_file(path)
+    else:
+        yield iter_upload(upload, max_bytes)
+
+
+async def _iter_bytes(data: bytes, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """바이트 데이터를 청크 이터레이터로 변환"""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+async def _feed_stdin(proc: asyncio.subprocess.Process, chunks: AsyncIterator[bytes]) -> None:
+    """입력 청크를 ffmpeg 표준 입력으로 전달 (drain으로 메모리 사용량 제한)"""
+    try:
+        async for chunk in chunks:
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # ffmpeg가 먼저 종료된 경우 (길이 제한 도달, 디코딩 실패 등): 나머지 입력은 버림
+        logger.debug("ffmpeg 입력 파이프가 먼저 닫혔습니다.")
+    finally:
+        with contextlib.suppress(Exception):
+            proc.stdin.close()
+
+
+@contextlib.asynccontextmanager
+async def transcode_stream(
+    source: AudioSource,
+    transcoder: Optional[Transcoder] = None,
+    pcm_output: bool = False
+):
+    """
+    오디오 입력을 ffmpeg로 STT 전송 형식(16kHz 모노)으로 변환하면서 출력 청크를 스트리밍
+
+    입력을 넣는 동안 출력이 바로 나오므로 STT 요청 본문(chunked)으로 그대로 넘길 수 있습니다.
+    파이프 버퍼만 사용하므로 업로드 크기와 무관하게 메모리 사용량이 일정하며,
+    Transcoder의 변환 슬롯을 사용해 동시에 실행되는 ffmpeg 수를 제한합니다.
+    pcm_output=True이면 VAD 입력용 16kHz 모노 PCM으로 출력합니다.
+
+    Yields:
+        AsyncIterator[bytes]: 변환된 오디오 청크 이터레이터
+            (변환 실패 시 이터레이터 끝에서 TranscodeError 발생)
+
+    Raises:
+        FileNotFoundError: ffmpeg 실행 파일이 없는 경우
+    """
+    transcoder = transcoder or get_transcoder()
+    from_file = isinstance(source, str)
+    output_format = "pcm" if pcm_output else transcoder.profile.name
+
+    async with transcoder.slot_async():
+        start_time = time.time()
+        proc = await asyncio.create_subprocess_exec(
+            *transcoder.ffmpeg_args(source if from_file else PIPE_INPUT, pcm_output=pcm_output),
+            stdin=asyncio.subprocess.DEVNULL if from_file else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        feeder = None
+        if not from_file:
+            chunks = _iter_bytes(source) if isinstance(source, bytes) else source
+            feeder = asyncio.create_task(_feed_stdin(proc, chunks))
+        stderr_task = asyncio.create_task(proc.stderr.read())
+
+        async def output() -> AsyncIterator[bytes]:
+            total = 0
+            while True:
+                data = await proc.stdout.read(OUTPUT_CHUNK_SIZE)
+                if not data:
+                    break
+                total += len(data)
+                yield data
+
+            # 입력 쪽 예외 (크기 제한 초과 등)를 호출자에게 전달
+            if feeder is not None:
+                await feeder
+
+            returncode = await proc.wait()
+            if returncode != 0 or total == 0:
+                stderr = (await stderr_task).decode("utf-8", errors="ignore").strip()
+                raise TranscodeError(f"오디오 변환 실패 (코드 {returncode}): {stderr[-200:]}")
+
+            TRANSCODE_OUTPUT_BYTES.labels(format=output_format).observe(total)
+            logger.info(f"오디오 스트리밍 변환 완료: {total} 바이트 ({output_format})")
+
+        try:
+            yield output()
+        finally:
+            if proc.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+                await proc.wait()
+            for task in (feeder, stderr_task):
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 소비되지 않은 예외 경고 방지
+            # 스트리밍 경로는 STT 전송과 겹치므로 transcode 단계 = 입력 시작 ~ 출력 종료
+            AUDIO_PIPELINE_STAGE_DURATION.labels(stage="transcode", format=output_format).observe(
+                time.time() - start_time
+            )
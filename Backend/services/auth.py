@@ -5,6 +5,7 @@ import base64
 import hmac
 import hashlib
 import secrets
+import json
 import jwt
 from fastapi import HTTPException, status
 from typing import Dict, Optional
@@ -97,17 +98,36 @@ def verify_csrf_token(token: str, max_age: int = 3600) -> bool:
             detail=f"유효하지 않거나 만료된 CSRF 토큰: {str(e)}"
         )
 
-def create_access_token(data: dict) -> str:
+def limits_version(limits: Optional[dict]) -> str:
+    """사용 횟수 제한(limits) 스냅샷의 버전 (값이 바뀌면 달라지는 짧은 해시)"""
+    canonical = json.dumps(limits or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=4).hexdigest()
+
+def user_claims(user: dict) -> dict:
+    """
+    액세스 토큰에 넣을 사용자 클레임 (DB 조회 없이 인증하는 api.deps.get_current_user_claims용)
+
+    토큰 발급 시점의 값이므로 최신 값이 필요하면 전체 사용자 정보를 조회해야 합니다.
+    """
+    return {
+        "onboarded": bool(user.get("is_onboarded")),
+        "lv": limits_version(user.get("limits"))
+    }
+
+def create_access_token(data: dict, user: Optional[dict] = None) -> str:
     """
     JWT 액세스 토큰 생성
     
     Args:
         data (dict): 토큰에 인코딩할 사용자 데이터
+        user (dict, optional): 사용자 문서 (주어지면 온보딩 여부, limits 버전 클레임 추가)
         
     Returns:
         str: 생성된 JWT 액세스 토큰
     """
     to_encode = data.copy()
+    if user:
+        to_encode.update(user_claims(user))
     
     # 만료 시간 설정
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
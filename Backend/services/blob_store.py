@@ -0,0 +1,272 @@
+"""
+답변 오디오 저장소 모듈
+
+Celery 작업에 오디오 바이트(또는 Base64)를 직접 넣으면 Redis 브로커를 통해 수 MB의 메시지가 오가고,
+재시도할 때마다 다시 전달됩니다. API는 업로드를 저장소에 한 번만 기록하고 작업에는 짧은 참조(키)만 넘기며,
+워커는 필요할 때 참조로 오디오를 가져옵니다.
+- s3: AWS S3 또는 MinIO (AUDIO_BLOB_ENDPOINT_URL)
+- local: 로컬 파일시스템 (개발 환경 또는 API/워커가 볼륨을 공유하는 단일 서버)
+키에는 오디오 지문(BLAKE2b)이 포함되어 있어 워커는 음성 인식 캐시를 먼저 조회하고, 적중하면 오디오를 가져오지 않습니다.
+오래된 오디오는 스케줄러의 정리 작업이 AUDIO_BLOB_TTL_SECONDS 기준으로 삭제합니다.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import UploadFile
+
+from core.config import settings
+from services.audio_stream import get_audio_extension, remove_spooled_file, spool_upload
+from services.transcript_cache import audio_digest, audio_file_digest
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+class BlobNotFoundError(KeyError):
+    """참조한 오디오가 저장소에 없음 (정리 작업으로 삭제되었거나 잘못된 참조)"""
+
+
+def make_blob_key(digest: str, extension: str, prefix: str = "") -> str:
+    """날짜별 디렉터리 아래 지문 기반 키 생성 (같은 날 같은 녹음은 같은 키)"""
+    date = datetime.now(timezone.utc).strftime("%Y/%m/%d")
+    suffix = f".{extension}" if extension else ""
+    return f"{prefix}{date}/{digest}{suffix}"
+
+
+def digest_from_key(key: str) -> str:
+    """키에서 오디오 지문 추출"""
+    return os.path.basename(key).split(".", 1)[0]
+
+
+class BlobStore(ABC):
+    """
+    오디오 저장소 공통 인터페이스 (동기 메서드 + API용 비동기 래퍼)
+
+    저장소 구현은 get, delete, delete_older_than, _write_bytes, _write_file을 모두 구현해야 합니다
+    (빠진 메서드가 있으면 워커에서 처음 호출할 때가 아니라 생성할 때 TypeError).
+    """
+
+    prefix = ""
+
+    def put(self, data: bytes, extension: str = "") -> str:
+        """오디오 바이트를 저장하고 참조 키 반환"""
+        key = make_blob_key(audio_digest(data), extension, self.prefix)
+        self._write_bytes(key, data)
+        return key
+
+    def put_file(self, path: str, extension: str = "") -> str:
+        """오디오 파일을 저장하고 참조 키 반환 (파일 전체를 메모리에 올리지 않음)"""
+        key = make_blob_key(audio_file_digest(path), extension, self.prefix)
+        self._write_file(key, path)
+        return key
+
+    def put_key(self, name: str, data: bytes) -> str:
+        """지정한 이름으로 저장하고 참조 키 반환 (내용 주소 기반 캐시처럼 이름이 이미 해시인 경우)"""
+        key = f"{self.prefix}{name}"
+        self._write_bytes(key, data)
+        return key
+
+    async def aput(self, data: bytes, extension: str = "") -> str:
+        return await asyncio.to_thread(self.put, data, extension)
+
+    async def aput_file(self, path: str, extension: str = "") -> str:
+        return await asyncio.to_thread(self.put_file, path, extension)
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """
+        참조 키로 오디오 바이트 조회
+
+        Raises:
+            BlobNotFoundError: 오디오가 없는 경우
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """오디오 삭제 (없으면 무시)"""
+
+    @abstractmethod
+    def delete_older_than(self, max_age_seconds: float) -> int:
+        """max_age_seconds보다 오래된 오디오를 삭제하고 삭제 개수 반환"""
+
+    @abstractmethod
+    def _write_bytes(self, key: str, data: bytes) -> None:
+        """키에 바이트 기록"""
+
+    @abstractmethod
+    def _write_file(self, key: str, path: str) -> None:
+        """키에 파일 내용 기록"""
+
+
+class LocalBlobStore(BlobStore):
+    """로컬 파일시스템 저장소"""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = os.path.abspath(root_dir)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if not path.startswith(self.root_dir + os.sep):
+            raise BlobNotFoundError(key)  # 저장소 밖을 가리키는 참조
+        return path
+
+    def _prepare(self, key: str) -> str:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _write_bytes(self, key: str, data: bytes) -> None:
+        path = self._prepare(key)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # 워커가 기록 중인 파일을 읽지 않도록 원자적으로 교체
+
+    def _write_file(self, key: str, path: str) -> None:
+        target = self._prepare(key)
+        tmp_path = f"{target}.tmp{os.getpid()}"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def delete_older_than(self, max_age_seconds: float) -> int:
+        cutoff = time.time() - max_age_seconds
+        deleted = 0
+
+        for dirpath, _, filenames in os.walk(self.root_dir, topdown=False):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        deleted += 1
+                except FileNotFoundError:
+                    continue
+            # 오래된 빈 날짜 디렉터리 정리 (지금 기록 중인 디렉터리는 건드리지 않음)
+            if dirpath != self.root_dir:
+                try:
+                    if os.path.getmtime(dirpath) < cutoff:
+                        os.rmdir(dirpath)
+                except OSError:
+                    pass
+
+        return deleted
+
+
+class S3BlobStore(BlobStore):
+    """S3/MinIO 저장소"""
+
+    DELETE_BATCH_SIZE = 1000  # delete_objects 한 번에 삭제할 수 있는 최대 개수
+
+    def __init__(self, bucket: str, prefix: str = "answer-audio/", client=None):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            from botocore.config import Config
+
+            self._client = boto3.client(
+                "s3",
+                region_name=settings.AWS_REGION,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                endpoint_url=settings.AUDIO_BLOB_ENDPOINT_URL or None,
+                config=Config(retries={"max_attempts": 3, "mode": "standard"}, max_pool_connections=20)
+            )
+        return self._client
+
+    def _write_bytes(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def _write_file(self, key: str, path: str) -> None:
+        self.client.upload_file(path, self.bucket, key)
+
+    def get(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            raise BlobNotFoundError(key)
+        return response["Body"].read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def delete_older_than(self, max_age_seconds: float) -> int:
+        cutoff = time.time() - max_age_seconds
+        expired = []
+
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                if obj["LastModified"].timestamp() < cutoff:
+                    expired.append({"Key": obj["Key"]})
+
+        for start in range(0, len(expired), self.DELETE_BATCH_SIZE):
+            batch = expired[start:start + self.DELETE_BATCH_SIZE]
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+
+        return len(expired)
+
+
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """설정 기반 전역 BlobStore 인스턴스 반환"""
+    global _store
+
+    if _store is None:
+        if settings.AUDIO_BLOB_BACKEND == "local":
+            _store = LocalBlobStore(settings.AUDIO_BLOB_DIR)
+        else:
+            _store = S3BlobStore(
+                bucket=settings.AUDIO_BLOB_BUCKET or settings.AWS_S3_BUCKET_NAME,
+                prefix=settings.AUDIO_BLOB_PREFIX
+            )
+
+    return _store
+
+
+async def store_upload(upload: UploadFile, store: Optional[BlobStore] = None) -> str:
+    """
+    업로드 파일을 임시 파일로 받은 뒤 저장소에 기록하고 참조 키 반환
+
+    Raises:
+        HTTPException: 업로드 크기 제한을 넘은 경우
+    """
+    store = store or get_blob_store()
+    spooled_path = await spool_upload(upload)
+    try:
+        return await store.aput_file(spooled_path, get_audio_extension(upload.filename))
+    finally:
+        remove_spooled_file(spooled_path)
+
+
+def cleanup_expired_blobs() -> int:
+    """보관 기간이 지난 답변 오디오 삭제 (스케줄러 정리 작업)"""
+    deleted = get_blob_store().delete_older_than(settings.AUDIO_BLOB_TTL_SECONDS)
+    logger.info(f"만료된 답변 오디오 {deleted}개 삭제")
+    return deleted
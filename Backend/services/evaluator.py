@@ -5,6 +5,8 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 from api.deps import handle_api_error, get_next_gemini_key
+from core.exceptions import APIQuotaExceededError, APIRateLimitError
+from services.rate_limiter import gemini_limiter
 
 import time
 import asyncio
@@ -296,6 +298,10 @@ class ResponseEvaluator:
                     | self.evaluation_parser
                 )
                 
+                # 전역 처리율 제한 (다른 워커/프로세스와 같은 키 한도를 나눠 씀)
+                if current_key:
+                    await gemini_limiter(current_key).aacquire()
+
                 # 평가 실행
                 result = await chain.ainvoke({
                     "user_response": user_response,
@@ -305,7 +311,10 @@ class ResponseEvaluator:
                 })
                 
                 return result
-                
+
+            except APIRateLimitError:
+                # 처리율 제한 대기 시간 초과는 키 문제가 아니므로 블랙리스트 처리 없이 호출자에게 전달
+                raise
             except Exception as e:
                 retry_count += 1
                 error_msg = str(e)
@@ -414,6 +423,8 @@ class ResponseEvaluator:
             
             # API 키 순환을 적용한 LLM 인스턴스 생성
             llm = self._get_llm()
+            if hasattr(llm, 'google_api_key'):
+                await gemini_limiter(llm.google_api_key).aacquire()
             
             # 종합 평가 체인 구성 및 실행
             chain = self.overall_prompt | llm | self.overall_parser
@@ -443,6 +454,9 @@ class ResponseEvaluator:
             logger.info(f"전체 테스트 종합 평가 완료 - 총점: {total_score}")
             return result
             
+        except (APIRateLimitError, APIQuotaExceededError):
+            # 처리율 제한 대기 초과는 오류 피드백으로 바꾸지 않고 호출자에게 전달 (재시도 또는 실패 처리)
+            raise
         except Exception as e:
             logger.error(f"종합 평가 중 오류 발생: {str(e)}", exc_info=True)
             # 오류 발생 시 계산된 값 사용, 없으면 "N/A" 반환
@@ -634,6 +648,8 @@ class ResponseEvaluator:
                 self.evaluate_overall_test(test_data, problem_details)
             )
             return result
+        except (APIRateLimitError, APIQuotaExceededError):
+            raise
         except Exception as e:
             logger.error(f"종합 평가 동기 실행 중 오류 발생: {str(e)}", exc_info=True)
             return {
@@ -735,6 +751,10 @@ class ResponseEvaluator:
                     | self.evaluation_parser
                 )
                 
+                # 전역 처리율 제한
+                if current_key:
+                    gemini_limiter(current_key).acquire()
+
                 # 평가 실행
                 result = evaluation_chain.invoke({
                     "user_response": user_response,
@@ -744,7 +764,9 @@ class ResponseEvaluator:
                 })
                 
                 return result
-                
+
+            except APIRateLimitError:
+                raise
             except Exception as e:
                 retry_count += 1
                 error_msg = str(e).lower()
@@ -0,0 +1,171 @@
+"""
+평가 작업 우선순위 및 사용자 간 공정 분배 모듈
+
+모든 평가 작업이 하나의 FIFO에 들어가면 한 사용자의 전체 시험(15문제)이나 일괄 재평가가
+다른 사용자의 랜덤 문제 하나보다 앞서 처리되므로, 작업 종류별 우선순위를 두고
+같은 우선순위 안에서는 사용자별로 돌아가며 처리합니다.
+- 우선순위 (Celery Redis 브로커 기준, 숫자가 작을수록 먼저 처리)
+  - PRIORITY_INTERACTIVE: 랜덤 문제 단건 평가 (사용자가 결과를 바로 기다림)
+  - PRIORITY_FINAL: 시험 마지막 답변과 종합 평가 (결과 화면 직전)
+  - PRIORITY_DEFAULT: 시험 중간 답변
+  - PRIORITY_BULK: 평균 점수 재계산 등 일괄 작업
+- Celery 경로: 최근 제출이 많은 사용자의 작업일수록 우선순위를 낮춰 (fair_priority)
+  다른 사용자의 첫 작업이 먼저 처리되도록 함 (Redis 카운터, 장애 시 기본 우선순위)
+- 프로세스 내 경로(BackgroundTasks): FairShareExecutor가 우선순위별, 사용자별 대기열을
+  라운드 로빈으로 꺼내 제한된 동시성으로 실행
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from core.config import settings
+from db.redis import get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_FINAL = 2
+PRIORITY_DEFAULT = 4
+PRIORITY_BULK = 9
+MAX_FAIR_SHARE_DEMOTION = 3  # 최근 제출이 많아도 일괄 작업보다 뒤로 밀리지 않도록 제한
+
+
+def fair_priority(owner: Optional[str], base: int = PRIORITY_DEFAULT, redis_client=None) -> int:
+    """
+    사용자의 최근 제출량을 반영한 Celery 작업 우선순위
+
+    FAIR_SHARE_WINDOW_SECONDS 동안 FAIR_SHARE_BURST개를 넘게 제출한 사용자의 작업은
+    넘은 만큼 한 단계씩(최대 MAX_FAIR_SHARE_DEMOTION) 뒤로 보냅니다.
+    창은 첫 제출 시점부터 고정되며, 만료 시간은 카운터에 아직 없을 때만 설정합니다
+    (매번 연장하면 계속 제출하는 사용자의 카운터가 초기화되지 않음).
+    """
+    if not owner or base >= PRIORITY_BULK:
+        return base
+
+    try:
+        redis_client = redis_client or get_redis_sync()
+        key = f"fair_share:{owner}"
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.ttl(key)
+        recent, ttl = pipe.execute()
+        recent = int(recent)
+        if ttl is not None and int(ttl) < 0:
+            # 새 카운터(또는 만료 설정 전에 중단된 카운터)에만 창 시작
+            redis_client.expire(key, settings.FAIR_SHARE_WINDOW_SECONDS)
+    except Exception as e:
+        logger.warning(f"공정 분배 카운터 갱신 실패, 기본 우선순위 사용 ({owner}): {e}")
+        return base
+
+    demotion = min(max(0, recent - 1) // max(1, settings.FAIR_SHARE_BURST), MAX_FAIR_SHARE_DEMOTION)
+    return min(base + demotion, PRIORITY_BULK)
+
+
+class FairShareExecutor:
+    """
+    우선순위 + 사용자별 라운드 로빈 비동기 작업 실행기 (API 프로세스 내 BackgroundTasks 대체)
+
+    높은 우선순위 대기열이 비어야 낮은 우선순위 작업을 꺼내고, 같은 우선순위 안에서는
+    사용자마다 한 작업씩 돌아가며 실행합니다. 동시에 실행되는 작업 수는 concurrency로 제한합니다.
+    """
+
+    def __init__(self, concurrency: int = 4):
+        self.concurrency = concurrency
+        # 우선순위 -> (사용자 -> 대기 작업) ; OrderedDict 순서가 라운드 로빈 순서
+        self._queues: Dict[int, "OrderedDict[str, Deque[Tuple[Callable, tuple, dict, asyncio.Future]]]"] = {}
+        self._workers = []
+        self._ready: Optional[asyncio.Event] = None
+        self._loop = None
+
+    def pending(self) -> int:
+        """대기 중인 작업 수"""
+        return sum(len(jobs) for owners in self._queues.values() for jobs in owners.values())
+
+    def submit(
+        self,
+        owner: Optional[str],
+        func: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_DEFAULT,
+        **kwargs: Any
+    ) -> asyncio.Future:
+        """
+        작업 등록 (실행 중인 이벤트 루프에서 호출)
+
+        Returns:
+            asyncio.Future: 작업 결과 (기다리지 않아도 됨, 예외는 로그로 남김)
+        """
+        self._ensure_workers()
+        future = self._loop.create_future()
+        owners = self._queues.setdefault(priority, OrderedDict())
+        owners.setdefault(str(owner or ""), deque()).append((func, args, kwargs, future))
+        self._ready.set()
+        return future
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 새 이벤트 루프(테스트, 재시작)에서는 작업자를 다시 만듦
+            self._loop = loop
+            self._ready = asyncio.Event()
+            self._queues = {}
+            self._workers = []
+
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._work()))
+
+    def _next_job(self):
+        for priority in sorted(self._queues):
+            owners = self._queues[priority]
+            if not owners:
+                continue
+
+            # 맨 앞 사용자의 작업 하나를 꺼내고, 남은 작업이 있으면 그 사용자를 맨 뒤로 보냄
+            owner, jobs = next(iter(owners.items()))
+            job = jobs.popleft()
+            if jobs:
+                owners.move_to_end(owner)
+            else:
+                del owners[owner]
+            return job
+        return None
+
+    async def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            func, args, kwargs, future = job
+            try:
+                result = func(*args, **kwargs)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"공정 분배 작업 실행 중 오류: {str(e)}", exc_info=True)
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # 결과를 기다리지 않는 호출자 때문에 경고가 나지 않도록 조회 처리
+
+
+_executor: Optional[FairShareExecutor] = None
+
+
+def get_fair_share_executor() -> FairShareExecutor:
+    """전역 FairShareExecutor 인스턴스 반환"""
+    global _executor
+
+    if _executor is None:
+        _executor = FairShareExecutor(concurrency=settings.FAIR_SHARE_CONCURRENCY)
+
+    return _executor
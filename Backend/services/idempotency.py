@@ -0,0 +1,110 @@
+"""
+답변 제출 멱등성 모듈
+
+더블 클릭이나 네트워크 재시도로 같은 답변이 다시 제출되어도 STT/LLM 평가와 스크립트 저장이
+두 번 실행되지 않도록, 작업을 시작하기 전에 제출 키를 Redis SET NX로 원자적으로 선점합니다.
+- 키: answer_submission:{test_id}:{문제 번호}:{Idempotency-Key 헤더 또는 녹음 지문}
+  (다시 녹음한 답변은 지문이 달라 새 제출로 처리)
+- 이미 선점된 키면 새 작업을 시작하지 않고 기존 작업 상태를 돌려줌 (실패한 작업은 다시 제출 가능)
+- Redis 장애 시에는 중복 확인 없이 제출을 허용 (fail open)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from core.config import settings
+from db.redis import get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+def submission_key(
+    test_id: str,
+    problem_number: str,
+    idempotency_key: Optional[str] = None,
+    audio_digest: Optional[str] = None
+) -> str:
+    """답변 제출 키 생성 (클라이언트가 보낸 Idempotency-Key를 녹음 지문보다 우선 사용)"""
+    if idempotency_key:
+        return f"{test_id}:{problem_number}:key:{idempotency_key}"
+    return f"{test_id}:{problem_number}:audio:{audio_digest}"
+
+
+class SubmissionGuard:
+    """제출 키 -> 선점 기록 저장소"""
+
+    PREFIX = "answer_submission:"
+
+    def __init__(self, redis_client=None, ttl_seconds: int = 3600):
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+
+    def _key(self, key: str) -> str:
+        return f"{self.PREFIX}{key}"
+
+    def claim(self, key: str, **record) -> Optional[dict]:
+        """
+        제출 키 선점
+
+        Returns:
+            dict: 이미 다른 요청이 선점한 경우 그 기록 (None이면 선점 성공 또는 Redis 장애)
+        """
+        if self._redis is None:
+            return None
+
+        value = json.dumps({**record, "claimed_at": time.time()}, ensure_ascii=False)
+        existing = None
+        try:
+            # 선점 실패 후 기록을 읽기 전에 만료될 수 있으므로 한 번 더 시도
+            for _ in range(2):
+                if self._redis.set(self._key(key), value, nx=True, ex=self._ttl_seconds):
+                    return None
+                existing = self._redis.get(self._key(key))
+                if existing is not None:
+                    break
+        except Exception as e:
+            logger.warning(f"답변 제출 키 선점 실패, 중복 확인 없이 진행 ({key}): {e}")
+            return None
+
+        try:
+            return json.loads(existing)
+        except (TypeError, ValueError):
+            return {}
+
+    def release(self, key: str) -> None:
+        """제출 키 해제 (작업을 시작하지 못했거나 이전 작업이 실패해 다시 제출을 허용할 때)"""
+        if self._redis is None:
+            return
+
+        try:
+            self._redis.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"답변 제출 키 해제 실패 ({key}): {e}")
+
+    async def aclaim(self, key: str, **record) -> Optional[dict]:
+        """claim의 비동기 버전"""
+        return await asyncio.to_thread(self.claim, key, **record)
+
+    async def arelease(self, key: str) -> None:
+        """release의 비동기 버전"""
+        await asyncio.to_thread(self.release, key)
+
+
+_guard: Optional[SubmissionGuard] = None
+
+
+def get_submission_guard() -> SubmissionGuard:
+    """전역 SubmissionGuard 인스턴스 반환"""
+    global _guard
+
+    if _guard is None:
+        _guard = SubmissionGuard(
+            redis_client=get_redis_sync(),
+            ttl_seconds=settings.ANSWER_IDEMPOTENCY_TTL_SECONDS
+        )
+
+    return _guard
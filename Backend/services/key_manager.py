@@ -0,0 +1,358 @@
+"""
+Gemini API 키 상태 관리 모듈
+
+각 프로세스가 키 상태(블랙리스트 해제 시각, 사용량 추정치)의 로컬 사본을 유지합니다.
+- 키 선택은 로컬 사본만 보고 메모리 안에서 처리 (Redis 왕복 없음)
+- 블랙리스트 추가/해제는 Redis에 기록하고 pub/sub 채널로 다른 프로세스에 전파
+- 백그라운드 스레드가 주기적으로 사용량을 Redis에 반영하고 전역 상태를 다시 읽어옴
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from core.config import settings
+from core.metrics import (
+    GEMINI_KEY_USAGE, GEMINI_KEY_USAGE_LIMIT, GEMINI_KEY_BLACKLIST_REMAINING,
+    GEMINI_KEY_ALLOCATIONS, GEMINI_KEY_FORCED_SELECTIONS
+)
+from db.redis import get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+def key_id(key: str) -> str:
+    """API 키를 로그/메시지에 노출하지 않기 위한 짧은 해시 식별자"""
+    return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+
+@dataclass
+class KeyState:
+    """로컬에 보관하는 키 하나의 상태"""
+    blacklist_until: float = 0.0  # 블랙리스트 해제 시각 (epoch 초)
+    usage: int = 0                # 전역 사용량 추정치 (마지막 동기화 값 + 로컬 증가분)
+
+
+class GeminiKeyManager:
+    """Redis pub/sub으로 무효화되는 로컬 키 상태 캐시"""
+
+    BLACKLIST_PREFIX = "key_blacklist:gemini:"
+    USAGE_PREFIX = "key_usage:gemini:"
+    CHANNEL = "key_events:gemini"
+    USAGE_WINDOW_SECONDS = 3600  # 사용량 카운터 만료 시간 (1시간 후 리셋)
+
+    def __init__(
+        self,
+        keys: List[str],
+        redis_client=None,
+        usage_limit: int = 40,
+        blacklist_seconds: int = 1800,
+        sync_interval: float = 10.0
+    ):
+        self._keys = list(keys)
+        self._keys_by_id = {key_id(k): k for k in self._keys}
+        self._state: Dict[str, KeyState] = {k: KeyState() for k in self._keys}
+        self._pending_usage: Dict[str, int] = {k: 0 for k in self._keys}
+        self._cursor = 0
+
+        self._redis = redis_client
+        self._usage_limit = usage_limit
+        self._blacklist_seconds = blacklist_seconds
+        self._sync_interval = sync_interval
+
+        self._origin = uuid.uuid4().hex  # 자신이 발행한 이벤트 식별용
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_pid: Optional[int] = None
+        self._stopped = threading.Event()
+
+        self._register_gauges()
+
+    def _register_gauges(self):
+        """스크레이프 시점의 로컬 상태를 그대로 노출하도록 게이지에 콜백 등록"""
+        GEMINI_KEY_USAGE_LIMIT.set(self._usage_limit)
+        for key in self._keys:
+            state = self._state[key]
+            label = key_id(key)
+            GEMINI_KEY_USAGE.labels(key=label).set_function(lambda s=state: s.usage)
+            GEMINI_KEY_BLACKLIST_REMAINING.labels(key=label).set_function(
+                lambda s=state: max(0.0, s.blacklist_until - time.time())
+            )
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    # ------------------------------------------------------------------
+    # 핫 패스: 메모리 안에서만 동작
+    # ------------------------------------------------------------------
+    def acquire(self) -> str:
+        """
+        사용할 키를 선택하고 로컬 사용량을 1 증가시킵니다.
+
+        라운드 로빈으로 블랙리스트에 없고 사용량 한도 미만인 키를 찾습니다.
+        모든 키가 사용 불가능하면 가장 빨리 해제될 키(또는 가장 적게 사용된 키)를 강제로 선택합니다.
+        """
+        if not self._keys:
+            logger.warning("Gemini API 키가 설정되지 않았습니다.")
+            return ""
+
+        self._ensure_sync()
+        now = time.time()
+
+        with self._lock:
+            total_keys = len(self._keys)
+            for _ in range(total_keys):
+                key = self._keys[self._cursor]
+                self._cursor = (self._cursor + 1) % total_keys
+
+                state = self._state[key]
+                if state.blacklist_until > now:
+                    continue
+                if state.usage >= self._usage_limit:
+                    continue
+
+                self._record_usage(key)
+                logger.info(f"Gemini API 키 사용: {key[:8]}... (사용량 추정: {state.usage})")
+                return key
+
+            key = self._select_forced(now)
+            self._record_usage(key)
+
+        GEMINI_KEY_FORCED_SELECTIONS.labels(key=key_id(key)).inc()
+        time_left = max(0, int(self._state[key].blacklist_until - now))
+        logger.warning(f"사용 가능한 Gemini API 키가 없어 {key[:8]}... 키를 강제로 선택합니다. (블랙리스트 해제까지 {time_left}초)")
+        return key
+
+    def _select_forced(self, now: float) -> str:
+        """모든 키가 사용 불가능할 때의 선택 (lock 보유 상태에서 호출)"""
+        blacklisted = [k for k in self._keys if self._state[k].blacklist_until > now]
+        if blacklisted:
+            return min(blacklisted, key=lambda k: self._state[k].blacklist_until)
+        return min(self._keys, key=lambda k: self._state[k].usage)
+
+    def _record_usage(self, key: str):
+        """로컬 사용량 증가 (lock 보유 상태에서 호출). Redis 반영은 동기화 스레드가 처리"""
+        self._state[key].usage += 1
+        self._pending_usage[key] += 1
+        GEMINI_KEY_ALLOCATIONS.labels(key=key_id(key)).inc()
+
+    def active_key_count(self) -> int:
+        """현재 블랙리스트에 없는 키 개수"""
+        now = time.time()
+        with self._lock:
+            return sum(1 for k in self._keys if self._state[k].blacklist_until <= now)
+
+    def snapshot(self) -> dict:
+        """관리자 API용 키 상태 스냅샷 (키 원문 대신 해시 식별자 사용)"""
+        now = time.time()
+        with self._lock:
+            keys = [
+                {
+                    "key_id": key_id(key),
+                    "usage": self._state[key].usage,
+                    "usage_limit": self._usage_limit,
+                    "usage_ratio": round(self._state[key].usage / self._usage_limit, 3) if self._usage_limit else None,
+                    "blacklisted": self._state[key].blacklist_until > now,
+                    "blacklist_remaining_seconds": max(0, int(self._state[key].blacklist_until - now)),
+                    "pending_usage": self._pending_usage[key]
+                }
+                for key in self._keys
+            ]
+
+        return {
+            "total_keys": len(keys),
+            "active_keys": sum(1 for k in keys if not k["blacklisted"]),
+            "sync_interval_seconds": self._sync_interval,
+            "keys": keys
+        }
+
+    # ------------------------------------------------------------------
+    # 상태 변경: Redis 기록 + pub/sub 전파
+    # ------------------------------------------------------------------
+    def blacklist(self, key: str, seconds: Optional[int] = None) -> float:
+        """키를 블랙리스트에 추가하고 다른 프로세스에 알립니다."""
+        seconds = seconds or self._blacklist_seconds
+        until = time.time() + seconds
+
+        with self._lock:
+            state = self._state.setdefault(key, KeyState())
+            state.blacklist_until = max(state.blacklist_until, until)
+
+        self._publish_change(
+            key,
+            {"event": "blacklist", "until": until},
+            lambda pipe: pipe.set(f"{self.BLACKLIST_PREFIX}{key}", until, ex=seconds)
+        )
+        return until
+
+    def release(self, key: str):
+        """키를 블랙리스트에서 해제하고 다른 프로세스에 알립니다."""
+        with self._lock:
+            if key in self._state:
+                self._state[key].blacklist_until = 0.0
+
+        self._publish_change(
+            key,
+            {"event": "release"},
+            lambda pipe: pipe.delete(f"{self.BLACKLIST_PREFIX}{key}")
+        )
+
+    def _publish_change(self, key: str, event: dict, write):
+        if self._redis is None:
+            return
+        try:
+            message = json.dumps({**event, "key_id": key_id(key), "origin": self._origin})
+            pipe = self._redis.pipeline()
+            write(pipe)
+            pipe.publish(self.CHANNEL, message)
+            pipe.execute()
+        except Exception as e:
+            # Redis 장애 시에도 로컬 상태는 이미 반영되어 있으므로 계속 진행
+            logger.error(f"키 상태 변경을 Redis에 반영하지 못했습니다: {str(e)}")
+
+    def _apply_event(self, raw_message):
+        """pub/sub으로 받은 다른 프로세스의 상태 변경을 로컬 사본에 반영"""
+        try:
+            event = json.loads(raw_message)
+        except (TypeError, ValueError):
+            logger.warning(f"잘못된 키 상태 이벤트: {raw_message!r}")
+            return
+
+        if event.get("origin") == self._origin:
+            return
+
+        key = self._keys_by_id.get(event.get("key_id"))
+        if key is None:
+            return
+
+        with self._lock:
+            if event.get("event") == "blacklist":
+                self._state[key].blacklist_until = max(
+                    self._state[key].blacklist_until, float(event.get("until", 0))
+                )
+            elif event.get("event") == "release":
+                self._state[key].blacklist_until = 0.0
+
+    # ------------------------------------------------------------------
+    # 주기적 재동기화
+    # ------------------------------------------------------------------
+    def reconcile(self):
+        """
+        로컬 사용량 증가분을 Redis에 반영하고 전역 상태를 다시 읽어옵니다.
+
+        pub/sub 메시지를 놓친 경우(재연결, 재시작 등)에도 이 과정에서 상태가 맞춰집니다.
+        """
+        if self._redis is None or not self._keys:
+            return
+
+        with self._lock:
+            flushed = {k: n for k, n in self._pending_usage.items() if n}
+            for k in flushed:
+                self._pending_usage[k] = 0
+
+        try:
+            pipe = self._redis.pipeline()
+            for key, count in flushed.items():
+                pipe.incrby(f"{self.USAGE_PREFIX}{key}", count)
+                pipe.expire(f"{self.USAGE_PREFIX}{key}", self.USAGE_WINDOW_SECONDS)
+            pipe.mget([f"{self.BLACKLIST_PREFIX}{k}" for k in self._keys])
+            pipe.mget([f"{self.USAGE_PREFIX}{k}" for k in self._keys])
+            results = pipe.execute()
+        except Exception as e:
+            # 반영하지 못한 사용량은 다음 주기에 다시 시도
+            with self._lock:
+                for k, n in flushed.items():
+                    self._pending_usage[k] += n
+            logger.error(f"키 상태 재동기화 중 오류: {str(e)}")
+            return
+
+        blacklist_values, usage_values = results[-2], results[-1]
+
+        with self._lock:
+            for key, blacklisted, usage in zip(self._keys, blacklist_values, usage_values):
+                state = self._state[key]
+                state.blacklist_until = float(blacklisted) if blacklisted else 0.0
+                state.usage = int(usage or 0) + self._pending_usage[key]
+
+    def _ensure_sync(self):
+        """동기화 스레드가 현재 프로세스에서 실행 중인지 확인 (fork 이후 재시작 포함)"""
+        if self._redis is None:
+            return
+        if self._sync_pid == os.getpid() and self._sync_thread and self._sync_thread.is_alive():
+            return
+
+        with self._start_lock:
+            if self._sync_pid == os.getpid() and self._sync_thread and self._sync_thread.is_alive():
+                return
+
+            # 새 프로세스가 블랙리스트된 키를 쓰지 않도록 시작 전에 한 번 동기화
+            self.reconcile()
+
+            self._sync_pid = os.getpid()
+            self._stopped.clear()
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="gemini-key-sync", daemon=True
+            )
+            self._sync_thread.start()
+
+    def _sync_loop(self):
+        """pub/sub 구독과 주기적 재동기화를 함께 처리하는 백그라운드 루프"""
+        retry_delay = 1.0
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                next_sync = time.monotonic() + self._sync_interval
+                retry_delay = 1.0
+
+                while not self._stopped.is_set():
+                    timeout = max(0.0, next_sync - time.monotonic())
+                    message = pubsub.get_message(timeout=timeout)
+                    if message and message.get("type") == "message":
+                        self._apply_event(message["data"])
+                    if time.monotonic() >= next_sync:
+                        self.reconcile()
+                        next_sync = time.monotonic() + self._sync_interval
+            except Exception as e:
+                logger.warning(f"키 상태 구독 연결 오류, {retry_delay:.0f}초 후 재연결: {str(e)}")
+                self._stopped.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stop(self):
+        self._stopped.set()
+
+
+_key_manager: Optional[GeminiKeyManager] = None
+_key_manager_lock = threading.Lock()
+
+
+def get_key_manager() -> GeminiKeyManager:
+    """프로세스 전역 GeminiKeyManager 인스턴스 반환"""
+    global _key_manager
+    if _key_manager is None:
+        with _key_manager_lock:
+            if _key_manager is None:
+                _key_manager = GeminiKeyManager(
+                    keys=settings.gemini_api_keys(),
+                    redis_client=get_redis_sync(),
+                    usage_limit=settings.GEMINI_KEY_USAGE_LIMIT,
+                    blacklist_seconds=settings.GEMINI_KEY_BLACKLIST_SECONDS,
+                    sync_interval=settings.KEY_STATE_SYNC_INTERVAL
+                )
+    return _key_manager
@@ -0,0 +1,150 @@
+"""
+Celery 브로커 큐 상태 조회 모듈
+
+워커 자동 확장을 CPU가 아닌 실제 적체량 기준으로 하기 위해, Redis 브로커의 큐 리스트를 직접 읽어
+큐별 대기 작업 수와 가장 오래 기다린 작업의 대기 시간을 계산합니다.
+- Redis 브로커는 우선순위 단계마다 별도 리스트를 사용 (priority_steps, sep=":")
+  - 우선순위 0: "{큐}", 그 외: "{큐}:{우선순위}"
+  - LPUSH로 넣고 BRPOP으로 꺼내므로 리스트 오른쪽 끝(-1)이 가장 오래된 작업
+- 대기 시간은 발행 시 기록한 enqueued_at 헤더로 계산 (tasks.monitoring)
+- Prometheus 수집 시점에 조회하는 Collector와 관리자 API(JSON)에서 함께 사용
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from prometheus_client.core import GaugeMetricFamily
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+PRIORITY_SEP = ":"
+PRIORITY_STEPS = list(range(10))
+
+
+def priority_queue_names(queue: str, steps: Iterable[int] = PRIORITY_STEPS) -> List[str]:
+    """큐 하나가 브로커에서 사용하는 우선순위별 리스트 이름"""
+    return [queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}" for step in steps]
+
+
+def message_enqueued_at(raw) -> Optional[float]:
+    """브로커 메시지에서 발행 시각(enqueued_at 헤더) 추출 (없거나 형식이 다르면 None)"""
+    try:
+        value = json.loads(raw).get("headers", {}).get("enqueued_at")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class QueueInspector:
+    """Redis 브로커 큐 적체량 조회기 (조회 결과는 cache_seconds 동안 재사용)"""
+
+    def __init__(self, redis_client, queues: Iterable[str], cache_seconds: float = 5.0):
+        self._redis = redis_client
+        self.queues = list(queues)
+        self.cache_seconds = cache_seconds
+        self._cached: Optional[Dict[str, dict]] = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def _inspect(self) -> Dict[str, dict]:
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        names = {queue: priority_queue_names(queue) for queue in self.queues}
+        for queue in self.queues:
+            for name in names[queue]:
+                pipe.llen(name)
+                pipe.lindex(name, -1)
+        results = iter(pipe.execute())
+
+        snapshot = {}
+        for queue in self.queues:
+            depth = 0
+            oldest_age = 0.0
+            by_priority = {}
+            for step, name in zip(PRIORITY_STEPS, names[queue]):
+                length, oldest = int(next(results) or 0), next(results)
+                if not length:
+                    continue
+                depth += length
+                by_priority[step] = length
+                enqueued_at = message_enqueued_at(oldest)
+                if enqueued_at is not None:
+                    oldest_age = max(oldest_age, now - enqueued_at)
+
+            snapshot[queue] = {
+                "depth": depth,
+                "oldest_age_seconds": round(oldest_age, 3),
+                "by_priority": by_priority
+            }
+        return snapshot
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        큐별 적체 상태 조회
+
+        Returns:
+            dict: {큐: {"depth", "oldest_age_seconds", "by_priority"}} (Redis 장애 시 빈 dict)
+        """
+        with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.cache_seconds:
+                return self._cached
+
+            try:
+                self._cached = self._inspect()
+            except Exception as e:
+                logger.warning(f"브로커 큐 조회 실패: {e}")
+                return {}
+            self._cached_at = time.monotonic()
+            return self._cached
+
+
+class QueueMetricsCollector:
+    """Prometheus 수집 시점에 브로커 큐 적체량을 게이지로 내보내는 Collector"""
+
+    def __init__(self, inspector: QueueInspector):
+        self.inspector = inspector
+
+    def describe(self):
+        # 등록 시 Redis를 조회하지 않도록 메트릭 이름만 알림
+        return [
+            GaugeMetricFamily("celery_queue_depth", "Celery 큐 대기 작업 수", labels=["queue"]),
+            GaugeMetricFamily(
+                "celery_queue_oldest_message_age_seconds", "Celery 큐에서 가장 오래 기다린 작업의 대기 시간(초)",
+                labels=["queue"]
+            ),
+        ]
+
+    def collect(self):
+        depth = GaugeMetricFamily("celery_queue_depth", "Celery 큐 대기 작업 수", labels=["queue"])
+        age = GaugeMetricFamily(
+            "celery_queue_oldest_message_age_seconds", "Celery 큐에서 가장 오래 기다린 작업의 대기 시간(초)",
+            labels=["queue"]
+        )
+        for queue, stats in self.inspector.snapshot().items():
+            depth.add_metric([queue], stats["depth"])
+            age.add_metric([queue], stats["oldest_age_seconds"])
+        yield depth
+        yield age
+
+
+_inspector: Optional[QueueInspector] = None
+
+
+def get_queue_inspector() -> QueueInspector:
+    """전역 QueueInspector 인스턴스 반환 (Celery 설정의 큐 목록 사용)"""
+    global _inspector
+
+    if _inspector is None:
+        from celery_worker import celery_app
+        from db.redis import get_redis_sync
+
+        _inspector = QueueInspector(
+            redis_client=get_redis_sync(),
+            queues=[queue.name for queue in celery_app.conf.task_queues]
+        )
+
+    return _inspector
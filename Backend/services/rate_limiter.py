@@ -0,0 +1,168 @@
+"""
+외부 API 전역 처리율 제한 모듈
+
+Celery 작업 rate_limit은 워커 인스턴스마다 따로 적용되고 BackgroundTasks/동기 API 경로에는 적용되지 않으므로,
+워커를 늘릴수록 외부 API 호출량도 늘어납니다. 모든 실행 경로가 같은 Redis 토큰 버킷에서 토큰을 받아 호출하여
+프로세스 수와 관계없이 실제 업스트림 한도에 맞춥니다.
+- 자원별 버킷: gemini:{키 식별자} (Gemini 키마다), wit_ai (Wit.ai 앱)
+- 토큰 계산은 Lua 스크립트 하나로 원자적으로 처리하고 시간은 Redis 서버 시계를 사용 (호스트 간 시계 차이 무관)
+- 토큰이 없으면 실패하지 않고 다음 토큰까지 기다림 (최대 RATE_LIMIT_MAX_WAIT_SECONDS, 초과 시 APIRateLimitError)
+- Redis 장애 시에는 제한 없이 통과 (fail open)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from core.config import settings
+from core.exceptions import APIRateLimitError
+from core.metrics import RATE_LIMIT_WAIT
+from db.redis import get_redis_sync
+from services.key_manager import key_id
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: 버킷 키, ARGV[1]: 초당 충전 토큰 수, ARGV[2]: 버킷 크기, ARGV[3]: 요청 토큰 수
+# 반환: 0이면 토큰 획득, 양수면 토큰이 생길 때까지 기다려야 하는 초 (문자열, Lua 숫자는 정수로 잘리므로)
+TOKEN_BUCKET_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimiter:
+    """자원 하나에 대한 Redis 토큰 버킷"""
+
+    PREFIX = "rate_limit:"
+    REDIS_RETRY_SECONDS = 30.0  # Redis 오류 후 다시 시도하기까지 대기 시간
+    MAX_SLEEP_SECONDS = 1.0     # 한 번에 기다리는 최대 시간 (다른 프로세스가 먼저 가져갈 수 있으므로 다시 확인)
+
+    def __init__(
+        self,
+        resource: str,
+        per_minute: float,
+        burst: Optional[int] = None,
+        redis_client=None,
+        max_wait_seconds: float = 60.0
+    ):
+        self.resource = resource
+        self.rate = per_minute / 60.0
+        self.capacity = burst or max(1, int(per_minute // 6))  # 기본: 10초 분량까지 몰아서 허용
+        self.max_wait_seconds = max_wait_seconds
+        self._redis = redis_client
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT) if redis_client is not None else None
+        self._redis_disabled_until = 0.0
+
+    def _key(self) -> str:
+        return f"{self.PREFIX}{self.resource}"
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        토큰 획득 시도
+
+        Returns:
+            float: 0이면 획득 성공, 양수면 다시 시도하기 전 기다릴 시간(초)
+        """
+        if self._script is None or self.rate <= 0 or time.time() < self._redis_disabled_until:
+            return 0.0
+
+        try:
+            return float(self._script(keys=[self._key()], args=[self.rate, self.capacity, tokens]))
+        except Exception as e:
+            # 처리율 제한 장애로 평가가 멈추지 않도록 제한 없이 통과
+            self._redis_disabled_until = time.time() + self.REDIS_RETRY_SECONDS
+            logger.warning(f"처리율 제한 Redis 오류, {self.REDIS_RETRY_SECONDS:.0f}초간 제한 없이 통과 ({self.resource}): {e}")
+            return 0.0
+
+    def _deadline_exceeded(self, started: float, wait: float) -> None:
+        if time.monotonic() - started + wait > self.max_wait_seconds:
+            RATE_LIMIT_WAIT.labels(resource=self.resource.split(":", 1)[0], result="timeout").observe(
+                time.monotonic() - started
+            )
+            raise APIRateLimitError(
+                f"{self.resource} rate limit 대기 시간 초과 ({self.max_wait_seconds:.0f}초)"
+            )
+
+    def _record(self, started: float) -> None:
+        RATE_LIMIT_WAIT.labels(resource=self.resource.split(":", 1)[0], result="acquired").observe(
+            time.monotonic() - started
+        )
+
+    def acquire(self, tokens: int = 1) -> None:
+        """
+        토큰을 얻을 때까지 대기 (동기, Celery 워커용 - gevent에서는 다른 작업에 양보)
+
+        Raises:
+            APIRateLimitError: max_wait_seconds 안에 토큰을 얻지 못한 경우
+        """
+        started = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                self._record(started)
+                return
+            self._deadline_exceeded(started, wait)
+            time.sleep(min(wait, self.MAX_SLEEP_SECONDS))
+
+    async def aacquire(self, tokens: int = 1) -> None:
+        """acquire의 비동기 버전 (Redis 왕복은 스레드에서, 대기는 이벤트 루프를 막지 않음)"""
+        started = time.monotonic()
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, tokens)
+            if wait <= 0:
+                self._record(started)
+                return
+            self._deadline_exceeded(started, wait)
+            await asyncio.sleep(min(wait, self.MAX_SLEEP_SECONDS))
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(resource: str, per_minute: float) -> RateLimiter:
+    """자원별 전역 RateLimiter 인스턴스 반환"""
+    limiter = _limiters.get(resource)
+
+    if limiter is None:
+        limiter = _limiters.setdefault(resource, RateLimiter(
+            resource,
+            per_minute=per_minute if settings.RATE_LIMIT_ENABLED else 0,
+            redis_client=get_redis_sync(),
+            max_wait_seconds=settings.RATE_LIMIT_MAX_WAIT_SECONDS
+        ))
+
+    return limiter
+
+
+def gemini_limiter(api_key) -> RateLimiter:
+    """Gemini API 키별 처리율 제한 (langchain의 SecretStr 키도 허용)"""
+    if hasattr(api_key, "get_secret_value"):
+        api_key = api_key.get_secret_value()
+    return get_rate_limiter(f"gemini:{key_id(api_key)}", settings.RATE_LIMIT_GEMINI_PER_MINUTE)
+
+
+def wit_ai_limiter() -> RateLimiter:
+    """Wit.ai 앱 처리율 제한"""
+    return get_rate_limiter("wit_ai", settings.RATE_LIMIT_WIT_AI_PER_MINUTE)
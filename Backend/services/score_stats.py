@@ -0,0 +1,188 @@
+"""
+사용자 평균 점수 증분 관리 모듈
+
+테스트가 끝날 때마다 사용자의 모든 테스트를 다시 읽어 평균을 계산하면 기록이 쌓일수록 비용이 커지므로,
+사용자 문서에 카테고리별 누적 합계/개수(OPIC_LEVELS 인덱스 기준)를 두고 $inc로 갱신합니다.
+- users.score_stats.{카테고리}.sum / .count: 누적 합계와 개수
+- tests.applied_score_indexes: 해당 테스트가 누적값에 반영한 레벨 인덱스
+  (같은 테스트를 다시 평가하거나 작업이 재시도되어도 차이만 반영하고, 테스트 삭제 시 그대로 빼기 위해 사용)
+기존 사용자는 scripts/backfill_score_stats.py로 누적값을 한 번 채워야 합니다.
+"""
+
+import logging
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from services.evaluator import OPIC_LEVELS
+from services.user_cache import get_user_cache
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SCORE_CATEGORIES = ("total_score", "comboset_score", "roleplaying_score", "unexpected_score")
+
+
+def score_indexes(test_score: Optional[dict]) -> Dict[str, int]:
+    """테스트 점수에서 카테고리별 레벨 인덱스 추출 (N/A 등 유효하지 않은 점수는 제외)"""
+    if not isinstance(test_score, dict):
+        return {}
+
+    return {
+        category: OPIC_LEVELS.index(test_score[category])
+        for category in SCORE_CATEGORIES
+        if test_score.get(category) in OPIC_LEVELS
+    }
+
+
+def score_delta(old: Dict[str, int], new: Dict[str, int]) -> Dict[str, int]:
+    """반영된 인덱스가 old에서 new로 바뀔 때 사용자 누적값에 더할 $inc 필드"""
+    delta = {}
+    for category in SCORE_CATEGORIES:
+        sum_change = new.get(category, 0) - old.get(category, 0)
+        count_change = (category in new) - (category in old)
+        if sum_change:
+            delta[f"score_stats.{category}.sum"] = sum_change
+        if count_change:
+            delta[f"score_stats.{category}.count"] = count_change
+    return delta
+
+
+def average_from_stats(stats: Optional[dict]) -> Dict[str, Optional[str]]:
+    """누적 합계/개수로 카테고리별 평균 레벨 계산 (가장 가까운 레벨로 반올림)"""
+    stats = stats or {}
+    averages = {}
+
+    for category in SCORE_CATEGORIES:
+        category_stats = stats.get(category) or {}
+        count = category_stats.get("count", 0)
+        if count <= 0:
+            averages[category] = None
+            continue
+
+        closest_index = round(category_stats.get("sum", 0) / count)
+        closest_index = max(0, min(closest_index, len(OPIC_LEVELS) - 1))
+        averages[category] = OPIC_LEVELS[closest_index]
+
+    return averages
+
+
+def _user_filter(user_id) -> dict:
+    return {"_id": ObjectId(user_id) if not isinstance(user_id, ObjectId) else user_id}
+
+
+def apply_test_scores_sync(db, test_id, user_id, test_score: Optional[dict]) -> Optional[dict]:
+    """
+    완료된 테스트 점수를 사용자 누적값에 반영하고 평균 점수 갱신 (동기, Celery 작업용)
+
+    테스트 문서의 반영 기록을 원자적으로 교체하고 이전 기록과의 차이만 $inc 하므로
+    같은 테스트를 여러 번 반영해도 결과가 같습니다.
+
+    Returns:
+        dict: 갱신된 평균 점수 (반영할 차이가 없으면 None)
+    """
+    new = score_indexes(test_score)
+    test = db.tests.find_one_and_update(
+        {"_id": ObjectId(test_id)},
+        {"$set": {"applied_score_indexes": new}},
+        projection={"applied_score_indexes": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not isinstance(test, dict):
+        return None
+
+    return _inc_user_stats_sync(db, user_id, score_delta(test.get("applied_score_indexes") or {}, new))
+
+
+def _inc_user_stats_sync(db, user_id, delta: dict) -> Optional[dict]:
+    if not delta or not user_id:
+        return None
+
+    user = db.users.find_one_and_update(
+        _user_filter(user_id),
+        {"$inc": delta},
+        projection={"score_stats": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not isinstance(user, dict):
+        return None
+
+    averages = average_from_stats(user.get("score_stats"))
+    db.users.update_one(_user_filter(user_id), {"$set": {"average_score": averages}})
+    get_user_cache().invalidate(user_id)
+    logger.info(f"사용자 {user_id}의 평균 점수가 업데이트되었습니다: {averages}")
+    return averages
+
+
+async def apply_test_scores(db, test_id, user_id, test_score: Optional[dict]) -> Optional[dict]:
+    """apply_test_scores_sync의 비동기 버전 (Motor, BackgroundTasks 경로용)"""
+    new = score_indexes(test_score)
+    test = await db.tests.find_one_and_update(
+        {"_id": ObjectId(test_id)},
+        {"$set": {"applied_score_indexes": new}},
+        projection={"applied_score_indexes": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not isinstance(test, dict):
+        return None
+
+    return await _inc_user_stats(db, user_id, score_delta(test.get("applied_score_indexes") or {}, new))
+
+
+async def remove_test_scores(db, test: dict) -> Optional[dict]:
+    """삭제된 테스트가 반영했던 점수를 사용자 누적값에서 제거 (테스트 삭제 API용)"""
+    return await _inc_user_stats(db, test.get("user_id"), score_delta(test.get("applied_score_indexes") or {}, {}))
+
+
+async def _inc_user_stats(db, user_id, delta: dict) -> Optional[dict]:
+    if not delta or not user_id:
+        return None
+
+    user = await db.users.find_one_and_update(
+        _user_filter(user_id),
+        {"$inc": delta},
+        projection={"score_stats": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not isinstance(user, dict):
+        return None
+
+    averages = average_from_stats(user.get("score_stats"))
+    await db.users.update_one(_user_filter(user_id), {"$set": {"average_score": averages}})
+    await get_user_cache().ainvalidate(user_id)
+    logger.info(f"사용자 {user_id}의 평균 점수가 업데이트되었습니다: {averages}")
+    return averages
+
+
+def rebuild_user_score_stats_sync(db, user_id) -> dict:
+    """
+    사용자의 모든 채점된 테스트로 누적값을 다시 계산 (백필, 누적값 보정용)
+
+    각 테스트의 반영 기록도 함께 다시 기록하여 이후 증분 갱신과 어긋나지 않게 합니다.
+
+    Returns:
+        dict: 다시 계산한 평균 점수
+    """
+    stats = {category: {"sum": 0, "count": 0} for category in SCORE_CATEGORIES}
+    test_updates = []
+
+    for test in db.tests.find(
+        {"user_id": str(user_id), "test_score.total_score": {"$exists": True}},
+        {"test_score": 1}
+    ):
+        indexes = score_indexes(test.get("test_score"))
+        for category, index in indexes.items():
+            stats[category]["sum"] += index
+            stats[category]["count"] += 1
+        test_updates.append(UpdateOne({"_id": test["_id"]}, {"$set": {"applied_score_indexes": indexes}}))
+
+    if test_updates:
+        db.tests.bulk_write(test_updates, ordered=False)
+
+    # 증분 갱신($inc)과 같은 모양이 되도록 점수가 없는 카테고리는 비워 둠
+    stats = {category: category_stats for category, category_stats in stats.items() if category_stats["count"]}
+    averages = average_from_stats(stats)
+    db.users.update_one(_user_filter(user_id), {"$set": {"score_stats": stats, "average_score": averages}})
+    get_user_cache().invalidate(user_id)
+    return averages
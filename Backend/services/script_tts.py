@@ -0,0 +1,88 @@
+"""
+스크립트 발음 음성(TTS) 모듈
+
+스크립트 듣기 요청마다 외부 TTS 서비스(CSM-1B, 최대 180초)를 호출하고 WAV를 Base64로 돌려주던 방식을,
+정리된 텍스트의 해시로 주소를 정한 MP3 캐시(services.tts_cache)로 대체합니다.
+- 같은 스크립트를 다시 들으면 합성 없이 캐시된 파일을 바로 전송
+- 같은 스크립트를 동시에 요청하면 TTS 서비스는 한 번만 호출 (single-flight)
+- WAV는 24kHz 모노 48k MP3로 인코딩하여 저장 (전송량 약 1/8)
+- TTS 서비스 연결은 프로세스(이벤트 루프)당 하나의 httpx.AsyncClient 연결 풀을 재사용
+"""
+
+import asyncio
+import logging
+import re
+import weakref
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+from services.transcoder import get_transcoder
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SCRIPT_VOICE = "csm-1b"  # 캐시 키에 포함 (TTS 모델이 바뀌면 새로 합성)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def clean_script_text(content: str) -> str:
+    """스크립트 HTML에서 TTS에 보낼 텍스트만 추출 (태그 제거, 공백 정리)"""
+    from bs4 import BeautifulSoup
+
+    text = BeautifulSoup(content or "", "html.parser").get_text(separator=" ", strip=True)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def get_tts_http_client() -> httpx.AsyncClient:
+    """TTS 서비스용 공유 AsyncClient (httpx 연결은 생성된 이벤트 루프에서만 사용 가능하므로 루프별로 생성)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.SCRIPT_TTS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRIPT_TTS_MAX_CONNECTIONS,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(settings.SCRIPT_TTS_TIMEOUT_SECONDS, connect=10.0)
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_tts_http_client() -> None:
+    """현재 이벤트 루프의 TTS 클라이언트 종료 (앱 종료 시 호출)"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    client: Optional[httpx.AsyncClient] = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+async def render_script_tts(text: str) -> bytes:
+    """
+    TTS 서비스로 합성한 WAV를 청취용 MP3로 변환 (캐시가 없을 때만 호출)
+
+    Raises:
+        httpx.HTTPStatusError, httpx.RequestError: TTS 서비스 오류
+        TranscodeError: MP3 변환 실패
+    """
+    logger.info(f"CSM-1B API 호출 시작: {settings.SCRIPT_TTS_API_URL}")
+    response = await get_tts_http_client().post(
+        settings.SCRIPT_TTS_API_URL,
+        json={"text": text},
+        headers={"Accept": "audio/wav"}  # WAV 형식 명시적 요청
+    )
+    logger.info(f"API 응답 상태 코드: {response.status_code}")
+    response.raise_for_status()
+
+    if not response.content:
+        raise ValueError("음성 생성 API에서 데이터를 받지 못했습니다")
+
+    return await asyncio.to_thread(get_transcoder().encode_playback, response.content)
@@ -0,0 +1,97 @@
+"""
+긴 답변 분할 모듈
+
+16kHz 모노 PCM을 무음 구간(에너지가 가장 낮은 지점)에서 10~20초 길이로 나누고,
+구간별 음성 인식 결과를 순서대로 이어 붙입니다.
+- 분할 지점 뒤로 overlap_ms만큼 겹쳐서 잘라, 경계에서 단어가 잘리지 않도록 함
+- 이어 붙일 때 겹친 구간에서 중복 인식된 단어를 제거
+청크 단위로 입력받으므로 스트리밍 경로에서는 첫 구간이 완성되는 즉시 인식을 시작할 수 있습니다.
+"""
+
+import re
+from typing import List
+
+import numpy as np
+
+from services.vad import SAMPLE_WIDTH, frame_levels_db
+
+FRAME_MS = 30
+SMOOTHING_FRAMES = 5  # 150ms 평균 에너지로 단어 사이의 짧은 틈이 아닌 실제 공백을 찾음
+
+
+class SilenceSegmenter:
+    """청크 단위로 PCM을 받아 무음 지점에서 잘린 구간을 반환"""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        min_seconds: float = 10.0,
+        max_seconds: float = 20.0,
+        overlap_ms: int = 300
+    ):
+        self._frame_len = sample_rate * FRAME_MS // 1000
+        self._frame_bytes = self._frame_len * SAMPLE_WIDTH
+        self._min_frames = int(min_seconds * 1000 // FRAME_MS)
+        self._max_frames = max(self._min_frames + 1, int(max_seconds * 1000 // FRAME_MS))
+        self._overlap_frames = overlap_ms // FRAME_MS
+        self._buffer = bytearray()
+
+    def _cut_frame(self) -> int:
+        """min~max 구간에서 평균 에너지가 가장 낮은 프레임 위치"""
+        window = bytes(self._buffer[self._min_frames * self._frame_bytes:self._max_frames * self._frame_bytes])
+        levels = frame_levels_db(np.frombuffer(window, dtype="<i2"), self._frame_len)
+        smoothed = np.convolve(levels, np.ones(SMOOTHING_FRAMES) / SMOOTHING_FRAMES, mode="same")
+        return self._min_frames + int(np.argmin(smoothed))
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """PCM 청크를 입력하고 완성된 구간 목록 반환"""
+        self._buffer.extend(pcm)
+        segments = []
+
+        while len(self._buffer) >= (self._max_frames + self._overlap_frames) * self._frame_bytes:
+            cut = self._cut_frame()
+            segments.append(bytes(self._buffer[:(cut + self._overlap_frames) * self._frame_bytes]))
+            del self._buffer[:cut * self._frame_bytes]
+
+        return segments
+
+    def finish(self) -> List[bytes]:
+        """입력 종료: 남은 PCM을 마지막 구간으로 반환"""
+        segments = [bytes(self._buffer)] if self._buffer else []
+        self._buffer = bytearray()
+        return segments
+
+
+def split_at_silence(pcm: bytes, **kwargs) -> List[bytes]:
+    """PCM 전체를 무음 지점에서 분할 (일괄 처리 버전)"""
+    segmenter = SilenceSegmenter(**kwargs)
+    return segmenter.feed(pcm) + segmenter.finish()
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch_transcripts(parts: List[str], max_overlap_words: int = 4) -> str:
+    """
+    구간별 인식 결과를 순서대로 이어 붙임
+
+    앞 구간의 마지막 단어들과 다음 구간의 첫 단어들이 같으면 (겹친 구간에서 중복 인식)
+    가장 긴 일치 부분을 다음 구간에서 제거합니다.
+    """
+    words: List[str] = []
+
+    for part in parts:
+        new_words = part.split()
+        if not new_words:
+            continue
+
+        overlap = 0
+        for k in range(min(max_overlap_words, len(words), len(new_words)), 0, -1):
+            if [_normalize_word(w) for w in words[-k:]] == [_normalize_word(w) for w in new_words[:k]]:
+                overlap = k
+                break
+
+        words.extend(new_words[overlap:])
+
+    return " ".join(words)
@@ -0,0 +1,110 @@
+"""
+처리 상태 실시간 알림(SSE) 모듈
+
+문제마다 상태 API를 폴링하지 않도록, 워커가 상태 저장소에 기록하며 발행하는
+processing_status_events:{test_id} 채널을 구독해 Server-Sent Events로 전달합니다.
+- 연결(재연결 포함) 직후 최신 전체 상태를 snapshot 이벤트로 먼저 보내므로 끊긴 동안의 변경을 놓치지 않음
+  (구독을 먼저 시작한 뒤 snapshot을 만들어 그 사이의 변경도 유실되지 않음)
+- 이후 상태 변경마다 problem / overall 이벤트, 일정 시간 변경이 없으면 keep-alive 주석 전송
+- 종합 평가가 끝나면(completed/failed) 스트림 종료
+- Redis 장애 시 snapshot만 보내고 종료하여 클라이언트가 retry 간격 후 다시 연결 (폴링으로 대체)
+"""
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from db.redis import get_redis_async
+from services.status_store import TERMINAL_STATUSES, get_status_store
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_SECONDS = 15.0       # 변경이 없을 때 keep-alive 전송 간격 (프록시 유휴 연결 종료 방지)
+MAX_STREAM_SECONDS = 1800.0    # 한 연결의 최대 유지 시간 (이후 클라이언트가 다시 연결하며 snapshot을 받음)
+RETRY_MILLISECONDS = 3000      # 연결이 끊겼을 때 클라이언트(EventSource)의 재연결 대기 시간
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """SSE 이벤트 한 개를 전송 형식으로 변환"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _decode_event(message: Optional[dict]) -> Optional[dict]:
+    if not message or message.get("type") != "message":
+        return None
+    try:
+        return json.loads(message["data"])
+    except (TypeError, ValueError):
+        return None
+
+
+async def status_event_stream(
+    test_id: str,
+    load_snapshot: Callable[[], Awaitable[Optional[dict]]],
+    redis_client=None,
+    keepalive_seconds: float = KEEPALIVE_SECONDS,
+    max_stream_seconds: float = MAX_STREAM_SECONDS
+) -> AsyncIterator[str]:
+    """
+    테스트의 처리 상태 SSE 스트림
+
+    Args:
+        test_id: 테스트 ID
+        load_snapshot: 현재 전체 상태(/overall-status 응답과 같은 형식)를 만드는 함수
+        redis_client: 구독에 사용할 비동기 Redis 클라이언트 (기본: 전역 클라이언트)
+    """
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+
+    pubsub = None
+    try:
+        pubsub = (redis_client or get_redis_async()).pubsub()
+        await pubsub.subscribe(get_status_store().channel(test_id))
+    except Exception as e:
+        logger.warning(f"처리 상태 채널 구독 실패 (테스트 {test_id}), snapshot만 전송: {e}")
+        pubsub = None
+
+    try:
+        snapshot = await load_snapshot()
+        if snapshot is None:
+            yield format_sse("error", {"message": "해당 테스트를 찾을 수 없습니다."})
+            return
+
+        yield format_sse("snapshot", snapshot)
+        if pubsub is None or snapshot.get("overall_status") in TERMINAL_STATUSES:
+            return
+
+        # 문제 번호 -> problem_id (워커가 발행하는 이벤트에는 문제 번호만 있음)
+        problem_ids = {
+            status.get("problem_number"): status.get("problem_id")
+            for status in snapshot.get("problem_statuses", [])
+        }
+        deadline = time.monotonic() + max_stream_seconds
+
+        while time.monotonic() < deadline:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive_seconds)
+            except Exception as e:
+                logger.warning(f"처리 상태 구독 중 오류 (테스트 {test_id}): {e}")
+                return
+
+            event = _decode_event(message)
+            if event is None:
+                if message is None:
+                    yield ": keep-alive\n\n"
+                continue
+
+            event_type = event.pop("type", "problem")
+            if event_type == "problem":
+                event.setdefault("problem_id", problem_ids.get(event.get("problem_number")))
+            yield format_sse(event_type, event)
+
+            if event_type == "overall" and event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"처리 상태 구독 해제 실패 (테스트 {test_id}): {e}")
@@ -0,0 +1,333 @@
+"""
+답변 처리 상태 저장소 모듈
+
+폴링 API가 큰 테스트 문서를 매번 읽고 워커가 같은 문서에 상태를 여러 번 쓰지 않도록,
+처리 상태는 테스트별 Redis 해시에 기록하고 상태 API는 이 해시만 읽습니다 (Redis 왕복 한 번).
+- 키: processing_status:{test_id}
+  - 필드 "{문제 번호}": {"status", "message", "updated_at", "started_at", "completed_at"} JSON
+  - 필드 "_overall": 종합 평가 상태 (같은 형식)
+  - 필드 "_problems": {문제 번호: problem_id} (아직 제출하지 않은 문제도 not_started로 응답하기 위해 사용)
+- 상태가 바뀔 때마다 processing_status_events:{test_id} 채널에 발행 (실시간 알림용)
+- 최종 결과(점수, 피드백, completed/failed)는 Mongo에도 저장되므로, TTL이 지나 해시가 사라졌거나
+  Redis 장애로 기록이 없으면 상태 API는 Mongo 값을 사용
+- 오래 갱신되지 않은 중간 상태는 버리지 않고 stale로 표시하며, 상태 API는 해당 항목의 상태 필드만
+  Mongo에서 확인해 최종 결과가 저장되어 있을 때만 그 값으로 바꿈 (중간 상태는 Mongo에 없으므로)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+from db.redis import get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+STALE_SECONDS = 600  # 이 시간 동안 갱신되지 않은 중간 상태는 stale로 표시하고 Mongo의 최종 결과 확인
+
+
+class StatusStore:
+    """테스트 ID -> {문제 번호: 처리 상태, 종합 평가 상태} 저장소"""
+
+    PREFIX = "processing_status:"
+    CHANNEL_PREFIX = "processing_status_events:"
+    OVERALL_FIELD = "_overall"
+    PROBLEMS_FIELD = "_problems"
+
+    def __init__(self, redis_client=None, ttl_seconds: int = 86400):
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+
+    def _key(self, test_id: str) -> str:
+        return f"{self.PREFIX}{test_id}"
+
+    def channel(self, test_id: str) -> str:
+        """테스트의 상태 변경 알림 채널 이름"""
+        return f"{self.CHANNEL_PREFIX}{test_id}"
+
+    def _write(self, test_id: str, field: str, value: dict, event: Optional[dict] = None) -> bool:
+        """해시 필드 갱신 + TTL 연장 (+ 알림 발행)을 한 번의 왕복으로 처리, 기록 여부 반환"""
+        if self._redis is None:
+            return False
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(self._key(test_id), field, json.dumps(value, ensure_ascii=False, default=str))
+            pipe.expire(self._key(test_id), self._ttl_seconds)
+            if event is not None:
+                pipe.publish(self.channel(test_id), json.dumps(event, ensure_ascii=False, default=str))
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"처리 상태 기록 실패 (테스트 {test_id}, {field}): {e}")
+            return False
+
+    def set_problem_status(
+        self, test_id: str, problem_number: str, status: str, message: str = "", **fields: Any
+    ) -> bool:
+        """
+        문제의 처리 상태 기록 및 알림 발행
+
+        fields로 started_at, completed_at 등을 함께 기록할 수 있습니다.
+
+        Returns:
+            bool: Redis에 기록했으면 True (False면 호출자가 Mongo에 대신 기록)
+        """
+        value = {"status": status, "message": message, "updated_at": time.time(), **fields}
+        event = {"type": "problem", "problem_number": str(problem_number), **value}
+        return self._write(test_id, str(problem_number), value, event)
+
+    def set_overall_status(self, test_id: str, status: str, message: str = "", **fields: Any) -> bool:
+        """종합 평가 상태 기록 및 알림 발행 (반환값은 set_problem_status와 같음)"""
+        value = {"status": status, "message": message, "updated_at": time.time(), **fields}
+        return self._write(test_id, self.OVERALL_FIELD, value, {"type": "overall", **value})
+
+    def set_test_problems(self, test_id: str, problems: Dict[str, str]) -> bool:
+        """테스트의 문제 구성({문제 번호: problem_id}) 기록 (알림 없음)"""
+        return self._write(test_id, self.PROBLEMS_FIELD, problems)
+
+    def get_test_state(self, test_id: str) -> Dict[str, Any]:
+        """
+        테스트의 저장된 상태 전체 조회 (기록이 없거나 Redis 장애 시 빈 상태)
+
+        Returns:
+            dict: {"problems": {번호: problem_id}, "overall": dict 또는 None, "statuses": {번호: dict}}
+        """
+        state = {"problems": {}, "overall": None, "statuses": {}}
+        if self._redis is None:
+            return state
+
+        try:
+            raw = self._redis.hgetall(self._key(test_id))
+        except Exception as e:
+            logger.warning(f"처리 상태 조회 실패 (테스트 {test_id}): {e}")
+            return state
+
+        for field, value in raw.items():
+            field = field.decode("utf-8") if isinstance(field, bytes) else field
+            try:
+                value = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+
+            if field == self.PROBLEMS_FIELD:
+                state["problems"] = value
+            elif field == self.OVERALL_FIELD:
+                state["overall"] = value
+            else:
+                state["statuses"][field] = value
+        return state
+
+    def get_test_statuses(self, test_id: str) -> Dict[str, dict]:
+        """테스트의 문제별 처리 상태 조회 (기록이 없거나 Redis 장애 시 빈 dict)"""
+        return self.get_test_state(test_id)["statuses"]
+
+    def get_problem_status(self, test_id: str, problem_number: str) -> Optional[dict]:
+        """문제 하나의 처리 상태 조회 (기록이 없거나 Redis 장애 시 None)"""
+        if self._redis is None:
+            return None
+
+        try:
+            value = self._redis.hget(self._key(test_id), str(problem_number))
+        except Exception as e:
+            logger.warning(f"처리 상태 조회 실패 (테스트 {test_id}, 문제 {problem_number}): {e}")
+            return None
+
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            return None
+
+    async def aset_problem_status(
+        self, test_id: str, problem_number: str, status: str, message: str = "", **fields: Any
+    ) -> bool:
+        """set_problem_status의 비동기 버전 (Redis 왕복 동안 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.set_problem_status, test_id, problem_number, status, message, **fields)
+
+    async def aset_overall_status(self, test_id: str, status: str, message: str = "", **fields: Any) -> bool:
+        """set_overall_status의 비동기 버전"""
+        return await asyncio.to_thread(self.set_overall_status, test_id, status, message, **fields)
+
+    async def aset_test_problems(self, test_id: str, problems: Dict[str, str]) -> bool:
+        """set_test_problems의 비동기 버전"""
+        return await asyncio.to_thread(self.set_test_problems, test_id, problems)
+
+    async def aget_test_state(self, test_id: str) -> Dict[str, Any]:
+        """get_test_state의 비동기 버전"""
+        return await asyncio.to_thread(self.get_test_state, test_id)
+
+    async def aget_test_statuses(self, test_id: str) -> Dict[str, dict]:
+        """get_test_statuses의 비동기 버전"""
+        return await asyncio.to_thread(self.get_test_statuses, test_id)
+
+    async def aget_problem_status(self, test_id: str, problem_number: str) -> Optional[dict]:
+        """get_problem_status의 비동기 버전"""
+        return await asyncio.to_thread(self.get_problem_status, test_id, problem_number)
+
+
+def is_stale(live: Optional[dict], stale_seconds: float = STALE_SECONDS) -> bool:
+    """
+    처리 중 상태가 너무 오래 갱신되지 않았는지 확인
+
+    워커가 최종 상태를 Redis에 기록하지 못한 경우(기록 직전 Redis 장애 등) 중간 상태가
+    TTL 동안 남을 수 있으므로, 오래된 중간 상태는 Mongo에 최종 결과가 있는지 확인해야 합니다.
+    """
+    if not live or live.get("status") in TERMINAL_STATUSES:
+        return False
+    return time.time() - float(live.get("updated_at", 0)) > stale_seconds
+
+
+def problem_number_of(state: Dict[str, Any], problem_id: str) -> Optional[str]:
+    """저장된 문제 구성에서 problem_id의 문제 번호 조회 (모르면 None)"""
+    return next((number for number, pid in state["problems"].items() if pid == problem_id), None)
+
+
+def problem_status_from_state(state: Dict[str, Any], problem_id: str) -> Optional[dict]:
+    """
+    저장된 상태만으로 문제 상태 응답 구성
+
+    오래 갱신되지 않은 중간 상태는 "stale": True로 표시합니다 (호출자가 Mongo의 최종 결과 확인).
+
+    Returns:
+        dict: {"status", "message", "started_at", "completed_at"} (저장소에 기록이 없으면 None)
+    """
+    problem_number = problem_number_of(state, problem_id)
+    live = state["statuses"].get(problem_number) if problem_number else None
+    if live is None:
+        return None
+
+    response = {
+        "status": live.get("status"),
+        "message": live.get("message", ""),
+        "started_at": live.get("started_at"),
+        "completed_at": live.get("completed_at")
+    }
+    if is_stale(live):
+        response["stale"] = True
+    return response
+
+
+def overall_status_from_state(state: Dict[str, Any]) -> Optional[dict]:
+    """
+    저장된 상태만으로 테스트 전체 상태 응답 구성 (문제 구성을 모르면 None)
+
+    오래 갱신되지 않은 중간 상태는 문제 항목 또는 전체 응답에 "stale": True로 표시합니다.
+    """
+    if not state["problems"]:
+        return None
+
+    problem_statuses = []
+    for number, problem_id in state["problems"].items():
+        live = state["statuses"].get(number)
+        if live is None:
+            problem_statuses.append({
+                "problem_number": number, "problem_id": problem_id, "status": "not_started", "message": ""
+            })
+            continue
+        status = {
+            "problem_number": number,
+            "problem_id": problem_id,
+            "status": live.get("status"),
+            "message": live.get("message", "")
+        }
+        if is_stale(live):
+            status["stale"] = True
+        problem_statuses.append(status)
+
+    overall = state["overall"] or {}
+    response = {
+        "overall_status": overall.get("status", "not_started"),
+        "overall_message": overall.get("message", ""),
+        "all_problems_completed": all(status["status"] == "completed" for status in problem_statuses),
+        "problem_statuses": problem_statuses,
+        "started_at": overall.get("started_at"),
+        "completed_at": overall.get("completed_at")
+    }
+    if overall and is_stale(overall):
+        response["stale"] = True
+    return response
+
+
+def stale_status_projection(response: dict) -> Optional[dict]:
+    """
+    overall_status_from_state 응답의 stale 항목 상태 필드만 읽는 Mongo projection (stale 항목이 없으면 None)
+    """
+    projection = {}
+    for status in response["problem_statuses"]:
+        if status.get("stale"):
+            number = status["problem_number"]
+            projection[f"problem_data.{number}.processing_status"] = 1
+            projection[f"problem_data.{number}.processing_message"] = 1
+    if response.get("stale"):
+        projection.update({
+            "overall_feedback_status": 1,
+            "overall_feedback_message": 1,
+            "overall_feedback_started_at": 1,
+            "overall_feedback_completed_at": 1
+        })
+    return projection or None
+
+
+def resolve_stale_overall(response: dict, test: Optional[dict]) -> dict:
+    """
+    stale 항목 중 Mongo에 최종 결과(completed/failed)가 저장된 항목만 Mongo 값으로 바꾼 전체 상태 응답
+
+    Mongo에도 최종 결과가 없으면 마지막 중간 상태를 stale 표시와 함께 그대로 둡니다.
+    """
+    test = test or {}
+    problem_data = test.get("problem_data", {})
+    for status in response["problem_statuses"]:
+        stored = problem_data.get(status["problem_number"], {})
+        if status.get("stale") and stored.get("processing_status") in TERMINAL_STATUSES:
+            status.pop("stale")
+            status["status"] = stored["processing_status"]
+            status["message"] = stored.get("processing_message", "")
+
+    if response.get("stale") and test.get("overall_feedback_status") in TERMINAL_STATUSES:
+        response.pop("stale")
+        response["overall_status"] = test["overall_feedback_status"]
+        response["overall_message"] = test.get("overall_feedback_message", "")
+        response["started_at"] = test.get("overall_feedback_started_at", response["started_at"])
+        response["completed_at"] = test.get("overall_feedback_completed_at")
+
+    response["all_problems_completed"] = all(
+        status["status"] == "completed" for status in response["problem_statuses"]
+    )
+    return response
+
+
+def merge_status(problem_data: dict, live: Optional[dict], default_message: str = "") -> Tuple[str, str]:
+    """
+    Mongo에 저장된 문제 상태와 저장소의 중간 상태를 합쳐 (상태, 메시지) 반환
+
+    Mongo 상태가 최종 상태(completed/failed)면 그대로 사용하고,
+    처리 중이면 저장소에 기록된 더 최근의 중간 상태를 사용합니다.
+    """
+    status = problem_data.get("processing_status", "not_started")
+    message = problem_data.get("processing_message", default_message)
+
+    if live and status not in TERMINAL_STATUSES:
+        return live.get("status", status), live.get("message", message)
+    return status, message
+
+
+_store: Optional[StatusStore] = None
+
+
+def get_status_store() -> StatusStore:
+    """전역 StatusStore 인스턴스 반환"""
+    global _store
+
+    if _store is None:
+        _store = StatusStore(
+            redis_client=get_redis_sync(),
+            ttl_seconds=settings.PROCESSING_STATUS_TTL_SECONDS
+        )
+
+    return _store
@@ -0,0 +1,196 @@
+"""
+STT 백엔드 모듈
+
+AudioProcessor가 특정 STT 업체에 묶이지 않도록 음성 인식 요청을 백엔드 인터페이스로 분리합니다.
+- wit_ai: Wit.ai Speech API (운영 기본값)
+- local: 고정 인식 결과를 지연 시간과 함께 돌려주는 로컬 대체 서버 (scripts/stt_stub_server.py)
+새 업체는 SttBackend를 구현하고 register_stt_backend로 등록하면 STT_BACKEND 설정만으로 교체할 수 있습니다.
+"""
+
+import json
+import logging
+from typing import AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Protocol, Union, runtime_checkable
+
+from core.config import settings
+from services.rate_limiter import RateLimiter, wit_ai_limiter
+from services.stt_client import SttHttpClient, get_stt_client
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SttContent = Union[bytes, AsyncIterator[bytes]]
+
+
+@runtime_checkable
+class SttBackend(Protocol):
+    """
+    STT 백엔드 인터페이스
+
+    name은 로그, 메트릭, 음성 인식 캐시 네임스페이스에 사용됩니다.
+    content_types는 변환 없이 그대로 받을 수 있는 업로드 형식입니다 (헤더 검사 후 그대로 전송).
+    네트워크 오류는 그대로 전파하고(동기: requests, 비동기: httpx 예외),
+    서버가 오류 응답을 반환한 경우 ValueError를 발생시킵니다.
+    """
+
+    name: str
+    content_types: FrozenSet[str]
+
+    def transcribe(self, payload: bytes, content_type: str) -> str:
+        """오디오를 인식하여 텍스트 반환 (동기, Celery 워커용)"""
+        ...
+
+    async def atranscribe(self, content: SttContent, content_type: str) -> str:
+        """오디오를 인식하여 텍스트 반환 (비동기, 청크 이터레이터는 chunked 전송)"""
+        ...
+
+
+def parse_wit_response(response_text: str) -> str:
+    """
+    Wit.ai NDJSON 응답을 파싱하여 최종 텍스트 추출
+
+    Args:
+        response_text: Wit.ai API 응답 텍스트 (NDJSON 형식)
+
+    Returns:
+        str: 추출된 텍스트
+    """
+    # Wit.ai는 여러 줄의 JSON으로 응답 (스트리밍 방식)
+    # 마지막 줄에 최종 결과가 있음
+    lines = response_text.strip().split('\n')
+
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        try:
+            result = json.loads(line)
+            if 'text' in result and result['text']:
+                return result['text'].strip()
+        except json.JSONDecodeError:
+            continue
+
+    return ""
+
+
+class HttpSttBackend:
+    """오디오 본문을 POST하고 Wit.ai 형식(NDJSON)의 응답을 받는 HTTP STT 백엔드"""
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        display_name: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content_types: FrozenSet[str] = frozenset(),
+        client: Optional[SttHttpClient] = None,
+        limiter: Optional[RateLimiter] = None
+    ):
+        self.name = name
+        self.url = url
+        self.display_name = display_name or name
+        self.content_types = content_types
+        self.headers = headers or {}
+        self.client = client or get_stt_client()
+        self.limiter = limiter  # 설정 시 모든 프로세스가 공유하는 처리율 제한을 거쳐 호출
+
+    def _headers(self, content_type: str) -> Dict[str, str]:
+        return {**self.headers, "Content-Type": content_type}
+
+    def _parse(self, status_code: int, response_text: str) -> str:
+        if status_code != 200:
+            logger.error(f"{self.display_name} API 오류: {status_code} - {response_text}")
+            raise ValueError(f"{self.display_name} API 오류: {status_code}")
+
+        transcribed_text = parse_wit_response(response_text)
+
+        if transcribed_text:
+            logger.info(f"{self.display_name} 음성 인식 완료: {transcribed_text[:50]}...")
+        else:
+            logger.warning(f"{self.display_name} 음성 인식 결과가 비어있습니다")
+
+        return transcribed_text
+
+    def transcribe(self, payload: bytes, content_type: str) -> str:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        response = self.client.post_sync(self.url, headers=self._headers(content_type), data=payload)
+        return self._parse(response.status_code, response.text)
+
+    async def atranscribe(self, content: SttContent, content_type: str) -> str:
+        if self.limiter is not None:
+            await self.limiter.aacquire()
+        response = await self.client.post(self.url, headers=self._headers(content_type), content=content)
+        return self._parse(response.status_code, response.text)
+
+
+class WitAiBackend(HttpSttBackend):
+    """
+    Wit.ai Speech API 백엔드
+
+    - 무료 무제한 사용 가능
+    - 한국어 지원
+    """
+
+    URL = "https://api.wit.ai/speech"
+    # Wit.ai가 받는 업로드 형식 (WebM은 지원하지 않아 변환 필요)
+    CONTENT_TYPES = frozenset({"audio/mpeg3", "audio/wav", "audio/ogg"})
+
+    def __init__(self, api_key: Optional[str], client: Optional[SttHttpClient] = None):
+        if not api_key:
+            raise ValueError("WIT_AI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+
+        self.api_key = api_key
+        super().__init__(
+            name="wit_ai",
+            url=self.URL,
+            display_name="Wit.ai",
+            headers={"Authorization": f"Bearer {api_key}"},
+            content_types=self.CONTENT_TYPES,
+            client=client,
+            limiter=wit_ai_limiter()
+        )
+
+
+# 백엔드 레지스트리: 이름 -> 생성 함수
+_registry: Dict[str, Callable[[], SttBackend]] = {}
+
+
+def register_stt_backend(name: str):
+    """STT 백엔드 생성 함수를 이름으로 등록하는 데코레이터"""
+    def decorator(factory: Callable[[], SttBackend]) -> Callable[[], SttBackend]:
+        _registry[name] = factory
+        return factory
+    return decorator
+
+
+@register_stt_backend("wit_ai")
+def _create_wit_ai_backend() -> SttBackend:
+    return WitAiBackend(settings.WIT_AI_API_KEY)
+
+
+@register_stt_backend("local")
+def _create_local_backend() -> SttBackend:
+    return HttpSttBackend(
+        name="local",
+        url=settings.STT_LOCAL_URL,
+        display_name="로컬 STT",
+        content_types=frozenset({"audio/mpeg3", "audio/wav", "audio/ogg", "audio/webm"})
+    )
+
+
+def available_stt_backends() -> List[str]:
+    """등록된 STT 백엔드 이름 목록"""
+    return sorted(_registry)
+
+
+def get_stt_backend(name: Optional[str] = None) -> SttBackend:
+    """
+    이름으로 STT 백엔드 생성 (기본값: STT_BACKEND 설정)
+
+    Raises:
+        ValueError: 등록되지 않은 백엔드이거나 백엔드 설정이 잘못된 경우
+    """
+    name = name or settings.STT_BACKEND
+    factory = _registry.get(name)
+    if factory is None:
+        raise ValueError(f"알 수 없는 STT 백엔드입니다: {name} (사용 가능: {', '.join(available_stt_backends())})")
+    return factory()
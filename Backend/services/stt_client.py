@@ -0,0 +1,201 @@
+"""
+STT HTTP 클라이언트 모듈
+
+프로세스당 하나의 연결 풀을 공유하여 STT 요청마다 TCP/TLS 핸드셰이크를 반복하지 않습니다.
+- 비동기: 공유 httpx.AsyncClient (keep-alive 연결 풀, h2 설치 시 HTTP/2)
+- 동기: Celery 워커용 requests.Session 파사드 (같은 동시 요청 제한과 타임아웃 적용)
+- 프로세스 전체의 동시 요청 수를 제한하여 STT 서버 과부하와 연결 고갈을 방지
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import settings
+from core.metrics import STT_REQUESTS_IN_PROGRESS, STT_CONCURRENCY_WAIT
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (httpx의 HTTP/2 지원에는 h2 패키지가 필요)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class _LoopState:
+    """이벤트 루프별 AsyncClient와 세마포어 (httpx 연결은 생성된 루프에서만 사용 가능)"""
+
+    def __init__(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore):
+        self.client = client
+        self.semaphore = semaphore
+
+
+class SttHttpClient:
+    """
+    STT API 호출용 공유 HTTP 클라이언트
+
+    사용법:
+        client = get_stt_client()
+        response = await client.post(url, headers=headers, content=payload)   # API 서버
+        response = client.post_sync(url, headers=headers, data=payload)       # Celery 워커
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        max_concurrency: int = 8,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        http2: bool = True
+    ):
+        self.max_connections = max(1, max_connections)
+        self.max_keepalive = max(0, max_keepalive)
+        self.max_concurrency = max(1, max_concurrency)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2 and http2_available()
+
+        self._loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+    # 비동기 클라이언트
+    def _new_async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(
+                self.read_timeout,
+                connect=self.connect_timeout,
+                pool=self.read_timeout  # 연결 풀이 가득 찬 경우 대기 시간
+            )
+        )
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loop_states.get(loop)
+        if state is None or state.client.is_closed:
+            state = _LoopState(self._new_async_client(), asyncio.Semaphore(self.max_concurrency))
+            self._loop_states[loop] = state
+            logger.info(f"STT HTTP 클라이언트 생성 (HTTP/2: {self.http2}, 최대 연결: {self.max_connections})")
+        return state
+
+    async def post(self, url: str, *, headers: dict, content) -> httpx.Response:
+        """
+        STT 요청 전송 (비동기)
+
+        content에는 bytes 또는 비동기 청크 이터레이터(chunked 전송)를 전달할 수 있습니다.
+
+        Raises:
+            httpx.TimeoutException, httpx.ConnectError: 네트워크 오류
+        """
+        state = self._loop_state()
+
+        wait_start = time.time()
+        async with state.semaphore:
+            STT_CONCURRENCY_WAIT.labels(mode="async").observe(time.time() - wait_start)
+            STT_REQUESTS_IN_PROGRESS.labels(mode="async").inc()
+            try:
+                return await state.client.post(url, headers=headers, content=content)
+            finally:
+                STT_REQUESTS_IN_PROGRESS.labels(mode="async").dec()
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 클라이언트 종료 (앱 종료 시 호출)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        state = self._loop_states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+    # 동기 파사드 (Celery 워커용)
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.max_keepalive or 1,
+                        pool_maxsize=self.max_connections
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def post_sync(self, url: str, *, headers: dict, data: bytes) -> requests.Response:
+        """
+        STT 요청 전송 (동기)
+
+        Raises:
+            requests.exceptions.RequestException: 네트워크 오류
+        """
+        session = self._get_session()
+
+        wait_start = time.time()
+        with self._sync_semaphore:
+            STT_CONCURRENCY_WAIT.labels(mode="sync").observe(time.time() - wait_start)
+            STT_REQUESTS_IN_PROGRESS.labels(mode="sync").inc()
+            try:
+                return session.post(
+                    url,
+                    headers=headers,
+                    data=data,
+                    timeout=(self.connect_timeout, self.read_timeout)
+                )
+            finally:
+                STT_REQUESTS_IN_PROGRESS.labels(mode="sync").dec()
+
+    def close_sync(self) -> None:
+        """동기 세션 종료"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_client: Optional[SttHttpClient] = None
+
+
+def get_stt_client() -> SttHttpClient:
+    """설정 기반 전역 SttHttpClient 인스턴스 반환"""
+    global _client
+
+    if _client is None:
+        _client = SttHttpClient(
+            max_connections=settings.STT_MAX_CONNECTIONS,
+            max_keepalive=settings.STT_MAX_KEEPALIVE,
+            max_concurrency=settings.STT_MAX_CONCURRENCY,
+            connect_timeout=settings.STT_CONNECT_TIMEOUT,
+            read_timeout=settings.STT_READ_TIMEOUT,
+            http2=settings.STT_HTTP2_ENABLED
+        )
+
+    return _client
+
+
+async def close_stt_client() -> None:
+    """전역 클라이언트가 생성되어 있으면 종료"""
+    if _client is not None:
+        await _client.aclose()
+        _client.close_sync()
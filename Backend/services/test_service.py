@@ -1,17 +1,23 @@
+import base64
 import logging
 import traceback
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from fastapi import BackgroundTasks, HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase as Database
 from bson import ObjectId
 
 from models.test import TestModel, TestTypeEnum
-from services.audio_processor import AudioProcessor, FastAudioProcessor
+from services.audio_processor import AudioProcessor
+from services.audio_stream import AudioSource, read_upload, remove_spooled_file
 from services.evaluator import ResponseEvaluator
+from services.score_stats import apply_test_scores
+from services.status_store import get_status_store
+from services.user_cache import load_user
 from services.test_generator import get_random_single_problem, generate_full_test, generate_comboset_test, generate_roleplay_test, generate_unexpected_test
 
 from core.config import settings
+from core.exceptions import APIQuotaExceededError, APIRateLimitError
 from schemas.test import RandomProblemEvaluationResponse
 from core.metrics import BACKGROUND_TASK_DURATION, ACTIVE_TASKS, track_time_async, ERROR_COUNTER
 
@@ -20,19 +26,47 @@ import asyncio
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# 두 가지 전역 인스턴스 생성
-standard_audio_processor = AudioProcessor(model_name="whisper-large-v3")  # 정확성 우선
-fast_audio_processor = FastAudioProcessor(model_name="whisper-large-v3")  # 속도 우선
+# 테스트 히스토리 목록에 필요한 필드 (문제별 피드백, 스크립트 등 큰 필드는 읽지 않음)
+TEST_HISTORY_PROJECTION = {
+    "overall_feedback_status": 1,
+    "test_date": 1,
+    "test_type": 1,
+    "test_type_str": 1,
+    "test_score": 1
+}
+
+# 전역 인스턴스 생성 (STT_BACKEND 설정의 백엔드 사용)
+standard_audio_processor = AudioProcessor()
 
 evaluator = ResponseEvaluator()
 
+
+def is_too_short_response(transcribed_text: str) -> bool:
+    """평가할 수 없을 만큼 짧은 응답인지 확인 (5단어 미만, 무음 녹음은 빈 문자열)"""
+    return len(transcribed_text.split()) < 5
+
+
+def short_response_evaluation() -> Dict[str, Any]:
+    """짧은 응답에 대한 평가 결과 (LLM 호출 없이 NL)"""
+    return {
+        "score": "NL",
+        "feedback": {
+            "paragraph": "응답이 너무 짧아 평가할 수 없습니다. 최소 한 문장 이상의 응답이 필요합니다.",
+            "vocabulary": "응답이 너무 짧아 어휘력을 평가할 수 없습니다.",
+            "spoken_amount": "발화량이 매우 부족합니다. 질문에 대해 충분한 길이로 답변해야 합니다."
+        }
+    }
+
+
 async def get_test_by_user_id(db: Database, user_id: str):
     """
     사용자 ID로 최근 테스트 7개 조회 (성적이 있는 테스트만)
     """
     try:
         # user_id가 일치하는 테스트 중 최근 7개만 조회 (날짜 기준 내림차순)
-        cursor = db.tests.find({"user_id": user_id}).sort("test_date", -1).limit(20)  # 더 많이 가져와서 필터링
+        cursor = db.tests.find(
+            {"user_id": user_id}, {"test_date": 1, "test_score": 1}
+        ).sort("test_date", -1).limit(20)  # 더 많이 가져와서 필터링
         tests = await cursor.to_list(length=20)
         
         if not tests:
@@ -76,6 +110,59 @@ async def get_test_by_user_id(db: Database, user_id: str):
         return None
     
 
+def encode_history_cursor(test: dict) -> str:
+    """히스토리 페이지의 마지막 테스트로 다음 페이지 커서 생성 (test_date, _id)"""
+    raw = f"{test['test_date'].isoformat()}|{test['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    히스토리 커서 해석
+
+    Raises:
+        HTTPException: 형식이 올바르지 않은 커서 (400)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        test_date, test_id = raw.split("|", 1)
+        return datetime.fromisoformat(test_date), ObjectId(test_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다.")
+
+
+async def get_test_history_page(
+    db: Database,
+    user_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    사용자의 테스트 히스토리 한 페이지 조회 (최신순)
+
+    (test_date, _id) 기준 keyset 페이지네이션으로 앞 페이지를 건너뛰지 않고 바로 이어서 읽으며,
+    user_id + test_date + _id 복합 인덱스를 사용해 기록 수와 관계없이 일정한 시간에 조회합니다.
+
+    Returns:
+        (테스트 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+    """
+    query: Dict[str, Any] = {"user_id": user_id}
+    if cursor:
+        test_date, test_id = decode_history_cursor(cursor)
+        query["$or"] = [
+            {"test_date": {"$lt": test_date}},
+            {"test_date": test_date, "_id": {"$lt": test_id}}
+        ]
+
+    tests = await db.tests.find(query, TEST_HISTORY_PROJECTION).sort(
+        [("test_date", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+
+    # 한 개 더 읽어 다음 페이지가 있는지 확인
+    next_cursor = encode_history_cursor(tests[limit - 1]) if len(tests) > limit else None
+    return tests[:limit], next_cursor
+
+
 async def create_test(
     db: Database, 
     test_type: int, 
@@ -100,9 +187,8 @@ async def create_test(
     try:
         logger.info(f"테스트 생성 시작 - 유형: {test_type}, 사용자: {user_id}")
         
-        # 사용자 정보 가져오기
-        user_object_id = ObjectId(user_id)
-        user = await db.users.find_one({"_id": user_object_id})
+        # 사용자 정보 가져오기 (캐시 우선)
+        user = await load_user(db, user_id)
         
         if not user:
             logger.error(f"사용자 ID {user_id}에 해당하는 사용자를 찾을 수 없습니다.")
@@ -127,7 +213,7 @@ async def create_test(
             test_type=is_half_test,  # 기존 bool 필드 설정
             test_type_str=test_type_enum,  # 새 열거형 필드 설정
             problem_data={},
-            user_id=str(user_object_id),
+            user_id=str(user_id),
             test_date=datetime.now()
         )
         
@@ -235,7 +321,7 @@ async def process_audio_and_evaluate(
             test_id=test_id,
             problem_id=problem_id,
             problem_number=problem_number,
-            audio_content=audio_content,
+            audio_source=audio_content,
             is_last_problem=is_last_problem
         )
         
@@ -277,7 +363,7 @@ async def process_audio_background(
     test_id: str,
     problem_id: str,
     problem_number: str,
-    audio_content: bytes,
+    audio_source: AudioSource,
     is_last_problem: bool
 ):
     """
@@ -288,36 +374,40 @@ async def process_audio_background(
         test_id: 테스트 ID
         problem_id: 문제 ID
         problem_number: 문제 번호
-        audio_content: 오디오 파일 바이트 데이터
+        audio_source: 오디오 바이트 데이터 또는 spool_upload로 기록한 임시 파일 경로
+            (임시 파일은 처리 후 삭제)
         is_last_problem: 마지막 문제 여부
     """
+    # 중간 상태는 상태 저장소에만 기록 (상태 API, 실시간 알림), Redis 장애 시에만 테스트 문서에 기록
+    status_store = get_status_store()
+
+    async def set_stage(stage: str, message: str) -> None:
+        if not await status_store.aset_problem_status(test_id, problem_number, stage, message):
+            await db.tests.update_one(
+                {"_id": ObjectId(test_id)},
+                {"$set": {
+                    f"problem_data.{problem_number}.processing_status": stage,
+                    f"problem_data.{problem_number}.processing_message": message
+                }}
+            )
+
     try:
         # 1. 상태 업데이트 - 오디오 처리 중
-        await db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "transcribing",
-                f"problem_data.{problem_number}.processing_message": "음성을 텍스트로 변환 중입니다."
-            }}
-        )
+        await set_stage("transcribing", "음성을 텍스트로 변환 중입니다.")
         
-        # 2. AudioProcessor를 사용하여 오디오 텍스트 변환
+        # 2. AudioProcessor를 사용하여 오디오 텍스트 변환 (ffmpeg -> Wit.ai 스트리밍)
         try:
-            transcribed_text = standard_audio_processor.process_audio(audio_content)
+            transcribed_text = await standard_audio_processor.process_audio_stream(audio_source)
             logger.info(f"음성 변환 완료: {transcribed_text[:50]}...")
+        except (APIQuotaExceededError, APIRateLimitError):
+            # 처리율 제한 대기 초과는 대체 문구를 평가하지 않고 문제를 실패로 기록 (다시 제출 가능)
+            raise
         except Exception as e:
             logger.error(f"음성 변환 중 오류: {str(e)}", exc_info=True)
             transcribed_text = "음성 변환 중 오류가 발생했습니다. 녹음을 다시 시도해 주세요."
         
         # 3. 상태 업데이트 - 평가 중
-        await db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "evaluating",
-                f"problem_data.{problem_number}.processing_message": "응답 평가 중입니다.",
-                f"problem_data.{problem_number}.user_response": transcribed_text
-            }}
-        )
+        await set_stage("evaluating", "응답 평가 중입니다.")
         
         # 4. 문제 정보 가져오기
         problem = await db.problems.find_one({"_id": ObjectId(problem_id)})
@@ -339,16 +429,9 @@ async def process_audio_background(
         
         await db.scripts.insert_one(script_data)
         
-        # 6. 응답이 너무 짧으면 평가 생략
-        if len(transcribed_text.split()) < 5:
-            evaluation_result = {
-                "score": "NL",
-                "feedback": {
-                    "paragraph": "응답이 너무 짧아 평가할 수 없습니다. 최소 한 문장 이상의 응답이 필요합니다.",
-                    "vocabulary": "응답이 너무 짧아 어휘력을 평가할 수 없습니다.",
-                    "spoken_amount": "발화량이 매우 부족합니다. 질문에 대해 충분한 길이로 답변해야 합니다."
-                }
-            }
+        # 6. 응답이 너무 짧으면 평가 생략 (무음 녹음 포함)
+        if is_too_short_response(transcribed_text):
+            evaluation_result = short_response_evaluation()
         else:
             # 7. 매번 새로운 API 키로 평가기 생성
             evaluator_instance = ResponseEvaluator()
@@ -364,17 +447,22 @@ async def process_audio_background(
         score = evaluation_result.get("score", "IM2")
         feedback = evaluation_result.get("feedback", {})
         
-        # 8. 테스트 문서 내 해당 문제의 평가 결과 업데이트
+        # 8. 테스트 문서 내 해당 문제의 평가 결과 업데이트 (결과를 저장한 뒤 완료 알림)
+        completed_at = datetime.now()
         await db.tests.update_one(
             {"_id": ObjectId(test_id)},
             {"$set": {
+                f"problem_data.{problem_number}.user_response": transcribed_text,
                 f"problem_data.{problem_number}.score": score,
                 f"problem_data.{problem_number}.feedback": feedback,
                 f"problem_data.{problem_number}.processing_status": "completed",
                 f"problem_data.{problem_number}.processing_message": "문제 평가가 완료되었습니다.",
-                f"problem_data.{problem_number}.processing_completed_at": datetime.now()
+                f"problem_data.{problem_number}.processing_completed_at": completed_at
             }}
         )
+        await status_store.aset_problem_status(
+            test_id, problem_number, "completed", "문제 평가가 완료되었습니다.", completed_at=completed_at.isoformat()
+        )
         
         logger.info(f"문제 {problem_number} 평가 완료 - 점수: {score}")
         
@@ -387,26 +475,35 @@ async def process_audio_background(
         
         # 오류 발생 시 상태 업데이트
         try:
+            message = f"오류가 발생했습니다: {str(e)}"
+            completed_at = datetime.now()
             await db.tests.update_one(
                 {"_id": ObjectId(test_id)},
                 {"$set": {
                     f"problem_data.{problem_number}.processing_status": "failed",
-                    f"problem_data.{problem_number}.processing_message": f"오류가 발생했습니다: {str(e)}",
+                    f"problem_data.{problem_number}.processing_message": message,
                     f"problem_data.{problem_number}.processing_error": str(e),
-                    f"problem_data.{problem_number}.processing_completed_at": datetime.now()
+                    f"problem_data.{problem_number}.processing_completed_at": completed_at
                 }}
             )
+            await status_store.aset_problem_status(
+                test_id, problem_number, "failed", message, completed_at=completed_at.isoformat()
+            )
             
             # 마지막 문제였다면 전체 피드백 상태도 업데이트
             if is_last_problem:
+                overall_message = f"전체 평가 중 오류가 발생했습니다: {str(e)}"
                 await db.tests.update_one(
                     {"_id": ObjectId(test_id)},
                     {"$set": {
                         "overall_feedback_status": "failed",
-                        "overall_feedback_message": f"전체 평가 중 오류가 발생했습니다: {str(e)}",
-                        "overall_feedback_completed_at": datetime.now()
+                        "overall_feedback_message": overall_message,
+                        "overall_feedback_completed_at": completed_at
                     }}
                 )
+                await status_store.aset_overall_status(
+                    test_id, "failed", overall_message, completed_at=completed_at.isoformat()
+                )
         except Exception as inner_error:
             logger.error(f"오류 상태 업데이트 중 추가 오류: {str(inner_error)}", exc_info=True)
         
@@ -419,6 +516,9 @@ async def process_audio_background(
             "timestamp": datetime.now(),
             "source": "process_audio_background"
         })
+    finally:
+        if isinstance(audio_source, str):
+            remove_spooled_file(audio_source)
 
 
 async def evaluate_overall_test_background(db: Database, test_id: str):
@@ -429,15 +529,21 @@ async def evaluate_overall_test_background(db: Database, test_id: str):
         db: MongoDB 데이터베이스
         test_id: 테스트 ID
     """
+    status_store = get_status_store()
+    started_at = datetime.now()
+
     try:
-        # 1. 상태 업데이트 - 종합 평가 중
-        await db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                "overall_feedback_status": "processing",
-                "overall_feedback_message": "전체 테스트 평가 중입니다."
-            }}
-        )
+        # 1. 상태 업데이트 - 종합 평가 중 (상태 저장소에 기록, Redis 장애 시에만 테스트 문서에 기록)
+        if not await status_store.aset_overall_status(
+            test_id, "processing", "전체 테스트 평가 중입니다.", started_at=started_at.isoformat()
+        ):
+            await db.tests.update_one(
+                {"_id": ObjectId(test_id)},
+                {"$set": {
+                    "overall_feedback_status": "processing",
+                    "overall_feedback_message": "전체 테스트 평가 중입니다."
+                }}
+            )
         
         # 2. 테스트 정보 가져오기
         test = await db.tests.find_one({"_id": ObjectId(test_id)})
@@ -457,7 +563,8 @@ async def evaluate_overall_test_background(db: Database, test_id: str):
         evaluator = ResponseEvaluator()
         evaluation_result = await evaluator.evaluate_overall_test(test, problem_details)
         
-        # 5. 테스트 점수 및 피드백 업데이트
+        # 5. 테스트 점수 및 피드백 업데이트 (결과를 저장한 뒤 완료 알림)
+        completed_at = datetime.now()
         await db.tests.update_one(
             {"_id": ObjectId(test_id)},
             {"$set": {
@@ -465,95 +572,35 @@ async def evaluate_overall_test_background(db: Database, test_id: str):
                 "test_feedback": evaluation_result.get("test_feedback", {}),
                 "overall_feedback_status": "completed",
                 "overall_feedback_message": "전체 테스트 평가가 완료되었습니다.",
-                "overall_feedback_completed_at": datetime.now()
+                "overall_feedback_completed_at": completed_at
             }}
         )
+        await status_store.aset_overall_status(
+            test_id, "completed", "전체 테스트 평가가 완료되었습니다.",
+            started_at=started_at.isoformat(), completed_at=completed_at.isoformat()
+        )
         
         logger.info(f"테스트 {test_id}의 종합 평가가 완료되었습니다.")
         
-        # 6. 사용자의 모든 테스트 가져오기
-        user_tests = await db.tests.find(
-            {"user_id": user_id, "test_score.total_score": {"$exists": True}}
-        ).to_list(length=None)
-        
-        # 7. 테스트 점수 분류
-        all_test_scores = {
-            "total_score": [],
-            "comboset_score": [],
-            "roleplaying_score": [],
-            "unexpected_score": []
-        }
-        
-        # OPIC_LEVELS 정의
-        OPIC_LEVELS = ["NL", "NM", "NH", "IL", "IM1", "IM2", "IM3", "IH", "AL"]
-        
-        for test_doc in user_tests:
-            test_score = test_doc.get("test_score", {})
-            
-            # 각 카테고리별 점수 수집
-            for category in all_test_scores.keys():
-                score = test_score.get(category)
-                if score and score != "N/A" and score in OPIC_LEVELS:
-                    all_test_scores[category].append(score)
-        
-        # 8. 평균 점수 계산
-        user_average_scores = {}
-        
-        for category, scores in all_test_scores.items():
-            if not scores:
-                user_average_scores[category] = None
-                continue
-                
-            # 레벨을 숫자로 변환
-            level_values = []
-            for level in scores:
-                try:
-                    level_index = OPIC_LEVELS.index(level)
-                    level_values.append(level_index)
-                except (ValueError, IndexError):
-                    # 유효하지 않은 레벨은 중간 레벨(IM2)로 처리
-                    level_values.append(OPIC_LEVELS.index("IM2"))
-            
-            # 평균 계산 및 가장 가까운 레벨 반환
-            average_value = sum(level_values) / len(level_values)
-            closest_index = round(average_value)
-            
-            # 인덱스 범위 확인
-            if closest_index < 0:
-                closest_index = 0
-            elif closest_index >= len(OPIC_LEVELS):
-                closest_index = len(OPIC_LEVELS) - 1
-            
-            user_average_scores[category] = OPIC_LEVELS[closest_index]
-        
-        # 9. 사용자 평균 점수 업데이트
-        await db.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": {
-                "average_score": {
-                    "total_score": user_average_scores.get("total_score"),
-                    "comboset_score": user_average_scores.get("comboset_score"),
-                    "roleplaying_score": user_average_scores.get("roleplaying_score"),
-                    "unexpected_score": user_average_scores.get("unexpected_score")
-                }
-            }}
-        )
-        
-        logger.info(f"사용자 {user_id}의 평균 점수가 업데이트되었습니다: {user_average_scores}")
+        # 6. 사용자 평균 점수 업데이트 (이 테스트의 점수만 누적값에 반영)
+        await apply_test_scores(db, test_id, user_id, evaluation_result.get("test_score", {}))
         
     except Exception as e:
         logger.error(f"종합 평가 중 오류: {str(e)}", exc_info=True)
         
         # 오류 발생 시 상태 업데이트
         try:
+            message = f"전체 평가 중 오류가 발생했습니다: {str(e)}"
+            completed_at = datetime.now()
             await db.tests.update_one(
                 {"_id": ObjectId(test_id)},
                 {"$set": {
                     "overall_feedback_status": "failed",
-                    "overall_feedback_message": f"전체 평가 중 오류가 발생했습니다: {str(e)}",
-                    "overall_feedback_completed_at": datetime.now()
+                    "overall_feedback_message": message,
+                    "overall_feedback_completed_at": completed_at
                 }}
             )
+            await status_store.aset_overall_status(test_id, "failed", message, completed_at=completed_at.isoformat())
         except Exception as inner_error:
             logger.error(f"오류 상태 업데이트 중 추가 오류: {str(inner_error)}", exc_info=True)
         
@@ -569,7 +616,7 @@ async def evaluate_overall_test_background(db: Database, test_id: str):
 
 async def get_audio_content(test, audio_file):
     if audio_file:
-        return await audio_file.read()
+        return await read_upload(audio_file)
     
     audio_content = test.get("cached_audio_content")
     if not audio_content:
@@ -616,14 +663,18 @@ async def validate_audio_file(audio_file):
     if len(audio_content) > max_size:
         raise HTTPException(status_code=400, detail=f"파일 크기가 너무 큽니다.")
 
-async def transcribe_audio(audio_content, user_id):
+async def transcribe_audio(audio_source: AudioSource, user_id):
     try:
-        if not audio_content:
+        if not audio_source:
             raise ValueError("오디오 파일이 비어있습니다.")
         
-        logger.info(f"음성 변환 시작 - 파일 크기: {len(audio_content)} 바이트")
+        if isinstance(audio_source, bytes):
+            logger.info(f"음성 변환 시작 - 파일 크기: {len(audio_source)} 바이트")
+        else:
+            logger.info("음성 변환 시작 - 스트리밍 입력")
         
-        transcribed_text = fast_audio_processor.process_audio_fast(audio_content)
+        # 업로드 청크를 그대로 ffmpeg -> STT로 흘려보내 이벤트 루프를 막지 않음
+        transcribed_text = await standard_audio_processor.process_audio_stream(audio_source)
         
         logger.info(f"음성 변환 성공: {transcribed_text[:50]}...")
         return transcribed_text
@@ -654,6 +705,11 @@ async def evaluate_response(
     problem
 ):
     """사용자 응답 평가 실행"""
+    # 무음이거나 너무 짧은 응답은 LLM 호출 없이 NL 처리
+    if is_too_short_response(transcribed_text):
+        logger.info("응답이 너무 짧아 평가를 생략합니다 (NL)")
+        return short_response_evaluation()
+
     logger.info(f"응답 평가 시작 - 문제 카테고리: {problem_category}, 토픽: {topic_category}")
     
     evaluator = ResponseEvaluator()
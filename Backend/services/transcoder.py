@@ -0,0 +1,231 @@
+import asyncio
+import contextlib
+import logging
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.config import settings
+from core.metrics import AUDIO_PIPELINE_STAGE_DURATION, TRANSCODE_IN_PROGRESS, TRANSCODE_OUTPUT_BYTES
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+MAX_AUDIO_SECONDS = 120     # 2분으로 제한 (비용 효율성)
+TARGET_SAMPLE_RATE = 16000  # STT 입력 샘플레이트 (16kHz)
+PLAYBACK_SAMPLE_RATE = 24000  # 청취용 음성 샘플레이트 (24kHz, TTS 출력과 같음)
+PLAYBACK_BITRATE = "48k"      # 청취용 모노 MP3 비트레이트 (24kHz 16비트 WAV 대비 약 1/8)
+
+# 16kHz 모노 16비트 리틀 엔디언 PCM (VAD 입력, Wit.ai 스트리밍 전송 형식)
+PCM_FORMAT_ARGS = ("-f", "s16le", "-acodec", "pcm_s16le")
+PCM_CONTENT_TYPE = f"audio/raw;encoding=signed-integer;bits=16;rate={TARGET_SAMPLE_RATE};endian=little"
+
+# 바이트 입력 (표준 입력): cache 프로토콜로 읽은 내용을 임시 파일에 보관해 탐색할 수 있게 함
+# (moov 아톰이 파일 끝에 있는 M4A/MP4는 일반 파이프 입력으로는 디코딩할 수 없음, pydub과 같은 방식)
+PIPE_INPUT = "cache:pipe:0"
+
+
+class TranscodeError(ValueError):
+    """ffmpeg 변환 실패 (손상되었거나 지원되지 않는 오디오)"""
+
+
+@dataclass(frozen=True)
+class TranscodeProfile:
+    """STT 전송용 출력 형식"""
+    name: str
+    codec_args: tuple
+    content_type: str
+
+
+PROFILES = {
+    # Wit.ai 기본 형식
+    "mp3": TranscodeProfile("mp3", ("-c:a", "libmp3lame", "-b:a", "64k", "-f", "mp3"), "audio/mpeg3"),
+    # 음성 전용 Opus: 같은 품질에서 MP3 대비 약 1/3 크기
+    "opus": TranscodeProfile(
+        "opus",
+        ("-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg"),
+        "audio/ogg"
+    ),
+}
+
+
+class Transcoder:
+    """
+    ffmpeg 변환 서비스: 입력 오디오를 한 번의 ffmpeg 실행으로 16kHz 모노 STT 형식으로 변환
+
+    pydub처럼 전체를 PCM으로 풀어 파이썬 메모리에 올리지 않고,
+    디코딩/리샘플링/다운믹스/인코딩을 하나의 ffmpeg 프로세스 안에서 처리합니다.
+    동시에 실행되는 ffmpeg 수는 프로세스당 max_workers개로 제한합니다 (동기/비동기 경로 공용).
+    """
+
+    def __init__(
+        self,
+        output_format: str = "mp3",
+        max_workers: int = 4,
+        timeout: float = 60.0,
+        ffmpeg_path: str = "ffmpeg"
+    ):
+        if output_format not in PROFILES:
+            logger.warning(f"알 수 없는 변환 형식 '{output_format}', mp3로 대체합니다.")
+            output_format = "mp3"
+
+        self.profile = PROFILES[output_format]
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.ffmpeg_path = ffmpeg_path
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+    @property
+    def content_type(self) -> str:
+        """STT 요청에 사용할 Content-Type"""
+        return self.profile.content_type
+
+    def ffmpeg_args(
+        self,
+        input_path: str = PIPE_INPUT,
+        pcm_input: bool = False,
+        pcm_output: bool = False
+    ) -> List[str]:
+        """
+        ffmpeg 명령행 인자 (입력 -> 2분 제한, 16kHz 모노 -> 표준 출력)
+
+        Args:
+            input_path: 입력 파일 경로 (기본값: 탐색 가능한 표준 입력)
+            pcm_input: 입력이 16kHz 모노 PCM인 경우 (VAD 결과 인코딩)
+            pcm_output: profile 형식 대신 16kHz 모노 PCM으로 출력 (VAD 입력)
+        """
+        input_args = ["-f", "s16le", "-ar", str(TARGET_SAMPLE_RATE), "-ac", "1"] if pcm_input else []
+        output_args = PCM_FORMAT_ARGS if pcm_output else self.profile.codec_args
+        return [
+            self.ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            *input_args,
+            "-i", input_path,
+            "-t", str(MAX_AUDIO_SECONDS),
+            "-vn", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+            *output_args,
+            "pipe:1"
+        ]
+
+    def _observe(self, stage: str, start_time: float) -> None:
+        AUDIO_PIPELINE_STAGE_DURATION.labels(stage=stage, format=self.profile.name).observe(time.time() - start_time)
+
+    @contextlib.contextmanager
+    def slot(self):
+        """변환 슬롯 확보 (동기 버전, 대기 시간은 queue_wait 단계로 기록)"""
+        start_time = time.time()
+        self._slots.acquire()
+        self._observe("queue_wait", start_time)
+        TRANSCODE_IN_PROGRESS.inc()
+        try:
+            yield
+        finally:
+            TRANSCODE_IN_PROGRESS.dec()
+            self._slots.release()
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self, poll_interval: float = 0.02):
+        """
+        변환 슬롯 확보 (비동기 버전)
+
+        동기 경로와 같은 세마포어를 공유하며, 이벤트 루프를 막지 않도록 논블로킹으로 재시도합니다.
+        """
+        start_time = time.time()
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(poll_interval)
+        self._observe("queue_wait", start_time)
+        TRANSCODE_IN_PROGRESS.inc()
+        try:
+            yield
+        finally:
+            TRANSCODE_IN_PROGRESS.dec()
+            self._slots.release()
+
+    def _run(self, args: List[str], audio_content: bytes, stage: str) -> bytes:
+        """변환 슬롯 안에서 ffmpeg를 한 번 실행하고 표준 출력 반환"""
+        with self.slot():
+            start_time = time.time()
+            try:
+                result = subprocess.run(
+                    args,
+                    input=audio_content,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=self.timeout,
+                    check=False
+                )
+            except subprocess.TimeoutExpired:
+                raise TranscodeError(f"오디오 변환 시간 초과 ({self.timeout}초)")
+            finally:
+                self._observe(stage, start_time)
+
+        if result.returncode != 0 or not result.stdout:
+            stderr = result.stderr.decode("utf-8", errors="ignore").strip()
+            raise TranscodeError(f"오디오 변환 실패 (코드 {result.returncode}): {stderr[-200:]}")
+
+        return result.stdout
+
+    def transcode(self, audio_content: bytes) -> bytes:
+        """
+        오디오 바이트를 STT 전송 형식으로 변환 (동기 버전, Celery 워커용)
+
+        Returns:
+            bytes: 변환된 오디오 (16kHz 모노, profile 형식)
+
+        Raises:
+            TranscodeError: ffmpeg가 실패하거나 시간 초과된 경우
+            FileNotFoundError: ffmpeg 실행 파일이 없는 경우
+        """
+        output = self._run(self.ffmpeg_args(), audio_content, "transcode")
+        TRANSCODE_OUTPUT_BYTES.labels(format=self.profile.name).observe(len(output))
+        logger.info(f"오디오 변환 완료: {len(audio_content)} -> {len(output)} 바이트 ({self.profile.name})")
+        return output
+
+    def decode_pcm(self, audio_content: bytes) -> bytes:
+        """오디오 바이트를 16kHz 모노 16비트 PCM으로 디코딩 (2분 제한)"""
+        return self._run(self.ffmpeg_args(pcm_output=True), audio_content, "decode")
+
+    def encode_pcm(self, pcm: bytes) -> bytes:
+        """16kHz 모노 PCM을 STT 전송 형식으로 인코딩"""
+        output = self._run(self.ffmpeg_args(pcm_input=True), pcm, "encode")
+        TRANSCODE_OUTPUT_BYTES.labels(format=self.profile.name).observe(len(output))
+        return output
+
+    def playback_args(self) -> List[str]:
+        """청취용 MP3 인코딩 인자 (STT 형식과 달리 길이 제한 없이 24kHz 모노)"""
+        return [
+            self.ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-i", PIPE_INPUT,
+            "-vn", "-ac", "1", "-ar", str(PLAYBACK_SAMPLE_RATE),
+            "-c:a", "libmp3lame", "-b:a", PLAYBACK_BITRATE, "-f", "mp3",
+            "pipe:1"
+        ]
+
+    def encode_playback(self, audio_content: bytes) -> bytes:
+        """
+        TTS 결과(WAV 등)를 청취용 MP3로 인코딩 (STT 변환과 같은 동시 실행 제한 사용)
+
+        Raises:
+            TranscodeError: ffmpeg가 실패하거나 시간 초과된 경우
+        """
+        output = self._run(self.playback_args(), audio_content, "playback_encode")
+        logger.info(f"청취용 오디오 인코딩 완료: {len(audio_content)} -> {len(output)} 바이트")
+        return output
+
+
+_transcoder: Optional[Transcoder] = None
+
+
+def get_transcoder() -> Transcoder:
+    """설정 기반 전역 Transcoder 인스턴스 반환"""
+    global _transcoder
+
+    if _transcoder is None:
+        _transcoder = Transcoder(
+            output_format=settings.AUDIO_TRANSCODE_FORMAT,
+            max_workers=settings.AUDIO_TRANSCODE_WORKERS,
+            timeout=settings.AUDIO_TRANSCODE_TIMEOUT
+        )
+
+    return _transcoder
@@ -0,0 +1,166 @@
+"""
+음성 인식 결과 캐시 모듈
+
+같은 녹음이 다시 제출되면 (재시도, 중복 클릭, BackgroundTasks/Celery 경로 중복 실행 등)
+STT를 다시 호출하지 않고 저장된 텍스트를 바로 반환합니다.
+- 1차 키: 업로드 원본 바이트의 BLAKE2b 해시 (변환 전에 조회하여 ffmpeg 실행도 생략)
+- 2차 키: 변환된 STT 전송 데이터의 해시 (컨테이너/메타데이터만 다른 같은 녹음)
+- 프로세스 로컬 LRU + Redis(TTL) 2단계 저장, Redis 장애 시에는 로컬 캐시만 사용
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from core.config import settings
+from core.metrics import STT_CACHE_LOOKUPS
+from db.redis import get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def new_audio_hasher():
+    """오디오 지문용 해시 객체 (청크 단위 갱신용)"""
+    return hashlib.blake2b(digest_size=16)
+
+
+def audio_digest(data: bytes) -> str:
+    """오디오 바이트의 지문 (BLAKE2b 128비트)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def audio_file_digest(path: str) -> str:
+    """오디오 파일의 지문 (파일 전체를 메모리에 올리지 않음)"""
+    hasher = new_audio_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class TranscriptCache:
+    """오디오 지문 -> 음성 인식 텍스트 캐시"""
+
+    PREFIX = "stt_cache:"
+    REDIS_RETRY_SECONDS = 30.0  # Redis 오류 후 다시 시도하기까지 대기 시간
+
+    def __init__(
+        self,
+        redis_client=None,
+        namespace: str = "wit_ai",
+        ttl_seconds: int = 86400,
+        local_size: int = 256
+    ):
+        self._redis = redis_client
+        self._namespace = namespace
+        self._ttl_seconds = ttl_seconds
+        self._local_size = local_size
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_disabled_until = 0.0
+
+    def _key(self, digest: str) -> str:
+        return f"{self.PREFIX}{self._namespace}:{digest}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_disabled_until
+
+    def _on_redis_error(self, e: Exception) -> None:
+        # Redis 장애가 요청마다 지연을 더하지 않도록 잠시 Redis 조회를 건너뜀
+        self._redis_disabled_until = time.time() + self.REDIS_RETRY_SECONDS
+        logger.warning(f"음성 인식 캐시 Redis 오류, {self.REDIS_RETRY_SECONDS:.0f}초간 로컬 캐시만 사용: {e}")
+
+    def _remember(self, digest: str, transcript: str) -> None:
+        if self._local_size <= 0:
+            return
+        with self._lock:
+            self._local[digest] = transcript
+            self._local.move_to_end(digest)
+            while len(self._local) > self._local_size:
+                self._local.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[str]:
+        """지문으로 캐시된 텍스트 조회 (없으면 None)"""
+        with self._lock:
+            transcript = self._local.get(digest)
+            if transcript is not None:
+                self._local.move_to_end(digest)
+
+        if transcript is not None:
+            STT_CACHE_LOOKUPS.labels(layer="local", result="hit").inc()
+            return transcript
+
+        if self._redis_available():
+            try:
+                value = self._redis.get(self._key(digest))
+            except Exception as e:
+                self._on_redis_error(e)
+                value = None
+
+            if value is not None:
+                transcript = value.decode("utf-8") if isinstance(value, bytes) else value
+                self._remember(digest, transcript)
+                STT_CACHE_LOOKUPS.labels(layer="redis", result="hit").inc()
+                return transcript
+
+        STT_CACHE_LOOKUPS.labels(layer="all", result="miss").inc()
+        return None
+
+    def set(self, *digests: Optional[str], transcript: str) -> None:
+        """
+        텍스트를 하나 이상의 지문으로 저장
+
+        빈 결과는 일시적인 STT 오류일 수 있으므로 저장하지 않습니다.
+        """
+        digests = [d for d in digests if d]
+        if not transcript or not digests:
+            return
+
+        for digest in digests:
+            self._remember(digest, transcript)
+
+        if self._redis_available():
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for digest in digests:
+                    pipe.set(self._key(digest), transcript, ex=self._ttl_seconds)
+                pipe.execute()
+            except Exception as e:
+                self._on_redis_error(e)
+
+    async def aget(self, digest: str) -> Optional[str]:
+        """get의 비동기 버전 (Redis 왕복 동안 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.get, digest)
+
+    async def aset(self, *digests: Optional[str], transcript: str) -> None:
+        """set의 비동기 버전"""
+        await asyncio.to_thread(self.set, *digests, transcript=transcript)
+
+    def clear_local(self) -> None:
+        """로컬 캐시 비우기"""
+        with self._lock:
+            self._local.clear()
+
+
+_caches: Dict[str, TranscriptCache] = {}
+
+
+def get_transcript_cache(namespace: str = "wit_ai") -> TranscriptCache:
+    """STT 백엔드(네임스페이스)별 전역 TranscriptCache 인스턴스 반환"""
+    cache = _caches.get(namespace)
+
+    if cache is None:
+        cache = _caches.setdefault(namespace, TranscriptCache(
+            redis_client=get_redis_sync(),
+            namespace=namespace,
+            ttl_seconds=settings.STT_CACHE_TTL_SECONDS
+        ))
+
+    return cache
@@ -0,0 +1,189 @@
+"""
+음성 합성(TTS) 결과 캐시 모듈
+
+문제 음성을 요청마다 gTTS로 합성하고 작업 디렉터리에 임시 파일을 썼다가 Base64 JSON으로 돌려주던 방식을,
+텍스트와 음성(합성기, 언어)의 해시로 주소를 정한 MP3 파일 캐시로 대체합니다.
+- 키: BLAKE2b(음성 + 텍스트) → 같은 내용은 항상 같은 파일 (내용이 바뀌면 새 키)
+- 로컬 디스크에 저장하여 FileResponse로 바로 제공 (Range 요청, ETag 지원)
+- TTS_CACHE_BACKEND=s3이면 S3/MinIO(tts-audio/)에도 보관하여 다른 서버는 합성 대신 내려받음
+- 같은 키를 동시에 요청하면 한 번만 합성하고 나머지는 그 결과를 사용 (single-flight)
+- scripts/prerender_problem_audio.py로 전체 문제 음성을 미리 채워 둘 수 있음
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import re
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi.responses import FileResponse, Response
+
+from core.config import settings
+from core.metrics import TTS_CACHE_LOOKUPS
+from services.blob_store import BlobNotFoundError, BlobStore, S3BlobStore
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+GTTS_VOICE = "gtts:en"  # 문제 음성 (gTTS 영어)
+AUDIO_EXTENSION = "mp3"
+AUDIO_MEDIA_TYPE = "audio/mpeg"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def tts_digest(text: str, voice: str) -> str:
+    """텍스트와 음성의 캐시 키 (BLAKE2b 128비트)"""
+    return hashlib.blake2b(f"{voice}\0{text.strip()}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def synthesize_gtts(text: str, lang: str = "en") -> bytes:
+    """gTTS로 MP3 합성 (네트워크 호출, 동기)"""
+    from gtts import gTTS
+
+    buffer = io.BytesIO()
+    gTTS(text=text, lang=lang).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+async def render_gtts(text: str) -> bytes:
+    """synthesize_gtts의 비동기 버전 (합성 동안 이벤트 루프를 막지 않음)"""
+    return await asyncio.to_thread(synthesize_gtts, text)
+
+
+class TtsCache:
+    """(텍스트, 음성) 해시 -> MP3 파일 캐시"""
+
+    def __init__(self, cache_dir: str, store: Optional[BlobStore] = None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self._store = store
+        self._inflight: Dict[str, asyncio.Lock] = {}
+
+    def path_for(self, digest: str) -> str:
+        """캐시 파일 경로 (한 디렉터리에 파일이 몰리지 않도록 앞 두 글자로 나눔)"""
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.{AUDIO_EXTENSION}")
+
+    def _store_name(self, digest: str) -> str:
+        return f"{digest[:2]}/{digest}.{AUDIO_EXTENSION}"
+
+    def _write_local(self, digest: str, data: bytes) -> str:
+        path = self.path_for(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # 제공 중인 파일이 중간 상태로 보이지 않도록 원자적으로 교체
+        return path
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """캐시된 파일 경로 조회 (로컬에 없으면 공유 저장소에서 내려받음, 없으면 None)"""
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            TTS_CACHE_LOOKUPS.labels(layer="local", result="hit").inc()
+            return path
+
+        if self._store is not None:
+            try:
+                data = self._store.get(f"{self._store.prefix}{self._store_name(digest)}")
+            except BlobNotFoundError:
+                data = None
+            except Exception as e:
+                logger.warning(f"TTS 캐시 저장소 조회 실패 ({digest}): {e}")
+                data = None
+
+            if data:
+                TTS_CACHE_LOOKUPS.labels(layer="store", result="hit").inc()
+                return self._write_local(digest, data)
+
+        TTS_CACHE_LOOKUPS.labels(layer="all", result="miss").inc()
+        return None
+
+    def save(self, digest: str, data: bytes) -> str:
+        """합성 결과 저장 (로컬 + 공유 저장소) 후 로컬 경로 반환"""
+        path = self._write_local(digest, data)
+        if self._store is not None:
+            try:
+                self._store.put_key(self._store_name(digest), data)
+            except Exception as e:
+                logger.warning(f"TTS 캐시 저장소 기록 실패 ({digest}), 로컬에만 보관: {e}")
+        return path
+
+    async def aensure(
+        self,
+        text: str,
+        voice: str,
+        render: Callable[[str], Awaitable[bytes]]
+    ) -> Tuple[str, str]:
+        """
+        캐시된 음성 파일을 반환하고, 없으면 render로 합성하여 저장
+
+        Args:
+            text: 합성할 텍스트
+            voice: 합성기/언어 식별자 (캐시 키에 포함)
+            render: 텍스트 -> 오디오 바이트 (캐시가 없을 때 키마다 한 번만 호출)
+
+        Returns:
+            Tuple[str, str]: (캐시 키, 로컬 파일 경로)
+        """
+        digest = tts_digest(text, voice)
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            TTS_CACHE_LOOKUPS.labels(layer="local", result="hit").inc()
+            return digest, path
+
+        lock = self._inflight.setdefault(digest, asyncio.Lock())
+        try:
+            async with lock:
+                # 먼저 합성한 요청이 있으면 그 결과를 사용
+                path = await asyncio.to_thread(self.lookup, digest)
+                if path is None:
+                    data = await render(text)
+                    if not data:
+                        raise ValueError("음성 합성 결과가 비어 있습니다")
+                    path = await asyncio.to_thread(self.save, digest, data)
+                    TTS_CACHE_LOOKUPS.labels(layer="render", result="stored").inc()
+        finally:
+            if not lock.locked() and self._inflight.get(digest) is lock:
+                del self._inflight[digest]
+
+        return digest, path
+
+
+def audio_file_response(
+    path: str,
+    digest: str,
+    cache_control: str = IMMUTABLE_CACHE_CONTROL,
+    if_none_match: Optional[str] = None
+) -> Response:
+    """
+    캐시된 음성 파일 응답 (Range 요청 지원)
+
+    Args:
+        cache_control: Cache-Control 헤더 (기본: 내용 주소 URL용 immutable)
+        if_none_match: 요청의 If-None-Match 헤더 (ETag가 같으면 본문 없이 304)
+    """
+    headers = {"Cache-Control": cache_control, "ETag": f'"{digest}"'}
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=AUDIO_MEDIA_TYPE, headers=headers)
+
+
+_cache: Optional[TtsCache] = None
+
+
+def get_tts_cache() -> TtsCache:
+    """설정 기반 전역 TtsCache 인스턴스 반환"""
+    global _cache
+
+    if _cache is None:
+        store = None
+        if settings.TTS_CACHE_BACKEND == "s3":
+            store = S3BlobStore(
+                bucket=settings.AUDIO_BLOB_BUCKET or settings.AWS_S3_BUCKET_NAME,
+                prefix=settings.TTS_CACHE_PREFIX
+            )
+        _cache = TtsCache(settings.TTS_CACHE_DIR, store=store)
+
+    return _cache
@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 from db.mongodb import get_mongodb
 from bson import ObjectId
 from datetime import date, datetime
+from services.user_cache import get_user_cache
 
 async def create_user(
     name: str,
@@ -145,6 +146,7 @@ async def update_user(user_id: ObjectId, update_data: Dict) -> Optional[Dict]:
         {"_id": user_id},
         {"$set": filtered_update}
     )
+    await get_user_cache().ainvalidate(user_id)
     
     if result.modified_count == 0 and result.matched_count == 0:
         # 문서가 존재하지 않음
@@ -161,6 +163,7 @@ async def delete_user(user_id: ObjectId) -> bool:
     users_collection = db.users
     
     result = await users_collection.delete_one({"_id": user_id})
+    await get_user_cache().ainvalidate(user_id)
     
     # 삭제된 문서가 있는지 확인
     return result.deleted_count > 0
\ No newline at end of file
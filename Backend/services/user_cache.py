@@ -0,0 +1,306 @@
+"""
+인증 사용자 캐시 모듈
+
+인증이 필요한 모든 요청이 get_current_user에서 users 컬렉션을 조회하므로,
+사용자 문서를 짧은 시간 캐시하여 요청마다 반복되는 Mongo 조회를 줄입니다.
+- 프로세스 로컬 LRU(짧은 TTL) + Redis(TTL) 2단계 저장, Redis 장애 시에는 로컬 캐시만 사용
+- users를 수정하는 모든 경로(limits $inc, 프로필 수정, 평균 점수 갱신, 제한 초기화)에서
+  invalidate로 즉시 삭제하고 user_cache_invalidations 채널로 발행
+  - API 프로세스는 listen_for_invalidations로 구독하여 다른 프로세스(워커, 스케줄러)의 변경도 로컬에서 즉시 삭제
+  - 구독이 끊겨도 로컬 값은 USER_CACHE_LOCAL_TTL_SECONDS 안에 만료
+- 조회 중에 무효화가 일어나면 조회한(이전) 문서는 저장하지 않음 (무효화 직후 이전 값이 다시 캐시되지 않도록)
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from bson import ObjectId, json_util
+
+from core.config import settings
+from core.metrics import USER_CACHE_LOOKUPS
+from db.redis import get_redis_async, get_redis_sync
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# Mongo 문서의 ObjectId/datetime을 그대로 복원 (Motor와 같이 timezone 없는 datetime)
+_JSON_OPTIONS = json_util.CANONICAL_JSON_OPTIONS.with_options(tz_aware=False)
+INVALIDATE_ALL = "*"
+
+
+class UserCache:
+    """사용자 ID -> 사용자 문서 캐시"""
+
+    PREFIX = "user_cache:"
+    CHANNEL = "user_cache_invalidations"
+    REDIS_RETRY_SECONDS = 30.0  # Redis 오류 후 다시 시도하기까지 대기 시간
+
+    def __init__(
+        self,
+        redis_client=None,
+        ttl_seconds: int = 60,
+        local_ttl_seconds: float = 5.0,
+        local_size: int = 1024
+    ):
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._local_ttl_seconds = local_ttl_seconds
+        self._local_size = local_size
+        self._local: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_disabled_until = 0.0
+        self._epoch = 0  # 무효화할 때마다 증가 (조회 중 무효화 감지용)
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.PREFIX}{user_id}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_disabled_until
+
+    def _on_redis_error(self, e: Exception) -> None:
+        # Redis 장애가 요청마다 지연을 더하지 않도록 잠시 Redis 조회를 건너뜀
+        self._redis_disabled_until = time.time() + self.REDIS_RETRY_SECONDS
+        logger.warning(f"사용자 캐시 Redis 오류, {self.REDIS_RETRY_SECONDS:.0f}초간 로컬 캐시만 사용: {e}")
+
+    @property
+    def epoch(self) -> int:
+        """현재 무효화 세대 (set의 epoch 인자로 전달)"""
+        return self._epoch
+
+    def _remember(self, user_id: str, user: dict) -> None:
+        if self._local_size <= 0 or self._local_ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + self._local_ttl_seconds, user)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self._local_size:
+                self._local.popitem(last=False)
+
+    def get_local(self, user_id: str) -> Optional[dict]:
+        """로컬 캐시에서만 조회 (만료되었거나 없으면 None)"""
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+
+        USER_CACHE_LOOKUPS.labels(layer="local", result="hit").inc()
+        # User.from_mongo 등이 문서를 수정하므로 사본을 반환
+        return copy.deepcopy(entry[1])
+
+    def get(self, user_id: str) -> Optional[dict]:
+        """사용자 ID로 캐시된 문서 조회 (없으면 None)"""
+        user = self.get_local(user_id)
+        if user is not None:
+            return user
+
+        user_id = str(user_id)
+        if self._redis_available():
+            try:
+                value = self._redis.get(self._key(user_id))
+            except Exception as e:
+                self._on_redis_error(e)
+                value = None
+
+            if value is not None:
+                try:
+                    user = json_util.loads(value, json_options=_JSON_OPTIONS)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"사용자 캐시 값 해석 실패 ({user_id}): {e}")
+                    user = None
+
+                if isinstance(user, dict):
+                    self._remember(user_id, copy.deepcopy(user))
+                    USER_CACHE_LOOKUPS.labels(layer="redis", result="hit").inc()
+                    return user
+
+        USER_CACHE_LOOKUPS.labels(layer="all", result="miss").inc()
+        return None
+
+    def set(self, user_id: str, user: dict, epoch: Optional[int] = None) -> bool:
+        """
+        사용자 문서 저장
+
+        Args:
+            epoch: 조회를 시작할 때의 epoch (그 사이 무효화가 있었으면 저장하지 않음)
+
+        Returns:
+            bool: 저장 여부
+        """
+        if not user or (epoch is not None and epoch != self._epoch):
+            return False
+
+        user_id = str(user_id)
+        self._remember(user_id, copy.deepcopy(user))
+
+        if self._redis_available():
+            try:
+                self._redis.set(
+                    self._key(user_id), json_util.dumps(user, json_options=_JSON_OPTIONS), ex=self._ttl_seconds
+                )
+            except Exception as e:
+                self._on_redis_error(e)
+        return True
+
+    def drop_local(self, user_ids: Iterable[str]) -> None:
+        """로컬 캐시에서 삭제 (다른 프로세스의 무효화 알림 처리용)"""
+        with self._lock:
+            self._epoch += 1
+            for user_id in user_ids:
+                self._local.pop(str(user_id), None)
+
+    def clear_local(self) -> None:
+        """로컬 캐시 비우기"""
+        with self._lock:
+            self._epoch += 1
+            self._local.clear()
+
+    def invalidate(self, *user_ids) -> None:
+        """사용자 정보가 바뀌었을 때 호출 (로컬, Redis에서 삭제하고 다른 프로세스에 알림)"""
+        user_ids = [str(user_id) for user_id in user_ids if user_id]
+        if not user_ids:
+            return
+
+        self.drop_local(user_ids)
+        if self._redis_available():
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.delete(*(self._key(user_id) for user_id in user_ids))
+                pipe.publish(self.CHANNEL, ",".join(user_ids))
+                pipe.execute()
+            except Exception as e:
+                self._on_redis_error(e)
+
+    def invalidate_all(self) -> None:
+        """모든 사용자 정보가 바뀌었을 때 호출 (제한 일괄 초기화 등)"""
+        self.clear_local()
+        if self._redis_available():
+            try:
+                keys = list(self._redis.scan_iter(match=f"{self.PREFIX}*", count=500))
+                pipe = self._redis.pipeline(transaction=False)
+                for start in range(0, len(keys), 500):
+                    pipe.delete(*keys[start:start + 500])
+                pipe.publish(self.CHANNEL, INVALIDATE_ALL)
+                pipe.execute()
+            except Exception as e:
+                self._on_redis_error(e)
+
+    def handle_invalidation(self, data) -> None:
+        """무효화 채널 메시지 처리"""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if not data:
+            return
+        if data == INVALIDATE_ALL:
+            self.clear_local()
+        else:
+            self.drop_local(data.split(","))
+
+    async def aget(self, user_id: str) -> Optional[dict]:
+        """get의 비동기 버전 (로컬 적중은 바로 반환, Redis 왕복 동안 이벤트 루프를 막지 않음)"""
+        user = self.get_local(user_id)
+        if user is not None:
+            return user
+        if not self._redis_available():
+            USER_CACHE_LOOKUPS.labels(layer="all", result="miss").inc()
+            return None
+        return await asyncio.to_thread(self.get, user_id)
+
+    async def aset(self, user_id: str, user: dict, epoch: Optional[int] = None) -> bool:
+        """set의 비동기 버전"""
+        if not self._redis_available():
+            return self.set(user_id, user, epoch=epoch)
+        return await asyncio.to_thread(self.set, user_id, user, epoch)
+
+    async def ainvalidate(self, *user_ids) -> None:
+        """invalidate의 비동기 버전"""
+        if not self._redis_available():
+            self.invalidate(*user_ids)
+            return
+        await asyncio.to_thread(self.invalidate, *user_ids)
+
+    async def ainvalidate_all(self) -> None:
+        """invalidate_all의 비동기 버전"""
+        await asyncio.to_thread(self.invalidate_all)
+
+
+_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """전역 UserCache 인스턴스 반환"""
+    global _cache
+
+    if _cache is None:
+        _cache = UserCache(
+            redis_client=get_redis_sync(),
+            ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+            local_ttl_seconds=settings.USER_CACHE_LOCAL_TTL_SECONDS
+        )
+
+    return _cache
+
+
+async def load_user(db, user_id) -> Optional[dict]:
+    """
+    사용자 문서 조회 (캐시 우선, 없으면 Mongo 조회 후 캐시)
+
+    Args:
+        db: MongoDB 데이터베이스 (Motor)
+        user_id: 사용자 ID (문자열 또는 ObjectId)
+
+    Returns:
+        dict: 사용자 문서 (없으면 None)
+    """
+    cache = get_user_cache()
+    user = await cache.aget(str(user_id))
+    if user is not None:
+        return user
+
+    epoch = cache.epoch
+    user = await db.users.find_one({"_id": ObjectId(user_id)})
+    if user is not None:
+        await cache.aset(str(user_id), user, epoch=epoch)
+    return user
+
+
+async def listen_for_invalidations(cache: Optional[UserCache] = None, redis_client=None) -> None:
+    """
+    다른 프로세스의 무효화 알림을 구독하여 로컬 캐시에서 삭제 (API 프로세스 수명 동안 실행)
+
+    연결이 끊기면 REDIS_RETRY_SECONDS 후 다시 구독하며, 다시 구독하기 전에 로컬 캐시를 비웁니다
+    (끊긴 동안의 알림을 놓쳤을 수 있으므로).
+    """
+    cache = cache or get_user_cache()
+
+    while True:
+        pubsub = None
+        try:
+            pubsub = (redis_client or get_redis_async()).pubsub()
+            await pubsub.subscribe(UserCache.CHANNEL)
+            cache.clear_local()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30.0)
+                if message and message.get("type") == "message":
+                    cache.handle_invalidation(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"사용자 캐시 무효화 구독 오류, {UserCache.REDIS_RETRY_SECONDS:.0f}초 후 재시도: {e}")
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+        await asyncio.sleep(UserCache.REDIS_RETRY_SECONDS)
@@ -0,0 +1,235 @@
+"""
+에너지 기반 음성 구간 검출(VAD) 모듈
+
+16kHz 모노 16비트 PCM에서 프레임별 에너지, 발화 판정, 남길 프레임 선택을 NumPy로 한 번에 계산하고,
+- 앞뒤 무음 제거 (발화 앞뒤로 padding_ms만 남김)
+- 발화 중간의 긴 공백을 max_pause_ms로 축소
+- 발화가 거의 없는 녹음은 무음으로 판정 (STT/LLM 호출 생략)
+청크 단위로 입력받아 바로 출력하므로 스트리밍 경로와 일괄 처리 경로에서 같은 로직을 사용합니다.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import AUDIO_SPEECH_SECONDS, AUDIO_SILENCE_TRIMMED_SECONDS, SILENT_RECORDINGS
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SAMPLE_WIDTH = 2  # 16비트 PCM
+
+
+class SilentAudioError(ValueError):
+    """녹음 전체가 사실상 무음인 경우"""
+
+
+@dataclass(frozen=True)
+class VadConfig:
+    """VAD 설정값"""
+    frame_ms: int = 30            # 에너지 계산 프레임 길이
+    abs_floor_db: float = -50.0   # 이 값보다 작으면 항상 무음 (dBFS)
+    margin_db: float = 10.0       # 추정 잡음 레벨보다 이만큼 크면 발화
+    noise_ceiling_db: float = -50.0  # 잡음 추정치 상한 (조용한 발화를 잘라내지 않도록)
+    noise_rise_db: float = 0.1    # 프레임당 잡음 추정치 상승 폭 (최솟값 추적)
+    padding_ms: int = 200         # 발화 앞뒤로 남길 무음 길이
+    max_pause_ms: int = 600       # 발화 중간 공백의 최대 길이
+    min_speech_ms: int = 300      # 이보다 발화가 짧으면 무음으로 판정
+
+
+def frame_levels_db(pcm: np.ndarray, frame_len: int) -> np.ndarray:
+    """프레임별 RMS 레벨(dBFS) 계산 (벡터화)"""
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float64)
+
+    frames = pcm[:n_frames * frame_len].astype(np.float64).reshape(n_frames, frame_len) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+class VoiceActivityTrimmer:
+    """
+    청크 단위로 PCM을 받아 무음을 잘라낸 PCM을 반환하는 VAD
+
+    사용법:
+        trimmer = VoiceActivityTrimmer()
+        out = trimmer.feed(chunk) ... + trimmer.finish()
+        trimmer.is_silent, trimmer.speech_seconds
+    """
+
+    def __init__(self, sample_rate: int = 16000, config: Optional[VadConfig] = None):
+        self.sample_rate = sample_rate
+        self.config = config or VadConfig()
+
+        self._frame_len = sample_rate * self.config.frame_ms // 1000
+        self._frame_bytes = self._frame_len * SAMPLE_WIDTH
+        self._padding_frames = max(0, self.config.padding_ms // self.config.frame_ms)
+        pause_frames = max(0, self.config.max_pause_ms // self.config.frame_ms)
+        self._pause_head_frames = pause_frames // 2
+        self._pause_tail_frames = pause_frames - self._pause_head_frames
+
+        self._remainder = b""
+        self._noise_db = self.config.abs_floor_db - self.config.margin_db
+        self._seen_speech = False
+        # 마지막 발화 이후 무음 프레임 (프레임 x 샘플 배열): 앞부분(head)과 뒷부분(tail)만 보관하여 메모리 제한
+        self._tail_capacity = max(self._pause_tail_frames, self._padding_frames)
+        self._pending_head = self._empty_frames()
+        self._pending_tail = self._empty_frames()
+        self._pending_count = 0
+
+        self.total_frames = 0
+        self.speech_frames = 0
+        self.output_frames = 0
+
+    # 통계
+    @property
+    def total_seconds(self) -> float:
+        return self.total_frames * self.config.frame_ms / 1000
+
+    @property
+    def speech_seconds(self) -> float:
+        return self.speech_frames * self.config.frame_ms / 1000
+
+    @property
+    def output_seconds(self) -> float:
+        return self.output_frames * self.config.frame_ms / 1000
+
+    @property
+    def is_silent(self) -> bool:
+        return self.speech_frames * self.config.frame_ms < self.config.min_speech_ms
+
+    def _classify(self, levels: np.ndarray) -> np.ndarray:
+        """
+        프레임별 발화 여부 (잡음 추정치는 최솟값 추적 방식으로 갱신, 벡터화)
+
+        잡음 추정치 n_t = min(상한, level_t, n_{t-1} + 상승 폭)을 풀면
+        n_t = min(상한, t * 상승 폭 + min(n_{-1} + 상승 폭, min_{s<=t}(level_s - s * 상승 폭)))이므로
+        누적 최솟값 한 번으로 계산합니다.
+        """
+        config = self.config
+        offsets = np.arange(len(levels)) * config.noise_rise_db
+        running = np.minimum.accumulate(np.minimum(levels - offsets, self._noise_db + config.noise_rise_db))
+        noise = np.minimum(running + offsets, config.noise_ceiling_db)
+        self._noise_db = float(noise[-1])
+        return levels > np.maximum(config.abs_floor_db, noise + config.margin_db)
+
+    def _hold(self, frames: np.ndarray) -> None:
+        """마지막 발화 이후의 무음 프레임 보관 (앞 pause_head개와 뒤 tail 한도만 남김)"""
+        self._pending_count += len(frames)
+        if self._seen_speech:
+            room = max(0, self._pause_head_frames - len(self._pending_head))
+            self._pending_head = np.concatenate([self._pending_head, frames[:room]])
+            frames = frames[room:]
+
+        tail = np.concatenate([self._pending_tail, frames])
+        self._pending_tail = tail[len(tail) - min(len(tail), self._tail_capacity):]
+
+    def _flush_pending(self, head_limit: int, tail_limit: int) -> np.ndarray:
+        """보관 중인 무음 프레임 중 앞 head_limit개와 뒤 tail_limit개만 순서대로 반환"""
+        count = self._pending_count
+        head, tail = self._pending_head, self._pending_tail
+        # 보관한 프레임의 무음 구간 내 위치 (앞부분은 0부터, 뒷부분은 구간 끝까지)
+        positions = np.concatenate([np.arange(len(head)), np.arange(count - len(tail), count)])
+        keep = (positions < head_limit) | (positions >= count - tail_limit)
+        frames = np.concatenate([head, tail])[keep]
+
+        self._pending_head = self._empty_frames()
+        self._pending_tail = self._empty_frames()
+        self._pending_count = 0
+        return frames
+
+    def _empty_frames(self) -> np.ndarray:
+        return np.empty((0, self._frame_len), dtype="<i2")
+
+    def feed(self, pcm: bytes) -> bytes:
+        """PCM 청크를 입력하고 잘라낸 결과 PCM 반환"""
+        data = self._remainder + pcm
+        n_frames = len(data) // self._frame_bytes
+        self._remainder = data[n_frames * self._frame_bytes:]
+        if n_frames == 0:
+            return b""
+
+        frames = np.frombuffer(data[:n_frames * self._frame_bytes], dtype="<i2").reshape(n_frames, self._frame_len)
+        is_speech = self._classify(frame_levels_db(frames.ravel(), self._frame_len))
+        self.total_frames += n_frames
+
+        speech_idx = np.flatnonzero(is_speech)
+        if len(speech_idx) == 0:
+            self._hold(frames)
+            return b""
+
+        first, last = int(speech_idx[0]), int(speech_idx[-1])
+        idx = np.arange(n_frames)
+        # 각 프레임의 직전/직후 발화 프레임으로 무음 구간 안의 위치 계산 (run-length)
+        prev_speech = np.maximum.accumulate(np.where(is_speech, idx, -1))
+        next_speech = np.minimum.accumulate(np.where(is_speech, idx, n_frames)[::-1])[::-1]
+        since_speech = idx - prev_speech - 1
+        until_speech = next_speech - idx - 1
+
+        # 발화 사이 공백은 앞 pause_head개와 뒤 pause_tail개만 남김
+        keep = is_speech | (since_speech < self._pause_head_frames) | (until_speech < self._pause_tail_frames)
+
+        # 첫 발화 앞 무음은 이전 청크에서 보관한 무음과 이어지는 구간
+        # (첫 발화 전이면 padding만, 이후면 공백 축소 규칙 적용)
+        lead_head = self._pause_head_frames if self._seen_speech else 0
+        lead_tail = self._pause_tail_frames if self._seen_speech else self._padding_frames
+        keep[:first] = (self._pending_count + idx[:first] < lead_head) | (until_speech[:first] < lead_tail)
+        pending = self._flush_pending(lead_head, max(0, lead_tail - first))
+
+        kept = frames[:last + 1][keep[:last + 1]]
+        self._seen_speech = True
+        self.speech_frames += len(speech_idx)
+        self.output_frames += len(pending) + len(kept)
+
+        # 마지막 발화 뒤 무음은 다음 발화 또는 입력 종료 때 처리
+        self._hold(frames[last + 1:])
+        return np.concatenate([pending, kept]).tobytes()
+
+    def finish(self) -> bytes:
+        """입력 종료: 마지막 발화 뒤 padding_ms만 남기고 나머지 무음 제거"""
+        frames = self._flush_pending(self._padding_frames, 0) if self._seen_speech else self._empty_frames()
+        self._remainder = b""
+        self.output_frames += len(frames)
+        self.record_metrics()
+        return frames.tobytes()
+
+    async def stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """PCM 청크 이터레이터를 무음이 제거된 청크 이터레이터로 변환"""
+        async for chunk in chunks:
+            output = self.feed(chunk)
+            if output:
+                yield output
+        tail = self.finish()
+        if tail:
+            yield tail
+
+    def record_metrics(self) -> None:
+        """발화 길이/제거된 무음 길이 메트릭 기록"""
+        AUDIO_SPEECH_SECONDS.observe(self.speech_seconds)
+        AUDIO_SILENCE_TRIMMED_SECONDS.observe(max(0.0, self.total_seconds - self.output_seconds))
+        if self.is_silent:
+            SILENT_RECORDINGS.inc()
+
+        logger.info(
+            f"VAD: 전체 {self.total_seconds:.1f}초, 발화 {self.speech_seconds:.1f}초, "
+            f"출력 {self.output_seconds:.1f}초"
+        )
+
+
+def trim_silence(
+    pcm: bytes,
+    sample_rate: int = 16000,
+    config: Optional[VadConfig] = None
+) -> Tuple[bytes, VoiceActivityTrimmer]:
+    """
+    PCM 전체에서 무음을 제거 (일괄 처리 버전)
+
+    Returns:
+        Tuple[bytes, VoiceActivityTrimmer]: 잘라낸 PCM과 통계가 담긴 trimmer
+    """
+    trimmer = VoiceActivityTrimmer(sample_rate, config)
+    trimmed = trimmer.feed(pcm) + trimmer.finish()
+    return trimmed, trimmer
@@ -2,18 +2,43 @@ import logging
 import traceback
 from datetime import datetime
 from bson import ObjectId
-from celery import shared_task
+from celery import chain, shared_task
+from celery.exceptions import Ignore
 from bson import ObjectId, errors as bson_errors
+from pymongo import ReturnDocument
 
 from db.mongodb import get_mongodb_sync
 from services.audio_processor import AudioProcessor
+from services.blob_store import BlobNotFoundError, digest_from_key, get_blob_store
 from services.evaluator import ResponseEvaluator
+from services.fair_share import PRIORITY_BULK, PRIORITY_DEFAULT, PRIORITY_FINAL
+from services.score_stats import apply_test_scores_sync, rebuild_user_score_stats_sync
+from services.status_store import get_status_store
 from core.exceptions import APIQuotaExceededError, APIRateLimitError, EvaluationError
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
 
+def transcribe_audio_ref(audio_processor, audio_ref):
+    """
+    저장소 참조 키로 오디오를 인식
+
+    키에 포함된 오디오 지문으로 음성 인식 캐시를 먼저 조회하고,
+    캐시에 없을 때만 저장소에서 오디오를 가져옵니다 (재시도 시에도 다시 가져오지 않음).
+
+    Raises:
+        BlobNotFoundError: 저장소에 오디오가 없는 경우
+    """
+    cached_text = audio_processor.transcript_cache.get(digest_from_key(audio_ref))
+    if cached_text is not None:
+        logger.info(f"음성 인식 캐시 적중, 오디오 조회 생략: {audio_ref}")
+        return cached_text
+
+    audio_content = get_blob_store().get(audio_ref)
+    return audio_processor.process_audio_for_celery(audio_content)
+
+
 def evaluate_with_error_handling(evaluator, method_name, *args, **kwargs):
     """
     평가 함수 호출 및 API 오류 감지 헬퍼 함수
@@ -70,6 +95,8 @@ def evaluate_with_error_handling(evaluator, method_name, *args, **kwargs):
 
         return result
 
+    except (APIQuotaExceededError, APIRateLimitError):
+        raise
     except Exception as e:
         error_msg = str(e).lower()
         # API 할당량이나 Rate Limit 관련 오류 감지
@@ -89,12 +116,8 @@ def evaluate_with_error_handling(evaluator, method_name, *args, **kwargs):
     retry_jitter=True,
     max_retries=5
 )
-def evaluate_random_problem_task(self, test_id, problem_id, user_id, audio_content_base64):
+def evaluate_random_problem_task(self, test_id, problem_id, user_id, audio_ref):
     try:
-        # Base64 디코딩
-        import base64
-        audio_content = base64.b64decode(audio_content_base64)
-        
         # MongoDB 연결
         db = get_mongodb_sync()
         
@@ -102,8 +125,8 @@ def evaluate_random_problem_task(self, test_id, problem_id, user_id, audio_conte
         problem = db.problems.find_one({"_id": ObjectId(problem_id)})
         
         # 음성 변환
-        audio_processor = AudioProcessor(model_name="whisper-large-v3")
-        transcribed_text = audio_processor.process_audio(audio_content)
+        audio_processor = AudioProcessor()
+        transcribed_text = transcribe_audio_ref(audio_processor, audio_ref)
         
         # 스크립트 저장
         script_data = {
@@ -205,97 +228,248 @@ def evaluate_random_problem_task(self, test_id, problem_id, user_id, audio_conte
             "evaluated_at": datetime.now().isoformat()
         }
 
-@shared_task(
-    bind=True,
-    name="process_audio",
+
+ANSWER_TASK_RETRY = dict(
     autoretry_for=(APIQuotaExceededError, APIRateLimitError),
     retry_backoff=True,
     retry_backoff_max=600,
     retry_jitter=True,
     max_retries=5
 )
-def process_audio_task(self, test_id, problem_id, problem_number, audio_content_bytes, is_last_problem=False):
+
+
+def build_answer_context(test, problem):
     """
-    오디오 파일을 처리하고 평가하는 Celery 작업
-    
+    워커가 DB를 다시 조회하지 않도록 작업 메시지에 담을 테스트/문제 정보
+
+    Args:
+        test: 테스트 문서 (user_id, test_date, problem_data)
+        problem: 문제 문서
+
+    Returns:
+        dict: JSON 직렬화 가능한 답변 처리 정보
+    """
+    test_date = test.get("test_date")
+    return {
+        "user_id": str(test["user_id"]),
+        "test_date": test_date.isoformat() if isinstance(test_date, datetime) else None,
+        "problem_count": len(test.get("problem_data", {})),
+        "problem_category": problem.get("problem_category", ""),
+        "topic_category": problem.get("topic_category", ""),
+        "problem_content": problem.get("content", "")
+    }
+
+
+def load_answer_context(db, test_id, problem_id):
+    """
+    DB에서 답변 처리 정보를 조회 (메시지에 정보가 없는 이전 버전 작업용)
+
+    Raises:
+        ValueError: 테스트나 문제를 찾을 수 없는 경우
+    """
+    test = db.tests.find_one({"_id": ObjectId(test_id)}, {"user_id": 1, "test_date": 1, "problem_data": 1})
+    if not isinstance(test, dict):
+        raise ValueError("테스트를 찾을 수 없습니다.")
+
+    try:
+        problem_obj_id = ObjectId(problem_id)
+    except bson_errors.InvalidId:
+        raise ValueError(f"잘못된 problem_id 형식입니다: {problem_id}")
+
+    problem = db.problems.find_one({"_id": problem_obj_id})
+    if not isinstance(problem, dict):
+        raise ValueError(f"문제 {problem_id} 를 찾을 수 없습니다.")
+
+    return build_answer_context(test, problem)
+
+
+def submit_answer_pipeline(test_id, problem_id, problem_number, audio_ref, context, priority=PRIORITY_DEFAULT):
+    """
+    답변 처리 파이프라인 실행: 음성 인식(stt 큐) → 평가(llm 큐) → 저장(기본 큐)
+
+    단계마다 전용 큐와 처리율 제한을 두어 STT 처리량과 LLM 할당량을 따로 조절합니다.
+    각 단계는 다음 단계에 답변 정보(dict)를 넘기며, 실패한 단계는 문제를 실패로 기록하고 체인을 중단합니다.
+    중간 상태는 처리 상태 저장소(Redis)에만 기록하고, Mongo에는 최종 결과만 한 번에 저장합니다.
+
     Args:
-        self: Celery 작업 인스턴스
         test_id: 테스트 ID
         problem_id: 문제 ID
         problem_number: 문제 번호
-        audio_content_bytes: 원본 오디오 바이트 데이터
-        is_last_problem: 마지막 문제 여부
+        audio_ref: 오디오 저장소 참조 키 (services.blob_store)
+        context: build_answer_context로 만든 테스트/문제 정보
+        priority: 모든 단계에 적용할 작업 우선순위 (services.fair_share.fair_priority)
     """
-    # import base64 - 필요 없어졌으므로 제거
-    
-    try:
-        # Base64 디코딩 제거 - 이미 bytes 타입으로 받음
-        # audio_content = base64.b64decode(audio_content_base64)
-        # audio_content_bytes는 이미 디코딩된 바이트 형태의 데이터임
+    answer = {"test_id": test_id, "problem_id": problem_id, "problem_number": problem_number, **context}
+    return chain(
+        transcribe_answer_task.s(answer, audio_ref).set(priority=priority),
+        evaluate_answer_task.s().set(priority=priority),
+        persist_answer_task.s().set(priority=priority)
+    ).apply_async()
+
 
-        # ✅ MongoDB 동기 연결
+def mark_problem_finished(db, test_id, problem_number, fields=None, problem_count=None):
+    """
+    문제 처리 완료(성공/실패)를 기록하고, 테스트의 모든 문제가 끝났으면 종합 평가를 한 번만 실행
+
+    완료된 문제 수로 판단하므로 앞선 답변의 평가가 끝나기 전에 종합 평가가 시작되지 않습니다.
+    클라이언트가 마지막 문제를 제출했으면(final_problem_submitted) 건너뛴 문제는 기다리지 않고,
+    제출된 답변(submitted_problems)이 모두 끝났을 때 실행합니다.
+
+    Args:
+        db: 동기 MongoDB 데이터베이스
+        test_id: 테스트 ID
+        problem_number: 문제 번호
+        fields: 완료 집계와 같은 갱신으로 저장할 문제 결과 필드 (problem_data.{번호}.{필드})
+        problem_count: 테스트의 문제 수 (없으면 problem_data를 읽어 계산)
+
+    Returns:
+        bool: 이번 호출에서 종합 평가를 실행했는지 여부
+    """
+    update = {"$addToSet": {"finished_problems": problem_number}}
+    if fields:
+        update["$set"] = {f"problem_data.{problem_number}.{key}": value for key, value in fields.items()}
+
+    projection = {"finished_problems": 1, "submitted_problems": 1, "final_problem_submitted": 1}
+    if problem_count is None:
+        projection["problem_data"] = 1
+
+    test = db.tests.find_one_and_update(
+        {"_id": ObjectId(test_id)},
+        update,
+        projection=projection,
+        return_document=ReturnDocument.AFTER
+    )
+    if not isinstance(test, dict):
+        return False
+
+    if problem_count is None:
+        problem_count = len(test.get("problem_data", {}))
+    finished = set(test.get("finished_problems", []))
+    if len(finished) < problem_count:
+        if not test.get("final_problem_submitted") or not set(test.get("submitted_problems", [])) <= finished:
+            return False
+
+    # 마지막 두 문제가 동시에 끝나도 종합 평가는 한 번만 실행되도록 조건부 갱신으로 선점
+    started_at = datetime.now()
+    claimed = db.tests.update_one(
+        {"_id": ObjectId(test_id), "overall_feedback_triggered": {"$ne": True}},
+        {"$set": {
+            "overall_feedback_triggered": True,
+            "overall_feedback_status": "pending",
+            "overall_feedback_started_at": started_at
+        }}
+    )
+    if not claimed.modified_count:
+        return False
+
+    get_status_store().set_overall_status(
+        test_id, "pending", "전체 테스트 평가 대기 중입니다.", started_at=started_at.isoformat()
+    )
+
+    logger.info(f"테스트 {test_id}의 모든 문제 처리 완료 - 종합 평가 시작")
+    evaluate_overall_test_task.apply_async(args=[test_id], priority=PRIORITY_FINAL)
+    return True
+
+
+def fail_answer_stage(task, answer, error, source):
+    """
+    파이프라인 단계 오류 처리
+
+    재시도 횟수가 남은 API 할당량/Rate Limit 오류는 다시 발생시켜 autoretry에 맡기고,
+    그 외에는 문제를 실패로 기록한 뒤 체인을 중단합니다 (Ignore).
+    """
+    if isinstance(error, (APIQuotaExceededError, APIRateLimitError)) and task.request.retries < task.max_retries:
+        raise error
+
+    test_id = answer["test_id"]
+    problem_number = answer["problem_number"]
+    logger.error(f"{source} 단계 오류 (문제 {problem_number}): {str(error)}", exc_info=True)
+
+    message = f"오류가 발생했습니다: {str(error)}"
+    completed_at = datetime.now()
+    get_status_store().set_problem_status(
+        test_id, problem_number, "failed", message, completed_at=completed_at.isoformat()
+    )
+
+    try:
         db = get_mongodb_sync()
-        
-        # 1. 상태 업데이트 - 오디오 처리 중
-        db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "transcribing",
-                f"problem_data.{problem_number}.processing_message": "음성을 텍스트로 변환 중입니다."
-            }}
+        # 실패 기록과 완료 집계를 한 번에 (실패한 문제도 완료로 집계해야 종합 평가가 멈추지 않음)
+        mark_problem_finished(
+            db,
+            test_id,
+            problem_number,
+            fields={
+                "processing_status": "failed",
+                "processing_message": message,
+                "processing_error": str(error),
+                "processing_completed_at": completed_at
+            },
+            problem_count=answer.get("problem_count")
         )
-        
-        # 2. AudioProcessor를 사용하여 오디오 텍스트 변환
+        db.errors.insert_one({
+            "test_id": test_id,
+            "problem_id": answer["problem_id"],
+            "error": str(error),
+            "traceback": traceback.format_exc(),
+            "timestamp": datetime.now(),
+            "source": source
+        })
+    except Exception as inner_error:
+        logger.error(f"오류 상태 업데이트 중 추가 오류: {str(inner_error)}", exc_info=True)
+
+    raise Ignore()
+
+
+@shared_task(bind=True, name="transcribe_answer", **ANSWER_TASK_RETRY)
+def transcribe_answer_task(self, answer, audio_ref):
+    """
+    1단계: 답변 오디오를 텍스트로 변환 (stt 큐, Mongo 접근 없음)
+
+    Returns:
+        dict: 답변 정보에 transcribed_text를 더한 결과
+    """
+    status_store = get_status_store()
+
+    try:
+        status_store.set_problem_status(
+            answer["test_id"], answer["problem_number"], "transcribing", "음성을 텍스트로 변환 중입니다."
+        )
+
         try:
-            audio_processor = AudioProcessor(model_name="whisper-large-v3")
-            # audio_content_bytes를 직접 전달
-            transcribed_text = audio_processor.process_audio_for_celery(audio_content_bytes)
+            transcribed_text = transcribe_audio_ref(AudioProcessor(), audio_ref)
             logger.info(f"음성 변환 완료: {transcribed_text[:50]}...")
+        except (BlobNotFoundError, APIQuotaExceededError, APIRateLimitError):
+            # 업로드된 오디오가 없으면 대체 문구를 평가하지 않고 문제를 실패로 기록,
+            # 처리율 제한 대기 초과는 대체 문구 대신 백오프 후 재시도 (fail_answer_stage)
+            raise
         except Exception as e:
             logger.error(f"음성 변환 중 오류: {str(e)}", exc_info=True)
             transcribed_text = "음성 변환 중 오류가 발생했습니다. 녹음을 다시 시도해 주세요."
-        
-        # 3. 상태 업데이트 - 평가 중
-        db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                f"problem_data.{problem_number}.processing_status": "evaluating",
-                f"problem_data.{problem_number}.processing_message": "응답 평가 중입니다.",
-                f"problem_data.{problem_number}.user_response": transcribed_text
-            }}
+
+        status_store.set_problem_status(
+            answer["test_id"], answer["problem_number"], "evaluating", "응답 평가 중입니다."
         )
-        
-        try:
-            problem_obj_id = ObjectId(problem_id)
-        except bson_errors.InvalidId:
-            raise ValueError(f"잘못된 problem_id 형식입니다: {problem_id}")
 
-        problem = db.problems.find_one({"_id": problem_obj_id})
-        if not isinstance(problem, dict):
-            raise ValueError(f"문제 {problem_id} 를 찾을 수 없습니다.")
+        return {**answer, "transcribed_text": transcribed_text}
 
-        problem_category = problem.get("problem_category", "")
-        topic_category = problem.get("topic_category", "")
-        problem_content = problem.get("content", "")
-        
-        # 5. 테스트 생성 시간을 가져와 스크립트 저장
-        test = db.tests.find_one({"_id": ObjectId(test_id)})
-        if not isinstance(test, dict):
-            raise ValueError("테스트를 찾을 수 없습니다.")
+    except Exception as e:
+        fail_answer_stage(self, answer, e, "transcribe_answer_task")
 
-        test_created_at = test.get("test_date", datetime.now())
-        
-        script_data = {
-            "user_id": str(test["user_id"]),
-            "problem_id": problem_id,
-            "content": transcribed_text,
-            "is_script": False,
-            "created_at": test_created_at
-        }
-        
-        db.scripts.insert_one(script_data)
-        
-        # 6. 응답이 너무 짧으면 평가 생략
+
+@shared_task(bind=True, name="evaluate_answer", **ANSWER_TASK_RETRY)
+def evaluate_answer_task(self, answer):
+    """
+    2단계: 변환된 답변을 LLM으로 평가 (llm 큐, API 할당량 초과 시 지수 백오프 재시도)
+
+    문제 정보는 작업 메시지에 담겨 오므로 Mongo에 접근하지 않습니다.
+
+    Returns:
+        dict: 답변 정보에 score, feedback을 더한 결과
+    """
+    try:
+        transcribed_text = answer["transcribed_text"]
+
+        # 응답이 너무 짧으면 평가 생략
         if len(transcribed_text.split()) < 5:
             evaluation_result = {
                 "score": "NL",
@@ -306,24 +480,19 @@ def process_audio_task(self, test_id, problem_id, problem_number, audio_content_
                 }
             }
         else:
-            # 7. 평가기 생성 및 평가 수행 - Celery auto-retry가 자동으로 재시도 처리
-            evaluator_instance = ResponseEvaluator()
-
             # 평가 수행 (API 오류 시 APIQuotaExceededError 발생 → auto-retry)
             evaluation_result = evaluate_with_error_handling(
-                evaluator_instance,
+                ResponseEvaluator(),
                 'evaluate_response_sync',
                 user_response=transcribed_text,
-                problem_category=problem_category,
-                topic_category=topic_category,
-                problem=problem_content
+                problem_category=answer["problem_category"],
+                topic_category=answer["topic_category"],
+                problem=answer["problem_content"]
             )
 
-            # 평가 결과 로깅
             logger.info(f"평가 결과: {evaluation_result}")
-        
+
         # 점수와 피드백 추출 - 더 안전한 방식으로
-        score = evaluation_result.get("score", None)
         feedback = evaluation_result.get("feedback", {})
         if not isinstance(feedback, dict):
             feedback = {
@@ -331,80 +500,83 @@ def process_audio_task(self, test_id, problem_id, problem_number, audio_content_
                 "vocabulary": "피드백 형식이 올바르지 않습니다.",
                 "spoken_amount": "피드백 형식이 올바르지 않습니다."
             }
-        
-        
-        # 8. 테스트 문서 내 해당 문제의 평가 결과 업데이트
-        db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                f"problem_data.{problem_number}.score": score,
-                f"problem_data.{problem_number}.feedback": feedback,
-                f"problem_data.{problem_number}.processing_status": "completed",
-                f"problem_data.{problem_number}.processing_message": "문제 평가가 완료되었습니다.",
-                f"problem_data.{problem_number}.processing_completed_at": datetime.now()
-            }}
+
+        return {**answer, "score": evaluation_result.get("score", None), "feedback": feedback}
+
+    except Exception as e:
+        fail_answer_stage(self, answer, e, "evaluate_answer_task")
+
+
+@shared_task(bind=True, name="persist_answer", **ANSWER_TASK_RETRY)
+def persist_answer_task(self, answer):
+    """
+    3단계: 스크립트와 평가 결과를 저장하고 완료된 문제 수를 집계 (기본 큐)
+
+    Mongo 접근은 스크립트 insert_one과, 결과 저장 + 완료 집계를 합친 find_one_and_update 두 번뿐입니다.
+    """
+    test_id = answer["test_id"]
+    problem_number = answer["problem_number"]
+
+    try:
+        db = get_mongodb_sync()
+
+        # 테스트 생성 시간으로 스크립트 저장
+        test_date = answer.get("test_date")
+        db.scripts.insert_one({
+            "user_id": answer["user_id"],
+            "problem_id": answer["problem_id"],
+            "content": answer["transcribed_text"],
+            "is_script": False,
+            "created_at": datetime.fromisoformat(test_date) if test_date else datetime.now()
+        })
+
+        completed_at = datetime.now()
+        mark_problem_finished(
+            db,
+            test_id,
+            problem_number,
+            fields={
+                "user_response": answer["transcribed_text"],
+                "score": answer["score"],
+                "feedback": answer["feedback"],
+                "processing_status": "completed",
+                "processing_message": "문제 평가가 완료되었습니다.",
+                "processing_completed_at": completed_at
+            },
+            problem_count=answer["problem_count"]
         )
-        
-        logger.info(f"문제 {problem_number} 평가 완료 - 점수: {score}")
-        
-        # 9. 마지막 문제인 경우 종합 평가를 위한 새 작업 실행
-        if is_last_problem:
-            evaluate_overall_test_task.delay(test_id)
-            
+
+        get_status_store().set_problem_status(
+            test_id, problem_number, "completed", "문제 평가가 완료되었습니다.", completed_at=completed_at.isoformat()
+        )
+        logger.info(f"문제 {problem_number} 평가 완료 - 점수: {answer['score']}")
+
         return {
             "status": "success",
             "test_id": test_id,
-            "problem_id": problem_id,
-            "score": score
+            "problem_id": answer["problem_id"],
+            "score": answer["score"]
         }
-            
+
     except Exception as e:
-        logger.error(f"오디오 처리 및 평가 중 오류: {str(e)}", exc_info=True)
-        
-        try:
-            db = get_mongodb_sync()
-            
-            # 오류 발생 시 상태 업데이트
-            db.tests.update_one(
-                {"_id": ObjectId(test_id)},
-                {"$set": {
-                    f"problem_data.{problem_number}.processing_status": "failed",
-                    f"problem_data.{problem_number}.processing_message": f"오류가 발생했습니다: {str(e)}",
-                    f"problem_data.{problem_number}.processing_error": str(e),
-                    f"problem_data.{problem_number}.processing_completed_at": datetime.now()
-                }}
-            )
-            
-            # 마지막 문제였다면 전체 피드백 상태도 업데이트
-            if is_last_problem:
-                db.tests.update_one(
-                    {"_id": ObjectId(test_id)},
-                    {"$set": {
-                        "overall_feedback_status": "failed",
-                        "overall_feedback_message": f"전체 평가 중 오류가 발생했습니다: {str(e)}",
-                        "overall_feedback_completed_at": datetime.now()
-                    }}
-                )
-                
-            # 오류 로깅
-            db.errors.insert_one({
-                "test_id": test_id,
-                "problem_id": problem_id,
-                "error": str(e),
-                "traceback": traceback.format_exc(),
-                "timestamp": datetime.now(),
-                "source": "process_audio_task"
-            })
-        except Exception as inner_error:
-            logger.error(f"오류 상태 업데이트 중 추가 오류: {str(inner_error)}", exc_info=True)
-            
-        # 작업 실패 표시
-        return {
-            "status": "error",
-            "test_id": test_id,
-            "problem_id": problem_id,
-            "error": str(e)
-        }
+        fail_answer_stage(self, answer, e, "persist_answer_task")
+
+
+@shared_task(bind=True, name="process_audio")
+def process_audio_task(self, test_id, problem_id, problem_number, audio_ref, is_last_problem=False):
+    """
+    (호환용) 단계별 파이프라인으로 답변 처리를 넘기는 Celery 작업
+
+    배포 전에 큐에 들어간 작업을 처리하기 위해 남겨둡니다.
+    is_last_problem은 더 이상 사용하지 않습니다 - 모든 문제가 끝나면 종합 평가가 자동으로 실행됩니다.
+    """
+    context = load_answer_context(get_mongodb_sync(), test_id, problem_id)
+    submit_answer_pipeline(test_id, problem_id, problem_number, audio_ref, context)
+    return {
+        "status": "submitted",
+        "test_id": test_id,
+        "problem_id": problem_id
+    }
 
 @shared_task(
     bind=True,
@@ -419,17 +591,20 @@ def evaluate_overall_test_task(self, test_id):
     """전체 테스트 종합 평가 Celery 작업"""
     from services.evaluator import ResponseEvaluator
 
+    status_store = get_status_store()
+
     try:
         db = get_mongodb_sync()
 
-        # 1. 상태 초기화
-        db.tests.update_one(
-            {"_id": ObjectId(test_id)},
-            {"$set": {
-                "overall_feedback_status": "processing",
-                "overall_feedback_message": "전체 테스트 평가 중입니다."
-            }}
-        )
+        # 1. 상태 초기화 (중간 상태는 상태 저장소에만, Redis 장애 시에만 테스트 문서에 기록)
+        if not status_store.set_overall_status(test_id, "processing", "전체 테스트 평가 중입니다."):
+            db.tests.update_one(
+                {"_id": ObjectId(test_id)},
+                {"$set": {
+                    "overall_feedback_status": "processing",
+                    "overall_feedback_message": "전체 테스트 평가 중입니다."
+                }}
+            )
 
         # 2. 테스트 조회
         test = db.tests.find_one({"_id": ObjectId(test_id)})
@@ -470,6 +645,8 @@ def evaluate_overall_test_task(self, test_id):
         logger.info(f"종합 평가 결과: {evaluation_result}")
 
         # 5. 점수 및 피드백 업데이트
+        completed_at = datetime.now()
+        started_at = test.get("overall_feedback_started_at")
         db.tests.update_one(
             {"_id": ObjectId(test_id)},
             {"$set": {
@@ -477,15 +654,20 @@ def evaluate_overall_test_task(self, test_id):
                 "test_feedback": evaluation_result.get("test_feedback", {}),
                 "overall_feedback_status": "completed",
                 "overall_feedback_message": "전체 테스트 평가가 완료되었습니다.",
-                "overall_feedback_completed_at": datetime.now()
+                "overall_feedback_completed_at": completed_at
             }}
         )
+        status_store.set_overall_status(
+            test_id, "completed", "전체 테스트 평가가 완료되었습니다.",
+            started_at=started_at.isoformat() if isinstance(started_at, datetime) else started_at,
+            completed_at=completed_at.isoformat()
+        )
 
         test_type_str = test.get("test_type_str", "N/A")
         logger.info(f"테스트 {test_type_str}의 종합 평가가 완료되었습니다.")
 
-        # 6. 평균 점수 업데이트
-        update_user_average_score_task.delay(str(user_id))
+        # 6. 평균 점수 업데이트 (이 테스트의 점수만 누적값에 반영)
+        update_user_average_score_task.apply_async(args=[str(user_id), test_id], priority=PRIORITY_BULK)
 
         return {
             "status": "success",
@@ -493,15 +675,21 @@ def evaluate_overall_test_task(self, test_id):
         }
 
     except Exception as e:
+        # 재시도 횟수가 남은 API 할당량/처리율 제한 오류는 autoretry에 맡김 (대체 평가를 저장하지 않음)
+        if isinstance(e, (APIQuotaExceededError, APIRateLimitError)) and self.request.retries < self.max_retries:
+            raise
         logger.error(f"종합 평가 중 오류: {str(e)}", exc_info=True)
+        message = f"전체 평가 중 오류가 발생했습니다: {str(e)}"
+        completed_at = datetime.now()
+        status_store.set_overall_status(test_id, "failed", message, completed_at=completed_at.isoformat())
         try:
             db = get_mongodb_sync()
             db.tests.update_one(
                 {"_id": ObjectId(test_id)},
                 {"$set": {
                     "overall_feedback_status": "failed",
-                    "overall_feedback_message": f"전체 평가 중 오류가 발생했습니다: {str(e)}",
-                    "overall_feedback_completed_at": datetime.now()
+                    "overall_feedback_message": message,
+                    "overall_feedback_completed_at": completed_at
                 }}
             )
             db.errors.insert_one({
@@ -523,61 +711,23 @@ def evaluate_overall_test_task(self, test_id):
 
 
 @shared_task(bind=True, name="update_user_average_score")
-def update_user_average_score_task(self, user_id):
-    """사용자 평균 점수 업데이트 Celery 작업"""
+def update_user_average_score_task(self, user_id, test_id=None):
+    """
+    사용자 평균 점수 업데이트 Celery 작업
+
+    test_id가 있으면 해당 테스트의 점수만 누적값에 반영하고 (O(1)),
+    없으면 (이전 버전 메시지) 사용자의 모든 테스트로 누적값을 다시 계산합니다.
+    """
     try:
-        from db.mongodb import get_mongodb_sync
         db = get_mongodb_sync()
 
-        OPIC_LEVELS = ["NL", "NM", "NH", "IL", "IM1", "IM2", "IM3", "IH", "AL"]
-
-        try:
-            user_obj_id = ObjectId(user_id)
-        except Exception:
-            raise ValueError(f"잘못된 사용자 ID 형식입니다: {user_id}")
-
-        user_tests = list(db.tests.find(
-            {"user_id": user_id, "test_score.total_score": {"$exists": True}}
-        ))
-
-        all_test_scores = {
-            "total_score": [],
-            "comboset_score": [],
-            "roleplaying_score": [],
-            "unexpected_score": []
-        }
-
-        for test_doc in user_tests:
-            test_score = test_doc.get("test_score", {})
-            for category in all_test_scores.keys():
-                score = test_score.get(category)
-                if score and score != "N/A" and score in OPIC_LEVELS:
-                    all_test_scores[category].append(score)
-
-        user_average_scores = {}
-        for category, scores in all_test_scores.items():
-            if not scores:
-                user_average_scores[category] = None
-                continue
-
-            level_values = [OPIC_LEVELS.index(level) for level in scores if level in OPIC_LEVELS]
-            if not level_values:
-                user_average_scores[category] = None
-                continue
-
-            average_value = sum(level_values) / len(level_values)
-            closest_index = round(average_value)
-            closest_index = max(0, min(closest_index, len(OPIC_LEVELS) - 1))
-            user_average_scores[category] = OPIC_LEVELS[closest_index]
-
-        db.users.update_one(
-            {"_id": user_obj_id},
-            {"$set": {
-                "average_score": user_average_scores
-            }}
-        )
-
-        logger.info(f"사용자 {user_id}의 평균 점수가 업데이트되었습니다: {user_average_scores}")
+        if test_id is None:
+            user_average_scores = rebuild_user_score_stats_sync(db, user_id)
+        else:
+            test = db.tests.find_one({"_id": ObjectId(test_id)}, {"test_score": 1})
+            if not isinstance(test, dict):
+                raise ValueError(f"테스트 ID {test_id}에 해당하는 테스트를 찾을 수 없습니다.")
+            user_average_scores = apply_test_scores_sync(db, test_id, user_id, test.get("test_score"))
 
         return {
             "status": "success",
@@ -0,0 +1,77 @@
+"""
+Celery 작업 모니터링 시그널
+
+큐별 적체로 워커를 확장할 수 있도록 작업의 대기 시간과 실행 시간을 기록합니다.
+- before_task_publish: 발행 시각을 enqueued_at 헤더로 기록 (브로커 큐 대기 시간 계산에도 사용)
+- task_prerun: 발행부터 실행 시작까지 대기 시간 기록 (eta/countdown으로 예약된 작업은 제외)
+- task_postrun: 실행 시작부터 종료까지 시간을 최종 상태와 함께 기록
+- worker_ready: 워커 메트릭을 CELERY_METRICS_PORT로 노출 (gevent 풀은 단일 프로세스)
+"""
+
+import logging
+import time
+from typing import Dict
+
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_ready
+from prometheus_client import start_http_server
+
+from core.config import settings
+from core.metrics import CELERY_TASK_QUEUE_LATENCY, CELERY_TASK_RUNTIME
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+_started_at: Dict[str, float] = {}  # 작업 ID -> 실행 시작 시각
+
+
+def _queue_name(task) -> str:
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    return delivery_info.get("routing_key") or "unknown"
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    """발행 시각 기록 (재시도로 다시 발행되면 새 시각으로 갱신)"""
+    if headers is not None:
+        headers["enqueued_at"] = time.time()
+
+
+@task_prerun.connect
+def record_queue_latency(task_id=None, task=None, **kwargs):
+    """발행부터 실행 시작까지 대기 시간 기록"""
+    now = time.time()
+    _started_at[task_id] = now
+
+    enqueued_at = getattr(task.request, "enqueued_at", None)
+    if enqueued_at is None or getattr(task.request, "eta", None):
+        return
+
+    CELERY_TASK_QUEUE_LATENCY.labels(task=task.name, queue=_queue_name(task)).observe(
+        max(0.0, now - float(enqueued_at))
+    )
+
+
+@task_postrun.connect
+def record_runtime(task_id=None, task=None, state=None, **kwargs):
+    """실행 시작부터 종료까지 시간 기록"""
+    started_at = _started_at.pop(task_id, None)
+    if started_at is None:
+        return
+
+    CELERY_TASK_RUNTIME.labels(task=task.name, queue=_queue_name(task), state=state or "UNKNOWN").observe(
+        time.time() - started_at
+    )
+
+
+@worker_ready.connect
+def start_metrics_server(**kwargs):
+    """워커 메트릭 HTTP 서버 시작"""
+    if not settings.CELERY_METRICS_PORT:
+        return
+
+    try:
+        start_http_server(settings.CELERY_METRICS_PORT)
+        logger.info(f"Celery 워커 메트릭 서버 시작: :{settings.CELERY_METRICS_PORT}/metrics")
+    except OSError as e:
+        # 같은 호스트에서 워커를 여러 개 띄우면 포트가 겹칠 수 있음
+        logger.warning(f"Celery 워커 메트릭 서버 시작 실패 (포트 {settings.CELERY_METRICS_PORT}): {e}")
@@ -205,3 +205,68 @@ def sample_audio_bytes():
     실제 오디오는 아니지만 크기 검증용으로 충분함
     '''
     return b"fake_audio_data" * 100  # 1500 bytes
+
+
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(monkeypatch):
+    '''
+    음성 인식 결과 캐시를 테스트마다 새로 만듦
+
+    전역 캐시에 이전 테스트의 결과가 남아 있으면
+    같은 오디오로 STT 오류를 검증하는 테스트가 캐시 적중으로 통과해버리므로
+    Redis 없이 로컬에서만 동작하는 빈 캐시로 교체
+    '''
+    from services import transcript_cache
+
+    monkeypatch.setattr(transcript_cache, "_caches", {})
+    monkeypatch.setattr(transcript_cache, "get_redis_sync", lambda: None)
+    return transcript_cache.get_transcript_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_status_store(monkeypatch):
+    '''
+    답변 처리 상태 저장소를 Redis 없이 동작하도록 교체 (기록 생략, 조회 결과 없음)
+    '''
+    from services import status_store
+
+    store = status_store.StatusStore(redis_client=None)
+    monkeypatch.setattr(status_store, "_store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiters(monkeypatch):
+    '''
+    외부 API 처리율 제한을 Redis 없이 동작하도록 교체 (제한 없이 통과)
+    '''
+    from services import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(rate_limiter, "get_redis_sync", lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_submission_guard(monkeypatch):
+    '''
+    답변 제출 멱등성 저장소를 Redis 없이 동작하도록 교체 (중복 확인 없이 제출 허용)
+    '''
+    from services import idempotency
+
+    guard = idempotency.SubmissionGuard(redis_client=None)
+    monkeypatch.setattr(idempotency, "_guard", guard)
+    return guard
+
+
+@pytest.fixture(autouse=True)
+def isolated_user_cache(monkeypatch):
+    '''
+    인증 사용자 캐시를 테스트마다 Redis 없는 빈 캐시로 교체
+
+    이전 테스트에서 캐시된 사용자 문서가 다른 테스트의 가짜 DB 조회 결과를 가리지 않도록 함
+    '''
+    from services import user_cache
+
+    cache = user_cache.UserCache(redis_client=None)
+    monkeypatch.setattr(user_cache, "_cache", cache)
+    return cache
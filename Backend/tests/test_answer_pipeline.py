@@ -0,0 +1,278 @@
+# tests/test_answer_pipeline.py
+"""
+답변 처리 파이프라인 테스트 파일
+
+단계별 작업(음성 인식 → 평가 → 저장), 완료된 문제 수에 따른 종합 평가 실행,
+단계 실패 시 문제 실패 기록과 체인 중단, 처리율 제한 대기 초과 시 대체 결과 대신 재시도,
+답변당 Mongo 접근 횟수를 검증
+"""
+
+from datetime import datetime
+
+import mongomock
+import pytest
+from bson import ObjectId
+from celery.exceptions import Ignore, Retry
+from mongomock_motor import AsyncMongoMockClient
+from unittest.mock import AsyncMock, Mock, patch
+
+from core.exceptions import APIQuotaExceededError, APIRateLimitError
+from services.audio_processor import AudioProcessor
+from services.blob_store import BlobNotFoundError
+from services.evaluator import ResponseEvaluator
+from services.fair_share import PRIORITY_FINAL
+from services.rate_limiter import RateLimiter
+from services import test_service
+from services.stt_backends import HttpSttBackend
+from tasks import audio_tasks
+from tasks.audio_tasks import (
+    build_answer_context,
+    evaluate_answer_task,
+    evaluate_overall_test_task,
+    fail_answer_stage,
+    mark_problem_finished,
+    persist_answer_task,
+    transcribe_answer_task,
+)
+
+
+@pytest.fixture
+def sync_db(monkeypatch):
+    """mongomock 기반 동기 DB (문제 3개짜리 테스트 1개)"""
+    db = mongomock.MongoClient().omypic
+    monkeypatch.setattr(audio_tasks, "get_mongodb_sync", lambda: db)
+    return db
+
+
+@pytest.fixture
+def test_id(sync_db):
+    problem_id = sync_db.problems.insert_one({
+        "problem_category": "묘사", "topic_category": "집", "content": "Describe your house."
+    }).inserted_id
+    problem_data = {str(n): {"problem_id": str(problem_id)} for n in (1, 2, 3)}
+    return str(sync_db.tests.insert_one({
+        "user_id": "user1", "test_date": datetime(2024, 1, 1), "problem_data": problem_data
+    }).inserted_id)
+
+
+def answer(test_id, sync_db, number="1", **extra):
+    """API가 작업 메시지에 담는 것과 같은 답변 정보"""
+    test = sync_db.tests.find_one({"_id": ObjectId(test_id)})
+    problem_id = test["problem_data"][number]["problem_id"]
+    problem = sync_db.problems.find_one({"_id": ObjectId(problem_id)})
+    return {
+        "test_id": test_id, "problem_id": problem_id, "problem_number": number,
+        **build_answer_context(test, problem), **extra
+    }
+
+
+class TestOverallTrigger:
+    """종합 평가 실행 조건 테스트"""
+
+    def test_triggers_once_after_all_problems(self, sync_db, test_id):
+        """모든 문제가 끝나야 종합 평가를 한 번만 실행 (순서와 무관)"""
+        with patch.object(audio_tasks.evaluate_overall_test_task, "apply_async") as mock_apply:
+            assert not mark_problem_finished(sync_db, test_id, "3")
+            assert not mark_problem_finished(sync_db, test_id, "1")
+            assert not mark_problem_finished(sync_db, test_id, "1")  # 다시 녹음한 문제는 한 번만 집계
+            assert mark_problem_finished(sync_db, test_id, "2")
+            assert not mark_problem_finished(sync_db, test_id, "2")
+
+        mock_apply.assert_called_once_with(args=[test_id], priority=PRIORITY_FINAL)
+        assert sync_db.tests.find_one({"_id": ObjectId(test_id)})["overall_feedback_status"] == "pending"
+
+
+    def test_final_problem_submitted_skips_unanswered(self, sync_db, test_id):
+        """마지막 문제를 제출했으면 건너뛴 문제(2번)는 기다리지 않고 제출된 답변이 모두 끝나면 실행"""
+        def submit(number, is_last_problem=False):
+            update = {"$addToSet": {"submitted_problems": number}}
+            if is_last_problem:
+                update["$set"] = {"final_problem_submitted": True}
+            sync_db.tests.update_one({"_id": ObjectId(test_id)}, update)
+
+        with patch.object(audio_tasks.evaluate_overall_test_task, "apply_async") as mock_apply:
+            submit("1")
+            submit("3", is_last_problem=True)
+            assert not mark_problem_finished(sync_db, test_id, "3", problem_count=3)  # 1번이 아직 처리 중
+            assert mark_problem_finished(sync_db, test_id, "1", problem_count=3)
+
+        mock_apply.assert_called_once_with(args=[test_id], priority=PRIORITY_FINAL)
+
+    def test_waits_for_all_problems_without_final_signal(self, sync_db, test_id):
+        sync_db.tests.update_one({"_id": ObjectId(test_id)}, {"$addToSet": {"submitted_problems": {"$each": ["1", "3"]}}})
+
+        with patch.object(audio_tasks.evaluate_overall_test_task, "apply_async") as mock_apply:
+            assert not mark_problem_finished(sync_db, test_id, "1", problem_count=3)
+            assert not mark_problem_finished(sync_db, test_id, "3", problem_count=3)
+
+        mock_apply.assert_not_called()
+
+
+class TestStages:
+    """단계별 작업 테스트"""
+
+    def test_transcribe_writes_status_store_only(self, sync_db, test_id, isolated_status_store):
+        """중간 상태는 상태 저장소에만 기록하고 테스트 문서는 건드리지 않음"""
+        before = sync_db.tests.find_one({"_id": ObjectId(test_id)})
+
+        with patch.object(isolated_status_store, "set_problem_status") as mock_status:
+            with patch.object(audio_tasks, "transcribe_audio_ref", return_value="I live in an apartment"):
+                result = transcribe_answer_task(answer(test_id, sync_db), "2024/01/01/abc.mp3")
+
+        assert result["transcribed_text"] == "I live in an apartment"
+        assert [c.args[2] for c in mock_status.call_args_list] == ["transcribing", "evaluating"]
+        assert sync_db.tests.find_one({"_id": ObjectId(test_id)}) == before
+
+    def test_evaluate_uses_context_from_message(self, test_id, sync_db):
+        """문제 정보는 메시지에서 가져오고 DB를 조회하지 않음"""
+        message = answer(test_id, sync_db, transcribed_text="I live in a small apartment downtown")
+        evaluation = {"score": "IM2", "feedback": {"paragraph": "good"}}
+
+        with patch.object(audio_tasks, "get_mongodb_sync", side_effect=AssertionError("DB 조회 없음")):
+            with patch.object(audio_tasks, "ResponseEvaluator") as mock_evaluator:
+                mock_evaluator.return_value.evaluate_response_sync.return_value = evaluation
+                result = evaluate_answer_task(message)
+
+        assert result["score"] == "IM2"
+        assert mock_evaluator.return_value.evaluate_response_sync.call_args.kwargs["problem"] == "Describe your house."
+
+    def test_short_answer_skips_llm(self, sync_db, test_id):
+        """다섯 단어 미만의 응답은 LLM을 호출하지 않고 NL"""
+        with patch.object(audio_tasks, "ResponseEvaluator") as mock_evaluator:
+            result = evaluate_answer_task(answer(test_id, sync_db, transcribed_text="hello"))
+
+        mock_evaluator.assert_not_called()
+        assert result["score"] == "NL"
+
+    def test_persist_saves_in_two_operations(self, sync_db, test_id):
+        """결과 저장과 완료 집계는 한 번의 갱신, 스크립트는 한 번의 삽입"""
+        message = answer(test_id, sync_db, transcribed_text="hello", score="IM2", feedback={})
+        db = Mock(wraps=sync_db)
+        db.tests = Mock(wraps=sync_db.tests)
+        db.scripts = Mock(wraps=sync_db.scripts)
+
+        with patch.object(audio_tasks, "get_mongodb_sync", return_value=db):
+            persist_answer_task(message)
+
+        assert [c[0] for c in db.tests.method_calls] == ["find_one_and_update"]
+        assert [c[0] for c in db.scripts.method_calls] == ["insert_one"]
+
+        problem = sync_db.tests.find_one({"_id": ObjectId(test_id)})["problem_data"]["1"]
+        assert (problem["score"], problem["user_response"], problem["processing_status"]) == ("IM2", "hello", "completed")
+        assert sync_db.scripts.find_one()["created_at"] == datetime(2024, 1, 1)
+
+
+class TestStageFailure:
+    """단계 실패 처리 테스트"""
+
+    def test_quota_error_retried_while_retries_left(self, sync_db, test_id):
+        task = Mock(max_retries=5)
+        task.request.retries = 1
+
+        with pytest.raises(APIQuotaExceededError):
+            fail_answer_stage(task, answer(test_id, sync_db), APIQuotaExceededError("quota"), "evaluate_answer_task")
+
+    def test_missing_upload_fails_problem(self, sync_db, test_id, isolated_status_store):
+        """저장소에 오디오가 없으면 대체 문구로 평가하지 않고 문제를 실패로 기록"""
+        with patch.object(audio_tasks, "transcribe_audio_ref", side_effect=BlobNotFoundError("2024/01/01/abc.mp3")):
+            with pytest.raises(Ignore):
+                transcribe_answer_task(answer(test_id, sync_db), "2024/01/01/abc.mp3")
+
+        test = sync_db.tests.find_one({"_id": ObjectId(test_id)})
+        assert test["problem_data"]["1"]["processing_status"] == "failed"
+        assert "user_response" not in test["problem_data"]["1"]
+        assert test["finished_problems"] == ["1"]
+
+    def test_failure_recorded_and_counted(self, sync_db, test_id):
+        """재시도할 수 없는 오류는 문제를 실패로 기록하고 완료로 집계한 뒤 체인 중단"""
+        task = Mock(max_retries=5)
+        task.request.retries = 5
+
+        with patch.object(audio_tasks, "mark_problem_finished") as mock_finished:
+            with pytest.raises(Ignore):
+                fail_answer_stage(task, answer(test_id, sync_db), APIQuotaExceededError("quota"), "evaluate_answer_task")
+
+        assert sync_db.errors.count_documents({"source": "evaluate_answer_task"}) == 1
+        assert mock_finished.call_args.kwargs["fields"]["processing_status"] == "failed"
+        assert mock_finished.call_args.kwargs["problem_count"] == 3
+
+
+class TestRateLimitRetry:
+    """STT 처리율 제한 대기 초과 시 재시도 테스트"""
+
+    def limited_processor(self):
+        """토큰을 얻으려면 120초를 기다려야 하는 (대기 한도 5초) STT 백엔드를 쓰는 AudioProcessor"""
+        redis = Mock()
+        redis.register_script.return_value = lambda keys, args: 120.0
+        limiter = RateLimiter("wit_ai", per_minute=1, burst=1, redis_client=redis, max_wait_seconds=5)
+        backend = HttpSttBackend(name="wit_ai", url="http://stt.invalid/speech", client=Mock(), limiter=limiter)
+        processor = AudioProcessor(backend=backend)
+        processor.vad_enabled = False
+        processor.segment_enabled = False
+        processor.transcoder = Mock(content_type="audio/mpeg3", transcode=lambda audio: audio)
+        processor.transcript_cache = Mock(get=Mock(return_value=None))
+        return processor
+
+    def test_process_audio_raises_rate_limit(self):
+        """대기 초과는 ValueError(대체 문구)로 바꾸지 않고 그대로 전달"""
+        with pytest.raises(APIRateLimitError):
+            self.limited_processor().process_audio(b"ID3" + bytes(2000))
+
+    def test_limiter_timeout_retries_instead_of_persisting(self, sync_db, test_id, isolated_status_store):
+        processor = self.limited_processor()
+        blob_store = Mock(get=Mock(return_value=b"ID3" + bytes(2000)))
+
+        with patch.object(audio_tasks, "AudioProcessor", return_value=processor), \
+                patch.object(audio_tasks, "get_blob_store", return_value=blob_store), \
+                patch.object(transcribe_answer_task, "retry", side_effect=Retry()) as mock_retry:
+            with pytest.raises(Retry):
+                transcribe_answer_task(answer(test_id, sync_db), "2024/01/01/abc.mp3")
+
+        assert isinstance(mock_retry.call_args.kwargs["exc"], APIRateLimitError)
+        problem = sync_db.tests.find_one({"_id": ObjectId(test_id)})["problem_data"]["1"]
+        assert "user_response" not in problem and "processing_status" not in problem
+        assert sync_db.scripts.count_documents({}) == 0
+
+    def test_overall_evaluation_raises_rate_limit(self):
+        """종합 평가도 대기 초과를 오류 피드백으로 바꾸지 않고 그대로 전달"""
+        evaluator = ResponseEvaluator()
+        limiter = Mock(aacquire=AsyncMock(side_effect=APIRateLimitError("대기 시간 초과")))
+
+        with patch.object(evaluator, "_get_llm", return_value=Mock(google_api_key="key")), \
+                patch("services.evaluator.gemini_limiter", return_value=limiter):
+            with pytest.raises(APIRateLimitError):
+                evaluator.evaluate_overall_test_sync({"test_type": True}, {"1": {"score": "IM2"}})
+
+    def test_overall_rate_limit_retries_instead_of_completing(self, sync_db, test_id, isolated_status_store):
+        # 작업 안에서 가져오므로 services.evaluator의 ResponseEvaluator를 교체
+        with patch("services.evaluator.ResponseEvaluator") as mock_evaluator, \
+                patch.object(evaluate_overall_test_task, "retry", side_effect=Retry()) as mock_retry:
+            mock_evaluator.return_value.evaluate_overall_test_sync.side_effect = APIRateLimitError("대기 시간 초과")
+            with pytest.raises(Retry):
+                evaluate_overall_test_task(test_id)
+
+        assert isinstance(mock_retry.call_args.kwargs["exc"], APIRateLimitError)
+        test = sync_db.tests.find_one({"_id": ObjectId(test_id)})
+        assert "test_score" not in test
+        assert test["overall_feedback_status"] == "processing"  # 재시도 전까지 처리 중 (Redis 없어 Mongo에 기록)
+
+    async def test_in_process_path_fails_problem_instead_of_scoring(self, isolated_status_store):
+        """공정 분배 실행기 경로도 대기 초과 시 대체 문구를 평가하지 않고 문제를 실패로 기록"""
+        db = AsyncMongoMockClient().omypic
+        problem_id = str((await db.problems.insert_one({"content": "Describe your house."})).inserted_id)
+        test_id = str((await db.tests.insert_one({
+            "user_id": "user1", "problem_data": {"1": {"problem_id": problem_id}}
+        })).inserted_id)
+        processor = Mock(process_audio_stream=AsyncMock(side_effect=APIRateLimitError("대기 시간 초과")))
+
+        with patch.object(test_service, "standard_audio_processor", processor), \
+                patch.object(test_service, "ResponseEvaluator") as mock_evaluator:
+            await test_service.process_audio_background(db, test_id, problem_id, "1", b"ID3" + bytes(2000), True)
+
+        mock_evaluator.assert_not_called()
+        test = await db.tests.find_one({"_id": ObjectId(test_id)})
+        assert test["problem_data"]["1"]["processing_status"] == "failed"
+        assert "score" not in test["problem_data"]["1"]
+        assert test["overall_feedback_status"] == "failed"
+        assert await db.scripts.count_documents({}) == 0
+
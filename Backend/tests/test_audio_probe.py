@@ -0,0 +1,201 @@
+# tests/test_audio_probe.py
+"""
+오디오 헤더 검사 테스트 파일
+
+MP3/WAV/WebM 헤더 해석, STT 요구사항 판단,
+요구사항을 만족하는 업로드의 변환 생략(그대로 전송)을 검증
+"""
+
+import io
+import struct
+import wave
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from services.audio_probe import id3v2_size, is_pcm16_mono, is_stt_compliant, probe_audio, probe_audio_file
+from services.audio_processor import AudioProcessor
+from services.transcoder import TranscodeError
+
+WIT_TYPES = frozenset({"audio/mpeg3", "audio/wav", "audio/ogg"})
+
+# MPEG-2 Layer III, 32kbps, 16kHz, 모노 (프레임 길이 144바이트, 프레임당 0.036초)
+MONO_16K_HEADER = bytes([0xFF, 0xF3, 0x48, 0xC0])
+# MPEG-1 Layer III, 128kbps, 44.1kHz, 스테레오 (프레임 길이 417바이트)
+STEREO_44K_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+
+
+def mp3_bytes(header: bytes, frame_length: int, frames: int, id3: bytes = b"") -> bytes:
+    frame = header + b"\x00" * (frame_length - len(header))
+    return id3 + frame * frames
+
+
+def id3_tag(payload_size: int) -> bytes:
+    size = bytes([(payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0)])
+    return b"ID3\x03\x00\x00" + size + b"\x00" * payload_size
+
+
+def wav_bytes(seconds: float, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        samples = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+        wav.writeframes(np.repeat(samples, channels).tobytes())
+    return buffer.getvalue()
+
+
+def ebml(element_id: bytes, payload: bytes) -> bytes:
+    size = len(payload)
+    encoded = bytes([0x80 | size]) if size < 0x7F else struct.pack(">H", 0x4000 | size)
+    return element_id + encoded + payload
+
+
+def webm_bytes(duration_ms=5000.0, codec=b"A_OPUS", channels=1) -> bytes:
+    header = ebml(b"\x1a\x45\xdf\xa3", ebml(b"\x42\x82", b"webm"))
+    info = ebml(b"\x2a\xd7\xb1", (1_000_000).to_bytes(3, "big"))
+    if duration_ms is not None:
+        info += ebml(b"\x44\x89", struct.pack(">d", duration_ms))
+    audio = ebml(b"\xb5", struct.pack(">d", 48000.0)) + ebml(b"\x9f", bytes([channels]))
+    track = ebml(b"\xae", ebml(b"\x83", b"\x02") + ebml(b"\x86", codec) + ebml(b"\xe1", audio))
+    segment = ebml(b"\x15\x49\xa9\x66", info) + ebml(b"\x16\x54\xae\x6b", track)
+    segment += ebml(b"\x1f\x43\xb6\x75", b"\x00" * 32)
+    # 라이브 녹음(MediaRecorder)처럼 Segment 크기를 '알 수 없음'으로 기록
+    return header + b"\x18\x53\x80\x67" + b"\x01\xff\xff\xff\xff\xff\xff\xff" + segment
+
+
+class TestProbe:
+    """헤더 해석 테스트"""
+
+    def test_mp3_mono(self):
+        """MP3 프레임 헤더에서 샘플레이트/채널/비트레이트/길이 추출"""
+        info = probe_audio(mp3_bytes(MONO_16K_HEADER, 144, 250))
+
+        assert (info.container, info.sample_rate, info.channels, info.bitrate) == ("mp3", 16000, 1, 32000)
+        assert abs(info.duration - 9.0) < 0.01  # 250프레임 x 0.036초
+
+    def test_mp3_after_id3_tag(self, tmp_path):
+        """ID3 태그 뒤의 첫 프레임을 찾음 (파일은 헤더만 읽음)"""
+        data = mp3_bytes(MONO_16K_HEADER, 144, 100, id3=id3_tag(100_000))
+        path = tmp_path / "answer.mp3"
+        path.write_bytes(data)
+
+        assert id3v2_size(data) == 100_010
+        assert probe_audio(data).channels == 1
+        assert probe_audio_file(str(path)) == probe_audio(data)
+
+    def test_mp3_xing_frame_count(self):
+        """Xing 헤더가 있으면 프레임 수로 길이 계산 (VBR)"""
+        xing = MONO_16K_HEADER + b"\x00" * 9 + b"Xing" + struct.pack(">II", 1, 1000)
+        data = xing + b"\x00" * (144 - len(xing)) + mp3_bytes(MONO_16K_HEADER, 144, 10)
+
+        assert abs(probe_audio(data).duration - 36.0) < 0.01
+
+    def test_wav(self):
+        """WAV fmt/data 청크 해석"""
+        info = probe_audio(wav_bytes(2.0))
+
+        assert (info.codec, info.sample_rate, info.channels) == ("pcm_s16le", 16000, 1)
+        assert abs(info.duration - 2.0) < 0.01
+        assert is_pcm16_mono(info)
+
+    def test_webm_opus(self):
+        """WebM 트랙 정보와 Segment Info의 길이 해석"""
+        info = probe_audio(webm_bytes())
+
+        assert (info.container, info.codec, info.sample_rate, info.channels) == ("webm", "opus", 48000, 1)
+        assert abs(info.duration - 5.0) < 0.01
+
+    def test_unknown_format(self):
+        """인식할 수 없는 데이터는 None"""
+        assert probe_audio(b"fake_audio_data" * 100) is None
+        assert probe_audio(b"") is None
+
+
+class TestCompliance:
+    """STT 요구사항 판단 테스트"""
+
+    def test_compact_mono_mp3_is_compliant(self):
+        assert is_stt_compliant(probe_audio(mp3_bytes(MONO_16K_HEADER, 144, 250)), WIT_TYPES, 120)
+
+    def test_stereo_high_bitrate_mp3_needs_transcode(self):
+        assert not is_stt_compliant(probe_audio(mp3_bytes(STEREO_44K_HEADER, 417, 50)), WIT_TYPES, 120)
+
+    def test_too_long_needs_transcode(self):
+        assert not is_stt_compliant(probe_audio(mp3_bytes(MONO_16K_HEADER, 144, 250)), WIT_TYPES, 5)
+
+    def test_wav_requires_16k_mono(self):
+        assert is_stt_compliant(probe_audio(wav_bytes(1.0)), WIT_TYPES, 120)
+        assert not is_stt_compliant(probe_audio(wav_bytes(1.0, sample_rate=44100)), WIT_TYPES, 120)
+        assert not is_stt_compliant(probe_audio(wav_bytes(1.0, channels=2)), WIT_TYPES, 120)
+
+    def test_webm_depends_on_backend(self):
+        """WebM은 받는 백엔드에서만 그대로 전송, 길이를 모르면 변환"""
+        info = probe_audio(webm_bytes())
+        assert not is_stt_compliant(info, WIT_TYPES, 120)
+        assert is_stt_compliant(info, WIT_TYPES | {"audio/webm"}, 120)
+        assert not is_stt_compliant(probe_audio(webm_bytes(duration_ms=None)), WIT_TYPES | {"audio/webm"}, 120)
+
+
+class TestPassthrough:
+    """AudioProcessor 변환 생략 테스트"""
+
+    def test_compliant_mp3_forwarded_without_ffmpeg(self):
+        """요구사항을 만족하는 MP3는 원본 바이트 그대로 전송"""
+        processor = AudioProcessor()
+        audio = mp3_bytes(MONO_16K_HEADER, 144, 250)
+        response = Mock(status_code=200, text='{"text": "hello", "is_final": true}')
+
+        with patch.object(processor.transcoder, '_run', side_effect=TranscodeError("호출되면 안 됨")) as mock_run:
+            with patch('services.stt_client.requests.Session.post', return_value=response) as mock_post:
+                assert processor.process_audio(audio) == "hello"
+
+        mock_run.assert_not_called()
+        assert mock_post.call_args.kwargs["data"] == audio
+        assert mock_post.call_args.kwargs["headers"]["Content-Type"] == "audio/mpeg3"
+
+    def test_passthrough_disabled(self):
+        """설정으로 끄면 기존 변환 경로 사용"""
+        processor = AudioProcessor()
+        processor.passthrough_enabled = False
+        audio = mp3_bytes(MONO_16K_HEADER, 144, 250)
+        response = Mock(status_code=200, text='{"text": "hello", "is_final": true}')
+
+        with patch.object(processor, '_preprocess_audio', return_value=b"processed" * 20) as mock_preprocess:
+            with patch.object(processor, '_prepare_segments', return_value=None):
+                with patch('services.stt_client.requests.Session.post', return_value=response):
+                    processor.process_audio(audio)
+
+        mock_preprocess.assert_called_once()
+
+    def test_pcm_wav_skips_decode(self):
+        """16kHz 모노 PCM WAV는 ffmpeg 디코딩 없이 VAD에 전달"""
+        processor = AudioProcessor()
+        audio = wav_bytes(2.0)
+
+        with patch.object(processor.transcoder, 'decode_pcm') as mock_decode:
+            pcm = processor._decode_speech(audio)
+
+        mock_decode.assert_not_called()
+        assert 0 < len(pcm) <= 2 * 16000 * 2
+
+    async def test_stream_passthrough(self, tmp_path):
+        """스트리밍 경로에서도 파일 헤더만 읽고 그대로 전송"""
+        backend = Mock()
+        backend.name = "fake"
+        backend.content_types = WIT_TYPES
+
+        async def atranscribe(content, content_type):
+            backend.sent = (content, content_type)
+            return "hello"
+        backend.atranscribe = atranscribe
+
+        path = tmp_path / "answer.mp3"
+        audio = mp3_bytes(MONO_16K_HEADER, 144, 250)
+        path.write_bytes(audio)
+
+        processor = AudioProcessor(backend=backend)
+        assert await processor.process_audio_stream(str(path)) == "hello"
+        assert backend.sent == (audio, "audio/mpeg3")
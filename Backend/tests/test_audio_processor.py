@@ -10,8 +10,12 @@ import json
 from unittest.mock import Mock, patch
 from io import BytesIO
 import requests
+import numpy as np
+from prometheus_client import REGISTRY
 
 from services.audio_processor import AudioProcessor
+from services.stt_backends import parse_wit_response
+from services.transcoder import TranscodeError
 
 
 class TestAudioProcessorInit:
@@ -21,12 +25,14 @@ class TestAudioProcessorInit:
         """정상적으로 API 키가 있을 때 초기화 성공"""
         processor = AudioProcessor()
 
-        assert processor.api_key == "test_key"  # 환경변수에서 설정한 값
-        assert processor.base_url == "https://api.wit.ai/speech"
+        assert processor.backend.name == "wit_ai"
+        assert processor.backend.api_key == "test_key"  # 환경변수에서 설정한 값
+        assert processor.backend.url == "https://api.wit.ai/speech"
 
     def test_init_fails_without_api_key(self):
         """API 키가 없을 때 ValueError 발생"""
-        with patch('services.audio_processor.settings') as mock_settings:
+        with patch('services.stt_backends.settings') as mock_settings:
+            mock_settings.STT_BACKEND = "wit_ai"
             mock_settings.WIT_AI_API_KEY = ""
 
             with pytest.raises(ValueError, match="WIT_AI_API_KEY가 설정되지 않았습니다"):
@@ -34,7 +40,8 @@ class TestAudioProcessorInit:
 
     def test_init_fails_with_none_api_key(self):
         """API 키가 None일 때 ValueError 발생"""
-        with patch('services.audio_processor.settings') as mock_settings:
+        with patch('services.stt_backends.settings') as mock_settings:
+            mock_settings.STT_BACKEND = "wit_ai"
             mock_settings.WIT_AI_API_KEY = None
 
             with pytest.raises(ValueError, match="WIT_AI_API_KEY가 설정되지 않았습니다"):
@@ -42,91 +49,86 @@ class TestAudioProcessorInit:
 
 
 class TestParseWitResponse:
-    """_parse_wit_response 메서드 테스트 (NDJSON 파싱)"""
+    """parse_wit_response 함수 테스트 (NDJSON 파싱)"""
 
-    @pytest.fixture
-    def processor(self):
-        """테스트용 AudioProcessor 인스턴스"""
-        return AudioProcessor()
-
-    def test_parse_single_line_ndjson(self, processor):
+    def test_parse_single_line_ndjson(self):
         """단일 줄 NDJSON 응답 파싱"""
         response_text = '{"text": "안녕하세요", "is_final": true}'
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         assert result == "안녕하세요"
 
-    def test_parse_multiline_ndjson(self, processor):
+    def test_parse_multiline_ndjson(self):
         """여러 줄 NDJSON 응답에서 마지막 텍스트 추출"""
         response_text = '''{"text": "안녕", "is_final": false}
 {"text": "안녕하세요", "is_final": false}
 {"text": "안녕하세요 반갑습니다", "is_final": true}'''
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         # 마지막 줄의 텍스트를 반환해야 함
         assert result == "안녕하세요 반갑습니다"
 
-    def test_parse_empty_response(self, processor):
+    def test_parse_empty_response(self):
         """빈 응답 처리"""
         response_text = ""
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         assert result == ""
 
-    def test_parse_whitespace_only_response(self, processor):
+    def test_parse_whitespace_only_response(self):
         """공백만 있는 응답 처리"""
         response_text = "   \n\n   "
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         assert result == ""
 
-    def test_parse_invalid_json(self, processor):
+    def test_parse_invalid_json(self):
         """잘못된 JSON 형식 처리"""
         response_text = "this is not json"
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         # 파싱 실패 시 빈 문자열 반환
         assert result == ""
 
-    def test_parse_json_without_text_field(self, processor):
+    def test_parse_json_without_text_field(self):
         """text 필드가 없는 JSON 처리"""
         response_text = '{"is_final": true, "speech": "안녕하세요"}'
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         # text 필드가 없으면 빈 문자열 반환
         assert result == ""
 
-    def test_parse_json_with_empty_text(self, processor):
+    def test_parse_json_with_empty_text(self):
         """text 필드가 빈 문자열인 JSON 처리"""
         response_text = '{"text": "", "is_final": true}'
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         assert result == ""
 
-    def test_parse_mixed_valid_and_invalid_lines(self, processor):
+    def test_parse_mixed_valid_and_invalid_lines(self):
         """유효한 JSON과 무효한 JSON이 섞인 경우"""
         response_text = '''invalid line
 {"text": "첫 번째 텍스트", "is_final": false}
 not json either
 {"text": "두 번째 텍스트", "is_final": true}'''
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         # 역순으로 검사하므로 마지막 유효한 텍스트 반환
         assert result == "두 번째 텍스트"
 
-    def test_parse_with_trailing_whitespace(self, processor):
+    def test_parse_with_trailing_whitespace(self):
         """텍스트에 앞뒤 공백이 있는 경우 trim 처리"""
         response_text = '{"text": "  안녕하세요  ", "is_final": true}'
 
-        result = processor._parse_wit_response(response_text)
+        result = parse_wit_response(response_text)
 
         assert result == "안녕하세요"
 
@@ -145,7 +147,7 @@ class TestProcessAudio:
         mock_response.status_code = 200
         mock_response.text = '{"text": "테스트 음성 인식 결과", "is_final": true}'
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response):
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response):
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
                 result = processor.process_audio(sample_audio_bytes)
 
@@ -167,7 +169,7 @@ class TestProcessAudio:
 
     def test_process_audio_api_timeout(self, processor, sample_audio_bytes):
         """Wit.ai API 타임아웃 처리"""
-        with patch('services.audio_processor.requests.post') as mock_post:
+        with patch('services.stt_client.requests.Session.post') as mock_post:
             mock_post.side_effect = requests.exceptions.Timeout()
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
@@ -176,7 +178,7 @@ class TestProcessAudio:
 
     def test_process_audio_connection_error(self, processor, sample_audio_bytes):
         """Wit.ai API 연결 오류 처리"""
-        with patch('services.audio_processor.requests.post') as mock_post:
+        with patch('services.stt_client.requests.Session.post') as mock_post:
             mock_post.side_effect = requests.exceptions.ConnectionError()
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
@@ -189,7 +191,7 @@ class TestProcessAudio:
         mock_response.status_code = 400
         mock_response.text = "Bad Request"
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response):
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response):
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
                 with pytest.raises(ValueError, match="Wit.ai API 오류: 400"):
@@ -201,7 +203,7 @@ class TestProcessAudio:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response):
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response):
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
                 with pytest.raises(ValueError, match="Wit.ai API 오류: 500"):
@@ -213,7 +215,7 @@ class TestProcessAudio:
         mock_response.status_code = 200
         mock_response.text = '{"text": "", "is_final": true}'
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response):
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response):
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
                 result = processor.process_audio(sample_audio_bytes)
 
@@ -226,7 +228,7 @@ class TestProcessAudio:
         mock_response.status_code = 200
         mock_response.text = '{"text": "테스트", "is_final": true}'
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response):
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response):
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes) as mock_preprocess:
                 processor.process_audio(sample_audio_bytes)
 
@@ -239,11 +241,11 @@ class TestProcessAudio:
         mock_response.status_code = 200
         mock_response.text = '{"text": "테스트", "is_final": true}'
 
-        with patch('services.audio_processor.requests.post', return_value=mock_response) as mock_post:
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response) as mock_post:
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
                 processor.process_audio(sample_audio_bytes)
 
-                # requests.post 호출 시 전달된 인자 확인
+                # STT 요청 시 전달된 인자 확인
                 call_args = mock_post.call_args
                 headers = call_args.kwargs['headers']
 
@@ -252,7 +254,7 @@ class TestProcessAudio:
 
     def test_process_audio_unsupported_format_error(self, processor, sample_audio_bytes):
         """지원되지 않는 오디오 형식 오류 처리"""
-        with patch('services.audio_processor.requests.post') as mock_post:
+        with patch('services.stt_client.requests.Session.post') as mock_post:
             mock_post.side_effect = Exception("unsupported audio format")
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
@@ -261,7 +263,7 @@ class TestProcessAudio:
 
     def test_process_audio_memory_error(self, processor, sample_audio_bytes):
         """메모리 오류 처리"""
-        with patch('services.audio_processor.requests.post') as mock_post:
+        with patch('services.stt_client.requests.Session.post') as mock_post:
             mock_post.side_effect = Exception("memory overflow")
             with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
 
@@ -269,6 +271,21 @@ class TestProcessAudio:
                     processor.process_audio(sample_audio_bytes)
 
 
+    def test_metrics_labeled_with_active_backend(self, sample_audio_bytes):
+        """처리 시간 메트릭은 설정된 STT 백엔드 이름으로 기록 (Wit.ai로 고정하지 않음)"""
+        backend = Mock(content_types=frozenset())
+        backend.name = "local"
+        backend.transcribe.return_value = "로컬 인식 결과"
+        processor = AudioProcessor(backend=backend)
+        labels = {"status": "success", "processor": "local"}
+        before = REGISTRY.get_sample_value("audio_process_duration_seconds_count", labels) or 0
+
+        with patch.object(processor, '_preprocess_audio', return_value=sample_audio_bytes):
+            assert processor.process_audio(sample_audio_bytes) == "로컬 인식 결과"
+
+        assert REGISTRY.get_sample_value("audio_process_duration_seconds_count", labels) == before + 1
+
+
 class TestPreprocessAudio:
     """_preprocess_audio 메서드 테스트"""
 
@@ -281,9 +298,9 @@ class TestPreprocessAudio:
         """전처리 실패 시 원본 오디오 반환"""
         original_audio = b"original_audio_data" * 100
 
-        # AudioSegment.from_file이 실패하도록 Mock
-        with patch('services.audio_processor.AudioSegment.from_file') as mock_from_file:
-            mock_from_file.side_effect = Exception("Audio processing failed")
+        # ffmpeg 변환이 실패하도록 Mock
+        with patch.object(processor.transcoder, 'decode_pcm') as mock_decode:
+            mock_decode.side_effect = TranscodeError("Audio processing failed")
 
             result = processor._preprocess_audio(original_audio)
 
@@ -291,30 +308,48 @@ class TestPreprocessAudio:
         assert result == original_audio
 
     def test_preprocess_audio_limits_duration(self, processor):
-        """2분 이상의 오디오를 2분으로 제한하는지 테스트"""
+        """한 번의 ffmpeg 실행으로 2분 제한, 16kHz 모노 변환을 처리하는지 테스트"""
         sample_audio = b"long_audio" * 100
 
-        # 3분짜리 오디오 Mock
-        mock_audio = Mock()
-        mock_audio.channels = 1
-        mock_audio.frame_rate = 16000
-        mock_audio.__len__ = Mock(return_value=180000)  # 3분 = 180초 = 180000ms
+        mock_result = Mock(returncode=0, stdout=b"processed_audio", stderr=b"")
+        processor.vad_enabled = False
+
+        with patch('services.transcoder.subprocess.run', return_value=mock_result) as mock_run:
+            result = processor._preprocess_audio(sample_audio)
+
+        assert result == b"processed_audio"
+        mock_run.assert_called_once()
+
+        args = mock_run.call_args.args[0]
+        assert args[args.index("-t") + 1] == "120"      # 2분(120초)으로 제한
+        assert args[args.index("-ar") + 1] == "16000"   # 16kHz
+        assert args[args.index("-ac") + 1] == "1"       # 모노
+        assert mock_run.call_args.kwargs["input"] == sample_audio
 
-        # 슬라이싱된 오디오 Mock
-        mock_sliced_audio = Mock()
-        mock_sliced_audio.channels = 1
-        mock_sliced_audio.frame_rate = 16000
-        mock_sliced_audio.export = Mock()
-        mock_audio.__getitem__ = Mock(return_value=mock_sliced_audio)
+    def test_preprocess_audio_trims_silence_with_vad(self, processor):
+        """VAD 사용 시 PCM 디코딩 -> 무음 제거 -> 인코딩 순서로 처리"""
+        tone = (np.sin(np.arange(16000 * 2) * 2 * np.pi * 220 / 16000) * 3000).astype("<i2")
+        silence = np.zeros(16000 * 3, dtype="<i2")
+        pcm = np.concatenate([silence, tone, silence]).tobytes()
 
-        mock_buffer = BytesIO(b"processed_audio")
+        with patch.object(processor.transcoder, 'decode_pcm', return_value=pcm):
+            with patch.object(processor.transcoder, 'encode_pcm', return_value=b"encoded") as mock_encode:
+                result = processor._preprocess_audio(b"original" * 100)
 
-        with patch('services.audio_processor.AudioSegment.from_file', return_value=mock_audio):
-            with patch('services.audio_processor.io.BytesIO', return_value=mock_buffer):
-                processor._preprocess_audio(sample_audio)
+        assert result == b"encoded"
+        trimmed_pcm = mock_encode.call_args.args[0]
+        assert len(trimmed_pcm) < len(pcm) / 2
 
-                # 2분(120000ms)으로 슬라이싱되었는지 확인
-                mock_audio.__getitem__.assert_called_once_with(slice(None, 120000, None))
+    def test_silent_recording_skips_stt(self, processor):
+        """무음 녹음은 STT를 호출하지 않고 빈 문자열 반환"""
+        silence = np.zeros(16000 * 5, dtype="<i2").tobytes()
+
+        with patch.object(processor.transcoder, 'decode_pcm', return_value=silence):
+            with patch('services.stt_client.requests.Session.post') as mock_post:
+                result = processor.process_audio(b"silent_audio" * 100)
+
+        assert result == ""
+        mock_post.assert_not_called()
 
 
 class TestProcessAudioForCelery:
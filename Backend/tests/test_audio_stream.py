@@ -0,0 +1,123 @@
+# tests/test_audio_stream.py
+"""
+오디오 스트리밍 유틸리티 테스트 파일
+
+업로드 청크 읽기/크기 제한, 임시 파일 기록, ffmpeg 파이프 스트리밍을 검증
+"""
+
+import asyncio
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from services import audio_stream
+from services.audio_stream import (
+    TranscodeError,
+    transcode_stream,
+    iter_upload,
+    spool_upload,
+    upload_source,
+    validate_audio_extension,
+)
+
+
+def make_upload(data: bytes, filename: str = "answer_1.mp3") -> UploadFile:
+    """테스트용 업로드 파일 생성"""
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+class TestUploadReading:
+    """업로드 파일 읽기 테스트"""
+
+    async def test_iter_upload_yields_chunks(self):
+        """청크 단위로 나누어 읽음"""
+        chunks = [chunk async for chunk in iter_upload(make_upload(b"a" * 250), chunk_size=100)]
+
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+    async def test_iter_upload_rejects_oversized_file(self):
+        """크기 제한을 넘으면 400 에러"""
+        with pytest.raises(HTTPException) as exc_info:
+            async for _ in iter_upload(make_upload(b"a" * 250), max_bytes=200, chunk_size=100):
+                pass
+
+        assert exc_info.value.status_code == 400
+
+    async def test_spool_upload_writes_temp_file(self):
+        """임시 파일에 업로드 내용을 기록"""
+        path = await spool_upload(make_upload(b"audio-bytes"))
+        try:
+            with open(path, "rb") as f:
+                assert f.read() == b"audio-bytes"
+            assert path.endswith(".mp3")
+        finally:
+            os.unlink(path)
+
+    async def test_spool_upload_removes_file_on_error(self):
+        """크기 제한 초과 시 임시 파일 삭제"""
+        created = []
+        original_mkstemp = audio_stream.tempfile.mkstemp
+
+        def tracking_mkstemp(*args, **kwargs):
+            fd, path = original_mkstemp(*args, **kwargs)
+            created.append(path)
+            return fd, path
+
+        with patch.object(audio_stream.tempfile, "mkstemp", side_effect=tracking_mkstemp):
+            with pytest.raises(HTTPException):
+                await spool_upload(make_upload(b"a" * 300), max_bytes=100)
+
+        assert created and not os.path.exists(created[0])
+
+    async def test_upload_source_spools_m4a_only(self):
+        """M4A는 임시 파일 경로, 그 외 형식은 청크 이터레이터로 전달"""
+        async with upload_source(make_upload(b"m4a-bytes", "answer.m4a")) as source:
+            assert isinstance(source, str)
+            spooled_path = source
+        assert not os.path.exists(spooled_path)
+
+        async with upload_source(make_upload(b"mp3-bytes", "answer.mp3")) as source:
+            assert not isinstance(source, (str, bytes))
+
+    def test_validate_audio_extension(self):
+        """지원하지 않는 확장자는 400 에러"""
+        assert validate_audio_extension("answer.MP3") == "mp3"
+
+        with pytest.raises(HTTPException):
+            validate_audio_extension("answer.txt")
+
+
+class TestFfmpegStream:
+    """ffmpeg 파이프 스트리밍 테스트 (ffmpeg 대신 cat/false로 파이프 동작만 검증)"""
+
+    @staticmethod
+    def fake_exec(command):
+        original = asyncio.create_subprocess_exec
+
+        async def _exec(*args, **kwargs):
+            return await original(command, **kwargs)
+
+        return _exec
+
+    async def test_streams_input_through_subprocess(self):
+        """입력 청크가 하위 프로세스를 거쳐 출력 청크로 전달"""
+        async def chunks():
+            for _ in range(4):
+                yield b"x" * 50_000
+
+        with patch.object(audio_stream.asyncio, "create_subprocess_exec", self.fake_exec("cat")):
+            async with transcode_stream(chunks()) as output:
+                received = b"".join([chunk async for chunk in output])
+
+        assert len(received) == 200_000
+
+    async def test_raises_transcode_error_on_failure(self):
+        """변환 프로세스가 실패하면 TranscodeError"""
+        with patch.object(audio_stream.asyncio, "create_subprocess_exec", self.fake_exec("false")):
+            with pytest.raises(TranscodeError):
+                async with transcode_stream(b"not audio") as output:
+                    async for _ in output:
+                        pass
@@ -0,0 +1,138 @@
+# tests/test_blob_store.py
+"""
+답변 오디오 저장소 테스트 파일
+
+로컬/S3 저장소의 지문 기반 키, 조회 실패, 만료 정리, 구현이 빠진 저장소의 생성 거부,
+워커의 지연 조회(음성 인식 캐시 적중 시 조회 생략)를 검증
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from services.blob_store import (
+    BlobNotFoundError,
+    BlobStore,
+    LocalBlobStore,
+    S3BlobStore,
+    digest_from_key,
+)
+from services.transcript_cache import audio_digest
+from tasks.audio_tasks import transcribe_audio_ref
+
+
+class TestBlobStoreInterface:
+    """저장소 공통 인터페이스 테스트"""
+
+    def test_incomplete_backend_fails_on_creation(self):
+        """필수 메서드가 빠진 저장소는 첫 호출이 아니라 생성할 때 실패"""
+        class ReadOnlyStore(BlobStore):
+            def get(self, key):
+                return b""
+
+        with pytest.raises(TypeError):
+            ReadOnlyStore()
+
+
+class TestLocalBlobStore:
+    """로컬 파일시스템 저장소 테스트"""
+
+    def test_put_get_roundtrip(self, tmp_path):
+        """저장한 오디오를 참조 키로 조회, 키에는 오디오 지문 포함"""
+        store = LocalBlobStore(str(tmp_path))
+        key = store.put(b"audio" * 100, "mp3")
+
+        assert key.endswith(".mp3")
+        assert digest_from_key(key) == audio_digest(b"audio" * 100)
+        assert store.get(key) == b"audio" * 100
+
+    def test_put_file_same_key_as_bytes(self, tmp_path):
+        """파일로 저장해도 같은 내용이면 같은 키"""
+        store = LocalBlobStore(str(tmp_path / "blobs"))
+        source = tmp_path / "answer.mp3"
+        source.write_bytes(b"audio" * 100)
+
+        assert store.put_file(str(source), "mp3") == store.put(b"audio" * 100, "mp3")
+
+    def test_missing_key(self, tmp_path):
+        """없는 키와 저장소 밖을 가리키는 키는 BlobNotFoundError"""
+        store = LocalBlobStore(str(tmp_path / "blobs"))
+
+        with pytest.raises(BlobNotFoundError):
+            store.get("2024/01/01/missing.mp3")
+        with pytest.raises(BlobNotFoundError):
+            store.get("../../etc/passwd")
+
+    def test_delete_older_than(self, tmp_path):
+        """보관 기간이 지난 오디오만 삭제"""
+        store = LocalBlobStore(str(tmp_path))
+        old_key = store.put(b"old" * 10, "mp3")
+        new_key = store.put(b"new" * 10, "mp3")
+        past = time.time() - 7200
+        os.utime(os.path.join(str(tmp_path), old_key), (past, past))
+
+        assert store.delete_older_than(3600) == 1
+        assert store.get(new_key) == b"new" * 10
+        with pytest.raises(BlobNotFoundError):
+            store.get(old_key)
+
+
+class TestS3BlobStore:
+    """S3 저장소 테스트 (boto3 클라이언트 Mock)"""
+
+    def test_put_uses_prefix(self):
+        client = Mock()
+        store = S3BlobStore("bucket", prefix="answer-audio/", client=client)
+
+        key = store.put(b"audio", "webm")
+
+        assert key.startswith("answer-audio/")
+        client.put_object.assert_called_once_with(Bucket="bucket", Key=key, Body=b"audio")
+
+    def test_delete_older_than_batches(self):
+        """만료된 객체만 모아 delete_objects로 일괄 삭제"""
+        client = Mock()
+        old = datetime.fromtimestamp(time.time() - 7200, tz=timezone.utc)
+        new = datetime.now(timezone.utc)
+        client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "answer-audio/a.mp3", "LastModified": old},
+                          {"Key": "answer-audio/b.mp3", "LastModified": new}]}
+        ]
+        store = S3BlobStore("bucket", client=client)
+
+        assert store.delete_older_than(3600) == 1
+        client.delete_objects.assert_called_once_with(
+            Bucket="bucket", Delete={"Objects": [{"Key": "answer-audio/a.mp3"}], "Quiet": True}
+        )
+
+
+class TestLazyFetch:
+    """워커 지연 조회 테스트"""
+
+    def test_cache_hit_skips_fetch(self, tmp_path, monkeypatch, isolated_transcript_cache):
+        """음성 인식 캐시에 있으면 저장소에서 오디오를 가져오지 않음"""
+        store = LocalBlobStore(str(tmp_path))
+        key = store.put(b"audio" * 100, "mp3")
+        isolated_transcript_cache.set(digest_from_key(key), transcript="cached transcript")
+
+        processor = Mock(transcript_cache=isolated_transcript_cache)
+        fetch = Mock()
+        monkeypatch.setattr("tasks.audio_tasks.get_blob_store", lambda: Mock(get=fetch))
+
+        assert transcribe_audio_ref(processor, key) == "cached transcript"
+        fetch.assert_not_called()
+        processor.process_audio_for_celery.assert_not_called()
+
+    def test_cache_miss_fetches_audio(self, tmp_path, monkeypatch, isolated_transcript_cache):
+        store = LocalBlobStore(str(tmp_path))
+        key = store.put(b"audio" * 100, "mp3")
+
+        processor = Mock(transcript_cache=isolated_transcript_cache)
+        processor.process_audio_for_celery.return_value = "hello"
+        monkeypatch.setattr("tasks.audio_tasks.get_blob_store", lambda: store)
+
+        assert transcribe_audio_ref(processor, key) == "hello"
+        processor.process_audio_for_celery.assert_called_once_with(b"audio" * 100)
@@ -0,0 +1,135 @@
+# tests/test_fair_share.py
+"""
+평가 작업 우선순위 및 공정 분배 테스트 파일
+
+우선순위가 높은 작업 먼저 실행, 같은 우선순위 안에서 사용자별 라운드 로빈,
+최근 제출이 많은 사용자의 Celery 우선순위 하향(고정 창), Redis 장애 시 기본 우선순위를 검증
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+from core.config import settings
+from services.fair_share import (
+    PRIORITY_BULK,
+    PRIORITY_DEFAULT,
+    PRIORITY_FINAL,
+    PRIORITY_INTERACTIVE,
+    FairShareExecutor,
+    fair_priority,
+)
+
+
+class FakeRedis:
+    """INCR/TTL/EXPIRE만 흉내 내는 테스트용 Redis (now로 시간을 옮겨 만료 확인)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.counts = {}
+        self.deadlines = {}
+        self.expire_calls = 0
+        self._ops = []
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def _expire_keys(self):
+        for key, deadline in list(self.deadlines.items()):
+            if self.now >= deadline:
+                del self.counts[key], self.deadlines[key]
+
+    def incr(self, key):
+        self._ops.append(("incr", key))
+
+    def ttl(self, key):
+        self._ops.append(("ttl", key))
+
+    def expire(self, key, seconds):
+        self.expire_calls += 1
+        self.deadlines[key] = self.now + seconds
+
+    def execute(self):
+        self._expire_keys()
+        results = []
+        for op, key in self._ops:
+            if op == "incr":
+                self.counts[key] = self.counts.get(key, 0) + 1
+                results.append(self.counts[key])
+            else:
+                results.append(int(self.deadlines[key] - self.now) if key in self.deadlines else -1)
+        self._ops = []
+        return results
+
+
+class TestFairPriority:
+    """Celery 작업 우선순위 테스트"""
+
+    def test_heavy_user_is_demoted(self):
+        redis = FakeRedis()
+        priorities = [fair_priority("heavy", PRIORITY_DEFAULT, redis_client=redis) for _ in range(20)]
+
+        assert priorities[0] == PRIORITY_DEFAULT
+        assert priorities[-1] < PRIORITY_BULK  # 일괄 작업보다 뒤로 밀리지는 않음
+        assert priorities == sorted(priorities)
+        assert fair_priority("light", PRIORITY_DEFAULT, redis_client=redis) == PRIORITY_DEFAULT
+
+    def test_window_is_fixed_from_first_submission(self, monkeypatch):
+        """계속 제출해도 창이 연장되지 않고, 창이 지나면 우선순위가 돌아옴"""
+        monkeypatch.setattr(settings, "FAIR_SHARE_WINDOW_SECONDS", 60)
+        redis = FakeRedis()
+
+        priorities = []
+        for _ in range(20):
+            priorities.append(fair_priority("heavy", PRIORITY_DEFAULT, redis_client=redis))
+            redis.now += 2  # 창(60초)보다 짧은 간격으로 계속 제출
+
+        assert redis.expire_calls == 1
+        assert priorities[-1] > PRIORITY_DEFAULT
+
+        redis.now = 61
+        assert fair_priority("heavy", PRIORITY_DEFAULT, redis_client=redis) == PRIORITY_DEFAULT
+        assert redis.expire_calls == 2
+
+    def test_redis_error_uses_base_priority(self):
+        redis = Mock()
+        redis.pipeline.side_effect = ConnectionError("down")
+
+        assert fair_priority("u1", PRIORITY_INTERACTIVE, redis_client=redis) == PRIORITY_INTERACTIVE
+
+
+class TestFairShareExecutor:
+    """프로세스 내 실행기 테스트"""
+
+    async def test_priority_then_round_robin(self):
+        executor = FairShareExecutor(concurrency=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def job(name):
+            await gate.wait()
+            order.append(name)
+
+        # 첫 작업이 실행을 붙잡고 있는 동안 나머지를 등록
+        first = executor.submit("heavy", job, "heavy-0")
+        await asyncio.sleep(0)
+        futures = [executor.submit("heavy", job, f"heavy-{i}") for i in range(1, 4)]
+        futures.append(executor.submit("light", job, "light-1"))
+        futures.append(executor.submit("bulk", job, "bulk-1", priority=PRIORITY_BULK))
+        futures.append(executor.submit("final", job, "final-1", priority=PRIORITY_FINAL))
+        gate.set()
+        await asyncio.gather(first, *futures)
+
+        assert order == ["heavy-0", "final-1", "heavy-1", "light-1", "heavy-2", "heavy-3", "bulk-1"]
+
+    async def test_error_does_not_stop_worker(self):
+        executor = FairShareExecutor(concurrency=1)
+
+        def broken():
+            raise ValueError("boom")
+
+        failed = executor.submit("u1", broken)
+        succeeded = executor.submit("u1", lambda: "ok")
+
+        assert await succeeded == "ok"
+        assert isinstance(failed.exception(), ValueError)
+        assert executor.pending() == 0
@@ -0,0 +1,86 @@
+# tests/test_idempotency.py
+"""
+답변 제출 멱등성 테스트 파일
+
+제출 키 선점/중복 감지, Redis 장애 시 허용, 중복 제출 시 기존 작업 상태 반환,
+실패한 작업의 재제출 허용을 검증
+"""
+
+from unittest.mock import Mock
+
+from services import idempotency
+from services.idempotency import SubmissionGuard, submission_key
+
+
+class FakeRedis:
+    """SET NX / GET / DELETE만 흉내 내는 테스트용 Redis"""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+class TestSubmissionGuard:
+    """제출 키 선점 테스트"""
+
+    def test_second_claim_is_duplicate(self):
+        guard = SubmissionGuard(redis_client=FakeRedis())
+        key = submission_key("t1", "3", audio_digest="abc")
+
+        assert guard.claim(key, problem_id="p3") is None
+        assert guard.claim(key, problem_id="p3")["problem_id"] == "p3"
+
+    def test_release_allows_new_claim(self):
+        guard = SubmissionGuard(redis_client=FakeRedis())
+        guard.claim("k")
+        guard.release("k")
+
+        assert guard.claim("k") is None
+
+    def test_header_key_takes_precedence(self):
+        assert submission_key("t1", "3", idempotency_key="req-1", audio_digest="abc") == "t1:3:key:req-1"
+        assert submission_key("t1", "3", audio_digest="abc") != submission_key("t1", "3", audio_digest="def")
+
+    def test_redis_error_allows_submission(self):
+        redis = Mock()
+        redis.set.side_effect = ConnectionError("down")
+
+        assert SubmissionGuard(redis_client=redis).claim("k") is None
+
+
+class TestClaimAnswerSubmission:
+    """API의 중복 제출 처리 테스트"""
+
+    TEST = {"problem_data": {"3": {"problem_id": "p3", "processing_status": "processing"}}}
+
+    async def claim(self, test=None):
+        from api.tests_api import claim_answer_submission
+        return await claim_answer_submission(test or self.TEST, "t1", "p3", "3", "t1:3:audio:abc", False)
+
+    async def test_duplicate_returns_existing_status(self, monkeypatch, isolated_status_store):
+        monkeypatch.setattr(idempotency, "_guard", SubmissionGuard(redis_client=FakeRedis()))
+
+        assert await self.claim() is None
+        response = await self.claim()
+
+        assert response.status_code == 202
+        assert b'"duplicate":true' in response.body
+        assert b'"status":"processing"' in response.body
+
+    async def test_failed_job_can_be_resubmitted(self, monkeypatch):
+        monkeypatch.setattr(idempotency, "_guard", SubmissionGuard(redis_client=FakeRedis()))
+        failed = {"problem_data": {"3": {"problem_id": "p3", "processing_status": "failed"}}}
+
+        assert await self.claim(failed) is None
+        assert await self.claim(failed) is None
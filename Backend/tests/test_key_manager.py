@@ -0,0 +1,135 @@
+# tests/test_key_manager.py
+"""
+GeminiKeyManager 테스트 파일
+
+로컬 키 상태 사본의 선택 로직, pub/sub 이벤트 반영, Redis 재동기화를 검증
+"""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.key_manager import GeminiKeyManager, key_id
+
+
+@pytest.fixture
+def manager():
+    """Redis 없이 메모리 안에서만 동작하는 키 매니저"""
+    return GeminiKeyManager(["key-a", "key-b", "key-c"], redis_client=None, usage_limit=2)
+
+
+class TestAcquire:
+    """acquire 메서드 테스트 (핫 패스)"""
+
+    def test_round_robin(self, manager):
+        """키를 순서대로 돌아가며 선택"""
+        assert [manager.acquire() for _ in range(3)] == ["key-a", "key-b", "key-c"]
+
+    def test_skips_blacklisted_key(self, manager):
+        """블랙리스트에 있는 키는 건너뜀"""
+        manager.blacklist("key-a")
+
+        assert manager.acquire() == "key-b"
+        assert manager.active_key_count() == 2
+
+    def test_skips_key_over_usage_limit(self, manager):
+        """사용량 한도에 도달한 키는 건너뜀"""
+        for _ in range(6):
+            manager.acquire()
+
+        # 모든 키가 2회씩 사용됨 -> 가장 적게 사용된 키를 강제로 선택
+        assert manager.acquire() in manager.keys
+
+    def test_forced_selection_picks_earliest_release(self, manager):
+        """모든 키가 블랙리스트에 있으면 가장 빨리 해제될 키 선택"""
+        manager.blacklist("key-a", seconds=300)
+        manager.blacklist("key-b", seconds=60)
+        manager.blacklist("key-c", seconds=600)
+
+        assert manager.acquire() == "key-b"
+
+    def test_release_makes_key_available(self, manager):
+        """해제된 키는 다시 선택 대상이 됨"""
+        manager.blacklist("key-a")
+        manager.release("key-a")
+
+        assert manager.active_key_count() == 3
+
+    def test_snapshot_hides_raw_keys(self, manager):
+        """스냅샷에는 키 원문 대신 해시 식별자만 포함"""
+        manager.acquire()
+        manager.blacklist("key-c")
+
+        snapshot = manager.snapshot()
+
+        assert snapshot["total_keys"] == 3
+        assert snapshot["active_keys"] == 2
+        assert snapshot["keys"][0]["key_id"] == key_id("key-a")
+        assert snapshot["keys"][0]["usage"] == 1
+        assert "key-a" not in str(snapshot)
+
+    def test_empty_keys(self):
+        """키가 없으면 빈 문자열 반환"""
+        assert GeminiKeyManager([], redis_client=None).acquire() == ""
+
+
+class TestEvents:
+    """pub/sub 이벤트 반영 테스트"""
+
+    def test_applies_blacklist_from_other_process(self, manager):
+        """다른 프로세스의 블랙리스트 이벤트를 로컬 상태에 반영"""
+        until = time.time() + 100
+        manager._apply_event(json.dumps({
+            "event": "blacklist", "key_id": key_id("key-a"), "until": until, "origin": "other"
+        }))
+
+        assert manager.active_key_count() == 2
+
+    def test_applies_release_from_other_process(self, manager):
+        """다른 프로세스의 해제 이벤트를 로컬 상태에 반영"""
+        manager.blacklist("key-a")
+        manager._apply_event(json.dumps({
+            "event": "release", "key_id": key_id("key-a"), "origin": "other"
+        }))
+
+        assert manager.active_key_count() == 3
+
+    def test_ignores_malformed_and_unknown_events(self, manager):
+        """잘못된 메시지나 모르는 키 이벤트는 무시"""
+        manager._apply_event(b"not json")
+        manager._apply_event(json.dumps({"event": "blacklist", "key_id": "unknown", "until": time.time() + 100}))
+
+        assert manager.active_key_count() == 3
+
+
+class TestReconcile:
+    """Redis 재동기화 테스트"""
+
+    def test_reconcile_flushes_usage_and_reads_global_state(self):
+        """로컬 사용량을 INCRBY로 반영하고 전역 블랙리스트/사용량을 읽어옴"""
+        redis_client = MagicMock()
+        pipe = redis_client.pipeline.return_value
+        until = time.time() + 100
+        pipe.execute.return_value = [1, True, [str(until).encode(), None], [b"1", b"7"]]
+
+        manager = GeminiKeyManager(["key-a", "key-b"], redis_client=redis_client, usage_limit=5)
+        manager._record_usage("key-a")
+        manager.reconcile()
+
+        pipe.incrby.assert_called_once_with("key_usage:gemini:key-a", 1)
+        # key-a는 블랙리스트, key-b는 사용량 한도 초과 -> 강제 선택
+        assert manager.active_key_count() == 1
+        assert manager._state["key-b"].usage == 7
+
+    def test_reconcile_keeps_pending_usage_on_redis_error(self):
+        """Redis 오류 시 반영하지 못한 사용량을 다음 주기로 넘김"""
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+
+        manager = GeminiKeyManager(["key-a"], redis_client=redis_client)
+        manager._record_usage("key-a")
+        manager.reconcile()
+
+        assert manager._pending_usage["key-a"] == 1
@@ -0,0 +1,104 @@
+# tests/test_queue_inspector.py
+"""
+Celery 큐 모니터링 테스트 파일
+
+브로커 우선순위 리스트 합산, 가장 오래된 작업의 대기 시간 계산, Redis 장애 시 동작,
+발행 시각 헤더 기록과 대기 시간 메트릭을 검증
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from prometheus_client import CollectorRegistry
+
+from core.metrics import CELERY_TASK_QUEUE_LATENCY
+from services.queue_inspector import QueueInspector, QueueMetricsCollector, priority_queue_names
+from tasks import monitoring
+
+
+class FakeRedis:
+    """LLEN/LINDEX 파이프라인만 흉내 내는 테스트용 Redis (리스트 왼쪽이 최신)"""
+
+    def __init__(self, lists):
+        self.lists = lists
+        self._ops = []
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def llen(self, name):
+        self._ops.append(("llen", name))
+
+    def lindex(self, name, index):
+        self._ops.append(("lindex", name))
+
+    def execute(self):
+        results = []
+        for op, name in self._ops:
+            items = self.lists.get(name, [])
+            results.append(len(items) if op == "llen" else (items[-1] if items else None))
+        self._ops = []
+        return results
+
+
+def message(enqueued_at):
+    return json.dumps({"body": "", "headers": {"enqueued_at": enqueued_at}})
+
+
+class TestQueueInspector:
+    """브로커 큐 조회 테스트"""
+
+    def test_depth_and_oldest_age_across_priorities(self):
+        now = time.time()
+        redis = FakeRedis({
+            "llm": [message(now - 5)],
+            "llm:4": [message(now - 1), message(now - 30)],
+            "stt:9": [json.dumps({"headers": {}})],  # 헤더 없는 작업은 대기 시간 계산에서 제외
+        })
+        inspector = QueueInspector(redis, ["llm", "stt", "celery"])
+
+        snapshot = inspector.snapshot()
+
+        assert snapshot["llm"]["depth"] == 3
+        assert snapshot["llm"]["by_priority"] == {0: 1, 4: 2}
+        assert 29 < snapshot["llm"]["oldest_age_seconds"] < 31
+        assert snapshot["stt"] == {"depth": 1, "oldest_age_seconds": 0.0, "by_priority": {9: 1}}
+        assert snapshot["celery"]["depth"] == 0
+
+    def test_collector_exports_gauges(self):
+        registry = CollectorRegistry()
+        registry.register(QueueMetricsCollector(QueueInspector(FakeRedis({"llm:2": [message(time.time())]}), ["llm"])))
+
+        assert registry.get_sample_value("celery_queue_depth", {"queue": "llm"}) == 1
+
+    def test_redis_error_returns_empty(self):
+        redis = Mock()
+        redis.pipeline.side_effect = ConnectionError("down")
+
+        assert QueueInspector(redis, ["llm"]).snapshot() == {}
+
+    def test_priority_queue_names(self):
+        assert priority_queue_names("stt", [0, 3]) == ["stt", "stt:3"]
+
+
+class TestMonitoringSignals:
+    """발행/실행 시그널 테스트"""
+
+    def test_latency_from_enqueued_header(self):
+        headers = {}
+        monitoring.stamp_enqueued_at(headers=headers)
+        headers["enqueued_at"] -= 2.0
+        task = SimpleNamespace(
+            name="evaluate_answer",
+            request=SimpleNamespace(enqueued_at=headers["enqueued_at"], eta=None, delivery_info={"routing_key": "llm"})
+        )
+        labels = {"task": "evaluate_answer", "queue": "llm"}
+        before = CELERY_TASK_QUEUE_LATENCY.labels(**labels)._sum.get()
+
+        monitoring.record_queue_latency(task_id="t1", task=task)
+        monitoring.record_runtime(task_id="t1", task=task, state="SUCCESS")
+
+        assert CELERY_TASK_QUEUE_LATENCY.labels(**labels)._sum.get() - before >= 2.0
+        assert "t1" not in monitoring._started_at
@@ -0,0 +1,124 @@
+# tests/test_rate_limiter.py
+"""
+외부 API 전역 처리율 제한 테스트 파일
+
+토큰이 없을 때 실패 대신 대기, 대기 시간 초과 시 APIRateLimitError,
+Redis 장애 시 제한 없이 통과(fail open)하는지 검증
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from core.exceptions import APIRateLimitError
+from services import rate_limiter
+from services.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """time.monotonic/time.sleep을 대신하는 가짜 시계 (실제로 기다리지 않음)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeBucketRedis:
+    """토큰 버킷 Lua 스크립트를 파이썬으로 흉내 내는 테스트용 Redis"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.buckets = {}
+
+    def register_script(self, script):
+        def run(keys, args):
+            rate, capacity, requested = (float(arg) for arg in args)
+            tokens, ts = self.buckets.get(keys[0], (capacity, self.clock.now))
+            tokens = min(capacity, tokens + max(0.0, self.clock.now - ts) * rate)
+            wait = 0.0
+            if tokens >= requested:
+                tokens -= requested
+            else:
+                wait = (requested - tokens) / rate
+            self.buckets[keys[0]] = (tokens, self.clock.now)
+            return str(wait)
+        return run
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake.sleep)
+    return fake
+
+
+class TestRateLimiter:
+    """토큰 버킷 대기 테스트"""
+
+    def test_waits_for_token_instead_of_failing(self, clock):
+        limiter = RateLimiter("gemini:k1", per_minute=60, burst=2, redis_client=FakeBucketRedis(clock))
+
+        for _ in range(3):
+            limiter.acquire()
+
+        # 버킷 2개는 바로 통과하고 세 번째는 초당 1개 충전을 기다림
+        assert clock.now == pytest.approx(1.0)
+
+    def test_buckets_are_per_resource(self, clock):
+        redis = FakeBucketRedis(clock)
+        first = RateLimiter("gemini:k1", per_minute=60, burst=1, redis_client=redis)
+        second = RateLimiter("gemini:k2", per_minute=60, burst=1, redis_client=redis)
+
+        first.acquire()
+        second.acquire()
+
+        assert clock.now == 0.0
+
+    def test_timeout_raises_rate_limit_error(self, clock):
+        limiter = RateLimiter(
+            "wit_ai", per_minute=6, burst=1, redis_client=FakeBucketRedis(clock), max_wait_seconds=5
+        )
+        limiter.acquire()
+
+        with pytest.raises(APIRateLimitError):
+            limiter.acquire()  # 다음 토큰까지 10초
+
+    def test_redis_error_fails_open(self, clock):
+        redis = Mock()
+        redis.register_script.return_value = Mock(side_effect=ConnectionError("down"))
+        limiter = RateLimiter("wit_ai", per_minute=1, burst=1, redis_client=redis)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.now == 0.0
+        # 장애 후에는 재시도 간격 동안 Redis를 다시 호출하지 않음
+        assert redis.register_script.return_value.call_count == 1
+
+    async def test_async_acquire_waits(self, clock, monkeypatch):
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+            clock.sleep(seconds)
+        monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+        limiter = RateLimiter("gemini:k1", per_minute=120, burst=1, redis_client=FakeBucketRedis(clock))
+
+        await limiter.aacquire()
+        await limiter.aacquire()
+
+        assert slept == [pytest.approx(0.5)]
+
+    def test_limiter_per_gemini_key(self):
+        """같은 키는 같은 버킷, 원문 키는 자원 이름에 남지 않음"""
+        limiter = rate_limiter.gemini_limiter("secret-key-1")
+
+        assert rate_limiter.gemini_limiter("secret-key-1") is limiter
+        assert rate_limiter.gemini_limiter("secret-key-2") is not limiter
+        assert "secret-key-1" not in limiter.resource
@@ -0,0 +1,107 @@
+# tests/test_score_stats.py
+"""
+사용자 평균 점수 증분 관리 테스트 파일
+
+누적 합계/개수로 계산한 평균, 같은 테스트 재반영 시 멱등성,
+테스트 삭제 시 보정, 전체 재계산(백필)과의 일치를 검증
+"""
+
+import mongomock
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from services.score_stats import (
+    apply_test_scores,
+    apply_test_scores_sync,
+    average_from_stats,
+    rebuild_user_score_stats_sync,
+    remove_test_scores,
+    score_indexes,
+)
+
+
+def scores(total, comboset="N/A"):
+    return {"total_score": total, "comboset_score": comboset, "roleplaying_score": "N/A", "unexpected_score": "N/A"}
+
+
+USER_ID = "0123456789ab0123456789ab"
+
+
+@pytest.fixture
+def sync_db(monkeypatch):
+    db = mongomock.MongoClient().omypic
+    db.users.insert_one({"_id": ObjectId(USER_ID)})
+
+    # 설치된 pymongo의 UpdateOne을 mongomock의 bulk_write가 처리하지 못하므로 하나씩 실행
+    def bulk_write(requests, ordered=True):
+        for request in requests:
+            db.tests.update_one(request._filter, request._doc)
+    monkeypatch.setattr(db.tests, "bulk_write", bulk_write)
+    return db
+
+
+def add_test(db, test_score):
+    return db.tests.insert_one({"user_id": USER_ID, "test_score": test_score}).inserted_id
+
+
+class TestPureFunctions:
+    """점수 변환 테스트"""
+
+    def test_score_indexes_skip_invalid(self):
+        assert score_indexes(scores("IM2", "IH")) == {"total_score": 5, "comboset_score": 7}
+        assert score_indexes(None) == {}
+
+    def test_average_rounds_to_nearest_level(self):
+        averages = average_from_stats({"total_score": {"sum": 5 + 7, "count": 2}})
+        assert averages["total_score"] == "IM3"
+        assert averages["comboset_score"] is None
+
+
+class TestIncrementalUpdate:
+    """증분 갱신 테스트"""
+
+    def test_apply_is_idempotent(self, sync_db):
+        test_id = add_test(sync_db, scores("IM2"))
+
+        apply_test_scores_sync(sync_db, test_id, USER_ID, scores("IM2"))
+        apply_test_scores_sync(sync_db, test_id, USER_ID, scores("IM2"))  # 작업 재시도
+
+        user = sync_db.users.find_one()
+        assert user["score_stats"]["total_score"] == {"sum": 5, "count": 1}
+        assert user["average_score"]["total_score"] == "IM2"
+
+    def test_reevaluation_applies_difference(self, sync_db):
+        """같은 테스트를 다시 평가하면 이전 점수를 빼고 새 점수를 더함"""
+        test_id = add_test(sync_db, scores("IM2"))
+        apply_test_scores_sync(sync_db, test_id, USER_ID, scores("IM2"))
+        apply_test_scores_sync(sync_db, test_id, USER_ID, scores("AL"))
+
+        assert sync_db.users.find_one()["score_stats"]["total_score"] == {"sum": 8, "count": 1}
+
+    def test_matches_full_rebuild(self, sync_db):
+        """증분 결과가 전체 재계산(백필)과 같음"""
+        for total, comboset in [("IM1", "IL"), ("IH", "N/A"), ("AL", "IM3")]:
+            test_id = add_test(sync_db, scores(total, comboset))
+            apply_test_scores_sync(sync_db, test_id, USER_ID, scores(total, comboset))
+        incremental = sync_db.users.find_one()
+
+        rebuilt = rebuild_user_score_stats_sync(sync_db, USER_ID)
+
+        assert rebuilt == incremental["average_score"]
+        assert sync_db.users.find_one()["score_stats"] == incremental["score_stats"]
+
+    async def test_delete_removes_contribution(self):
+        """테스트 삭제 시 반영했던 점수를 누적값에서 뺌 (비동기 경로)"""
+        db = AsyncMongoMockClient().omypic
+        await db.users.insert_one({"_id": ObjectId(USER_ID)})
+        first = (await db.tests.insert_one({"user_id": USER_ID})).inserted_id
+        second = (await db.tests.insert_one({"user_id": USER_ID})).inserted_id
+        await apply_test_scores(db, first, USER_ID, scores("NH"))
+        await apply_test_scores(db, second, USER_ID, scores("IH"))
+
+        await remove_test_scores(db, await db.tests.find_one({"_id": second}))
+
+        user = await db.users.find_one()
+        assert user["score_stats"]["total_score"] == {"sum": 2, "count": 1}
+        assert user["average_score"]["total_score"] == "NH"
@@ -0,0 +1,168 @@
+# tests/test_script_tts.py
+"""
+스크립트 발음 음성(TTS) 테스트 파일
+
+정리된 텍스트가 같으면 TTS 서비스를 한 번만 호출하는지(동시 요청 포함),
+스크립트 음성 API가 MP3를 Range/ETag와 함께 전송하고 기존 Base64 응답도 유지하는지 검증
+"""
+
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from mongomock_motor import AsyncMongoMockClient
+
+from api import problems_api
+from core.config import settings
+from db.mongodb import get_mongodb
+from services import script_tts, tts_cache
+from services.script_tts import clean_script_text
+from services.tts_cache import TtsCache
+
+WAV = b"RIFF" + bytes(1024)
+MP3 = b"ID3" + bytes(range(256)) * 4
+
+
+class FakeTranscoder:
+    def __init__(self):
+        self.calls = 0
+
+    def encode_playback(self, audio_content):
+        self.calls += 1
+        assert audio_content == WAV
+        time.sleep(0.01)  # 인코딩 중 들어온 요청도 기다렸다가 같은 결과를 사용
+        return MP3
+
+
+class FakeTtsApi:
+    """TTS 서비스 흉내 (MockTransport 핸들러)"""
+
+    def __init__(self):
+        self.requests = []
+        self.error = None
+        self.status_code = 200
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        return httpx.Response(self.status_code, content=WAV, headers={"Content-Type": "audio/wav"})
+
+    @property
+    def call_count(self):
+        return len(self.requests)
+
+
+class TestCleanScriptText:
+    """스크립트 텍스트 정리 테스트"""
+
+    def test_strips_tags_and_whitespace(self):
+        content = "<p>I live in   <b>Seoul</b>.</p>\n<p>It is\tbusy.</p>"
+
+        assert clean_script_text(content) == "I live in Seoul . It is busy."
+
+    def test_empty(self):
+        assert clean_script_text("<p> </p>") == ""
+        assert clean_script_text(None) == ""
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch):
+    db = AsyncMongoMockClient().omypic
+    script_id = (await db.scripts.insert_one({"content": "<p>I usually go <b>hiking</b>.</p>"})).inserted_id
+    transcoder = FakeTranscoder()
+    monkeypatch.setattr(tts_cache, "_cache", TtsCache(str(tmp_path)))
+    monkeypatch.setattr(script_tts, "get_transcoder", lambda: transcoder)
+
+    app = FastAPI()
+    app.include_router(problems_api.router, prefix="/api/problems")
+
+    async def override_db():
+        return db
+    app.dependency_overrides[get_mongodb] = override_db
+
+    tts_api = FakeTtsApi()
+    tts_client = httpx.AsyncClient(transport=httpx.MockTransport(tts_api))
+    monkeypatch.setattr(script_tts, "get_tts_http_client", lambda: tts_client)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http, db, str(script_id), tts_api, transcoder
+
+    await tts_client.aclose()
+
+
+class TestScriptAudioApi:
+    """스크립트 음성 API 테스트"""
+
+    async def test_concurrent_requests_call_tts_once(self, client):
+        http, _, script_id, route, transcoder = client
+        url = f"/api/problems/scripts/{script_id}/audio"
+
+        responses = await asyncio.gather(http.post(url), http.get(url), http.post(url), http.get(url))
+
+        assert [r.status_code for r in responses] == [200] * 4
+        assert route.call_count == 1
+        assert transcoder.calls == 1
+        assert str(route.requests[0].url) == settings.SCRIPT_TTS_API_URL
+        assert json.loads(route.requests[0].content) == {"text": "I usually go hiking ."}
+
+    async def test_post_keeps_base64_response(self, client):
+        http, _, script_id, _, _ = client
+
+        body = (await http.post(f"/api/problems/scripts/{script_id}/audio")).json()
+
+        assert base64.b64decode(body["audio_base64"]) == MP3
+        assert body["audio_type"] == "audio/mpeg"
+        assert body["file_size_bytes"] == len(MP3)
+        assert body["audio_url"] == f"http://test/api/problems/scripts/{script_id}/audio"
+
+    async def test_get_streams_with_range_and_etag(self, client):
+        http, _, script_id, _, _ = client
+        url = f"/api/problems/scripts/{script_id}/audio"
+
+        full = await http.get(url)
+        partial = await http.get(url, headers={"Range": "bytes=0-99"})
+        not_modified = await http.get(url, headers={"If-None-Match": full.headers["etag"]})
+
+        assert full.content == MP3
+        assert full.headers["content-type"] == "audio/mpeg"
+        assert full.headers["cache-control"] == "no-cache"
+        assert partial.status_code == 206
+        assert partial.content == MP3[:100]
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+    async def test_edited_script_is_rendered_again(self, client):
+        http, db, script_id, route, _ = client
+        url = f"/api/problems/scripts/{script_id}/audio"
+        etag = (await http.get(url)).headers["etag"]
+
+        await db.scripts.update_one({"_id": ObjectId(script_id)}, {"$set": {"content": "<p>I go camping.</p>"}})
+        response = await http.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert route.call_count == 2
+
+    async def test_errors(self, client):
+        http, db, script_id, route, _ = client
+        empty_id = (await db.scripts.insert_one({"content": "<p> </p>"})).inserted_id
+
+        assert (await http.get(f"/api/problems/scripts/{ObjectId()}/audio")).status_code == 404
+        assert (await http.post("/api/problems/scripts/not-an-id/audio")).status_code == 404
+        assert (await http.post(f"/api/problems/scripts/{empty_id}/audio")).status_code == 400
+        assert route.call_count == 0
+
+        route.status_code = 503
+        response = await http.post(f"/api/problems/scripts/{script_id}/audio")
+        assert response.status_code == 503
+
+        route.error = httpx.ConnectError("refused")
+        response = await http.get(f"/api/problems/scripts/{script_id}/audio")
+        assert response.status_code == 500
+        assert "연결 오류" in response.json()["detail"]
@@ -0,0 +1,130 @@
+# tests/test_segmenter.py
+"""
+긴 답변 분할/병합 테스트 파일
+
+무음 지점 분할, 구간 길이 제한, 겹침 처리, 인식 결과 병합을 검증
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from services.audio_processor import AudioProcessor
+from services.segmenter import SilenceSegmenter, split_at_silence, stitch_transcripts
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds))
+    return (np.sin(2 * np.pi * 220 * t / SAMPLE_RATE) * 3000).astype("<i2")
+
+
+def pause(seconds: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype="<i2")
+
+
+def seconds_of(pcm: bytes) -> float:
+    return len(pcm) / 2 / SAMPLE_RATE
+
+
+def speech_with_pauses(pause_at=(14, 29), total=40) -> bytes:
+    """지정한 위치(초)에 0.5초 공백이 있는 발화"""
+    pieces, cursor = [], 0
+    for at in pause_at:
+        pieces += [tone(at - cursor), pause(0.5)]
+        cursor = at + 0.5
+    pieces.append(tone(total - cursor))
+    return np.concatenate(pieces).tobytes()
+
+
+class TestSplitAtSilence:
+    """무음 지점 분할 테스트"""
+
+    def test_short_audio_is_single_segment(self):
+        """최대 길이보다 짧으면 나누지 않음"""
+        pcm = tone(8).tobytes()
+
+        assert split_at_silence(pcm) == [pcm]
+
+    def test_cuts_at_pauses(self):
+        """공백 위치에서 나누고 구간 길이는 최대 길이(+겹침) 이하"""
+        segments = split_at_silence(speech_with_pauses(), min_seconds=10, max_seconds=20, overlap_ms=300)
+
+        assert len(segments) == 3
+        assert all(seconds_of(seg) <= 20.3 for seg in segments)
+        # 첫 구간은 14초 공백 근처에서 잘림
+        assert 14 <= seconds_of(segments[0]) <= 15
+
+    def test_segments_cover_audio_with_overlap(self):
+        """구간들을 이어 붙이면 원본 + 겹침 길이"""
+        pcm = speech_with_pauses()
+        segments = split_at_silence(pcm, overlap_ms=300)
+
+        total = sum(seconds_of(seg) for seg in segments)
+        assert abs(total - (seconds_of(pcm) + 0.3 * (len(segments) - 1))) < 0.05
+
+    def test_chunked_feed_matches_batch(self):
+        """청크 단위 입력과 일괄 입력의 결과가 같음"""
+        pcm = speech_with_pauses()
+        segmenter = SilenceSegmenter()
+        chunked = []
+        for i in range(0, len(pcm), 32_000):
+            chunked += segmenter.feed(pcm[i:i + 32_000])
+        chunked += segmenter.finish()
+
+        assert chunked == split_at_silence(pcm)
+
+
+class TestStitchTranscripts:
+    """인식 결과 병합 테스트"""
+
+    def test_joins_in_order(self):
+        assert stitch_transcripts(["I like", "going to", "the park"]) == "I like going to the park"
+
+    def test_removes_duplicated_boundary_words(self):
+        """겹친 구간에서 중복 인식된 단어 제거 (대소문자/구두점 무시)"""
+        assert stitch_transcripts(["I went to the", "The park. Yesterday"]) == "I went to the park. Yesterday"
+        assert stitch_transcripts(["we played soccer", "played soccer all day"]) == "we played soccer all day"
+
+    def test_skips_empty_parts(self):
+        assert stitch_transcripts(["hello", "", "world"]) == "hello world"
+
+
+class TestParallelTranscription:
+    """AudioProcessor 병렬 인식 테스트"""
+
+    def test_long_answer_transcribed_in_parallel(self):
+        """긴 답변은 구간별로 동시에 인식하고 순서대로 이어 붙임"""
+        processor = AudioProcessor()
+        processor.vad_enabled = False
+        pcm = speech_with_pauses()
+
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fake_post(url, headers, data, timeout):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            index = data.decode()
+            return Mock(status_code=200, text=f'{{"text": "part{index}"}}')
+
+        # 구간 순서 번호를 인코딩 결과로 사용 (호출 순서와 무관)
+        order = {segment: str(i).encode() for i, segment in enumerate(split_at_silence(pcm))}
+
+        def fake_encode(segment):
+            return order[segment]
+
+        with patch.object(processor.transcoder, 'decode_pcm', return_value=pcm):
+            with patch.object(processor.transcoder, 'encode_pcm', side_effect=fake_encode):
+                with patch('services.stt_client.requests.Session.post', side_effect=fake_post):
+                    result = processor.process_audio(b"long_answer" * 100)
+
+        assert result == "part0 part1 part2"
+        assert state["peak"] > 1
@@ -0,0 +1,244 @@
+# tests/test_status_events.py
+"""
+처리 상태 실시간 알림(SSE) 테스트 파일
+
+연결 시 snapshot 재전송, 발행된 상태 변경 전달, 종합 평가 완료 시 종료,
+Redis 장애 시 snapshot만 보내고 종료하는지, /record로 제출한 답변의 처리 단계가 스트림으로 전달되는지 검증
+"""
+
+import asyncio
+import json
+import queue
+import time
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI
+from mongomock_motor import AsyncMongoMockClient
+
+from api import tests_api
+from db.mongodb import get_mongodb
+from services import status_events, status_store, test_service
+from services.status_events import status_event_stream
+from services.status_store import StatusStore
+
+
+class FakePubSub:
+    """미리 넣어 둔 메시지를 차례로 돌려주는 테스트용 pub/sub"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        if not self.messages:
+            return None
+        event = self.messages.pop(0)
+        return None if event is None else {"type": "message", "data": json.dumps(event)}
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self):
+        return self._pubsub
+
+
+SNAPSHOT = {
+    "overall_status": "not_started",
+    "problem_statuses": [{"problem_number": "1", "problem_id": "p1", "status": "evaluating"}],
+}
+
+
+def parse(chunks):
+    """SSE 전송 문자열에서 (이벤트 이름, 데이터) 목록 추출"""
+    events = []
+    for chunk in chunks:
+        if chunk.startswith("event: "):
+            name, data = chunk.strip().split("\n")
+            events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+async def load_snapshot():
+    return SNAPSHOT
+
+
+class TestStatusEventStream:
+    """상태 알림 스트림 테스트"""
+
+    async def test_snapshot_then_changes_until_overall_done(self):
+        pubsub = FakePubSub([
+            {"type": "problem", "problem_number": "1", "status": "completed"},
+            None,  # 변경 없음 → keep-alive
+            {"type": "overall", "status": "completed"},
+            {"type": "problem", "problem_number": "1", "status": "failed"},  # 종료 후 메시지는 전달하지 않음
+        ])
+
+        chunks = await collect(status_event_stream("t1", load_snapshot, redis_client=FakeRedis(pubsub)))
+        events = parse(chunks)
+
+        assert [name for name, _ in events] == ["snapshot", "problem", "overall"]
+        assert events[1][1]["problem_id"] == "p1"
+        assert ": keep-alive\n\n" in chunks
+        assert pubsub.channels == ["processing_status_events:t1"]
+        assert pubsub.closed
+
+    async def test_finished_test_sends_snapshot_only(self):
+        async def finished():
+            return {**SNAPSHOT, "overall_status": "completed"}
+        pubsub = FakePubSub([{"type": "problem", "problem_number": "1", "status": "completed"}])
+
+        events = parse(await collect(status_event_stream("t1", finished, redis_client=FakeRedis(pubsub))))
+
+        assert [name for name, _ in events] == ["snapshot"]
+
+    async def test_redis_down_sends_snapshot_and_closes(self):
+        class BrokenRedis:
+            def pubsub(self):
+                raise ConnectionError("down")
+
+        chunks = await collect(status_event_stream("t1", load_snapshot, redis_client=BrokenRedis()))
+
+        assert chunks[0].startswith("retry: ")  # 클라이언트가 재연결하며 snapshot을 다시 받음
+        assert [name for name, _ in parse(chunks)] == ["snapshot"]
+
+    async def test_missing_test(self):
+        async def missing():
+            return None
+
+        events = parse(await collect(status_event_stream("t1", missing, redis_client=FakeRedis(FakePubSub([])))))
+
+        assert events[0][0] == "error"
+
+
+class SharedRedis:
+    """상태 저장소(동기 해시 + 발행)와 구독(비동기 pub/sub)을 함께 흉내 내는 테스트용 Redis"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.subscribers = {}
+        self.subscribed = asyncio.Event()
+
+    # 상태 저장소가 사용하는 동기 명령 (asyncio.to_thread에서 호출됨)
+    def pipeline(self, transaction=False):
+        return self
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def publish(self, channel, message):
+        for messages in self.subscribers.get(channel, []):
+            messages.put(message)
+
+    def execute(self):
+        return []
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    # 실시간 알림이 사용하는 비동기 구독
+    def pubsub(self):
+        return SharedPubSub(self)
+
+
+class SharedPubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = queue.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.setdefault(channel, []).append(self.messages)
+        self.redis.subscribed.set()
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            try:
+                return {"type": "message", "data": self.messages.get_nowait()}
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    return None
+                await asyncio.sleep(0.01)
+
+    async def aclose(self):
+        pass
+
+
+class FakeAudioProcessor:
+    async def process_audio_stream(self, audio_source):
+        return "I like parks"
+
+
+class FakeEvaluator:
+    async def evaluate_overall_test(self, test, problem_details):
+        return {"test_score": {"total_score": "IM2"}, "test_feedback": {"paragraph": "good"}}
+
+
+class TestRecordAnswerEvents:
+    """/record로 제출한 답변의 처리 상태가 실시간 알림으로 전달되는지 테스트"""
+
+    async def test_record_streams_problem_and_overall_events(self, monkeypatch, sample_audio_bytes):
+        db = AsyncMongoMockClient().omypic
+        user_id = str((await db.users.insert_one({"name": "tester"})).inserted_id)
+        problem_id = str((await db.problems.insert_one({"content": "Describe your favorite park."})).inserted_id)
+        test_id = str((await db.tests.insert_one({
+            "user_id": user_id,
+            "test_type": 0,
+            "problem_data": {"1": {"problem_id": problem_id}}
+        })).inserted_id)
+
+        redis = SharedRedis()
+        monkeypatch.setattr(status_store, "_store", StatusStore(redis_client=redis))
+        monkeypatch.setattr(status_events, "get_redis_async", lambda: redis)
+        monkeypatch.setattr(test_service, "standard_audio_processor", FakeAudioProcessor())
+        monkeypatch.setattr(test_service, "ResponseEvaluator", FakeEvaluator)
+
+        app = FastAPI()
+        app.include_router(tests_api.router, prefix="/api/tests")
+
+        async def override_db():
+            return db
+        app.dependency_overrides[get_mongodb] = override_db
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            stream = asyncio.create_task(http.get(f"/api/tests/{test_id}/events"))
+            await asyncio.wait_for(redis.subscribed.wait(), timeout=5)
+
+            response = await http.post(
+                f"/api/tests/{test_id}/record/{problem_id}",
+                files={"audio_file": ("answer.webm", sample_audio_bytes, "audio/webm")},
+                data={"is_last_problem": "true"}
+            )
+            events = parse((await asyncio.wait_for(stream, timeout=5)).text.split("\n\n"))
+
+        assert response.status_code == 202
+        assert events[0][0] == "snapshot"
+        problem_events = [data for name, data in events if name == "problem"]
+        assert [event["status"] for event in problem_events] == ["processing", "transcribing", "evaluating", "completed"]
+        assert {event["problem_id"] for event in problem_events} == {problem_id}
+        assert [data["status"] for name, data in events if name == "overall"] == ["pending", "processing", "completed"]
+
+        test = await db.tests.find_one({"_id": ObjectId(test_id)})
+        assert test["problem_data"]["1"]["processing_status"] == "completed"
+        assert test["problem_data"]["1"]["user_response"] == "I like parks"
+        assert "processing_started_at" not in test["problem_data"]["1"]  # 중간 상태는 Mongo에 쓰지 않음
+        assert test["overall_feedback_status"] == "completed"
@@ -0,0 +1,293 @@
+# tests/test_status_store.py
+"""
+답변 처리 상태 저장소 테스트 파일
+
+Redis 해시 기록/조회와 알림 발행, 저장소만으로 구성하는 상태 응답,
+Redis 장애 시 동작, Mongo 상태와의 병합 규칙,
+/record로 제출한 답변의 상태 API가 테스트 문서 없이 응답하는지(오래된 상태 포함) 검증
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI
+from mongomock_motor import AsyncMongoMockClient
+
+from api import tests_api
+from db.mongodb import get_mongodb
+from services import status_store
+from services.status_store import (
+    StatusStore,
+    merge_status,
+    overall_status_from_state,
+    problem_status_from_state,
+    resolve_stale_overall,
+    stale_status_projection,
+)
+
+
+class FakeRedis:
+    """해시 명령만 흉내 내는 테스트용 Redis"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expires = {}
+        self.published = []
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def expire(self, key, seconds):
+        self.expires[key] = seconds
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def execute(self):
+        return []
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+
+class TestStatusStore:
+    """상태 저장소 테스트"""
+
+    def test_set_and_get(self):
+        redis = FakeRedis()
+        store = StatusStore(redis_client=redis, ttl_seconds=60)
+
+        store.set_problem_status("t1", "1", "transcribing", "변환 중")
+        store.set_problem_status("t1", "2", "evaluating")
+
+        assert store.get_problem_status("t1", "1")["status"] == "transcribing"
+        assert {k: v["status"] for k, v in store.get_test_statuses("t1").items()} == {
+            "1": "transcribing", "2": "evaluating"
+        }
+        assert redis.expires["processing_status:t1"] == 60
+
+    def test_status_change_is_published(self):
+        redis = FakeRedis()
+        store = StatusStore(redis_client=redis)
+
+        assert store.set_problem_status("t1", "1", "completed", completed_at="2024-01-01T00:00:00")
+        store.set_overall_status("t1", "processing")
+
+        assert [(channel, event["type"], event["status"]) for channel, event in redis.published] == [
+            ("processing_status_events:t1", "problem", "completed"),
+            ("processing_status_events:t1", "overall", "processing"),
+        ]
+        assert redis.published[0][1]["problem_number"] == "1"
+
+    def test_redis_error_is_ignored(self):
+        """Redis 장애 시 기록은 건너뛰고 조회 결과는 비어 있음"""
+        redis = Mock()
+        redis.pipeline.side_effect = ConnectionError("down")
+        redis.hget.side_effect = ConnectionError("down")
+        redis.hgetall.side_effect = ConnectionError("down")
+        store = StatusStore(redis_client=redis)
+
+        assert not store.set_problem_status("t1", "1", "transcribing")
+        assert store.get_problem_status("t1", "1") is None
+        assert store.get_test_statuses("t1") == {}
+
+
+class TestStateResponses:
+    """저장소만으로 상태 API 응답을 구성하는 규칙 테스트"""
+
+    def make_store(self):
+        store = StatusStore(redis_client=FakeRedis())
+        store.set_test_problems("t1", {"1": "p1", "2": "p2"})
+        return store
+
+    def test_overall_from_store_only(self):
+        store = self.make_store()
+        store.set_problem_status("t1", "1", "completed", "완료", completed_at="2024-01-01T00:00:00")
+
+        response = overall_status_from_state(store.get_test_state("t1"))
+
+        assert response["overall_status"] == "not_started"
+        assert [s["status"] for s in response["problem_statuses"]] == ["completed", "not_started"]
+        assert response["all_problems_completed"] is False
+
+    def test_problem_status_by_problem_id(self):
+        store = self.make_store()
+        store.set_problem_status("t1", "2", "evaluating", "평가 중", started_at="2024-01-01T00:00:00")
+
+        response = problem_status_from_state(store.get_test_state("t1"), "p2")
+
+        assert response["status"] == "evaluating"
+        assert response["started_at"] == "2024-01-01T00:00:00"
+        assert problem_status_from_state(store.get_test_state("t1"), "p1") is None  # 기록 없음 → Mongo 사용
+
+    def test_stale_intermediate_status_is_kept_and_marked(self):
+        """오래 갱신되지 않은 중간 상태는 버리지 않고 stale로 표시"""
+        store = self.make_store()
+        store.set_problem_status("t1", "1", "evaluating", "평가 중")
+        store.set_overall_status("t1", "pending")
+        state = store.get_test_state("t1")
+        state["statuses"]["1"]["updated_at"] = time.time() - 3600
+        state["overall"]["updated_at"] = time.time() - 3600
+
+        problem = problem_status_from_state(state, "p1")
+        overall = overall_status_from_state(state)
+
+        assert (problem["status"], problem["stale"]) == ("evaluating", True)
+        assert overall["stale"] is True
+        assert overall["problem_statuses"][0] == {
+            "problem_number": "1", "problem_id": "p1", "status": "evaluating", "message": "평가 중", "stale": True
+        }
+        assert "stale" not in overall["problem_statuses"][1]
+        assert stale_status_projection(overall) == {
+            "problem_data.1.processing_status": 1,
+            "problem_data.1.processing_message": 1,
+            "overall_feedback_status": 1,
+            "overall_feedback_message": 1,
+            "overall_feedback_started_at": 1,
+            "overall_feedback_completed_at": 1
+        }
+
+    def test_resolve_stale_uses_terminal_mongo_status_only(self):
+        store = self.make_store()
+        store.set_problem_status("t1", "1", "evaluating")
+        store.set_problem_status("t1", "2", "transcribing")
+        state = store.get_test_state("t1")
+        for live in state["statuses"].values():
+            live["updated_at"] = time.time() - 3600
+
+        response = resolve_stale_overall(overall_status_from_state(state), {
+            "problem_data": {"1": {"processing_status": "completed", "processing_message": "완료"}}
+        })
+
+        first, second = response["problem_statuses"]
+        assert (first["status"], first["message"], "stale" in first) == ("completed", "완료", False)
+        assert (second["status"], second["stale"]) == ("transcribing", True)  # Mongo에 결과가 없으면 중간 상태 유지
+        assert response["all_problems_completed"] is False
+
+    def test_fresh_status_needs_no_projection(self):
+        store = self.make_store()
+        store.set_problem_status("t1", "1", "evaluating")
+
+        assert stale_status_projection(overall_status_from_state(store.get_test_state("t1"))) is None
+
+    def test_unknown_problem_layout_falls_back(self):
+        assert overall_status_from_state(StatusStore(redis_client=FakeRedis()).get_test_state("t1")) is None
+
+
+class TestMergeStatus:
+    """Mongo 상태와 중간 상태 병합 테스트"""
+
+    def test_live_status_while_processing(self):
+        live = {"status": "evaluating", "message": "평가 중"}
+        assert merge_status({"processing_status": "processing"}, live) == ("evaluating", "평가 중")
+
+    def test_terminal_mongo_status_wins(self):
+        """Mongo에 최종 결과가 저장되었으면 남아 있는 중간 상태는 무시"""
+        data = {"processing_status": "completed", "processing_message": "완료"}
+        assert merge_status(data, {"status": "evaluating", "message": "평가 중"}) == ("completed", "완료")
+
+    def test_no_live_status(self):
+        assert merge_status({}, None, "시작 전") == ("not_started", "시작 전")
+
+
+class RecordingTests:
+    """tests 컬렉션의 find_one 호출(projection)을 기록하는 래퍼"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.reads = []
+
+    async def find_one(self, filter, projection=None, *args, **kwargs):
+        self.reads.append(projection)
+        return await self.collection.find_one(filter, projection, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+class TestStatusApiAfterRecord:
+    """/record로 제출한 답변의 상태 API 테스트"""
+
+    async def test_status_served_from_store_then_stale_checks_status_fields(self, monkeypatch, sample_audio_bytes):
+        mongo = AsyncMongoMockClient().omypic
+        problem_id = str((await mongo.problems.insert_one({"content": "Describe your house."})).inserted_id)
+        test_id = str((await mongo.tests.insert_one({
+            "user_id": "u1",
+            "problem_data": {"1": {"problem_id": problem_id, "feedback": "x" * 1000}, "2": {"problem_id": "p2"}}
+        })).inserted_id)
+        tests = RecordingTests(mongo.tests)
+        db = SimpleNamespace(tests=tests, problems=mongo.problems)
+
+        redis = FakeRedis()
+        monkeypatch.setattr(status_store, "_store", StatusStore(redis_client=redis))
+        submitted = []
+        monkeypatch.setattr(
+            tests_api, "get_fair_share_executor",
+            lambda: SimpleNamespace(submit=lambda *args, **kwargs: submitted.append(args))
+        )
+
+        app = FastAPI()
+        app.include_router(tests_api.router, prefix="/api/tests")
+
+        async def override_db():
+            return db
+        app.dependency_overrides[get_mongodb] = override_db
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            response = await http.post(
+                f"/api/tests/{test_id}/record/{problem_id}",
+                files={"audio_file": ("answer.webm", sample_audio_bytes, "audio/webm")}
+            )
+            assert response.status_code == 202
+            assert len(submitted) == 1
+            tests.reads.clear()
+
+            problem = (await http.get(f"/api/tests/{test_id}/status/{problem_id}")).json()
+            overall = (await http.get(f"/api/tests/{test_id}/overall-status")).json()
+
+            assert problem["status"] == "processing"
+            assert [s["status"] for s in overall["problem_statuses"]] == ["processing", "not_started"]
+            assert tests.reads == []  # 테스트 문서를 읽지 않음
+
+            # 워커가 멈춰 중간 상태가 오래되면 상태 필드만 읽고, Mongo에 결과가 없으면 중간 상태 유지
+            key = f"{StatusStore.PREFIX}{test_id}"
+            live = json.loads(redis.hashes[key]["1"])
+            redis.hashes[key]["1"] = json.dumps({**live, "updated_at": time.time() - 3600})
+
+            problem = (await http.get(f"/api/tests/{test_id}/status/{problem_id}")).json()
+            overall = (await http.get(f"/api/tests/{test_id}/overall-status")).json()
+
+            assert (problem["status"], problem["stale"]) == ("processing", True)
+            assert problem["started_at"] == live["started_at"]
+            assert overall["problem_statuses"][0]["stale"] is True
+            assert tests.reads and all(set(projection) <= {
+                "_id",
+                "problem_data.1.processing_status",
+                "problem_data.1.processing_message",
+                "problem_data.1.processing_started_at",
+                "problem_data.1.processing_completed_at"
+            } for projection in tests.reads)
+
+            # 최종 결과가 Mongo에 저장되었으면 그 값을 사용
+            await mongo.tests.update_one({"_id": ObjectId(test_id)}, {"$set": {
+                "problem_data.1.processing_status": "failed",
+                "problem_data.1.processing_message": "오류"
+            }})
+
+            problem = (await http.get(f"/api/tests/{test_id}/status/{problem_id}")).json()
+            overall = (await http.get(f"/api/tests/{test_id}/overall-status")).json()
+
+            assert (problem["status"], problem["message"], "stale" in problem) == ("failed", "오류", False)
+            assert overall["problem_statuses"][0] == {
+                "problem_number": "1", "problem_id": problem_id, "status": "failed", "message": "오류"
+            }
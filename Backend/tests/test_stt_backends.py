@@ -0,0 +1,121 @@
+# tests/test_stt_backends.py
+"""
+STT 백엔드 테스트 파일
+
+백엔드 레지스트리, Wit.ai 요청 헤더, 사용자 정의 백엔드 교체,
+로컬 대체 서버를 이용한 오프라인 인식을 검증
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+import httpx
+
+from scripts.stt_stub_server import DEFAULT_TRANSCRIPTS, create_app
+from services.audio_processor import AudioProcessor
+from services.stt_backends import (
+    HttpSttBackend,
+    SttBackend,
+    WitAiBackend,
+    available_stt_backends,
+    get_stt_backend,
+    register_stt_backend,
+)
+from services.stt_client import SttHttpClient
+
+
+class FakeBackend:
+    """고정 결과를 돌려주는 테스트용 백엔드"""
+
+    name = "fake"
+    content_types = frozenset()
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, payload: bytes, content_type: str) -> str:
+        self.calls.append(content_type)
+        return "fake transcript"
+
+    async def atranscribe(self, content, content_type: str) -> str:
+        self.calls.append(content_type)
+        return "fake transcript"
+
+
+class TestRegistry:
+    """백엔드 레지스트리 테스트"""
+
+    def test_builtin_backends_registered(self):
+        """wit_ai, local 백엔드가 기본 등록됨"""
+        assert {"wit_ai", "local"} <= set(available_stt_backends())
+        assert isinstance(get_stt_backend("wit_ai"), WitAiBackend)
+        assert get_stt_backend("local").name == "local"
+
+    def test_unknown_backend(self):
+        """등록되지 않은 백엔드 이름은 ValueError"""
+        with pytest.raises(ValueError, match="알 수 없는 STT 백엔드"):
+            get_stt_backend("nope")
+
+    def test_register_custom_backend(self, monkeypatch):
+        """사용자 정의 백엔드를 등록하여 이름으로 생성"""
+        from services import stt_backends
+        monkeypatch.setattr(stt_backends, "_registry", dict(stt_backends._registry))
+
+        register_stt_backend("fake")(FakeBackend)
+
+        backend = get_stt_backend("fake")
+        assert isinstance(backend, FakeBackend)
+        assert isinstance(backend, SttBackend)
+
+
+class TestWitAiBackend:
+    """Wit.ai 백엔드 테스트"""
+
+    def test_sync_request_headers(self):
+        """인증 헤더와 Content-Type을 함께 전송"""
+        backend = WitAiBackend("secret", client=SttHttpClient())
+        response = Mock(status_code=200, text='{"text": "hello", "is_final": true}')
+
+        with patch('services.stt_client.requests.Session.post', return_value=response) as mock_post:
+            assert backend.transcribe(b"audio", "audio/mpeg3") == "hello"
+
+        headers = mock_post.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "Bearer secret"
+        assert headers["Content-Type"] == "audio/mpeg3"
+
+    def test_error_status_raises(self):
+        """200이 아닌 응답은 ValueError"""
+        backend = WitAiBackend("secret", client=SttHttpClient())
+
+        with patch('services.stt_client.requests.Session.post', return_value=Mock(status_code=429, text="")):
+            with pytest.raises(ValueError, match="Wit.ai API 오류: 429"):
+                backend.transcribe(b"audio", "audio/mpeg3")
+
+
+class TestBackendSwap:
+    """AudioProcessor 백엔드 교체 테스트"""
+
+    def test_processor_uses_injected_backend(self, sample_audio_bytes):
+        """주입한 백엔드로 인식하고 백엔드별 캐시 네임스페이스를 사용"""
+        backend = FakeBackend()
+        processor = AudioProcessor(backend=backend)
+
+        with patch.object(processor, '_preprocess_audio', return_value=b"processed" * 20):
+            assert processor.process_audio(sample_audio_bytes) == "fake transcript"
+
+        assert backend.calls == [processor.transcoder.content_type]
+        assert processor.transcript_cache._namespace == "fake"
+
+    async def test_local_stub_server_offline(self):
+        """로컬 대체 서버로 외부 API 없이 인식"""
+        client = SttHttpClient()
+        stub = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency_ms=0, jitter_ms=0)))
+        backend = HttpSttBackend(name="local", url="http://stub/speech", client=client)
+
+        with patch.object(client, '_new_async_client', return_value=stub):
+            first = await backend.atranscribe(b"pcm" * 100, "audio/raw")
+            second = await backend.atranscribe(b"pcm" * 100, "audio/raw")
+
+        assert first in DEFAULT_TRANSCRIPTS
+        assert first == second  # 같은 오디오에는 같은 결과
+        await client.aclose()
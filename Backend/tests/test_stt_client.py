@@ -0,0 +1,100 @@
+# tests/test_stt_client.py
+"""
+SttHttpClient 테스트 파일
+
+연결 풀 재사용, 동시 요청 제한, 동기 파사드의 타임아웃 전달을 검증
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import httpx
+
+from services.stt_client import SttHttpClient
+
+
+def mock_async_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncClient:
+    """비동기 클라이언트 테스트"""
+
+    async def test_client_reused_across_requests(self):
+        """같은 이벤트 루프에서는 하나의 AsyncClient를 재사용"""
+        client = SttHttpClient()
+        created = []
+
+        def new_client():
+            created.append(mock_async_client(lambda request: httpx.Response(200, text='{"text": "ok"}')))
+            return created[-1]
+
+        with patch.object(client, '_new_async_client', side_effect=new_client):
+            for _ in range(3):
+                response = await client.post("https://stt.test/speech", headers={}, content=b"audio")
+                assert response.status_code == 200
+
+        assert len(created) == 1
+        await client.aclose()
+
+    async def test_concurrency_is_bounded(self):
+        """동시에 진행되는 요청 수가 max_concurrency를 넘지 않음"""
+        client = SttHttpClient(max_concurrency=2)
+        state = {"running": 0, "peak": 0}
+
+        async def handler(request):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.02)
+            state["running"] -= 1
+            return httpx.Response(200)
+
+        with patch.object(client, '_new_async_client', return_value=mock_async_client(handler)):
+            await asyncio.gather(*[
+                client.post("https://stt.test/speech", headers={}, content=b"audio") for _ in range(6)
+            ])
+
+        assert state["peak"] == 2
+        await client.aclose()
+
+    async def test_streaming_content(self):
+        """비동기 청크 이터레이터를 그대로 전송"""
+        client = SttHttpClient()
+        received = {}
+
+        async def handler(request):
+            received["body"] = await request.aread()
+            return httpx.Response(200)
+
+        async def chunks():
+            yield b"first-"
+            yield b"second"
+
+        with patch.object(client, '_new_async_client', return_value=mock_async_client(handler)):
+            await client.post("https://stt.test/speech", headers={}, content=chunks())
+
+        assert received["body"] == b"first-second"
+        await client.aclose()
+
+
+class TestSyncFacade:
+    """동기 파사드 테스트"""
+
+    def test_session_reused_with_timeouts(self):
+        """세션을 재사용하고 연결/응답 타임아웃을 전달"""
+        client = SttHttpClient(connect_timeout=3.0, read_timeout=30.0)
+
+        with patch('services.stt_client.requests.Session.post', return_value=Mock(status_code=200)) as mock_post:
+            client.post_sync("https://stt.test/speech", headers={"A": "b"}, data=b"audio")
+            session = client._get_session()
+            client.post_sync("https://stt.test/speech", headers={"A": "b"}, data=b"audio")
+
+        assert client._get_session() is session
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.kwargs["timeout"] == (3.0, 30.0)
+        client.close_sync()
+
+    def test_http2_disabled_without_h2(self):
+        """h2 패키지가 없으면 HTTP/1.1로 동작"""
+        with patch('services.stt_client.http2_available', return_value=False):
+            assert SttHttpClient(http2=True).http2 is False
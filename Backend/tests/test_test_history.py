@@ -0,0 +1,69 @@
+# tests/test_test_history.py
+"""
+테스트 히스토리 페이지네이션 테스트 파일
+
+(test_date, _id) keyset 페이지가 빠짐/중복 없이 이어지는지, 요약 필드만 읽는지,
+잘못된 커서를 거부하는지 검증
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from mongomock_motor import AsyncMongoMockClient
+
+from services.test_service import get_test_history_page
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient().omypic
+    dates = [datetime(2024, 1, day) for day in (1, 2, 2, 2, 3)]  # 같은 날짜는 _id로 순서 결정
+    for index, test_date in enumerate(dates):
+        await db.tests.insert_one({
+            "user_id": USER_ID,
+            "test_date": test_date,
+            "test_type": True,
+            "test_type_str": "full",
+            "problem_data": {"1": {"feedback": "x" * 1000}},
+            "order": index
+        })
+    await db.tests.insert_one({"user_id": "other", "test_date": datetime(2024, 1, 9), "test_type": True})
+    return db
+
+
+class TestHistoryPagination:
+    """keyset 페이지네이션 테스트"""
+
+    async def test_pages_cover_all_tests_in_order(self, db):
+        seen = []
+        cursor = None
+        while True:
+            tests, cursor = await get_test_history_page(db, USER_ID, limit=2, cursor=cursor)
+            seen.extend(tests)
+            if cursor is None:
+                break
+
+        keys = [(test["test_date"], test["_id"]) for test in seen]
+        assert len(seen) == 5
+        assert keys == sorted(keys, reverse=True)
+        assert len(set(keys)) == 5
+
+    async def test_summary_projection(self, db):
+        tests, _ = await get_test_history_page(db, USER_ID, limit=1)
+
+        assert "problem_data" not in tests[0]
+        assert set(tests[0]) <= {"_id", "overall_feedback_status", "test_date", "test_type", "test_type_str", "test_score"}
+
+    async def test_last_page_has_no_cursor(self, db):
+        tests, cursor = await get_test_history_page(db, USER_ID, limit=5)
+
+        assert len(tests) == 5
+        assert cursor is None
+
+    async def test_invalid_cursor(self, db):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_test_history_page(db, USER_ID, cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
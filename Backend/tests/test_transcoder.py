@@ -0,0 +1,116 @@
+# tests/test_transcoder.py
+"""
+Transcoder 테스트 파일
+
+ffmpeg 명령행 구성, 출력 형식, 동시 실행 제한, 실패 처리,
+moov 아톰이 끝에 있는 M4A를 바이트 입력으로 디코딩하는지 검증
+"""
+
+import shutil
+import subprocess
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.transcoder import TranscodeError, Transcoder
+
+
+class TestFfmpegArgs:
+    """ffmpeg 명령행 인자 테스트"""
+
+    def test_mp3_profile(self):
+        """기본 형식은 64k MP3"""
+        transcoder = Transcoder()
+        args = transcoder.ffmpeg_args()
+
+        assert args[args.index("-i") + 1] == "cache:pipe:0"  # 바이트 입력도 탐색 가능
+        assert args[args.index("-b:a") + 1] == "64k"
+        assert args[-1] == "pipe:1"
+        assert transcoder.content_type == "audio/mpeg3"
+
+    def test_opus_profile(self):
+        """Opus 형식은 ogg 컨테이너로 출력"""
+        transcoder = Transcoder(output_format="opus")
+        args = transcoder.ffmpeg_args("/tmp/answer.m4a")
+
+        assert args[args.index("-i") + 1] == "/tmp/answer.m4a"
+        assert args[args.index("-c:a") + 1] == "libopus"
+        assert transcoder.content_type == "audio/ogg"
+
+    def test_unknown_format_falls_back_to_mp3(self):
+        """알 수 없는 형식은 mp3로 대체"""
+        assert Transcoder(output_format="flac").profile.name == "mp3"
+
+    def test_playback_profile(self):
+        """청취용 인코딩은 출력 형식 설정과 무관하게 24kHz 모노 48k MP3"""
+        args = Transcoder(output_format="opus").playback_args()
+
+        assert args[args.index("-c:a") + 1] == "libmp3lame"
+        assert args[args.index("-ar") + 1] == "24000"
+        assert args[args.index("-b:a") + 1] == "48k"
+        assert args[args.index("-i") + 1] == "cache:pipe:0"
+        assert "-t" not in args
+
+
+class TestTranscode:
+    """transcode 메서드 테스트"""
+
+    def test_raises_on_ffmpeg_failure(self):
+        """ffmpeg가 실패하면 TranscodeError"""
+        transcoder = Transcoder(ffmpeg_path="false")
+
+        with pytest.raises(TranscodeError):
+            transcoder.transcode(b"not audio")
+
+    def test_raises_on_empty_output(self):
+        """출력이 비어 있으면 TranscodeError"""
+        with patch("services.transcoder.subprocess.run", return_value=Mock(returncode=0, stdout=b"", stderr=b"")):
+            with pytest.raises(TranscodeError):
+                Transcoder().transcode(b"audio")
+
+    def test_limits_concurrent_processes(self):
+        """동시에 실행되는 ffmpeg 수를 max_workers로 제한"""
+        transcoder = Transcoder(max_workers=2)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fake_run(*args, **kwargs):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return Mock(returncode=0, stdout=b"out", stderr=b"")
+
+        with patch("services.transcoder.subprocess.run", side_effect=fake_run):
+            threads = [threading.Thread(target=transcoder.transcode, args=(b"audio",)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert state["peak"] == 2
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 설치되어 있지 않음")
+class TestSeekableInput:
+    """탐색이 필요한 컨테이너의 바이트 입력 테스트 (실제 ffmpeg 사용)"""
+
+    def test_moov_at_end_m4a_decodes_from_bytes(self, tmp_path):
+        path = tmp_path / "answer.m4a"
+        # mp4 muxer 기본값은 moov 아톰을 파일 끝에 기록 (+faststart 없이)
+        # 입력 버퍼 안에서 되돌아가 읽을 수 없도록 충분히 긴 녹음 사용 (20초)
+        subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=20",
+             "-c:a", "aac", str(path)],
+            check=True
+        )
+        audio = path.read_bytes()
+        assert audio.index(b"moov") > audio.index(b"mdat")
+
+        pcm = Transcoder().decode_pcm(audio)
+
+        assert abs(len(pcm) - 20 * 16000 * 2) < 16000 * 2  # 16kHz 16비트 20초 분량
@@ -0,0 +1,98 @@
+# tests/test_transcript_cache.py
+"""
+TranscriptCache 테스트 파일
+
+오디오 지문 계산, 로컬 LRU/Redis 2단계 저장, 중복 제출 시 STT 생략을 검증
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+from services.audio_processor import AudioProcessor
+from services.transcript_cache import TranscriptCache, audio_digest, audio_file_digest
+
+
+class TestDigest:
+    """오디오 지문 테스트"""
+
+    def test_same_bytes_same_digest(self):
+        """같은 바이트는 같은 지문, 다른 바이트는 다른 지문"""
+        assert audio_digest(b"audio") == audio_digest(b"audio")
+        assert audio_digest(b"audio") != audio_digest(b"audio2")
+
+    def test_file_digest_matches_bytes_digest(self, tmp_path):
+        """파일 지문과 바이트 지문이 일치"""
+        path = tmp_path / "answer.mp3"
+        path.write_bytes(b"x" * 200_000)
+
+        assert audio_file_digest(str(path)) == audio_digest(b"x" * 200_000)
+
+
+class TestTranscriptCache:
+    """캐시 저장/조회 테스트"""
+
+    def test_local_hit(self):
+        """저장한 텍스트를 모든 지문으로 조회 가능"""
+        cache = TranscriptCache(redis_client=None)
+        cache.set("raw", "payload", transcript="hello world")
+
+        assert cache.get("raw") == "hello world"
+        assert cache.get("payload") == "hello world"
+        assert cache.get("other") is None
+
+    def test_empty_transcript_not_stored(self):
+        """빈 결과는 저장하지 않음"""
+        cache = TranscriptCache(redis_client=None)
+        cache.set("raw", transcript="")
+
+        assert cache.get("raw") is None
+
+    def test_local_lru_eviction(self):
+        """로컬 캐시는 가장 오래 사용하지 않은 항목부터 제거"""
+        cache = TranscriptCache(redis_client=None, local_size=2)
+        cache.set("a", transcript="A")
+        cache.set("b", transcript="B")
+        cache.get("a")
+        cache.set("c", transcript="C")
+
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+
+    def test_redis_hit_fills_local(self):
+        """Redis에서 찾은 결과를 로컬 캐시에 채움"""
+        redis_client = MagicMock()
+        redis_client.get.return_value = "from redis".encode()
+        cache = TranscriptCache(redis_client=redis_client, namespace="wit_ai")
+
+        assert cache.get("raw") == "from redis"
+        redis_client.get.assert_called_once_with("stt_cache:wit_ai:raw")
+
+        redis_client.get.reset_mock()
+        assert cache.get("raw") == "from redis"
+        redis_client.get.assert_not_called()
+
+    def test_redis_error_backs_off(self):
+        """Redis 오류 후에는 잠시 Redis 조회를 건너뜀"""
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ConnectionError("down")
+        cache = TranscriptCache(redis_client=redis_client)
+
+        assert cache.get("raw") is None
+        assert cache.get("raw") is None
+        assert redis_client.get.call_count == 1
+
+
+class TestProcessAudioCache:
+    """AudioProcessor 중복 제출 테스트"""
+
+    def test_duplicate_submission_skips_stt(self, sample_audio_bytes):
+        """같은 녹음을 다시 제출하면 STT를 호출하지 않음"""
+        processor = AudioProcessor()
+        mock_response = Mock(status_code=200, text='{"text": "캐시된 결과", "is_final": true}')
+
+        with patch('services.stt_client.requests.Session.post', return_value=mock_response) as mock_post:
+            with patch.object(processor, '_preprocess_audio', return_value=b"processed" * 20):
+                first = processor.process_audio(sample_audio_bytes)
+                second = processor.process_audio(sample_audio_bytes)
+
+        assert first == second == "캐시된 결과"
+        assert mock_post.call_count == 1
@@ -0,0 +1,162 @@
+# tests/test_tts_cache.py
+"""
+음성 합성(TTS) 캐시 테스트 파일
+
+같은 텍스트는 한 번만 합성하는지(동시 요청 포함), 공유 저장소에 있으면 합성 대신 내려받는지,
+문제 음성 API가 MP3를 Range 요청과 캐시 헤더와 함께 바로 전송하는지 검증
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from mongomock_motor import AsyncMongoMockClient
+
+from api import tests_api
+from db.mongodb import get_mongodb
+from services import tts_cache
+from services.blob_store import BlobNotFoundError
+from services.tts_cache import TtsCache, tts_digest
+
+AUDIO = b"ID3" + bytes(range(256)) * 4
+
+
+class FakeStore:
+    """put_key/get만 흉내 내는 테스트용 공유 저장소"""
+
+    prefix = "tts-audio/"
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_key(self, name, data):
+        self.objects[f"{self.prefix}{name}"] = data
+        return f"{self.prefix}{name}"
+
+    def get(self, key):
+        if key not in self.objects:
+            raise BlobNotFoundError(key)
+        return self.objects[key]
+
+
+class CountingRender:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self, text):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AUDIO
+
+
+class TestTtsCache:
+    """TTS 캐시 테스트"""
+
+    async def test_concurrent_requests_render_once(self, tmp_path):
+        cache = TtsCache(str(tmp_path))
+        render = CountingRender(delay=0.01)
+
+        results = await asyncio.gather(*(cache.aensure("Tell me about your house.", "v", render) for _ in range(5)))
+
+        assert render.calls == 1
+        assert len({path for _, path in results}) == 1
+        assert open(results[0][1], "rb").read() == AUDIO
+
+    async def test_key_depends_on_text_and_voice(self, tmp_path):
+        cache = TtsCache(str(tmp_path))
+        render = CountingRender()
+
+        await cache.aensure("Hello", "gtts:en", render)
+        await cache.aensure("  Hello ", "gtts:en", render)  # 앞뒤 공백만 다른 텍스트는 같은 키
+        await cache.aensure("Hello", "csm-1b", render)
+
+        assert render.calls == 2
+        assert tts_digest("Hello", "gtts:en") != tts_digest("Hello", "csm-1b")
+
+    async def test_shared_store_avoids_rendering(self, tmp_path):
+        store = FakeStore()
+        await TtsCache(str(tmp_path / "a"), store=store).aensure("Hello", "v", CountingRender())
+        render = CountingRender()
+
+        digest, path = await TtsCache(str(tmp_path / "b"), store=store).aensure("Hello", "v", render)
+
+        assert render.calls == 0  # 다른 서버는 저장소에서 내려받음
+        assert open(path, "rb").read() == AUDIO
+
+    async def test_failed_render_is_not_cached(self, tmp_path):
+        cache = TtsCache(str(tmp_path))
+
+        async def broken(text):
+            raise RuntimeError("tts down")
+
+        with pytest.raises(RuntimeError):
+            await cache.aensure("Hello", "v", broken)
+
+        render = CountingRender()
+        await cache.aensure("Hello", "v", render)
+        assert render.calls == 1
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch):
+    db = AsyncMongoMockClient().omypic
+    problem_id = (await db.problems.insert_one({"content": "Describe your favorite park."})).inserted_id
+    render = CountingRender()
+    monkeypatch.setattr(tts_cache, "_cache", TtsCache(str(tmp_path)))
+    monkeypatch.setattr(tests_api, "render_gtts", render)
+
+    app = FastAPI()
+    app.include_router(tests_api.router, prefix="/api/tests")
+
+    async def override_db():
+        return db
+    app.dependency_overrides[get_mongodb] = override_db
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http, str(problem_id), render
+
+
+class TestProblemAudioApi:
+    """문제 음성 API 테스트"""
+
+    async def test_streams_mp3_and_reuses_cache(self, client):
+        http, problem_id, render = client
+
+        first = await http.get(f"/api/tests/{problem_id}/audio")
+        second = await http.get(f"/api/tests/{problem_id}/audio")
+
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "audio/mpeg"
+        assert first.content == AUDIO
+        assert second.content == AUDIO
+        assert render.calls == 1
+
+    async def test_range_request(self, client):
+        http, problem_id, _ = client
+
+        response = await http.get(f"/api/tests/{problem_id}/audio", headers={"Range": "bytes=0-99"})
+
+        assert response.status_code == 206
+        assert response.content == AUDIO[:100]
+
+    async def test_content_addressed_url_is_immutable(self, client):
+        http, problem_id, _ = client
+        location = (await http.get(f"/api/tests/{problem_id}/audio")).headers["content-location"]
+        digest = location.rsplit("/", 1)[-1][:-len(".mp3")]
+
+        response = await http.get(f"/api/tests/audio/{digest}.mp3")
+
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"] == f'"{digest}"'
+        assert (await http.get(f"/api/tests/audio/{'0' * 32}.mp3")).status_code == 404
+
+    async def test_missing_problem(self, client):
+        http, _, render = client
+
+        assert (await http.get(f"/api/tests/{ObjectId()}/audio")).status_code == 404
+        assert (await http.get("/api/tests/not-an-id/audio")).status_code == 404
+        assert render.calls == 0
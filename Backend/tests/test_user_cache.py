@@ -0,0 +1,185 @@
+# tests/test_user_cache.py
+"""
+인증 사용자 캐시 테스트 파일
+
+캐시 적중 시 Mongo를 다시 조회하지 않는지, 사용자 정보 변경 시 무효화되는지,
+조회 중 무효화된 이전 문서를 저장하지 않는지, Redis 장애 시 로컬 캐시로 동작하는지,
+캐시된 limits가 오래되어도 스크립트 생성 제한을 넘지 않는지 검증
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from mongomock_motor import AsyncMongoMockClient
+
+from api.problems_api import make_script
+from models.user import User
+from schemas.problem import QuestionAnswers, ScriptCreationRequest
+from services import user_cache
+from services.score_stats import apply_test_scores
+from services.user_cache import UserCache, load_user
+
+
+class FakeRedis:
+    """get/set/delete/publish만 흉내 내는 테스트용 Redis"""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode("utf-8")
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.values) if key.startswith(prefix)]
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+            def execute(self):
+                return [getattr(redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+        return Pipeline()
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient().omypic
+    await db.users.insert_one({
+        "_id": ObjectId("65f000000000000000000001"),
+        "name": "테스트 유저",
+        "limits": {"test_count": 0},
+        "created_at": datetime(2024, 1, 1, 9, 30)
+    })
+    return db
+
+
+USER_ID = "65f000000000000000000001"
+
+
+class TestUserCache:
+    """사용자 캐시 테스트"""
+
+    async def test_hit_skips_mongo(self, mock_db):
+        mock_db.users.find_one.return_value = {"_id": ObjectId(USER_ID), "limits": {"test_count": 0}}
+
+        first = await load_user(mock_db, USER_ID)
+        second = await load_user(mock_db, ObjectId(USER_ID))
+
+        assert mock_db.users.find_one.await_count == 1
+        assert second == first
+        second["limits"]["test_count"] = 99  # 반환값을 수정해도 캐시된 문서는 그대로
+        assert (await load_user(mock_db, USER_ID))["limits"]["test_count"] == 0
+
+    async def test_invalidate_rereads_updated_user(self, db):
+        await load_user(db, USER_ID)
+        await db.users.update_one({"_id": ObjectId(USER_ID)}, {"$inc": {"limits.test_count": 1}})
+        await user_cache.get_user_cache().ainvalidate(USER_ID)
+
+        assert (await load_user(db, USER_ID))["limits"]["test_count"] == 1
+
+    async def test_score_update_invalidates(self, db):
+        await load_user(db, USER_ID)
+        test_id = (await db.tests.insert_one({"user_id": USER_ID})).inserted_id
+
+        await apply_test_scores(db, test_id, USER_ID, {"total_score": "IM2"})
+
+        assert "average_score" in await load_user(db, USER_ID)
+
+    def test_invalidation_during_read_is_not_cached(self):
+        cache = UserCache(redis_client=None)
+        epoch = cache.epoch
+        cache.invalidate(USER_ID)  # 조회 도중 다른 요청이 사용자 정보를 변경
+
+        assert cache.set(USER_ID, {"name": "이전 값"}, epoch=epoch) is False
+        assert cache.get(USER_ID) is None
+
+    def test_redis_layer_shared_and_invalidated(self):
+        redis = FakeRedis()
+        writer = UserCache(redis_client=redis)
+        reader = UserCache(redis_client=redis)
+        user = {"_id": ObjectId(USER_ID), "created_at": datetime(2024, 1, 1, 9, 30)}
+
+        writer.set(USER_ID, user)
+        assert reader.get(USER_ID) == user  # ObjectId/datetime 그대로 복원
+
+        writer.invalidate(USER_ID)
+        assert redis.get(f"{UserCache.PREFIX}{USER_ID}") is None
+        assert redis.published == [(UserCache.CHANNEL, USER_ID)]
+
+        # 다른 프로세스는 발행된 알림으로 로컬 캐시에서 삭제
+        reader.handle_invalidation(redis.published[-1][1].encode("utf-8"))
+        assert reader.get(USER_ID) is None
+
+    def test_invalidate_all(self):
+        redis = FakeRedis()
+        cache = UserCache(redis_client=redis)
+        cache.set("a", {"name": "a"})
+        cache.set("b", {"name": "b"})
+
+        cache.invalidate_all()
+
+        assert redis.values == {}
+        assert cache.get("a") is None
+        assert redis.published[-1] == (UserCache.CHANNEL, "*")
+
+    def test_redis_error_falls_back_to_local(self):
+        redis = Mock()
+        redis.get.side_effect = ConnectionError("down")
+        cache = UserCache(redis_client=redis)
+
+        assert cache.get(USER_ID) is None
+        cache.set(USER_ID, {"name": "테스트 유저"})
+
+        assert cache.get(USER_ID) == {"name": "테스트 유저"}
+        redis.set.assert_not_called()  # 장애 후에는 재시도 간격 동안 Redis를 건너뜀
+
+    def test_local_entry_expires(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(user_cache.time, "monotonic", lambda: now[0])
+        cache = UserCache(redis_client=None, local_ttl_seconds=5)
+        cache.set(USER_ID, {"name": "테스트 유저"})
+
+        now[0] += 6
+
+        assert cache.get(USER_ID) is None
+
+
+class TestScriptLimit:
+    """캐시된 사용자 정보로 확인하는 스크립트 생성 제한 테스트"""
+
+    async def test_stale_cached_limits_cannot_exceed_limit(self, db):
+        # 캐시에는 4회로 남아 있지만 다른 요청이 이미 5회째를 사용한 경우
+        await db.users.update_one({"_id": ObjectId(USER_ID)}, {"$set": {"limits.script_count": 5}})
+        cached_user = User(id=USER_ID, name="테스트 유저", limits={"script_count": 4})
+        request = ScriptCreationRequest(
+            type="basic", basic_answers=QuestionAnswers(answer1="a", answer2="b", answer3="c")
+        )
+
+        with pytest.raises(HTTPException) as exc:
+            await make_script(str(ObjectId()), request, cached_user, db)
+
+        assert exc.value.status_code == 403
+        assert (await db.users.find_one({"_id": ObjectId(USER_ID)}))["limits"]["script_count"] == 5
+        assert await db.scripts.count_documents({}) == 0
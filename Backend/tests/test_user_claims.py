@@ -0,0 +1,130 @@
+# tests/test_user_claims.py
+"""
+클레임 기반 경량 인증 테스트 파일
+
+액세스 토큰에 온보딩 여부/limits 버전 클레임이 들어가는지, 서명 검증만으로 인증하고
+전체 사용자 정보는 처음 필요할 때 한 번만 조회하는지, 필요한 필드만 조회할 때 limits 버전이 같은
+로컬 캐시를 쓰고 아니면 projection으로 읽는지, 오류 응답이 기존 인증과 같은지 검증
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from api.deps import get_current_user_claims
+from core.config import settings
+from services.auth import create_access_token, limits_version
+
+USER_ID = "65f000000000000000000001"
+USER = {
+    "_id": ObjectId(USER_ID),
+    "name": "테스트 유저",
+    "auth_provider": "google",
+    "is_onboarded": True,
+    "limits": {"test_count": 1, "random_problem": 0}
+}
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def issue(user=USER):
+    return create_access_token({"sub": USER_ID, "name": user["name"], "auth_provider": "google"}, user=user)
+
+
+class TestUserClaims:
+    """경량 인증 의존성 테스트"""
+
+    def test_access_token_carries_claims(self):
+        payload = jwt.decode(issue(), settings.JWT_SECRET_KEY, algorithms=settings.JWT_ALGORITHM)
+
+        assert payload["onboarded"] is True
+        assert payload["lv"] == limits_version(USER["limits"])
+        # limits가 바뀌면 버전도 달라짐
+        assert limits_version({"test_count": 0, "random_problem": 0}) != payload["lv"]
+
+    async def test_claims_without_db_read(self, mock_db):
+        claims = await get_current_user_claims(bearer(issue()), mock_db)
+
+        assert claims.id == USER_ID
+        assert claims.is_onboarded is True
+        mock_db.users.find_one.assert_not_awaited()
+
+    async def test_full_user_loaded_once_on_demand(self, mock_db):
+        mock_db.users.find_one.return_value = dict(USER)
+        claims = await get_current_user_claims(bearer(issue()), mock_db)
+
+        first = await claims.get_user()
+        second = await claims.get_user()
+
+        assert first is second
+        assert first.limits["test_count"] == 1
+        assert mock_db.users.find_one.await_count == 1
+
+    async def test_fields_read_with_projection(self, mock_db):
+        mock_db.users.find_one.return_value = {"_id": USER["_id"], "limits": USER["limits"]}
+        claims = await get_current_user_claims(bearer(issue()), mock_db)
+
+        fields = await claims.get_fields("limits", "average_score")
+
+        assert fields == {"limits": USER["limits"], "average_score": None}
+        mock_db.users.find_one.assert_awaited_once_with({"_id": USER["_id"]}, {"limits": 1, "average_score": 1})
+
+    async def test_fields_from_local_cache_when_limits_version_matches(self, mock_db, isolated_user_cache):
+        isolated_user_cache.set(USER_ID, USER)
+        claims = await get_current_user_claims(bearer(issue()), mock_db)
+
+        assert (await claims.get_fields("limits"))["limits"] == USER["limits"]
+        mock_db.users.find_one.assert_not_awaited()
+
+        # 캐시의 limits가 토큰 발급 이후 바뀌었으면 DB에서 다시 읽음
+        isolated_user_cache.set(USER_ID, {**USER, "limits": {"test_count": 0}})
+        mock_db.users.find_one.return_value = {"_id": USER["_id"], "limits": {"test_count": 0}}
+
+        assert (await claims.get_fields("limits"))["limits"] == {"test_count": 0}
+        mock_db.users.find_one.assert_awaited_once()
+
+    async def test_missing_user_on_load(self, mock_db):
+        claims = await get_current_user_claims(bearer(issue()), mock_db)
+
+        with pytest.raises(HTTPException) as exc:
+            await claims.get_user()
+
+        assert exc.value.status_code == 404
+
+    async def test_expired_token(self, mock_db):
+        expired = jwt.encode(
+            {"sub": USER_ID, "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+            settings.JWT_SECRET_KEY,
+            algorithm=settings.JWT_ALGORITHM
+        )
+
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_claims(bearer(expired), mock_db)
+
+        assert exc.value.status_code == 401
+        assert exc.value.headers["X-Error-Type"] == "token_expired"
+
+    @pytest.mark.parametrize("credentials, error_type", [
+        (None, "missing_token"),
+        (bearer("not-a-token"), "invalid_token"),
+    ])
+    async def test_invalid_credentials(self, mock_db, credentials, error_type):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_claims(credentials, mock_db)
+
+        assert exc.value.status_code == 401
+        assert exc.value.headers["X-Error-Type"] == error_type
+
+    async def test_malformed_user_id(self, mock_db):
+        token = jwt.encode({"sub": "bad-id"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_claims(bearer(token), mock_db)
+
+        assert exc.value.headers["X-Error-Type"] == "invalid_user_id_format"
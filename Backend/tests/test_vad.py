@@ -0,0 +1,88 @@
+# tests/test_vad.py
+"""
+VAD(음성 구간 검출) 테스트 파일
+
+앞뒤 무음 제거, 긴 공백 축소, 무음 녹음 판정, 청크 입력 일관성을 검증
+"""
+
+import numpy as np
+
+from services.vad import VadConfig, VoiceActivityTrimmer, frame_levels_db, trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds: float, amplitude: int = 3000) -> np.ndarray:
+    """발화 대신 사용할 220Hz 사인파"""
+    t = np.arange(int(SAMPLE_RATE * seconds))
+    return (np.sin(2 * np.pi * 220 * t / SAMPLE_RATE) * amplitude).astype("<i2")
+
+
+def silence(seconds: float, noise: int = 5) -> np.ndarray:
+    """약한 잡음이 섞인 무음"""
+    rng = np.random.default_rng(0)
+    return rng.integers(-noise, noise + 1, int(SAMPLE_RATE * seconds)).astype("<i2")
+
+
+def seconds_of(pcm: bytes) -> float:
+    return len(pcm) / 2 / SAMPLE_RATE
+
+
+class TestFrameLevels:
+    """프레임 에너지 계산 테스트"""
+
+    def test_levels(self):
+        """사인파는 높은 레벨, 0은 매우 낮은 레벨"""
+        levels = frame_levels_db(np.concatenate([tone(0.3), np.zeros(4800, dtype="<i2")]), 480)
+
+        assert levels[0] > -25
+        assert levels[-1] < -150
+
+
+class TestTrimSilence:
+    """무음 제거 테스트"""
+
+    def test_trims_leading_and_trailing_silence(self):
+        """앞뒤 무음은 padding만 남기고 제거"""
+        pcm = np.concatenate([silence(3), tone(2), silence(4)]).tobytes()
+
+        trimmed, vad = trim_silence(pcm)
+
+        assert not vad.is_silent
+        assert abs(vad.speech_seconds - 2) < 0.1
+        # 발화 2초 + 앞뒤 padding 0.2초씩
+        assert abs(seconds_of(trimmed) - 2.4) < 0.1
+
+    def test_collapses_long_pause(self):
+        """발화 중간의 긴 공백을 max_pause_ms로 축소"""
+        pcm = np.concatenate([tone(1), silence(5), tone(1)]).tobytes()
+
+        trimmed, _ = trim_silence(pcm, config=VadConfig(padding_ms=0, max_pause_ms=600))
+
+        assert abs(seconds_of(trimmed) - 2.6) < 0.1
+
+    def test_keeps_short_pause(self):
+        """짧은 공백은 그대로 유지"""
+        pcm = np.concatenate([tone(1), silence(0.3), tone(1)]).tobytes()
+
+        trimmed, _ = trim_silence(pcm, config=VadConfig(padding_ms=0))
+
+        assert abs(seconds_of(trimmed) - 2.3) < 0.05
+
+    def test_silent_recording(self):
+        """발화가 없는 녹음은 무음으로 판정하고 출력하지 않음"""
+        trimmed, vad = trim_silence(silence(5).tobytes())
+
+        assert vad.is_silent
+        assert trimmed == b""
+
+    def test_chunked_feed_matches_batch(self):
+        """청크 단위 입력과 일괄 입력의 결과가 같음"""
+        pcm = np.concatenate([silence(1), tone(1), silence(2), tone(0.5), silence(1)]).tobytes()
+        batch, _ = trim_silence(pcm)
+
+        trimmer = VoiceActivityTrimmer()
+        chunked = b"".join(trimmer.feed(pcm[i:i + 1001]) for i in range(0, len(pcm), 1001))
+        chunked += trimmer.finish()
+
+        assert chunked == batch